@@ -48,6 +48,19 @@ def create_app() -> Flask:
     from app.core.database import close_db
     app.teardown_appcontext(close_db)
     
+    # Request ids for log records and the X-Request-ID header
+    from app.core.request_id import init_request_id
+    init_request_id(app)
+    
+    # Per-route latency, in-flight requests and on-demand profiling
+    # (registered before the other request hooks so they are timed too)
+    from app.core.request_metrics import init_request_metrics
+    init_request_metrics(app)
+    
+    # Per-request SQL statistics (Server-Timing header, slow-query log)
+    from app.core.sql_instrumentation import init_sql_instrumentation
+    init_sql_instrumentation(app)
+    
     # Initialize Redis cache (singleton pattern - done once at startup)
     logger = logging.getLogger(__name__)
     logger.info("Initializing Redis cache connection...")
@@ -64,25 +77,17 @@ def create_app() -> Flask:
     for bp, prefix in blueprints:
         app.register_blueprint(bp, url_prefix=prefix)
     
-    # Initialize ReferenceData cache AFTER blueprints are registered
-    # This avoids circular import issues with middleware
-    logger = logging.getLogger(__name__)
+    # Rate limiting (Redis token buckets, policies in app/blueprints.py)
+    from app.blueprints import rate_limits, default_rate_limit, rate_limit_exempt
+    from app.core.rate_limiter import init_rate_limiting
+    init_rate_limiting(app, rate_limits, default_rate_limit, rate_limit_exempt)
     
-    # Skip cache initialization in testing mode - tests will initialize it after seeding data
-    if not app.config.get('TESTING', False):
-        logger.info("Initializing ReferenceData cache...")
-        try:
-            from app.core.reference_data import ReferenceDataCache
-            
-            # Initialize cache within Flask app context
-            with app.app_context():
-                ReferenceDataCache.initialize()
-            logger.info("ReferenceData cache initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize ReferenceData cache: {e}", exc_info=True)
-            # Continue anyway - cache will be lazy-loaded on first use
-    else:
-        logger.info("Skipping ReferenceData cache initialization (testing mode) - will be initialized after test data seeding")
+    # Load the ReferenceData snapshot AFTER blueprints are registered (avoids
+    # circular imports with middleware); its refresher thread starts with the
+    # first request served.
+    # Skipped in testing mode - tests initialize it after seeding data
+    from app.core.reference_data import init_reference_data
+    init_reference_data(app)
 
     # Centralized error handler for API
     @app.errorhandler(Exception)
@@ -0,0 +1,25 @@
+"""
+Analytics Module
+
+Sales dashboard metrics (revenue per day, top products, category mix,
+return rates) read from daily rollup tables that are refreshed
+incrementally for the days changed by order and return mutations.
+
+Blueprint: analytics_bp - handles all analytics routes
+"""
+
+from flask import Blueprint
+
+# Create analytics blueprint
+analytics_bp = Blueprint('analytics', __name__)
+
+# Import routes after blueprint creation to avoid circular imports
+from app.analytics.routes.analytics_routes import register_analytics_routes
+
+# Register routes with the blueprint
+register_analytics_routes(analytics_bp)
+
+# Export main components for easy importing
+__all__ = [
+    'analytics_bp'
+]
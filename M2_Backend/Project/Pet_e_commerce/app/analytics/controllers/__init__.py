@@ -0,0 +1,11 @@
+"""
+Analytics Controllers Module
+
+Exports:
+- AnalyticsController: HTTP layer of the analytics dashboard
+"""
+from app.analytics.controllers.analytics_controller import AnalyticsController
+
+__all__ = [
+    'AnalyticsController',
+]
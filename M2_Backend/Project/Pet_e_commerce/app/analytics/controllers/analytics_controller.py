@@ -0,0 +1,88 @@
+"""
+Analytics Controller Module
+
+HTTP request processing layer for the sales analytics dashboard.
+Delegates to AnalyticsService, which reads the daily rollup tables.
+
+Responsibilities:
+- Query parameter validation (date range, limit, ordering, grouping)
+- HTTP response formatting
+- Error handling and logging
+
+Usage:
+    controller = AnalyticsController()
+    response, status = controller.get_daily_sales()
+"""
+from flask import request, jsonify
+from marshmallow import ValidationError
+from config.logging import get_logger, EXC_INFO_LOG_ERRORS
+from app.core.lib.error_utils import error_response
+
+# Service imports
+from app.analytics.services.analytics_service import AnalyticsService
+
+# Schema imports
+from app.analytics.schemas.analytics_schema import analytics_query_schema
+
+logger = get_logger(__name__)
+
+
+class AnalyticsController:
+    """Controller for analytics HTTP operations."""
+
+    def __init__(self):
+        """Initialize analytics controller with service dependency."""
+        self.analytics_service = AnalyticsService()
+        self.logger = logger
+
+    def _run_report(self, name: str, build):
+        """Validate the query string, build one report and format the response."""
+        try:
+            query = analytics_query_schema.load(request.args)
+            report = build(query)
+            if report is None:
+                self.logger.error(f"Analytics {name} report failed in service layer")
+                return jsonify({"error": f"Failed to build {name} report"}), 500
+            return jsonify(report), 200
+
+        except ValidationError as err:
+            self.logger.warning(f"Analytics {name} query validation error: {err.messages}")
+            return jsonify({"errors": err.messages}), 400
+        except Exception as e:
+            self.logger.error(f"Error building analytics {name} report: {e}", exc_info=EXC_INFO_LOG_ERRORS)
+            return error_response(f"Failed to build {name} report", e)
+
+    def get_daily_sales(self):
+        """GET /analytics/sales/daily - revenue, orders and units per day."""
+        return self._run_report("daily sales", lambda query: self.analytics_service.get_daily_sales(
+            query["start_day"], query["end_day"]))
+
+    def get_top_products(self):
+        """GET /analytics/products/top - best sellers (?limit, ?order_by=revenue|units)."""
+        return self._run_report("top products", lambda query: self.analytics_service.get_top_products(
+            query["start_day"], query["end_day"], limit=query["limit"], order_by=query["order_by"]))
+
+    def get_category_mix(self):
+        """GET /analytics/categories - revenue and unit share per category."""
+        return self._run_report("category mix", lambda query: self.analytics_service.get_category_mix(
+            query["start_day"], query["end_day"]))
+
+    def get_return_rates(self):
+        """GET /analytics/returns - return rates (?group_by=category|product)."""
+        return self._run_report("return rates", lambda query: self.analytics_service.get_return_rates(
+            query["start_day"], query["end_day"], group_by=query["group_by"]))
+
+    def refresh(self):
+        """POST /analytics/refresh - recompute one batch of changed days."""
+        try:
+            result = self.analytics_service.refresh_rollups()
+            if result is None:
+                self.logger.error("Analytics refresh failed in service layer")
+                return jsonify({"error": "Failed to refresh analytics"}), 500
+
+            self.logger.info(f"Analytics refresh: {len(result['refreshed_days'])} day(s) refreshed")
+            return jsonify({"message": "Analytics refreshed", **result}), 200
+
+        except Exception as e:
+            self.logger.error(f"Error refreshing analytics: {e}", exc_info=EXC_INFO_LOG_ERRORS)
+            return error_response("Failed to refresh analytics", e)
@@ -0,0 +1,13 @@
+"""
+Analytics models package - exports rollup tables.
+"""
+
+from .rollups import DailySales, DailyProductSales, DailyCategorySales, DailyReturns, AnalyticsDirtyDay
+
+__all__ = [
+    'DailySales',
+    'DailyProductSales',
+    'DailyCategorySales',
+    'DailyReturns',
+    'AnalyticsDirtyDay'
+]
@@ -0,0 +1,121 @@
+"""
+Analytics Rollup Models Module
+
+Pre-aggregated daily sales and returns, read by the analytics dashboard
+instead of scanning orders/order_item/returns history.
+
+Models:
+- DailySales: Orders, units and revenue per day
+- DailyProductSales: Units and revenue per day and product
+- DailyCategorySales: Units and revenue per day and product category
+- DailyReturns: Returned units and refunds per day and product
+- AnalyticsDirtyDay: Days whose rollups must be recomputed
+
+Maintenance:
+- Triggers on orders/returns (installed by scripts/init_db.py) append the
+  created_at day of every inserted, updated or deleted row to analytics_dirty_days
+  (append-only: a day may be listed several times, writers never conflict)
+- AnalyticsRepository.refresh_dirty_days recomputes only those days
+  (scripts/refresh_analytics.py or POST /analytics/refresh)
+
+Cancelled orders and rejected returns are excluded from the rollups. Rollups
+are derived data, so they carry plain ids without foreign keys.
+"""
+from sqlalchemy import BigInteger, Integer, Float, Date, DateTime
+from sqlalchemy.orm import Mapped, mapped_column, declared_attr
+from app.core.database import Base, get_schema
+from datetime import date, datetime
+
+
+class DailySales(Base):
+    """Order totals per day."""
+    __tablename__ = "daily_sales"
+
+    @declared_attr
+    def __table_args__(cls):
+        return {'schema': get_schema()}
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    order_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    units: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    revenue: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<DailySales(day={self.day}, orders={self.order_count}, revenue={self.revenue})>"
+
+
+class DailyProductSales(Base):
+    """Units and revenue per day and product."""
+    __tablename__ = "daily_product_sales"
+
+    @declared_attr
+    def __table_args__(cls):
+        return {'schema': get_schema()}
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    product_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    product_category_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    order_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    units: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    revenue: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<DailyProductSales(day={self.day}, product_id={self.product_id}, units={self.units})>"
+
+
+class DailyCategorySales(Base):
+    """Units and revenue per day and product category."""
+    __tablename__ = "daily_category_sales"
+
+    @declared_attr
+    def __table_args__(cls):
+        return {'schema': get_schema()}
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    product_category_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    order_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    units: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    revenue: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<DailyCategorySales(day={self.day}, category_id={self.product_category_id}, revenue={self.revenue})>"
+
+
+class DailyReturns(Base):
+    """Returned units and refunds per day (return created_at) and product."""
+    __tablename__ = "daily_returns"
+
+    @declared_attr
+    def __table_args__(cls):
+        return {'schema': get_schema()}
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    product_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    product_category_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    return_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    units: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    refund_amount: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<DailyReturns(day={self.day}, product_id={self.product_id}, units={self.units})>"
+
+
+class AnalyticsDirtyDay(Base):
+    """
+    Mark of a day whose rollups are stale (appended by triggers, drained by the refresh job).
+
+    Not unique per day: checkouts only ever INSERT, so they never wait on a
+    refresh holding an earlier mark of the same day, or on each other.
+    """
+    __tablename__ = "analytics_dirty_days"
+
+    @declared_attr
+    def __table_args__(cls):
+        return {'schema': get_schema()}
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    day: Mapped[date] = mapped_column(Date, nullable=False, index=True)
+    marked_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<AnalyticsDirtyDay(day={self.day})>"
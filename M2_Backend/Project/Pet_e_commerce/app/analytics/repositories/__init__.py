@@ -0,0 +1,11 @@
+"""
+Analytics Repositories Module
+
+Exports:
+- AnalyticsRepository: Rollup reads and incremental refresh
+"""
+from app.analytics.repositories.analytics_repository import AnalyticsRepository
+
+__all__ = [
+    'AnalyticsRepository',
+]
@@ -0,0 +1,340 @@
+"""
+Analytics Repository Module
+
+Reads the daily rollup tables and keeps them up to date.
+
+Responsibilities:
+- Dashboard queries over pre-aggregated rows (daily revenue, top products,
+  category mix, returned vs sold units)
+- Incremental refresh: recompute only the days listed in analytics_dirty_days
+- Trigger DDL that marks days dirty on order/return mutations
+
+Refresh model:
+    Triggers on orders and returns append the created_at day of every changed
+    row to analytics_dirty_days (statement-level, so bulk COPY loads mark
+    each day once per statement). The marks are not unique per day: writers
+    only INSERT, so a checkout never waits on a refresh that holds an earlier
+    mark of its day, nor on another checkout. refresh_dirty_days claims all
+    marks of the oldest days with FOR UPDATE SKIP LOCKED, deletes their
+    rollup rows and re-aggregates them from orders/order_item/returns. A day
+    changed while it is being refreshed gets a new mark and is picked up by
+    the next run.
+
+Usage:
+    repo = AnalyticsRepository()
+    days = repo.refresh_dirty_days(limit=31)
+    rows = repo.get_daily_sales(date(2025, 1, 1), date(2025, 2, 1))
+"""
+from datetime import date
+from typing import Any, Dict, List, Optional
+from sqlalchemy import bindparam, delete, func, select, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.types import Date
+from sqlalchemy.exc import SQLAlchemyError
+from app.core.database import get_db, get_schema
+from app.analytics.models.rollups import (
+    DailySales, DailyProductSales, DailyCategorySales, DailyReturns, AnalyticsDirtyDay
+)
+from app.products.models.product import Product
+import logging
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_MODELS = (DailySales, DailyProductSales, DailyCategorySales, DailyReturns)
+
+# Tables whose created_at day drives the rollups
+TRACKED_TABLES = ("orders", "returns")
+
+_DAYS = bindparam("days", type_=ARRAY(Date))
+
+
+def install_analytics_triggers(conn, schema_name: str) -> None:
+    """
+    Create the triggers that mark rollup days dirty (run by scripts/init_db.py).
+
+    One statement-level trigger per table and event; transition tables give
+    the changed rows, so a multi-row COPY or UPDATE marks each day once.
+    Also moves a queue created with a unique day key to the append-only layout.
+    """
+    conn.execute(text(f"""
+        DO $$
+        BEGIN
+            IF EXISTS (
+                SELECT 1 FROM pg_index i
+                JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
+                WHERE i.indrelid = '{schema_name}.analytics_dirty_days'::regclass
+                  AND i.indisprimary AND a.attname = 'day'
+            ) THEN
+                ALTER TABLE {schema_name}.analytics_dirty_days DROP CONSTRAINT analytics_dirty_days_pkey;
+                ALTER TABLE {schema_name}.analytics_dirty_days ADD COLUMN id bigserial PRIMARY KEY;
+            END IF;
+        END
+        $$
+    """))
+    conn.execute(text(f"""
+        CREATE OR REPLACE FUNCTION {schema_name}.mark_analytics_days_dirty() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO {schema_name}.analytics_dirty_days (day, marked_at)
+                SELECT DISTINCT created_at::date, now() FROM new_rows WHERE created_at IS NOT NULL;
+            END IF;
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                INSERT INTO {schema_name}.analytics_dirty_days (day, marked_at)
+                SELECT DISTINCT created_at::date, now() FROM old_rows WHERE created_at IS NOT NULL;
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """))
+    transition_tables = {
+        "INSERT": "NEW TABLE AS new_rows",
+        "UPDATE": "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+        "DELETE": "OLD TABLE AS old_rows",
+    }
+    for table_name in TRACKED_TABLES:
+        table = f"{schema_name}.{table_name}"
+        for event, referencing in transition_tables.items():
+            trigger = f"{table_name}_analytics_{event.lower()}"
+            conn.execute(text(f"DROP TRIGGER IF EXISTS {trigger} ON {table}"))
+            conn.execute(text(
+                f"CREATE TRIGGER {trigger} AFTER {event} ON {table} REFERENCING {referencing} "
+                f"FOR EACH STATEMENT EXECUTE FUNCTION {schema_name}.mark_analytics_days_dirty()"
+            ))
+
+
+class AnalyticsRepository:
+    """Repository for analytics rollups."""
+
+    # ============ REFRESH ============
+
+    def mark_days_dirty(self, start_day: date, end_day: date) -> Optional[int]:
+        """
+        Queue every day in [start_day, end_day] for recomputation (rebuilds, backfills).
+
+        Returns:
+            Number of queued days, or None on error
+        """
+        try:
+            db = get_db()
+            result = db.execute(text(f"""
+                INSERT INTO {get_schema()}.analytics_dirty_days (day, marked_at)
+                SELECT day::date, now() FROM generate_series(CAST(:start AS date), CAST(:end AS date), interval '1 day') AS day
+            """), {"start": start_day, "end": end_day})
+            return result.rowcount
+        except SQLAlchemyError as e:
+            logger.error(f"Error marking analytics days dirty: {e}")
+            return None
+
+    def get_history_start(self) -> Optional[date]:
+        """Day of the oldest order or return (start of a full rebuild), None when empty or on error."""
+        try:
+            db = get_db()
+            return db.execute(text(f"""
+                SELECT least(
+                    (SELECT min(created_at) FROM {get_schema()}.orders),
+                    (SELECT min(created_at) FROM {get_schema()}.returns)
+                )::date
+            """)).scalar()
+        except SQLAlchemyError as e:
+            logger.error(f"Error reading analytics history start: {e}")
+            return None
+
+    def count_dirty_days(self) -> Optional[int]:
+        """Number of days waiting for a refresh, or None on error."""
+        try:
+            db = get_db()
+            return db.scalar(select(func.count(func.distinct(AnalyticsDirtyDay.day))))
+        except SQLAlchemyError as e:
+            logger.error(f"Error counting analytics dirty days: {e}")
+            return None
+
+    def refresh_dirty_days(self, limit: int) -> Optional[List[date]]:
+        """
+        Claim up to `limit` dirty days and recompute their rollups.
+
+        Runs in the caller's transaction: if it is rolled back, the days stay
+        queued. Concurrent refreshers skip days already claimed.
+
+        Returns:
+            Refreshed days (empty when nothing was pending), or None on error
+        """
+        schema = get_schema()
+        try:
+            db = get_db()
+            days = sorted(set(db.scalars(text(f"""
+                DELETE FROM {schema}.analytics_dirty_days
+                WHERE id IN (
+                    SELECT id FROM {schema}.analytics_dirty_days
+                    WHERE day IN (
+                        SELECT DISTINCT day FROM {schema}.analytics_dirty_days ORDER BY day LIMIT :limit
+                    )
+                    FOR UPDATE SKIP LOCKED
+                )
+                RETURNING day
+            """), {"limit": limit})))
+            if not days:
+                return []
+
+            for model in ROLLUP_MODELS:
+                db.execute(delete(model).where(model.day.in_(days)))
+
+            db.execute(text(f"""
+                WITH days AS (
+                    SELECT unnest(:days) AS day
+                ), day_orders AS (
+                    SELECT days.day, o.id, o.total_amount
+                    FROM days
+                    JOIN {schema}.orders o ON o.created_at >= days.day AND o.created_at < days.day + 1
+                    JOIN {schema}.order_status st ON st.id = o.order_status_id
+                    WHERE st.status <> 'cancelled'
+                ), lines AS (
+                    SELECT day_orders.day, i.order_id, i.product_id, p.product_category_id, i.quantity, i.amount
+                    FROM day_orders
+                    JOIN {schema}.order_item i ON i.order_id = day_orders.id
+                    JOIN {schema}.products p ON p.id = i.product_id
+                ), totals AS (
+                    INSERT INTO {schema}.daily_sales (day, order_count, units, revenue)
+                    SELECT day_orders.day, count(*), coalesce(sum(order_units.units), 0), sum(day_orders.total_amount)
+                    FROM day_orders
+                    LEFT JOIN (
+                        SELECT order_id, sum(quantity) AS units FROM lines GROUP BY order_id
+                    ) order_units ON order_units.order_id = day_orders.id
+                    GROUP BY day_orders.day
+                ), by_product AS (
+                    INSERT INTO {schema}.daily_product_sales
+                        (day, product_id, product_category_id, order_count, units, revenue)
+                    SELECT day, product_id, min(product_category_id), count(DISTINCT order_id), sum(quantity), sum(amount)
+                    FROM lines GROUP BY day, product_id
+                )
+                INSERT INTO {schema}.daily_category_sales (day, product_category_id, order_count, units, revenue)
+                SELECT day, product_category_id, count(DISTINCT order_id), sum(quantity), sum(amount)
+                FROM lines GROUP BY day, product_category_id
+            """).bindparams(_DAYS), {"days": days})
+
+            db.execute(text(f"""
+                INSERT INTO {schema}.daily_returns
+                    (day, product_id, product_category_id, return_count, units, refund_amount)
+                SELECT days.day, ri.product_id, min(p.product_category_id),
+                       count(DISTINCT r.id), sum(ri.quantity), sum(ri.amount)
+                FROM unnest(:days) AS days(day)
+                JOIN {schema}.returns r ON r.created_at >= days.day AND r.created_at < days.day + 1
+                JOIN {schema}.return_status st ON st.id = r.return_status_id
+                JOIN {schema}.return_item ri ON ri.return_id = r.id
+                JOIN {schema}.products p ON p.id = ri.product_id
+                WHERE st.status <> 'rejected'
+                GROUP BY days.day, ri.product_id
+            """).bindparams(_DAYS), {"days": days})
+
+            return days
+        except SQLAlchemyError as e:
+            logger.error(f"Error refreshing analytics rollups: {e}")
+            return None
+
+    # ============ DASHBOARD QUERIES ============
+
+    def get_daily_sales(self, start_day: date, end_day: date) -> Optional[List[DailySales]]:
+        """Daily totals for start_day <= day < end_day, oldest first."""
+        try:
+            db = get_db()
+            return list(db.scalars(
+                select(DailySales)
+                .where(DailySales.day >= start_day, DailySales.day < end_day)
+                .order_by(DailySales.day)
+            ))
+        except SQLAlchemyError as e:
+            logger.error(f"Error reading daily sales: {e}")
+            return None
+
+    def get_top_products(self, start_day: date, end_day: date, limit: int,
+                         order_by: str = "revenue") -> Optional[List[Dict[str, Any]]]:
+        """
+        Products ranked by units or revenue over the range.
+
+        Args:
+            order_by: "revenue" or "units"
+        """
+        units = func.sum(DailyProductSales.units).label("units")
+        revenue = func.sum(DailyProductSales.revenue).label("revenue")
+        orders = func.sum(DailyProductSales.order_count).label("order_count")
+        ranked = (
+            select(DailyProductSales.product_id, units, revenue, orders)
+            .where(DailyProductSales.day >= start_day, DailyProductSales.day < end_day)
+            .group_by(DailyProductSales.product_id)
+            .order_by((units if order_by == "units" else revenue).desc(), DailyProductSales.product_id)
+            .limit(limit)
+            .subquery()
+        )
+        statement = (
+            select(ranked, Product.sku, Product.description, Product.product_category_id)
+            .join(Product, Product.id == ranked.c.product_id)
+            .order_by((ranked.c.units if order_by == "units" else ranked.c.revenue).desc(), ranked.c.product_id)
+        )
+        try:
+            db = get_db()
+            return [dict(row._mapping) for row in db.execute(statement)]
+        except SQLAlchemyError as e:
+            logger.error(f"Error reading top products: {e}")
+            return None
+
+    def get_category_sales(self, start_day: date, end_day: date) -> Optional[List[Dict[str, Any]]]:
+        """Units and revenue per category over the range."""
+        statement = (
+            select(
+                DailyCategorySales.product_category_id,
+                func.sum(DailyCategorySales.units).label("units"),
+                func.sum(DailyCategorySales.revenue).label("revenue"),
+            )
+            .where(DailyCategorySales.day >= start_day, DailyCategorySales.day < end_day)
+            .group_by(DailyCategorySales.product_category_id)
+        )
+        try:
+            db = get_db()
+            return [dict(row._mapping) for row in db.execute(statement)]
+        except SQLAlchemyError as e:
+            logger.error(f"Error reading category sales: {e}")
+            return None
+
+    def get_returned_units(self, start_day: date, end_day: date,
+                           group_by: str = "category") -> Optional[List[Dict[str, Any]]]:
+        """
+        Returned units and refunds over the range, with units sold in the same range.
+
+        Args:
+            group_by: "category" (key product_category_id) or "product" (key product_id;
+                only products with returns)
+        """
+        if group_by == "product":
+            key, sold_model = DailyReturns.product_id, DailyProductSales
+            sold_key = DailyProductSales.product_id
+        else:
+            key, sold_model = DailyReturns.product_category_id, DailyCategorySales
+            sold_key = DailyCategorySales.product_category_id
+
+        returned = (
+            select(
+                key.label("key"),
+                func.sum(DailyReturns.units).label("units_returned"),
+                func.sum(DailyReturns.refund_amount).label("refund_amount"),
+                func.sum(DailyReturns.return_count).label("return_count"),
+            )
+            .where(DailyReturns.day >= start_day, DailyReturns.day < end_day)
+            .group_by(key)
+            .subquery()
+        )
+        sold = (
+            select(sold_key.label("key"), func.sum(sold_model.units).label("units_sold"))
+            .where(sold_model.day >= start_day, sold_model.day < end_day, sold_key.in_(select(returned.c.key)))
+            .group_by(sold_key)
+            .subquery()
+        )
+        statement = (
+            select(returned, func.coalesce(sold.c.units_sold, 0).label("units_sold"))
+            .outerjoin(sold, sold.c.key == returned.c.key)
+            .order_by(returned.c.units_returned.desc())
+        )
+        try:
+            db = get_db()
+            return [dict(row._mapping) for row in db.execute(statement)]
+        except SQLAlchemyError as e:
+            logger.error(f"Error reading returned units: {e}")
+            return None
@@ -0,0 +1,92 @@
+"""
+Analytics Routes Module
+
+Provides sales dashboard endpoints (admin only), served from daily rollup tables:
+- GET /analytics/sales/daily - Revenue, orders and units per day
+- GET /analytics/products/top - Top products by revenue or units
+- GET /analytics/categories - Category mix
+- GET /analytics/returns - Return rates by category or product
+- POST /analytics/refresh - Recompute rollups of changed days
+
+Query params: from/to (inclusive dates, default last 30 days), limit, order_by, group_by.
+
+Features:
+- Reads pre-aggregated rows instead of scanning order/return history
+- Validation and error handling delegated to AnalyticsController
+"""
+# Common imports
+from flask.views import MethodView
+
+# Auth imports (for decorators)
+from app.core.middleware import admin_required_with_repo
+
+# Controller imports
+from app.analytics.controllers.analytics_controller import AnalyticsController
+
+
+class DailySalesAPI(MethodView):
+    init_every_request = False
+
+    def __init__(self):
+        self.controller = AnalyticsController()
+
+    @admin_required_with_repo
+    def get(self):
+        """Revenue per day."""
+        return self.controller.get_daily_sales()
+
+
+class TopProductsAPI(MethodView):
+    init_every_request = False
+
+    def __init__(self):
+        self.controller = AnalyticsController()
+
+    @admin_required_with_repo
+    def get(self):
+        """Top products by revenue or units."""
+        return self.controller.get_top_products()
+
+
+class CategoryMixAPI(MethodView):
+    init_every_request = False
+
+    def __init__(self):
+        self.controller = AnalyticsController()
+
+    @admin_required_with_repo
+    def get(self):
+        """Revenue and unit share per category."""
+        return self.controller.get_category_mix()
+
+
+class ReturnRatesAPI(MethodView):
+    init_every_request = False
+
+    def __init__(self):
+        self.controller = AnalyticsController()
+
+    @admin_required_with_repo
+    def get(self):
+        """Returned vs sold units."""
+        return self.controller.get_return_rates()
+
+
+class AnalyticsRefreshAPI(MethodView):
+    init_every_request = False
+
+    def __init__(self):
+        self.controller = AnalyticsController()
+
+    @admin_required_with_repo
+    def post(self):
+        """Recompute rollups of changed days (one batch)."""
+        return self.controller.refresh()
+
+
+def register_analytics_routes(analytics_bp):
+    analytics_bp.add_url_rule('/sales/daily', view_func=DailySalesAPI.as_view('daily_sales'))
+    analytics_bp.add_url_rule('/products/top', view_func=TopProductsAPI.as_view('top_products'))
+    analytics_bp.add_url_rule('/categories', view_func=CategoryMixAPI.as_view('category_mix'))
+    analytics_bp.add_url_rule('/returns', view_func=ReturnRatesAPI.as_view('return_rates'))
+    analytics_bp.add_url_rule('/refresh', view_func=AnalyticsRefreshAPI.as_view('analytics_refresh'))
@@ -0,0 +1,5 @@
+"""
+Analytics schemas package - exports query parameter schemas.
+"""
+
+from .analytics_schema import analytics_query_schema, AnalyticsQuerySchema
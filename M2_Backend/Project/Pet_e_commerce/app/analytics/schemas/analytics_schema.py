@@ -0,0 +1,42 @@
+from datetime import date, timedelta
+from marshmallow import Schema, fields, validate, validates_schema, ValidationError, post_load
+from config.settings import ANALYTICS_DEFAULT_RANGE_DAYS, ANALYTICS_MAX_RANGE_DAYS
+
+
+class AnalyticsQuerySchema(Schema):
+    """
+    Query parameters of the analytics endpoints.
+
+    from/to are inclusive dates; the loaded data carries start_day and the
+    exclusive end_day used by the rollup queries. Defaults to the last
+    ANALYTICS_DEFAULT_RANGE_DAYS days (today included).
+
+    Example: ?from=2025-01-01&to=2025-01-31&limit=5&order_by=units
+    """
+    from_day = fields.Date(data_key="from")
+    to_day = fields.Date(data_key="to")
+    limit = fields.Int(load_default=10, validate=validate.Range(min=1, max=100))
+    order_by = fields.Str(load_default="revenue", validate=validate.OneOf(["revenue", "units"]))
+    group_by = fields.Str(load_default="category", validate=validate.OneOf(["category", "product"]))
+
+    @post_load
+    def resolve_range(self, data, **kwargs):
+        """Fill the default range and convert it to [start_day, end_day)."""
+        to_day = data.pop("to_day", None) or date.today()
+        from_day = data.pop("from_day", None) or to_day - timedelta(days=ANALYTICS_DEFAULT_RANGE_DAYS - 1)
+        data["start_day"], data["end_day"] = from_day, to_day + timedelta(days=1)
+        return data
+
+    @validates_schema
+    def validate_range(self, data, **kwargs):
+        """from must not be after to; the range is capped at ANALYTICS_MAX_RANGE_DAYS."""
+        from_day, to_day = data.get("from_day"), data.get("to_day")
+        if from_day and to_day:
+            if from_day > to_day:
+                raise ValidationError("'from' must not be after 'to'", field_name="from")
+            if (to_day - from_day).days + 1 > ANALYTICS_MAX_RANGE_DAYS:
+                raise ValidationError(f"Range cannot exceed {ANALYTICS_MAX_RANGE_DAYS} days", field_name="from")
+
+
+# Schema instances for easy import
+analytics_query_schema = AnalyticsQuerySchema()
@@ -0,0 +1,11 @@
+"""
+Analytics Services Module
+
+Exports:
+- AnalyticsService: Dashboard metrics and rollup refresh
+"""
+from app.analytics.services.analytics_service import AnalyticsService
+
+__all__ = [
+    'AnalyticsService',
+]
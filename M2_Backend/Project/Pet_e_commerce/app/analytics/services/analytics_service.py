@@ -0,0 +1,158 @@
+"""
+Analytics Service Module
+
+Dashboard metrics computed from the daily rollup tables, plus the
+incremental rollup refresh.
+
+Metrics:
+- Revenue per day (orders, units, revenue)
+- Top products by units or revenue
+- Category mix (share of revenue and units)
+- Return rates (returned / sold units, by category or product)
+
+Ranges are half-open [start_day, end_day); reports echo them as inclusive
+from/to dates. Every report carries stale_days, the number of days changed
+since the last refresh.
+
+Usage:
+    service = AnalyticsService()
+    report = service.get_daily_sales(date(2025, 1, 1), date(2025, 2, 1))
+    refreshed = service.refresh_rollups()
+"""
+import logging
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+from app.analytics.repositories.analytics_repository import AnalyticsRepository
+from app.core.reference_data import ReferenceData
+from config.settings import ANALYTICS_REFRESH_BATCH_DAYS
+
+logger = logging.getLogger(__name__)
+
+
+def _ratio(part: float, whole: float) -> float:
+    return round(part / whole, 4) if whole else 0.0
+
+
+class AnalyticsService:
+    """Service class for analytics dashboard metrics."""
+
+    def __init__(self):
+        self.analytics_repo = AnalyticsRepository()
+        self.logger = logger
+
+    def _report(self, start_day: date, end_day: date, key: str, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return {
+            "from": start_day.isoformat(),
+            "to": (end_day - timedelta(days=1)).isoformat(),
+            "stale_days": self.analytics_repo.count_dirty_days(),
+            key: rows
+        }
+
+    def get_daily_sales(self, start_day: date, end_day: date) -> Optional[Dict[str, Any]]:
+        """Revenue, orders and units per day (days without orders are omitted)."""
+        try:
+            rows = self.analytics_repo.get_daily_sales(start_day, end_day)
+            if rows is None:
+                return None
+            return self._report(start_day, end_day, "days", [
+                {"day": row.day.isoformat(), "order_count": row.order_count,
+                 "units": row.units, "revenue": round(row.revenue, 2)}
+                for row in rows
+            ])
+        except Exception as e:
+            self.logger.error(f"Error building daily sales report: {e}")
+            return None
+
+    def get_top_products(self, start_day: date, end_day: date, limit: int = 10,
+                         order_by: str = "revenue") -> Optional[Dict[str, Any]]:
+        """Best-selling products by revenue or units."""
+        try:
+            rows = self.analytics_repo.get_top_products(start_day, end_day, limit, order_by=order_by)
+            if rows is None:
+                return None
+            return self._report(start_day, end_day, "products", [
+                {
+                    "product_id": row["product_id"],
+                    "sku": row["sku"],
+                    "description": row["description"],
+                    "category": ReferenceData.get_product_category_name(row["product_category_id"]),
+                    "order_count": row["order_count"],
+                    "units": row["units"],
+                    "revenue": round(row["revenue"], 2)
+                }
+                for row in rows
+            ])
+        except Exception as e:
+            self.logger.error(f"Error building top products report: {e}")
+            return None
+
+    def get_category_mix(self, start_day: date, end_day: date) -> Optional[Dict[str, Any]]:
+        """Revenue and units per category with their share of the total."""
+        try:
+            rows = self.analytics_repo.get_category_sales(start_day, end_day)
+            if rows is None:
+                return None
+            total_revenue = sum(row["revenue"] for row in rows)
+            total_units = sum(row["units"] for row in rows)
+            categories = [
+                {
+                    "category": ReferenceData.get_product_category_name(row["product_category_id"]),
+                    "units": row["units"],
+                    "revenue": round(row["revenue"], 2),
+                    "revenue_share": _ratio(row["revenue"], total_revenue),
+                    "units_share": _ratio(row["units"], total_units)
+                }
+                for row in rows
+            ]
+            categories.sort(key=lambda item: item["revenue"], reverse=True)
+            return self._report(start_day, end_day, "categories", categories)
+        except Exception as e:
+            self.logger.error(f"Error building category mix report: {e}")
+            return None
+
+    def get_return_rates(self, start_day: date, end_day: date,
+                         group_by: str = "category") -> Optional[Dict[str, Any]]:
+        """Returned vs sold units per category or product (only groups with returns)."""
+        try:
+            rows = self.analytics_repo.get_returned_units(start_day, end_day, group_by=group_by)
+            if rows is None:
+                return None
+            groups = []
+            for row in rows:
+                group = {
+                    "return_count": row["return_count"],
+                    "units_returned": row["units_returned"],
+                    "units_sold": row["units_sold"],
+                    "return_rate": _ratio(row["units_returned"], row["units_sold"]),
+                    "refund_amount": round(row["refund_amount"], 2)
+                }
+                if group_by == "product":
+                    group = {"product_id": row["key"], **group}
+                else:
+                    group = {"category": ReferenceData.get_product_category_name(row["key"]), **group}
+                groups.append(group)
+            return self._report(start_day, end_day, "groups", groups)
+        except Exception as e:
+            self.logger.error(f"Error building return rates report: {e}")
+            return None
+
+    def refresh_rollups(self, max_days: int = ANALYTICS_REFRESH_BATCH_DAYS) -> Optional[Dict[str, Any]]:
+        """
+        Recompute up to max_days dirty days (one batch, in the current transaction).
+
+        Returns:
+            Dict with refreshed days and the number still pending, or None on error
+        """
+        try:
+            days = self.analytics_repo.refresh_dirty_days(max_days)
+            if days is None:
+                return None
+            if days:
+                self.logger.info(f"Analytics rollups refreshed for {len(days)} day(s): {days[0]}..{days[-1]}")
+            return {
+                "refreshed_days": [day.isoformat() for day in days],
+                "pending_days": self.analytics_repo.count_dirty_days()
+            }
+        except Exception as e:
+            self.logger.error(f"Error refreshing analytics rollups: {e}")
+            return None
@@ -7,15 +7,17 @@ Features:
 - User registration
 - Input validation with Marshmallow schemas
 - Comprehensive error handling and logging
+- Password hash upgrade on login when the bcrypt cost changed
+- 503 with Retry-After when the password hashing pool is saturated
 """
 from flask import request, jsonify, g
 from marshmallow import ValidationError
 from config.logging import get_logger, EXC_INFO_LOG_ERRORS
-from app.core.lib.error_utils import error_response
+from app.core.lib.error_utils import error_response, busy_response, PasswordHasherBusyError
 
 # Auth services
 from app.auth.services import AuthService
-from app.auth.services.security_service import hash_password, verify_password
+from app.auth.services.security_service import verify_password
 from app.core.lib.jwt import generate_jwt_token
 
 # Schemas
@@ -62,6 +64,9 @@ class AuthController:
                 self.logger.warning(f"Failed login attempt for user: {user.username}")
                 return jsonify({"error": "Invalid credentials"}), 401
 
+            # Upgrade hashes made with an outdated bcrypt cost
+            self.auth_service.upgrade_password_hash(user, validated_data['password'])
+
             # Generate JWT token
             token = generate_jwt_token(user)
             if not token:
@@ -79,6 +84,9 @@ class AuthController:
         except ValidationError as err:
             self.logger.warning(f"Login validation error: {err.messages}")
             return jsonify({"errors": err.messages}), 400
+        except PasswordHasherBusyError as e:
+            self.logger.warning("Login rejected: password hashing pool saturated")
+            return busy_response(e)
         except Exception as e:
             self.logger.error(f"Login error: {e}", exc_info=EXC_INFO_LOG_ERRORS)
             return error_response("Login failed", e)
@@ -138,6 +146,9 @@ class AuthController:
         except ValidationError as err:
             self.logger.warning(f"Registration validation error: {err.messages}")
             return jsonify({"errors": err.messages}), 400
+        except PasswordHasherBusyError as e:
+            self.logger.warning("Registration rejected: password hashing pool saturated")
+            return busy_response(e)
         except Exception as e:
             self.logger.error(f"Registration error: {e}", exc_info=EXC_INFO_LOG_ERRORS)
             return error_response("Registration failed", e)
@@ -12,7 +12,7 @@ Features:
 from flask import request, jsonify, g
 from marshmallow import ValidationError
 from config.logging import get_logger, EXC_INFO_LOG_ERRORS
-from app.core.lib.error_utils import error_response
+from app.core.lib.error_utils import error_response, busy_response, PasswordHasherBusyError
 
 # Auth services
 from app.auth.services.security_service import hash_password, verify_password
@@ -335,6 +335,9 @@ class UserController:
         except ValidationError as err:
             self.logger.warning(f"Password change validation error: {err.messages}")
             return jsonify({"errors": err.messages}), 400
+        except PasswordHasherBusyError as e:
+            self.logger.warning(f"Password change rejected for user {user_id}: hashing pool saturated")
+            return busy_response(e)
     
     def _update_profile(self, user_id):
         """Handle profile updates (non-password fields)."""
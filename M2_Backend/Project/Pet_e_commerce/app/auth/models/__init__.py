@@ -4,10 +4,11 @@ Auth Models Package
 Exports ORM models for authentication.
 """
 
-from app.auth.models.user import User, Role, RoleUser
+from app.auth.models.user import User, Role, RoleUser, UserStats
 
 __all__ = [
     'User',
     'Role',
-    'RoleUser'
+    'RoleUser',
+    'UserStats'
 ]
\ No newline at end of file
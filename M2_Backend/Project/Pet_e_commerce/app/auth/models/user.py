@@ -8,6 +8,7 @@ Models:
 - Role: Reference table for user roles (normalized)
 - RoleUser: Join table for user-role many-to-many relationship
 - User: User authentication and profile information
+- UserStats: Precomputed account summary (orders, spend, open invoices, pending returns)
 
 Features:
 - SQLAlchemy ORM with normalized reference tables
@@ -22,10 +23,11 @@ Migration Notes:
 - Added RoleUser join table for flexibility
 - Serialization now handled by Marshmallow schemas (user_schema.py)
 """
-from sqlalchemy import String, Integer, ForeignKey
+from sqlalchemy import String, Integer, Float, DateTime, ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column, relationship, declared_attr
 from app.core.database import Base, get_schema
 from typing import Optional, List
+from datetime import datetime
 
 
 class Role(Base):
@@ -108,5 +110,39 @@ class User(Base):
     returns: Mapped[List["Return"]] = relationship(back_populates="user")
     invoices: Mapped[List["Invoice"]] = relationship(back_populates="user")
     
+    # Account summary (maintained by database triggers, loaded on access)
+    stats: Mapped[Optional["UserStats"]] = relationship(back_populates="user", viewonly=True)
+    
     def __repr__(self):
         return f"<User(id={self.id}, username='{self.username}', email='{self.email}')>"
+
+
+class UserStats(Base):
+    """
+    Account summary per user, recomputed for the affected users by triggers
+    on orders, invoices and returns (same transaction as the change).
+    Cancelled orders are excluded; open invoices are pending or overdue;
+    pending returns are requested or approved.
+    """
+    __tablename__ = "user_stats"
+    
+    @declared_attr
+    def __table_args__(cls):
+        return {'schema': get_schema()}
+    
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey(f"{get_schema()}.users.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    order_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    lifetime_spend: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    open_invoice_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    open_invoice_amount: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    pending_return_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    
+    # Relationship
+    user: Mapped["User"] = relationship(back_populates="stats", viewonly=True)
+    
+    def __repr__(self):
+        return f"<UserStats(user_id={self.user_id}, orders={self.order_count}, spend={self.lifetime_spend})>"
@@ -14,7 +14,9 @@ Usage:
     user = repo.get_by_id(1)
     all_users = repo.get_all()
 """
+from functools import lru_cache
 from typing import Optional, List
+from sqlalchemy import bindparam, select
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import selectinload
 from app.core.database import get_db
@@ -24,6 +26,23 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=None)
+def _user_by_id_statement():
+    """
+    Hot lookup (runs on every authenticated request), built once on first use.
+    
+    Each call only binds parameters and reuses the compiled SQL from the
+    engine's statement cache. Built lazily because loader options need all
+    mappers configured.
+    """
+    return (
+        select(User)
+        .options(selectinload(User.user_roles).selectinload(RoleUser.role))
+        .where(User.id == bindparam('user_id'))
+        .limit(1)
+    )
+
+
 class UserRepository:
     """Repository for User database operations."""
     
@@ -39,9 +58,7 @@ class UserRepository:
         """
         try:
             db = get_db()
-            return db.query(User).options(
-                selectinload(User.user_roles).selectinload(RoleUser.role)
-            ).filter_by(id=user_id).first()
+            return db.scalars(_user_by_id_statement(), {'user_id': user_id}).first()
         except SQLAlchemyError as e:
             logger.error(f"Error fetching user by id {user_id}: {e}")
             return None
@@ -84,14 +101,17 @@ class UserRepository:
     
     def get_all(self) -> List[User]:
         """
-        Get all users.
+        Get all users with roles and account summary (user_stats) loaded in batch.
         
         Returns:
             List of all User objects
         """
         try:
             db = get_db()
-            return db.query(User).all()
+            return db.query(User).options(
+                selectinload(User.user_roles).selectinload(RoleUser.role),
+                selectinload(User.stats)
+            ).all()
         except SQLAlchemyError as e:
             logger.error(f"Error fetching all users: {e}")
             return []
@@ -0,0 +1,151 @@
+"""
+User Stats Repository Module
+
+Reads and maintains the user_stats account summary.
+
+Responsibilities:
+- Trigger DDL that recomputes the summary of the users touched by an
+  order, invoice or return mutation
+- Full or partial rebuilds (existing databases, bulk loads)
+
+Maintenance model:
+    Statement-level triggers on orders, invoices and returns collect the
+    distinct user_ids of the changed rows (transition tables) and call
+    recompute_user_stats(ids), which re-aggregates only those users from
+    their indexed rows and upserts their summary. The summary commits or
+    rolls back with the change itself; reads load the single summary row
+    (User.stats) and never scan a user's history.
+
+Concurrency:
+    recompute_user_stats first takes a transaction-level advisory lock per
+    user (in id order), then aggregates in a separate statement. Under READ
+    COMMITTED that statement gets a fresh snapshot, so a transaction that
+    waited for another writer of the same user counts its committed rows
+    instead of overwriting the summary with stale totals. The locks are held
+    until commit: concurrent writes for the same user serialize on the
+    summary, writes for different users don't.
+
+Usage:
+    repo = UserStatsRepository()
+    rebuilt = repo.rebuild(after_user_id=0, limit=1000)
+"""
+from typing import List, Optional
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from app.core.database import get_db, get_schema
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Tables whose rows feed the summary
+TRACKED_TABLES = ("orders", "invoices", "returns")
+
+
+def install_user_stats_triggers(conn, schema_name: str) -> None:
+    """
+    Create recompute_user_stats() and the triggers calling it (run by scripts/init_db.py).
+
+    One statement-level trigger per table and event; a multi-row COPY or
+    UPDATE recomputes each affected user once.
+    """
+    conn.execute(text(f"""
+        CREATE OR REPLACE FUNCTION {schema_name}.recompute_user_stats(user_ids integer[]) RETURNS void AS $$
+            SELECT pg_advisory_xact_lock(hashtext('{schema_name}.user_stats'), id)
+            FROM (SELECT DISTINCT unnest(user_ids) AS id ORDER BY 1) ids;
+            INSERT INTO {schema_name}.user_stats (
+                user_id, order_count, lifetime_spend, open_invoice_count,
+                open_invoice_amount, pending_return_count, updated_at
+            )
+            SELECT u.id,
+                   coalesce(os.order_count, 0), coalesce(os.lifetime_spend, 0),
+                   coalesce(inv.open_invoice_count, 0), coalesce(inv.open_invoice_amount, 0),
+                   coalesce(rs.pending_return_count, 0), now()
+            FROM {schema_name}.users u
+            LEFT JOIN LATERAL (
+                SELECT count(*) AS order_count, sum(o.total_amount) AS lifetime_spend
+                FROM {schema_name}.orders o
+                JOIN {schema_name}.order_status st ON st.id = o.order_status_id
+                WHERE o.user_id = u.id AND st.status <> 'cancelled'
+            ) os ON true
+            LEFT JOIN LATERAL (
+                SELECT count(*) AS open_invoice_count, sum(i.total_amount) AS open_invoice_amount
+                FROM {schema_name}.invoices i
+                JOIN {schema_name}.invoice_status st ON st.id = i.invoice_status_id
+                WHERE i.user_id = u.id AND st.name IN ('pending', 'overdue')
+            ) inv ON true
+            LEFT JOIN LATERAL (
+                SELECT count(*) AS pending_return_count
+                FROM {schema_name}.returns r
+                JOIN {schema_name}.return_status st ON st.id = r.return_status_id
+                WHERE r.user_id = u.id AND st.status IN ('requested', 'approved')
+            ) rs ON true
+            WHERE u.id = ANY(user_ids)
+            ON CONFLICT (user_id) DO UPDATE SET
+                order_count = EXCLUDED.order_count,
+                lifetime_spend = EXCLUDED.lifetime_spend,
+                open_invoice_count = EXCLUDED.open_invoice_count,
+                open_invoice_amount = EXCLUDED.open_invoice_amount,
+                pending_return_count = EXCLUDED.pending_return_count,
+                updated_at = EXCLUDED.updated_at
+        $$ LANGUAGE sql
+    """))
+    conn.execute(text(f"""
+        CREATE OR REPLACE FUNCTION {schema_name}.user_stats_changed() RETURNS trigger AS $$
+        DECLARE
+            user_ids integer[];
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                SELECT array_agg(DISTINCT user_id) INTO user_ids FROM new_rows;
+            ELSIF TG_OP = 'UPDATE' THEN
+                SELECT array_agg(DISTINCT user_id) INTO user_ids
+                FROM (SELECT user_id FROM new_rows UNION SELECT user_id FROM old_rows) changed;
+            ELSE
+                SELECT array_agg(DISTINCT user_id) INTO user_ids FROM old_rows;
+            END IF;
+            IF user_ids IS NOT NULL THEN
+                PERFORM {schema_name}.recompute_user_stats(user_ids);
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """))
+    transition_tables = {
+        "INSERT": "NEW TABLE AS new_rows",
+        "UPDATE": "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+        "DELETE": "OLD TABLE AS old_rows",
+    }
+    for table_name in TRACKED_TABLES:
+        table = f"{schema_name}.{table_name}"
+        for event, referencing in transition_tables.items():
+            trigger = f"{table_name}_user_stats_{event.lower()}"
+            conn.execute(text(f"DROP TRIGGER IF EXISTS {trigger} ON {table}"))
+            conn.execute(text(
+                f"CREATE TRIGGER {trigger} AFTER {event} ON {table} REFERENCING {referencing} "
+                f"FOR EACH STATEMENT EXECUTE FUNCTION {schema_name}.user_stats_changed()"
+            ))
+
+
+class UserStatsRepository:
+    """Repository for the per-user account summary."""
+
+    def rebuild(self, after_user_id: int, limit: int) -> Optional[List[int]]:
+        """
+        Recompute the summary of the next `limit` users with id > after_user_id.
+
+        Runs in the caller's transaction (commit per batch).
+
+        Returns:
+            Rebuilt user ids (empty when done), or None on error
+        """
+        try:
+            db = get_db()
+            user_ids = list(db.scalars(text(f"""
+                SELECT id FROM {get_schema()}.users WHERE id > :after ORDER BY id LIMIT :limit
+            """), {"after": after_user_id, "limit": limit}))
+            if user_ids:
+                db.execute(text(f"SELECT {get_schema()}.recompute_user_stats(CAST(:ids AS integer[]))"),
+                           {"ids": user_ids})
+            return user_ids
+        except SQLAlchemyError as e:
+            logger.error(f"Error rebuilding user stats after user {after_user_id}: {e}")
+            return None
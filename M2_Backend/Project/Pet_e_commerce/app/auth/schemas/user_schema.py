@@ -5,7 +5,7 @@ Provides Marshmallow schemas for user data validation and serialization:
 - UserRegistrationSchema: Validates new user registration data
 - UserLoginSchema: Validates user login credentials  
 - UserUpdateSchema: Validates user profile updates
-- UserResponseSchema: Serializes user data for API responses
+- UserResponseSchema: Serializes user data for API responses (with account summary)
 - UserPasswordChangeSchema: Validates password change requests
 
 Features:
@@ -33,6 +33,14 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+EMPTY_USER_STATS = {
+    "order_count": 0,
+    "lifetime_spend": 0.0,
+    "open_invoice_count": 0,
+    "open_invoice_amount": 0.0,
+    "pending_return_count": 0
+}
+
 class UserRegistrationSchema(Schema):
     """Schema for user registration - converts validated data to User instance"""
     username = fields.Str(required=True, validate=validate.Length(min=3, max=50))
@@ -104,6 +112,28 @@ class UserResponseSchema(Schema):
     first_name = fields.Str(allow_none=True)
     last_name = fields.Str(allow_none=True)
     phone = fields.Str(allow_none=True)
+    stats = fields.Method("get_stats", dump_only=True)
+    
+    def get_stats(self, obj):
+        """
+        Account summary from the precomputed user_stats row (one row, no history scan).
+        
+        Users without orders, invoices or returns have no row yet: all zeros.
+        """
+        try:
+            stats = getattr(obj, 'stats', None)
+            if stats is None:
+                return dict(EMPTY_USER_STATS)
+            return {
+                "order_count": stats.order_count,
+                "lifetime_spend": round(stats.lifetime_spend, 2),
+                "open_invoice_count": stats.open_invoice_count,
+                "open_invoice_amount": round(stats.open_invoice_amount, 2),
+                "pending_return_count": stats.pending_return_count
+            }
+        except Exception as e:
+            logger.error(f"Error getting stats for user: {e}")
+            return dict(EMPTY_USER_STATS)
     
     def get_all_roles(self, obj):
         """
@@ -7,12 +7,13 @@ Note: auth_decorators moved to app.shared.middleware
 
 from app.auth.services.auth_service import AuthService
 from app.auth.services.user_service import UserService
-from app.auth.services.security_service import SecurityService, hash_password, verify_password
+from app.auth.services.security_service import SecurityService, hash_password, verify_password, needs_rehash
 
 __all__ = [
     'AuthService',
     'UserService',
     'SecurityService',
     'hash_password',
-    'verify_password'
+    'verify_password',
+    'needs_rehash'
 ]
\ No newline at end of file
@@ -9,6 +9,7 @@ Responsibilities:
 - User lookup for authentication
 - Username/email uniqueness checks
 - Initial role assignment during registration
+- Password hash upgrades after login (rehash-on-login)
 - Orchestrates repository operations for auth
 
 Dependencies:
@@ -24,6 +25,7 @@ import logging
 from typing import Optional, Tuple
 from app.auth.repositories import UserRepository
 from app.auth.models.user import User
+from app.core.lib.error_utils import PasswordHasherBusyError
 
 logger = logging.getLogger(__name__)
 
@@ -128,10 +130,41 @@ class AuthService:
             self.logger.info(f"User created successfully: {username} with role: {role_name}")
             return created_user, None
             
+        except PasswordHasherBusyError:
+            # Surface as 503 instead of a registration failure
+            raise
         except Exception as e:
             self.logger.error(f"Error creating user: {e}")
             return None, f"Error creating user: {e}"
     
+    def upgrade_password_hash(self, user: User, password: str) -> bool:
+        """
+        Rehash a verified password if it was hashed with an outdated cost.
+        Called after a successful login; failures never block the login.
+        
+        Args:
+            user: Authenticated user
+            password: Plain text password that was just verified
+            
+        Returns:
+            True if the stored hash was upgraded, False otherwise
+        """
+        from app.auth.services.security_service import hash_password, needs_rehash
+        
+        if not needs_rehash(user.password_hash):
+            return False
+        
+        try:
+            user.password_hash = hash_password(password)
+            if not self.user_repo.update(user):
+                self.logger.warning(f"Failed to store upgraded password hash for user {user.username}")
+                return False
+            self.logger.info(f"Password hash upgraded for user {user.username}")
+            return True
+        except Exception as e:
+            self.logger.warning(f"Password hash upgrade skipped for user {user.username}: {e}")
+            return False
+    
     # ============================================
     # PRIVATE HELPER METHODS
     # ============================================
@@ -5,26 +5,59 @@ Handles authentication security functions including:
 - Password hashing and verification with bcrypt
 - Application-wide pepper implementation for additional security
 - Configurable security parameters
+- Bounded worker pool so bcrypt never runs on the request thread
 
 Security Features:
-- bcrypt with configurable rounds (default: 14)
+- bcrypt with configurable rounds (BCRYPT_ROUNDS, default: 14)
 - Application-wide pepper for additional password protection
 - Secure password verification with timing-safe comparison
+- Rehash-on-login when the configured cost changes (needs_rehash)
+
+Worker Pool:
+    bcrypt at cost 14 takes ~1s of CPU per hash/verify. Hashing runs in a
+    process pool of PASSWORD_HASH_WORKERS processes (created lazily, per
+    application process). At most PASSWORD_HASH_MAX_PENDING operations may
+    be running or queued; beyond that PasswordHasherBusyError (HTTP 503) is
+    raised immediately instead of queueing requests behind each other. An
+    operation that times out keeps its slot until it actually finishes.
+    Workers are started by a forkserver (not forked from the app process).
+    PASSWORD_HASH_WORKERS=0 hashes inline (same limit applies).
 
 Environment Variables:
 - APP_PEPPER: Application-wide secret (should be set in production)
+- BCRYPT_ROUNDS, PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING,
+  PASSWORD_HASH_TIMEOUT_SECONDS (see config/settings.py)
 
 Usage:
     from app.auth.services.security_service import hash_password, verify_password
-    
+
     # Hash a password
     hashed = hash_password("user_password")
-    
+
     # Verify a password
     is_valid = verify_password("user_password", hashed)
+
+    # After a successful login
+    if needs_rehash(user.password_hash):
+        user.password_hash = hash_password("user_password")
 """
 import os
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
 import bcrypt
+from app.core.lib.error_utils import PasswordHasherBusyError
+from app.core.metrics import counter, gauge
+from config.settings import (
+    BCRYPT_ROUNDS,
+    PASSWORD_HASH_WORKERS,
+    PASSWORD_HASH_MAX_PENDING,
+    PASSWORD_HASH_TIMEOUT_SECONDS
+)
+
+logger = logging.getLogger(__name__)
 
 # Application-wide pepper (secret not stored in database)
 # IMPORTANT: Set APP_PEPPER environment variable in production!
@@ -32,28 +65,139 @@ APP_PEPPER = os.environ.get('APP_PEPPER', 'dev-only-pepper-change-in-production'
 
 # Security configuration
 SECURITY_CONFIG = {
-    'bcrypt_rounds': 14,
+    'bcrypt_rounds': BCRYPT_ROUNDS,
 }
 
+PASSWORD_HASH_REJECTED = counter(
+    "password_hash_rejected_total", "Hash/verify requests rejected because the pool was saturated", ["operation"]
+)
+PASSWORD_HASH_IN_FLIGHT = gauge("password_hash_in_flight", "Hash/verify operations running or queued")
+
+
+# Worker functions (module level so they can be sent to pool processes)
+def _hashpw(peppered_password: bytes, rounds: int) -> bytes:
+    return bcrypt.hashpw(peppered_password, bcrypt.gensalt(rounds=rounds))
+
+
+def _checkpw(peppered_password: bytes, hashed_password: bytes) -> bool:
+    return bcrypt.checkpw(peppered_password, hashed_password)
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt operations on a bounded process pool.
+
+    The semaphore counts running + queued operations; acquiring it never
+    blocks, so a saturated pool fails fast with PasswordHasherBusyError.
+    """
+
+    def __init__(self, workers: int, max_pending: int, timeout: float):
+        self.workers = workers
+        self.max_pending = max(max_pending, 1)
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        # Created on first use so pre-fork servers start the pool in each worker
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    # forkserver: children must not inherit the parent's threads,
+                    # locks and open sockets (DB pool, Redis) as fork would copy them
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers, mp_context=multiprocessing.get_context("forkserver")
+                    )
+        return self._executor
+
+    def run(self, operation: str, func, *args):
+        """
+        Run func(*args) on the pool.
+
+        Raises:
+            PasswordHasherBusyError: Too many operations in flight, or the
+                operation did not finish within the timeout
+        """
+        if not self._slots.acquire(blocking=False):
+            PASSWORD_HASH_REJECTED.inc(operation=operation)
+            logger.warning("Password %s rejected: %s operations already in flight", operation, self.max_pending)
+            raise PasswordHasherBusyError()
+
+        PASSWORD_HASH_IN_FLIGHT.inc()
+        if self.workers <= 0:
+            try:
+                return func(*args)
+            finally:
+                self._release()
+
+        try:
+            future = self._get_executor().submit(func, *args)
+        except BaseException:
+            self._release()
+            raise
+        # The slot is held until the task really finishes: a timed-out hash
+        # keeps running in the pool and must still count against max_pending
+        future.add_done_callback(lambda _: self._release())
+        try:
+            return future.result(timeout=self.timeout)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM-killed); start a fresh pool for the next call
+            logger.error("Password hashing pool broken, restarting it")
+            self.shutdown()
+            raise
+        except FutureTimeoutError:
+            PASSWORD_HASH_REJECTED.inc(operation=operation)
+            logger.warning("Password %s timed out after %ss", operation, self.timeout)
+            raise PasswordHasherBusyError()
+
+    def _release(self) -> None:
+        PASSWORD_HASH_IN_FLIGHT.dec()
+        self._slots.release()
+
+    def shutdown(self) -> None:
+        """Stop the worker processes (a new pool starts on next use)."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+_hasher = PasswordHasher(PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING, PASSWORD_HASH_TIMEOUT_SECONDS)
+
+
+def get_password_hasher() -> PasswordHasher:
+    """Return the process-wide PasswordHasher."""
+    return _hasher
+
+
 class SecurityService:
     """Centralized security service for password hashing and verification."""
-    
+
     @staticmethod
     def hash_password(password):
         """Hash password using bcrypt with salt and application pepper"""
         # Add application-wide pepper (stored separately from database)
         peppered_password = password + APP_PEPPER
-        # Generate salt with configurable cost factor
-        salt = bcrypt.gensalt(rounds=SECURITY_CONFIG['bcrypt_rounds'])
-        hashed = bcrypt.hashpw(peppered_password.encode('utf-8'), salt)
+        # Salt is generated in the worker with the configured cost factor
+        hashed = _hasher.run('hash', _hashpw, peppered_password.encode('utf-8'), SECURITY_CONFIG['bcrypt_rounds'])
         return hashed.decode('utf-8') # decode for JSON compatibility
-    
+
     @staticmethod
     def verify_password(password, hashed_password):
         """Verify password against bcrypt hash with pepper"""
         # Add same pepper before verification
         peppered_password = password + APP_PEPPER
-        return bcrypt.checkpw(peppered_password.encode('utf-8'), hashed_password.encode('utf-8'))
+        return _hasher.run('verify', _checkpw, peppered_password.encode('utf-8'), hashed_password.encode('utf-8'))
+
+    @staticmethod
+    def needs_rehash(hashed_password):
+        """Check whether a stored hash uses a different cost than configured"""
+        # bcrypt format: $2b$<cost>$<salt+hash>
+        parts = (hashed_password or '').split('$')
+        if len(parts) < 4 or not parts[2].isdigit():
+            return False
+        return int(parts[2]) != SECURITY_CONFIG['bcrypt_rounds']
 
 # Convenience functions for backward compatibility and easy imports
 def hash_password(password):
@@ -63,3 +207,7 @@ def hash_password(password):
 def verify_password(password, hashed_password):
     """Convenience function for password verification with pepper."""
     return SecurityService.verify_password(password, hashed_password)
+
+def needs_rehash(hashed_password):
+    """Convenience function to detect hashes made with an outdated cost."""
+    return SecurityService.needs_rehash(hashed_password)
@@ -11,6 +11,7 @@ Responsibilities:
 - Business logic and validation rules
 - Orchestrates repository operations
 - Cache management for frequently accessed users
+- Principal cache invalidation when roles, password or account change
 
 Dependencies:
 - UserRepository: Database operations
@@ -28,6 +29,7 @@ from app.auth.repositories import UserRepository
 from app.auth.models.user import User
 from app.core.cache_manager import get_cache
 from app.core.middleware.cache_decorators import CacheHelper, cache_invalidate
+from app.core.lib.principals import invalidate_principal
 
 logger = logging.getLogger(__name__)
 
@@ -216,6 +218,7 @@ class UserService:
             if not self.user_repo.assign_role(user_id, role_id):
                 return False, "Failed to assign role"
             
+            invalidate_principal(user_id)
             self.logger.info(f"Role '{role_name}' assigned to user {user_id}")
             return True, None
             
@@ -269,6 +272,7 @@ class UserService:
             if not self.user_repo.remove_role(user_id, role_id):
                 return False, "Failed to remove role"
             
+            invalidate_principal(user_id)
             self.logger.info(f"Role '{role_name}' removed from user {user_id}")
             return True, None
             
@@ -315,6 +319,7 @@ class UserService:
             if not updated_user:
                 return None, "Failed to update profile"
             
+            invalidate_principal(user_id)
             self.logger.info(f"Profile updated for user: {user.username}")
             return updated_user, None
             
@@ -351,6 +356,7 @@ class UserService:
             if not updated_user:
                 return None, "Failed to update password"
             
+            invalidate_principal(user_id)
             self.logger.info(f"Password updated for user: {user.username}")
             return updated_user, None
             
@@ -386,6 +392,7 @@ class UserService:
             if not self.user_repo.delete(user_id):
                 return False, "Failed to delete user"
             
+            invalidate_principal(user_id)
             self.logger.info(f"User deleted: {username}")
             return True, None
             
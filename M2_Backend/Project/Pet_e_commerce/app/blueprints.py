@@ -2,11 +2,42 @@ from flask import Blueprint
 from app.auth import auth_bp, user_bp
 from app.products import products_bp
 from app.sales import sales_bp
+from app.analytics import analytics_bp
+from app.core.monitoring import monitoring_bp
+from app.core.rate_limiter import RateLimitPolicy
 
 # Each tuple: (blueprint, url_prefix)
 blueprints = [
     (auth_bp, '/auth'),
     (user_bp, '/auth'),  # User management routes under same /auth prefix
     (products_bp, '/products'),
-    (sales_bp, '/sales')
+    (sales_bp, '/sales'),
+    (analytics_bp, '/analytics'),
+    (monitoring_bp, '')  # /metrics, /metrics/pools, /metrics/profiles
 ]
+
+# Rate limits per endpoint ("<blueprint>.<view name>"), token buckets in Redis
+rate_limits = {
+    # bcrypt verify per attempt; per IP to slow down credential stuffing
+    'auth.auth_api': RateLimitPolicy('login', limit=10, period=60, scope='ip'),
+    'auth.register_api': RateLimitPolicy('register', limit=5, period=300, scope='ip'),
+    # Catalog search (ILIKE scans); writes on the same endpoint are admin-only
+    'products.products': RateLimitPolicy('catalog_search', limit=60, period=60, burst=20, methods=('GET',)),
+    # Bulk catalog writes (one set-based statement per request)
+    'products.product_import': RateLimitPolicy('product_import', limit=5, period=60),
+    'products.product_bulk_update': RateLimitPolicy('product_bulk_update', limit=10, period=60),
+    # Checkout (order creation)
+    'sales.order_create': RateLimitPolicy('checkout', limit=10, period=60),
+    # Streaming exports (long-running scans, one shared bucket)
+    'sales.order_export': RateLimitPolicy('sales_export', limit=5, period=60),
+    'sales.invoice_export': RateLimitPolicy('sales_export', limit=5, period=60),
+    'sales.return_export': RateLimitPolicy('sales_export', limit=5, period=60),
+    # Rollup refresh (recomputes a batch of days)
+    'analytics.analytics_refresh': RateLimitPolicy('analytics_refresh', limit=10, period=60),
+}
+
+# Applied to every other endpoint, per user (per IP when anonymous)
+default_rate_limit = RateLimitPolicy('default', limit=300, period=60, burst=100)
+
+# Blueprints never rate limited (scrapers)
+rate_limit_exempt = ['monitoring']
@@ -35,7 +35,7 @@ Features:
 
 import redis
 import logging
-from typing import Optional
+from typing import List, Optional
 from config.settings import REDIS_HOST, REDIS_PORT, REDIS_PASSWORD, REDIS_DB
 
 # Configure module logger
@@ -81,7 +81,7 @@ class CacheManager:
             # Test connection
             connection_status = self.redis_client.ping()
             if connection_status:
-                self.logger.info(f"Redis cache connection established successfully (host={host}, port={port}, db={db})")
+                self.logger.info("Redis cache connection established successfully (host=%s, port=%s, db=%s)", host, port, db)
             else:
                 self.logger.warning("Redis ping returned False - connection may be unstable")
                 
@@ -183,6 +183,27 @@ class CacheManager:
             self.logger.error(f"Unexpected error deleting data from Redis (key={key}): {error}")
             return False
 
+    def delete_many(self, keys: List[str]) -> int:
+        """
+        Delete several keys in one round trip.
+        
+        Args:
+            keys: Cache keys to delete
+            
+        Returns:
+            Number of keys deleted (0 on error)
+        """
+        if not keys:
+            return 0
+        try:
+            return self.redis_client.delete(*keys)
+        except redis.RedisError as error:
+            self.logger.error(f"Error deleting {len(keys)} keys from Redis: {error}")
+            return 0
+        except Exception as error:
+            self.logger.error(f"Unexpected error deleting {len(keys)} keys from Redis: {error}")
+            return 0
+
     def delete_data_with_pattern(self, pattern: str) -> bool:
         """
         Delete all keys matching a pattern.
@@ -198,7 +219,7 @@ class CacheManager:
             for key in self.redis_client.scan_iter(match=pattern):
                 if self.delete_data(key):
                     deleted_count += 1
-            self.logger.info(f"Deleted {deleted_count} keys matching pattern: {pattern}")
+            self.logger.info("Deleted %s keys matching pattern: %s", deleted_count, pattern)
             return True
         except redis.RedisError as error:
             self.logger.error(f"Error deleting data with pattern from Redis (pattern={pattern}): {error}")
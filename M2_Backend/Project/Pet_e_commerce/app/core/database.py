@@ -11,6 +11,15 @@ Essential Components:
 - get_db_session(): Creates new database session
 - session_scope(): Context manager for transactions (legacy)
 - get_db(): Get current request database session
+- create_pooled_engine(): Engine with the configured, instrumented pool (DB_POOL_*)
+- bump_version(): Compare-and-swap guard for versioned models
+- RoutingSession / read_only: Read-replica routing (optional, DB_REPLICA_HOSTS)
+
+Transaction modes:
+- GET/HEAD/OPTIONS requests run in a READ ONLY transaction and end with a
+  rollback (nothing to commit); other requests commit at teardown
+- Sessions only check out a connection on first use, so requests that never
+  touch the database (e.g. cache hits) never use the pool
 
 Usage Option 1 (Session per request - RECOMMENDED):
     from app.core.database import get_db
@@ -31,13 +40,32 @@ Usage Option 2 (Session scope - for background tasks):
         # Auto-commit happens here
 """
 
-from flask import g, current_app
-from sqlalchemy import create_engine
+from flask import g, current_app, has_app_context, has_request_context, request
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import declarative_base, sessionmaker, Session
+from sqlalchemy.sql.expression import UpdateBase
 from sqlalchemy.exc import SQLAlchemyError
 from contextlib import contextmanager
-from config.settings import get_database_url, DB_SCHEMA
+from functools import wraps
+from typing import Optional, List
+from config.settings import (
+    get_database_url,
+    get_replica_urls,
+    DB_SCHEMA,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE,
+    DB_QUERY_CACHE_SIZE,
+    DB_REPLICA_MAX_LAG_SECONDS,
+    DB_READ_ONLY_DEFERRABLE,
+    DB_REPLICA_LAG_CHECK_INTERVAL,
+    READ_YOUR_WRITES_SECONDS
+)
+import itertools
 import logging
+import threading
+import time
 
 # Configure module logger
 logger = logging.getLogger(__name__)
@@ -46,11 +74,48 @@ logger = logging.getLogger(__name__)
 # Engine and SessionLocal are created on first access to support testing
 _engine = None
 _SessionLocal = None
+_replica_engines = None
+
+# Replica health cache: engine url -> (checked_at, healthy)
+_replica_health = {}
+_replica_lock = threading.Lock()
+_replica_counter = itertools.count()
+
+# HTTP methods whose requests may read from a replica
+READ_ONLY_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
 
 # Current schema
 _current_schema = DB_SCHEMA
 
 
+def create_pooled_engine(database_url: str, pool_name: str):
+    """
+    Create an engine with the configured, instrumented connection pool.
+    
+    Pool size, overflow, timeout, recycle and pre-ping mode come from
+    config/settings.py (DB_POOL_*); the pool reports to the db_pool_* metrics.
+    DB_QUERY_CACHE_SIZE sizes the compiled statement cache used by the
+    prebuilt hot-path statements in the repositories.
+    """
+    from app.core.pool_metrics import InstrumentedQueuePool, install_pool_hooks
+    from app.core.sql_instrumentation import install_engine_hooks
+    
+    engine = create_engine(
+        database_url,
+        poolclass=InstrumentedQueuePool,
+        echo=False,  # Set to True for SQL query debugging
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        query_cache_size=DB_QUERY_CACHE_SIZE
+    )
+    # Pre-ping is done by the pool hooks (DB_POOL_PRE_PING) instead of pool_pre_ping
+    install_pool_hooks(engine, pool_name)
+    install_engine_hooks(engine)
+    return engine
+
+
 def get_engine():
     """Get or create the database engine (lazy initialization)."""
     global _engine
@@ -58,13 +123,7 @@ def get_engine():
         # Get database URL from environment (allows test override)
         database_url = get_database_url()
         logger.info(f"Creating database engine for: {database_url}")
-        _engine = create_engine(
-            database_url,
-            pool_pre_ping=True,
-            echo=False,  # Set to True for SQL query debugging
-            pool_size=10,
-            max_overflow=20
-        )
+        _engine = create_pooled_engine(database_url, "primary")
     return _engine
 
 
@@ -73,13 +132,214 @@ def get_session_local():
     global _SessionLocal
     if _SessionLocal is None:
         _SessionLocal = sessionmaker(
+            class_=RoutingSession,
             autocommit=False,
             autoflush=False,
+            # Request sessions are committed at teardown and scripts use objects
+            # after session_scope() commits; expiring would only force reloads
+            expire_on_commit=False,
             bind=get_engine()
         )
     return _SessionLocal
 
 
+def get_replica_engines() -> List:
+    """Get or create the read-replica engines (empty list when not configured)."""
+    global _replica_engines
+    if _replica_engines is None:
+        engines = []
+        for index, url in enumerate(get_replica_urls(), start=1):
+            logger.info(f"Creating read-replica engine for: {url.split('@')[-1]}")
+            engines.append(create_pooled_engine(url, f"replica-{index}"))
+        _replica_engines = engines
+    return _replica_engines
+
+
+def replica_lag_seconds(engine) -> Optional[float]:
+    """
+    Measure replication lag of a replica in seconds.
+    
+    Reports 0 when the replica has replayed everything it received, so an idle
+    primary does not make the replica look stale.
+    
+    Returns:
+        Lag in seconds, or None if the replica could not be queried
+    """
+    try:
+        with engine.connect() as conn:
+            lag = conn.execute(text(
+                "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+                "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+            )).scalar()
+            return float(lag or 0)
+    except SQLAlchemyError as e:
+        logger.warning(f"Replica lag check failed for {engine.url.host}: {e}")
+        return None
+
+
+def _replica_is_healthy(engine) -> bool:
+    """Check replica lag, cached for DB_REPLICA_LAG_CHECK_INTERVAL seconds."""
+    key = str(engine.url)
+    now = time.monotonic()
+    checked = _replica_health.get(key)
+    if checked and now - checked[0] < DB_REPLICA_LAG_CHECK_INTERVAL:
+        return checked[1]
+    
+    with _replica_lock:
+        checked = _replica_health.get(key)
+        if checked and now - checked[0] < DB_REPLICA_LAG_CHECK_INTERVAL:
+            return checked[1]
+        lag = replica_lag_seconds(engine)
+        healthy = lag is not None and lag <= DB_REPLICA_MAX_LAG_SECONDS
+        if not healthy:
+            logger.warning(f"Skipping replica {engine.url.host} (lag={lag}s, max={DB_REPLICA_MAX_LAG_SECONDS}s)")
+        _replica_health[key] = (now, healthy)
+        return healthy
+
+
+def choose_replica_engine():
+    """Pick a healthy replica round-robin, or None to fall back to the primary."""
+    engines = get_replica_engines()
+    if not engines:
+        return None
+    start = next(_replica_counter)
+    for offset in range(len(engines)):
+        engine = engines[(start + offset) % len(engines)]
+        if _replica_is_healthy(engine):
+            return engine
+    return None
+
+
+def _recent_write_key(user_id: int) -> str:
+    return f"db:recent_write:v1:user:{user_id}"
+
+
+def mark_recent_write(user_id: int) -> None:
+    """Pin a user's reads to the primary for READ_YOUR_WRITES_SECONDS."""
+    try:
+        from app.core.cache_manager import get_cache
+        get_cache().store_data(_recent_write_key(user_id), "1", READ_YOUR_WRITES_SECONDS)
+    except Exception as e:
+        logger.warning(f"Could not record recent write for user {user_id}: {e}")
+
+
+def has_recent_write(user_id: int) -> bool:
+    """Check whether a user wrote recently (their reads must see their writes)."""
+    try:
+        from app.core.cache_manager import get_cache
+        exists, _ = get_cache().check_key(_recent_write_key(user_id))
+        return bool(exists)
+    except Exception as e:
+        # Unknown: the primary is always consistent
+        logger.warning(f"Could not check recent writes for user {user_id}: {e}")
+        return True
+
+
+def _current_user_wrote_recently() -> bool:
+    """Read-your-writes check for the authenticated user, memoized per request."""
+    user = g.get('current_user')
+    user_id = getattr(user, 'id', None)
+    if user_id is None:
+        return False
+    checked = g.setdefault('recent_write_checked', {})
+    if user_id not in checked:
+        checked[user_id] = has_recent_write(user_id)
+    return checked[user_id]
+
+
+class RoutingSession(Session):
+    """
+    Session that sends eligible reads to a read replica.
+    
+    Reads go to a replica when all of these hold:
+    - Replicas are configured (DB_REPLICA_HOSTS) and one is within DB_REPLICA_MAX_LAG_SECONDS
+    - The request is a GET/HEAD/OPTIONS, or the caller is inside a @read_only method
+    - This session has not flushed any writes (its transaction must see them)
+    - The current user has not written within READ_YOUR_WRITES_SECONDS
+    
+    Everything else (writes, flushes, reads after writes) uses the primary.
+    
+    The replica is chosen once per transaction (session.info['replica']), so
+    parent rows, selectinload children and counts of one response all come
+    from the same replica connection and snapshot.
+    """
+    
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if not self._flushing and not isinstance(clause, UpdateBase) and self._wants_replica():
+            replica = self.info.get('replica')
+            if replica is None:
+                replica = choose_replica_engine()
+                if replica is not None:
+                    self.info['replica'] = replica
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+    
+    def _wants_replica(self) -> bool:
+        if self.info.get('wrote') or not get_replica_engines():
+            return False
+        if self.info.get('read_only_depth', 0) == 0:
+            if not has_request_context() or request.method not in READ_ONLY_METHODS:
+                return False
+        if has_app_context() and _current_user_wrote_recently():
+            return False
+        return True
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _record_session_write(session, flush_context):
+    """Route the rest of this session to the primary and remember who wrote."""
+    session.info['wrote'] = True
+    if has_app_context():
+        user = g.get('current_user')
+        if getattr(user, 'id', None) is not None:
+            g.db_write_user_id = user.id
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _release_replica(session, transaction):
+    """Let the next transaction pick a replica again (lag and health may have changed)."""
+    if transaction.parent is None:
+        session.info.pop('replica', None)
+
+
+@event.listens_for(RoutingSession, "after_begin")
+def _begin_read_only_transaction(session, transaction, connection):
+    """Mark read-request transactions READ ONLY so PostgreSQL can skip write bookkeeping."""
+    if session.info.get('read_only_tx') and connection.dialect.name == 'postgresql':
+        # Hot standbys reject SERIALIZABLE; their transactions are read-only anyway
+        on_replica = session.info.get('replica') is connection.engine
+        if DB_READ_ONLY_DEFERRABLE and not on_replica:
+            # Waits for a safe snapshot once, then never fails with serialization errors
+            connection.exec_driver_sql("SET TRANSACTION ISOLATION LEVEL SERIALIZABLE, READ ONLY, DEFERRABLE")
+        else:
+            connection.exec_driver_sql("SET TRANSACTION READ ONLY")
+
+
+def read_only(func):
+    """
+    Allow a service method's reads to use a read replica outside GET requests.
+    
+    Read-your-writes still applies: if the session already wrote, or the user
+    wrote recently, reads stay on the primary.
+    
+    Usage:
+        @read_only
+        def get_all_products(self): ...
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if not has_app_context():
+            return func(*args, **kwargs)
+        db = get_db()
+        db.info['read_only_depth'] = db.info.get('read_only_depth', 0) + 1
+        try:
+            return func(*args, **kwargs)
+        finally:
+            db.info['read_only_depth'] -= 1
+    return wrapper
+
+
 # Declarative Base for ORM models
 Base = declarative_base()
 
@@ -120,6 +380,8 @@ def get_db() -> Session:
     """
     if 'db' not in g:
         g.db = get_session_local()()
+        if has_request_context() and request.method in READ_ONLY_METHODS:
+            g.db.info['read_only_tx'] = True
     return g.db
 
 
@@ -128,15 +390,23 @@ def close_db(exception=None):
     Close the database session at the end of the request.
     This should be registered as a teardown function in your Flask app.
     
+    Read-only (GET) sessions are rolled back instead of committed, and
+    sessions that never started a transaction are just closed.
+    
     Usage in app/__init__.py:
         app.teardown_appcontext(close_db)
     """
     db = g.pop('db', None)
+    write_user_id = g.pop('db_write_user_id', None)
     
     if db is not None:
         try:
-            if exception is None:
+            if not db.in_transaction():
+                pass
+            elif exception is None and not db.info.get('read_only_tx'):
                 db.commit()
+                if write_user_id is not None:
+                    mark_recent_write(write_user_id)
             else:
                 db.rollback()
         except SQLAlchemyError as e:
@@ -173,3 +443,28 @@ def session_scope():
     
     finally:
         session.close()
+
+
+def bump_version(instance, expected_version: Optional[int] = None) -> None:
+    """
+    Prepare an optimistic-concurrency (compare-and-swap) update.
+    
+    Models mapped with ``version_id_col`` and ``version_id_generator=False``
+    (Cart, Order, Invoice, Return) are flushed as
+    ``UPDATE ... SET version = n + 1 WHERE id = ? AND version = n``. A concurrent
+    writer that got there first makes the UPDATE match 0 rows and SQLAlchemy
+    raises StaleDataError. Bumping explicitly also versions changes that only
+    touch child rows (e.g. cart items).
+    
+    Args:
+        instance: Persistent versioned ORM object about to be flushed
+        expected_version: Version the client last read (optional). Raises
+            ConcurrencyConflictError immediately if it no longer matches.
+    """
+    if expected_version is not None and instance.version != expected_version:
+        from app.core.lib.error_utils import ConcurrencyConflictError  # Lazy import to avoid circular import
+        raise ConcurrencyConflictError(
+            f"{type(instance).__name__} {instance.id} is at version {instance.version}, "
+            f"expected {expected_version}"
+        )
+    instance.version = (instance.version or 1) + 1
@@ -0,0 +1,322 @@
+"""
+Background Jobs Module
+
+Durable job queue in PostgreSQL for work the client doesn't have to wait for
+(e.g. creating the invoice of a new order).
+
+Key Components:
+- Job / DeadJob: Queued jobs and jobs that exhausted their retries
+- job_task: Decorator registering a task handler by name
+- JobQueue: Enqueue, claim-and-run, dead-letter inspection and requeue
+- run_worker: Polling loop used by scripts/run_jobs.py
+
+Semantics:
+- enqueue() only adds the row to the current session, so the job commits or
+  rolls back together with the request that created it (no job for an
+  order that was never saved, no saved order without its job)
+- A worker claims one due job with SELECT ... FOR UPDATE SKIP LOCKED and
+  keeps the row locked while the handler runs; the handler's writes and the
+  job deletion commit in one transaction. If the worker dies, the lock is
+  released and another worker picks the job up
+- A failing handler is rolled back to a savepoint; the job is retried after
+  JOB_RETRY_BASE_SECONDS * 2^(attempt-1) (capped, with jitter) and moved to
+  dead_jobs after max_attempts
+
+Handlers receive the JSON payload and must be idempotent; they signal
+failure by raising.
+
+Usage:
+    from app.core.jobs import JobQueue, job_task
+
+    @job_task("sales.create_invoice")
+    def create_invoice(payload):
+        ...
+
+    JobQueue().enqueue("sales.create_invoice", {"order_id": order.id})
+"""
+import importlib
+import logging
+import os
+import random
+import socket
+import time
+import traceback
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import BigInteger, DateTime, Integer, String, Text, JSON, Index, func, select, delete
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Mapped, mapped_column, declared_attr
+
+from app.core.database import Base, get_db, get_schema
+from config.settings import (
+    JOB_MAX_ATTEMPTS, JOB_RETRY_BASE_SECONDS, JOB_RETRY_MAX_SECONDS, JOB_POLL_INTERVAL_SECONDS
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE = "default"
+
+# Modules whose @job_task handlers are loaded by workers
+TASK_MODULES = (
+    "app.sales.tasks",
+)
+
+TASKS: Dict[str, Callable[[Dict[str, Any]], Any]] = {}
+
+
+class Job(Base):
+    """Job waiting to run (deleted once it succeeds or is dead-lettered)."""
+    __tablename__ = "jobs"
+
+    @declared_attr
+    def __table_args__(cls):
+        return (
+            Index("ix_jobs_queue_run_at", "queue", "run_at"),
+            {'schema': get_schema()}
+        )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    queue: Mapped[str] = mapped_column(String(50), nullable=False, default=DEFAULT_QUEUE)
+    task: Mapped[str] = mapped_column(String(100), nullable=False)
+    payload: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=False, default=dict)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    max_attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=JOB_MAX_ATTEMPTS)
+    run_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    def __repr__(self):
+        return f"<Job(id={self.id}, task='{self.task}', attempts={self.attempts})>"
+
+
+class DeadJob(Base):
+    """Job that failed max_attempts times (kept for inspection and manual requeue)."""
+    __tablename__ = "dead_jobs"
+
+    @declared_attr
+    def __table_args__(cls):
+        return {'schema': get_schema()}
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    job_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    queue: Mapped[str] = mapped_column(String(50), nullable=False)
+    task: Mapped[str] = mapped_column(String(100), nullable=False)
+    payload: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    failed_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<DeadJob(id={self.id}, task='{self.task}', attempts={self.attempts})>"
+
+
+def job_task(name: str):
+    """Register a handler for jobs of this task name."""
+    def decorator(func: Callable[[Dict[str, Any]], Any]) -> Callable[[Dict[str, Any]], Any]:
+        TASKS[name] = func
+        return func
+    return decorator
+
+
+def load_tasks() -> Dict[str, Callable[[Dict[str, Any]], Any]]:
+    """Import the task modules so their handlers are registered."""
+    for module in TASK_MODULES:
+        importlib.import_module(module)
+    return TASKS
+
+
+def retry_delay(attempts: int) -> float:
+    """Seconds before the next try: exponential backoff, capped, +/-20% jitter."""
+    delay = min(JOB_RETRY_MAX_SECONDS, JOB_RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0))
+    return delay * random.uniform(0.8, 1.2)
+
+
+class JobQueue:
+    """Enqueue and run background jobs."""
+
+    def __init__(self, worker_id: Optional[str] = None):
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.logger = logger
+
+    def enqueue(self, task: str, payload: Optional[Dict[str, Any]] = None, queue: str = DEFAULT_QUEUE,
+                delay_seconds: float = 0, max_attempts: int = JOB_MAX_ATTEMPTS) -> Optional[Job]:
+        """
+        Add a job to the current transaction (committed with the caller's work).
+
+        Returns:
+            The pending Job, or None on error
+        """
+        try:
+            now = datetime.utcnow()
+            job = Job(
+                queue=queue, task=task, payload=payload or {}, attempts=0, max_attempts=max_attempts,
+                run_at=now + timedelta(seconds=delay_seconds), created_at=now
+            )
+            get_db().add(job)
+            self.logger.debug("Enqueued job %s (%s)", task, payload)
+            return job
+        except Exception as e:
+            self.logger.error("Error enqueueing job '%s': %s", task, e)
+            return None
+
+    def run_next(self, queues: Iterable[str] = (DEFAULT_QUEUE,)) -> Optional[bool]:
+        """
+        Claim one due job, run it and commit the outcome.
+
+        Returns:
+            True if the job succeeded, False if it failed (retried or dead-lettered),
+            None if no job was due
+        """
+        db = get_db()
+        job = db.scalars(
+            select(Job)
+            .where(Job.queue.in_(list(queues)), Job.run_at <= datetime.utcnow())
+            .order_by(Job.run_at, Job.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        ).first()
+        if job is None:
+            db.rollback()
+            return None
+
+        started = time.perf_counter()
+        try:
+            handler = TASKS.get(job.task)
+            if handler is None:
+                raise LookupError(f"No handler registered for task '{job.task}'")
+            with db.begin_nested():
+                handler(dict(job.payload))
+        except Exception as e:
+            self._record_failure(job, e)
+            db.commit()
+            return False
+
+        db.delete(job)
+        db.commit()
+        self.logger.info(
+            "Job %s (%s) done in %.1fms [%s]",
+            job.id, job.task, (time.perf_counter() - started) * 1000, self.worker_id
+        )
+        return True
+
+    def _record_failure(self, job: Job, error: Exception) -> None:
+        """Schedule a retry, or move the job to dead_jobs after its last attempt."""
+        job.attempts += 1
+        job.last_error = "".join(traceback.format_exception_only(type(error), error)).strip()[:2000]
+        if job.attempts >= job.max_attempts:
+            now = datetime.utcnow()
+            get_db().add(DeadJob(
+                job_id=job.id, queue=job.queue, task=job.task, payload=job.payload, attempts=job.attempts,
+                last_error=job.last_error, created_at=job.created_at, failed_at=now
+            ))
+            get_db().delete(job)
+            self.logger.error(
+                "Job %s (%s) dead-lettered after %s attempts: %s", job.id, job.task, job.attempts, job.last_error
+            )
+        else:
+            delay = retry_delay(job.attempts)
+            job.run_at = datetime.utcnow() + timedelta(seconds=delay)
+            self.logger.warning(
+                "Job %s (%s) failed (attempt %s/%s), retrying in %.0fs: %s",
+                job.id, job.task, job.attempts, job.max_attempts, delay, job.last_error
+            )
+
+    # ============ INSPECTION ============
+
+    def stats(self) -> Optional[Dict[str, Any]]:
+        """Pending/due jobs per queue and dead-letter count, or None on error."""
+        try:
+            db = get_db()
+            now = datetime.utcnow()
+            rows = db.execute(
+                select(
+                    Job.queue,
+                    func.count().label("pending"),
+                    func.count().filter(Job.run_at <= now).label("due"),
+                    func.min(Job.created_at).label("oldest")
+                ).group_by(Job.queue)
+            ).all()
+            return {
+                "queues": {
+                    row.queue: {"pending": row.pending, "due": row.due,
+                                "oldest": row.oldest.isoformat() if row.oldest else None}
+                    for row in rows
+                },
+                "dead": db.scalar(select(func.count()).select_from(DeadJob))
+            }
+        except SQLAlchemyError as e:
+            self.logger.error("Error reading job stats: %s", e)
+            return None
+
+    def list_dead(self, limit: int = 50) -> Optional[List[DeadJob]]:
+        """Most recent dead jobs, or None on error."""
+        try:
+            db = get_db()
+            return list(db.scalars(select(DeadJob).order_by(DeadJob.failed_at.desc()).limit(limit)))
+        except SQLAlchemyError as e:
+            self.logger.error("Error listing dead jobs: %s", e)
+            return None
+
+    def requeue_dead(self, dead_ids: Optional[List[int]] = None) -> Optional[int]:
+        """
+        Move dead jobs (all when dead_ids is None) back to the queue with fresh attempts.
+
+        Returns:
+            Number of requeued jobs, or None on error
+        """
+        try:
+            db = get_db()
+            statement = select(DeadJob).with_for_update(skip_locked=True)
+            if dead_ids is not None:
+                statement = statement.where(DeadJob.id.in_(dead_ids))
+            dead_jobs = list(db.scalars(statement))
+            now = datetime.utcnow()
+            for dead in dead_jobs:
+                db.add(Job(
+                    queue=dead.queue, task=dead.task, payload=dead.payload, attempts=0,
+                    max_attempts=JOB_MAX_ATTEMPTS, run_at=now, created_at=now, last_error=dead.last_error
+                ))
+            if dead_jobs:
+                db.execute(delete(DeadJob).where(DeadJob.id.in_([dead.id for dead in dead_jobs])))
+            return len(dead_jobs)
+        except SQLAlchemyError as e:
+            self.logger.error("Error requeueing dead jobs: %s", e)
+            return None
+
+
+def run_worker(app, queues: Iterable[str] = (DEFAULT_QUEUE,), poll_interval: float = JOB_POLL_INTERVAL_SECONDS,
+               once: bool = False, should_stop: Callable[[], bool] = lambda: False) -> int:
+    """
+    Process jobs until stopped (or until no job is due when once=True).
+
+    Each job runs in its own application context (fresh session). Database
+    errors outside the handler (e.g. connection loss) are logged and retried
+    after poll_interval.
+
+    Returns:
+        Number of jobs processed (succeeded or failed)
+    """
+    queues = list(queues)
+    load_tasks()
+    job_queue = JobQueue()
+    processed = 0
+    logger.info("Job worker %s started (queues: %s)", job_queue.worker_id, ', '.join(queues))
+
+    while not should_stop():
+        try:
+            with app.app_context():
+                outcome = job_queue.run_next(queues)
+        except SQLAlchemyError as e:
+            logger.error("Job worker database error: %s", e)
+            outcome = None
+        if outcome is not None:
+            processed += 1
+            continue
+        if once:
+            break
+        time.sleep(poll_interval)
+
+    logger.info("Job worker %s stopped after %s job(s)", job_queue.worker_id, processed)
+    return processed
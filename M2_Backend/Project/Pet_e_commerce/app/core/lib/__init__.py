@@ -5,6 +5,7 @@ Provides:
 - auth: Authorization helper functions (user_has_role, is_admin_user, is_user_or_admin)
 - jwt: JWT token generation and verification
 - users: User data access functions (for use in decorators)
+- principals: Cached authenticated principal (id, username, roles)
 """
 
 from app.core.lib.auth import (
@@ -20,9 +21,12 @@ from app.core.lib.jwt import (
 
 from app.core.lib.users import (
     get_user_by_id,
-    get_user_by_username
+    get_user_by_username,
+    get_principal
 )
 
+from app.core.lib.principals import Principal, invalidate_principal
+
 __all__ = [
     # Auth utilities
     'user_has_role',
@@ -33,5 +37,9 @@ __all__ = [
     'verify_jwt_token',
     # User utilities
     'get_user_by_id',
-    'get_user_by_username'
+    'get_user_by_username',
+    'get_principal',
+    # Principal cache
+    'Principal',
+    'invalidate_principal'
 ]
@@ -6,17 +6,36 @@ This module provides HELPER FUNCTIONS for authorization checks.
 For decorators, use app.core.middleware.
 """
 import logging
+from typing import List
 from flask import g
+from app.core.lib.principals import Principal
 
 logger = logging.getLogger(__name__)
 
+
+def role_names(user) -> List[str]:
+    """
+    Role names of a User or cached Principal.
+    
+    Args:
+        user: User object with user_roles relationship, or Principal
+        
+    Returns:
+        list: Role names (empty if none)
+    """
+    if isinstance(user, Principal):
+        return list(user.roles)
+    if not user or not getattr(user, 'user_roles', None):
+        return []
+    return [ur.role.name for ur in user.user_roles]
+
 def user_has_role(user, role_name: str) -> bool:
     """
     Check if a user has a specific role.
     Supports multiple roles per user.
     
     Args:
-        user: User object with user_roles relationship
+        user: User object with user_roles relationship, or Principal
         role_name: Role name to check (e.g., 'admin', 'user')
         
     Returns:
@@ -26,6 +45,8 @@ def user_has_role(user, role_name: str) -> bool:
         if user_has_role(current_user, 'admin'):
             # Grant admin access
     """
+    if isinstance(user, Principal):
+        return user.has_role(role_name)
     if not user or not hasattr(user, 'user_roles') or not user.user_roles:
         return False
     
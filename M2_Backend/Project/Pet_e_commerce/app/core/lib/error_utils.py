@@ -13,10 +13,40 @@ Usage:
     except Exception as e:
         logger.error(f"Operation failed: {e}", exc_info=True)
         return error_response("Operation failed", e, status_code=500)
+
+Exceptions:
+    ConcurrencyConflictError: optimistic concurrency (version) check failed,
+    maps to HTTP 409 Conflict
+    PasswordHasherBusyError: password hashing pool saturated,
+    maps to HTTP 503 Service Unavailable
 """
 import os
 from flask import jsonify
 from typing import Union, Tuple
+from werkzeug.exceptions import Conflict, ServiceUnavailable
+
+
+class ConcurrencyConflictError(Conflict):
+    """
+    Raised when a versioned row was modified by another request.
+    
+    Subclasses werkzeug's Conflict, so the global error handler answers
+    409 if a controller does not handle it explicitly.
+    """
+    description = "Resource was modified by another request. Reload and retry."
+
+
+class PasswordHasherBusyError(ServiceUnavailable):
+    """
+    Raised when too many password hashes/verifications are already queued.
+    
+    Subclasses werkzeug's ServiceUnavailable (503); retry_after (seconds)
+    becomes the Retry-After header.
+    """
+    description = "Server is busy. Retry shortly."
+    
+    def __init__(self, description=None, response=None, retry_after=1):
+        super().__init__(description, response, retry_after)
 
 
 def error_response(
@@ -79,3 +109,16 @@ def validation_error_response(errors: dict) -> Tuple[dict, int]:
         "error": "Validation failed",
         "details": errors
     }), 400
+
+
+def busy_response(exception: PasswordHasherBusyError) -> Tuple[dict, int, dict]:
+    """
+    Format a 503 response for a saturated worker pool.
+    
+    Args:
+        exception: The PasswordHasherBusyError raised by the pool
+        
+    Returns:
+        Tuple of (jsonify response, 503, {"Retry-After": seconds})
+    """
+    return jsonify({"error": exception.description}), 503, {"Retry-After": str(exception.retry_after)}
@@ -0,0 +1,229 @@
+"""
+Principal Cache Module
+
+Caches the authenticated principal (user id, username, role names) so the auth
+decorators don't load User + user_roles + roles (2-3 queries) on every request.
+
+Lookup order (get_principal):
+1. In-process cache, valid for PRINCIPAL_LOCAL_TTL_SECONDS (default 2s)
+2. Redis ``auth:principal:v1:{user_id}`` (PRINCIPAL_CACHE_TTL_SECONDS, default 60s),
+   accepted only if it carries the user's current security version
+   (``auth:secver:v1:{user_id}``)
+3. Database (UserRepository.get_by_id), then stored in both caches
+
+Invalidation (invalidate_principal):
+- Bumps the security version, so any entry cached from older data is rejected
+  even if a concurrent request writes it back after the invalidation
+- Deletes the Redis and in-process entries
+- Runs again when the surrounding transaction commits, so a request that read
+  the pre-commit rows can't keep them cached
+
+Role changes therefore apply immediately in the process that made them and
+within PRINCIPAL_LOCAL_TTL_SECONDS everywhere else. If Redis is unavailable
+principals are loaded from the database (local cache only).
+
+Usage:
+    principal = get_principal(user_id)
+    principal.has_role('admin')
+
+    # After changing roles/password or deleting the user
+    invalidate_principal(user_id)
+"""
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Optional, Tuple
+from flask import g, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.core.cache_manager import get_cache
+from config.settings import (
+    PRINCIPAL_CACHE_ENABLED,
+    PRINCIPAL_CACHE_TTL_SECONDS,
+    PRINCIPAL_LOCAL_TTL_SECONDS
+)
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on in-process entries (oldest evicted first)
+LOCAL_CACHE_MAX_ENTRIES = 10000
+
+_user_repo = None
+
+# user_id -> (expires_at, Principal)
+_local_cache: "OrderedDict[int, Tuple[float, Principal]]" = OrderedDict()
+# user_id -> local invalidation counter (stops in-flight loads from caching stale data)
+_local_generation = {}
+_local_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Authenticated user identity and roles, as needed by authorization checks."""
+
+    id: int
+    username: str
+    roles: Tuple[str, ...]
+    security_version: int = 0
+
+    def has_role(self, role_name: str) -> bool:
+        return role_name in self.roles
+
+    @classmethod
+    def from_user(cls, user, security_version: int = 0) -> "Principal":
+        roles = tuple(ur.role.name for ur in user.user_roles) if user.user_roles else ()
+        return cls(id=user.id, username=user.username, roles=roles, security_version=security_version)
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, raw) -> "Principal":
+        data = json.loads(raw)
+        data['roles'] = tuple(data['roles'])
+        return cls(**data)
+
+
+def _principal_key(user_id: int) -> str:
+    return f"auth:principal:v1:{user_id}"
+
+
+def _version_key(user_id: int) -> str:
+    return f"auth:secver:v1:{user_id}"
+
+
+def _load_user(user_id: int):
+    # Imported lazily: app.core.lib.auth imports this module before app.auth is loaded
+    global _user_repo
+    if _user_repo is None:
+        from app.auth.repositories.user_repository import UserRepository
+        _user_repo = UserRepository()
+    return _user_repo.get_by_id(user_id)
+
+
+def _redis_client():
+    try:
+        return get_cache().redis_client
+    except Exception as e:
+        logger.warning(f"Principal cache unavailable, using database: {e}")
+        return None
+
+
+def _local_get(user_id: int) -> Optional[Principal]:
+    entry = _local_cache.get(user_id)
+    if entry is not None and entry[0] > time.monotonic():
+        return entry[1]
+    return None
+
+
+def _local_put(principal: Principal, generation: int) -> None:
+    with _local_lock:
+        if _local_generation.get(principal.id, 0) != generation:
+            return
+        _local_cache[principal.id] = (time.monotonic() + PRINCIPAL_LOCAL_TTL_SECONDS, principal)
+        _local_cache.move_to_end(principal.id)
+        while len(_local_cache) > LOCAL_CACHE_MAX_ENTRIES:
+            _local_cache.popitem(last=False)
+
+
+def get_principal(user_id: int) -> Optional[Principal]:
+    """
+    Resolve the principal for an authenticated user id.
+
+    Args:
+        user_id: User ID from the verified token
+
+    Returns:
+        Principal, or None if the user does not exist
+    """
+    if not PRINCIPAL_CACHE_ENABLED:
+        user = _load_user(user_id)
+        return Principal.from_user(user) if user else None
+
+    principal = _local_get(user_id)
+    if principal is not None:
+        return principal
+    generation = _local_generation.get(user_id, 0)
+
+    client = _redis_client()
+    version = 0
+    if client is not None:
+        try:
+            raw, raw_version = client.mget(_principal_key(user_id), _version_key(user_id))
+            version = int(raw_version or 0)
+            if raw:
+                principal = Principal.from_json(raw)
+                if principal.security_version == version:
+                    _local_put(principal, generation)
+                    return principal
+        except Exception as e:
+            logger.warning(f"Principal cache read failed for user {user_id}: {e}")
+            client = None
+
+    user = _load_user(user_id)
+    if not user:
+        return None
+    principal = Principal.from_user(user, security_version=version)
+
+    if client is not None:
+        try:
+            client.set(_principal_key(user_id), principal.to_json(), ex=PRINCIPAL_CACHE_TTL_SECONDS)
+        except Exception as e:
+            logger.warning(f"Principal cache write failed for user {user_id}: {e}")
+    _local_put(principal, generation)
+    return principal
+
+
+def _invalidate_now(user_id: int) -> None:
+    with _local_lock:
+        _local_generation[user_id] = _local_generation.get(user_id, 0) + 1
+        _local_cache.pop(user_id, None)
+
+    client = _redis_client()
+    if client is None:
+        return
+    try:
+        pipe = client.pipeline(transaction=True)
+        pipe.incr(_version_key(user_id))
+        # Outlives every entry stamped with the old version
+        pipe.expire(_version_key(user_id), PRINCIPAL_CACHE_TTL_SECONDS * 10)
+        pipe.delete(_principal_key(user_id))
+        pipe.execute()
+    except Exception as e:
+        logger.error(f"Failed to invalidate principal for user {user_id}: {e}")
+
+
+def invalidate_principal(user_id: int) -> None:
+    """
+    Invalidate a user's cached principal (roles, password or account changed).
+
+    Takes effect immediately and again after the current request's transaction
+    commits.
+
+    Args:
+        user_id: ID of the user whose security-relevant data changed
+    """
+    _invalidate_now(user_id)
+    if has_app_context() and 'db' in g:
+        g.db.info.setdefault('principal_invalidations', set()).add(user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    for user_id in session.info.pop('principal_invalidations', ()):
+        _invalidate_now(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session):
+    session.info.pop('principal_invalidations', None)
+
+
+def clear_local_principals() -> None:
+    """Drop all in-process entries (tests, admin tooling)."""
+    with _local_lock:
+        _local_cache.clear()
+        _local_generation.clear()
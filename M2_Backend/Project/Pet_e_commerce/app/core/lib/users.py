@@ -12,6 +12,7 @@ Note: Uses UserRepository directly to avoid circular imports with AuthService
 from typing import Optional
 from app.auth.repositories import UserRepository
 from app.auth.models.user import User
+from app.core.lib.principals import Principal, get_principal as _get_principal
 
 # Module-level repository instance
 _user_repo = UserRepository()
@@ -31,6 +32,21 @@ def get_user_by_id(user_id: int) -> Optional[User]:
     """
     return _user_repo.get_by_id(user_id)
 
+def get_principal(user_id: int) -> Optional[Principal]:
+    """
+    Fetch the authenticated principal (id, username, roles) for a user ID.
+    
+    Served from the principal cache when possible; use this instead of
+    get_user_by_id() when only identity and roles are needed (auth checks).
+    
+    Args:
+        user_id: The ID of the user
+        
+    Returns:
+        Principal if the user exists, None otherwise
+    """
+    return _get_principal(user_id)
+
 def get_user_by_username(username: str) -> Optional[User]:
     """
     Fetch a user by username from the database.
@@ -5,7 +5,7 @@ Provides Flask route decorators for authentication and authorization.
 Compatible with multi-role system (users can have multiple roles).
 
 DECORATORS PROVIDED:
-1. @token_required_with_repo - Validates token, loads user from DB, sets g.current_user
+1. @token_required_with_repo - Validates token, resolves the user's principal, sets g.current_user
 2. @admin_required_with_repo - Validates token + requires admin role (all-in-one)
 
 USAGE PATTERNS:
@@ -27,8 +27,12 @@ USAGE PATTERNS:
         # Call _try_authenticate() manually
         # Then check: if is_admin_user(): show_admin_data
         
+g.current_user is a Principal (id, username, roles) served from the principal
+cache (app.core.lib.principals) instead of a User loaded on every request.
+Role changes invalidate the cache, so authorization stays current.
+
 Dependencies:
-- app.core.lib.users for user retrieval
+- app.core.lib.users for principal retrieval
 - app.core.lib.jwt for token verification
 - app.core.lib.auth for role checking (user_has_role)
 - Flask g object for user session storage
@@ -36,9 +40,9 @@ Dependencies:
 
 from functools import wraps
 from flask import request, jsonify, g
-from app.core.lib.users import get_user_by_id
+from app.core.lib.users import get_principal
 from app.core.lib.jwt import verify_jwt_token
-from app.core.lib.auth import user_has_role
+from app.core.lib.auth import user_has_role, role_names
 from config.logging import get_logger, EXC_INFO_LOG_ERRORS
 
 # Module-level logger
@@ -47,16 +51,16 @@ logger = get_logger(__name__)
 
 def token_required_with_repo(function):
     """
-    Decorator that validates JWT token AND loads fresh user data from database.
+    Decorator that validates JWT token AND resolves the user's current roles.
     Sets g.current_user with up-to-date information including roles.
     
     Use this decorator when:
     - You need authentication
-    - You want fresh user data from DB (not cached in token)
+    - You want current roles (not the ones embedded in the token)
     - You need to check user roles or permissions
     
     After decoration, you can:
-    - Access g.current_user (User object with user_roles loaded)
+    - Access g.current_user (Principal: id, username, roles)
     - Use is_admin_user() to check admin status
     - Use is_user_or_admin(user_id) to check ownership
     
@@ -93,9 +97,9 @@ def token_required_with_repo(function):
                 logger.warning("Invalid or expired JWT token.")
                 return jsonify({'error': 'Invalid or expired token'}), 401
             
-            # Get FRESH user from database (includes roles)
+            # Resolve current identity and roles (principal cache, DB on miss)
             logger.debug(f"Looking up user with id {data.get('user_id')} from token.")
-            current_user = get_user_by_id(data['user_id'])
+            current_user = get_principal(data['user_id'])
             
             if not current_user:
                 logger.warning(f"User not found for id {data.get('user_id')} from token.")
@@ -106,7 +110,7 @@ def token_required_with_repo(function):
             
             logger.info(
                 f"Authenticated user {current_user.username} (id={current_user.id}) via JWT. "
-                f"Roles: {[ur.role.name for ur in current_user.user_roles] if current_user.user_roles else []}"
+                f"Roles: {role_names(current_user)}"
             )
         except Exception as e:
             logger.error(f"Token validation failed: {e}", exc_info=EXC_INFO_LOG_ERRORS)
@@ -124,7 +128,7 @@ def admin_required_with_repo(function):
     
     Use this decorator for admin-only endpoints:
     - Validates JWT token
-    - Loads fresh user from DB
+    - Resolves current roles (principal cache, DB on miss)
     - Verifies user has 'admin' role (supports multi-role)
     - Sets g.current_user if successful
     
@@ -160,8 +164,8 @@ def admin_required_with_repo(function):
                 logger.warning("Invalid or expired JWT token.")
                 return jsonify({'error': 'Invalid or expired token'}), 401
             
-            # Get FRESH user from database
-            current_user = get_user_by_id(data['user_id'])
+            # Resolve current identity and roles (principal cache, DB on miss)
+            current_user = get_principal(data['user_id'])
             
             if not current_user:
                 logger.warning(f"User not found for id {data.get('user_id')}.")
@@ -169,7 +173,7 @@ def admin_required_with_repo(function):
             
             # Verify admin role from database (supports multi-role system)
             if not user_has_role(current_user, 'admin'):
-                user_roles = [ur.role.name for ur in current_user.user_roles] if current_user.user_roles else []
+                user_roles = role_names(current_user)
                 logger.warning(
                     f"Admin access denied for user {current_user.username} "
                     f"(id={current_user.id}, roles={user_roles})."
@@ -5,6 +5,11 @@ Reusable for all modules (products, auth, sales, etc.).
 Key Components:
 - CacheHelper: Reusable class for schema-based caching (DRY principle)
 - cache_invalidate: Decorator for automatic cache invalidation after mutations
+- CacheHelper.invalidate_many_after_commit: Invalidation deferred until the
+  request's session commits (batch jobs that commit after the service call)
+- call_after_commit: Any other Redis cleanup deferred to the same commit hook
+- context_key / set_invalidation_context: Keys built from values the mutated
+  method already loaded (e.g. the owner's user_id), without extra queries
 
 Usage:
     from app.core.middleware.cache_decorators import CacheHelper, cache_invalidate
@@ -19,15 +24,28 @@ Usage:
         @cache_invalidate([lambda self, id, **kw: f"product:v1:{id}:admin=True"])
         def update_product(self, product_id: int, **updates):
             return self.product_repo.update(...)
+        
+        @cache_invalidate([context_key("invoice:v1:user:{user_id}:all")])
+        def delete_invoice(self, invoice_id: int):
+            invoice = self.repository.get_by_id(invoice_id)
+            set_invalidation_context(user_id=invoice.user_id)
+            ...
 """
 import json
 import logging
+from contextvars import ContextVar
 from functools import wraps
-from typing import Any, Callable, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from flask import g, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session
 from app.core.cache_manager import get_cache
 
 logger = logging.getLogger(__name__)
 
+# Values exposed by the running @cache_invalidate method (one dict per call)
+_invalidation_context: ContextVar[Optional[Dict[str, Any]]] = ContextVar("cache_invalidation_context", default=None)
+
 
 class CacheHelper:
     """
@@ -112,13 +130,13 @@ class CacheHelper:
         cached = self.cache.get_data(full_key)
         if cached:
             try:
-                self.logger.info(f"Cache HIT: {full_key}")
+                self.logger.info("Cache HIT: %s", full_key)
                 return json.loads(cached)
             except Exception as e:
                 self.logger.error(f"Cache deserialization error for '{full_key}': {e}")
         
         # Cache miss - fetch from database
-        self.logger.info(f"Cache MISS: {full_key}")
+        self.logger.info("Cache MISS: %s", full_key)
         data = fetch_func()
         
         if data is None:
@@ -137,7 +155,7 @@ class CacheHelper:
                 time_to_live=ttl
             )
             count = len(serialized) if many else 1
-            self.logger.info(f"Cached {count} item(s) under '{full_key}' (TTL: {ttl}s)")
+            self.logger.info("Cached %s item(s) under '%s' (TTL: %ss)", count, full_key, ttl)
         except Exception as e:
             self.logger.error(f"Failed to cache result for '{full_key}': {e}")
         
@@ -158,24 +176,179 @@ class CacheHelper:
             try:
                 deleted = self.cache.delete_data(full_key)
                 if deleted:
-                    self.logger.info(f"Cache invalidated: {full_key}")
+                    self.logger.info("Cache invalidated: %s", full_key)
                 else:
-                    self.logger.debug(f"Cache key not found: {full_key}")
+                    self.logger.debug("Cache key not found: %s", full_key)
             except Exception as e:
                 self.logger.error(f"Failed to invalidate cache key '{full_key}': {e}")
 
+    def invalidate_many(self, key_suffixes: Iterable[str]) -> int:
+        """
+        Invalidate many cache keys in one round trip (e.g. after a bulk update).
+        
+        Args:
+            key_suffixes: Cache key suffixes to invalidate
+        
+        Returns:
+            Number of keys that were cached and deleted
+        
+        Example:
+            helper.invalidate_many(["12", "13", "user:5:all", "all"])
+        """
+        full_keys = [self._build_cache_key(suffix) for suffix in dict.fromkeys(key_suffixes)]
+        try:
+            deleted = self.cache.delete_many(full_keys)
+            self.logger.info("Cache invalidated: %s of %s key(s) for %s", deleted, len(full_keys), self.resource_name)
+            return deleted
+        except Exception as e:
+            self.logger.error(f"Failed to invalidate {len(full_keys)} cache keys: {e}")
+            return 0
+
+    def invalidate_many_after_commit(self, key_suffixes: Iterable[str]) -> None:
+        """
+        Invalidate many cache keys once the current session commits.
+        
+        Deleting keys before the commit lets a concurrent read cache the old
+        rows again until their TTL expires; deferred keys are deleted in one
+        round trip after the commit and dropped on rollback. Without an open
+        session the keys are invalidated immediately.
+        
+        Args:
+            key_suffixes: Cache key suffixes to invalidate
+        
+        Example:
+            helper.invalidate_many_after_commit(["12", "user:5:all", "all"])
+            get_db().commit()  # keys deleted here
+        """
+        if not (has_app_context() and 'db' in g):
+            self.invalidate_many(key_suffixes)
+            return
+        g.db.info.setdefault('cache_invalidations', set()).update(
+            self._build_cache_key(suffix) for suffix in key_suffixes
+        )
+
+    def invalidate_all(self) -> None:
+        """
+        Invalidate every cached entry of this resource and version in one pass.
+        Used after bulk changes instead of per-item invalidation.
+
+        Example:
+            helper.invalidate_all()  # deletes "product:v1:*"
+        """
+        pattern = self._build_cache_key("*")
+        try:
+            self.cache.delete_data_with_pattern(pattern)
+        except Exception as e:
+            self.logger.error(f"Failed to invalidate cache pattern '{pattern}': {e}")
+
+    def invalidate_all_after_commit(self) -> None:
+        """
+        invalidate_all() once the current session commits (dropped on rollback).
+        
+        For bulk writes made in the request's transaction: clearing the
+        resource before the commit lets a concurrent read cache the old rows
+        again until their TTL expires.
+        
+        Example:
+            helper.invalidate_all_after_commit()
+            get_db().commit()  # "product:v1:*" deleted here
+        """
+        call_after_commit(self.invalidate_all)
+
 
 # ============ CACHE INVALIDATION DECORATOR ============
 
+class context_key:
+    """
+    Cache key template filled from set_invalidation_context() values.
+    
+    Used for keys that depend on the mutated entity (e.g. its owner) rather
+    than on the method arguments. The key is skipped when the method did not
+    provide every value (e.g. the entity was not found).
+    
+    Example:
+        context_key("invoice:v1:user:{user_id}:all")
+    """
+    
+    def __init__(self, template: str):
+        self.template = template
+    
+    def __call__(self, context: Dict[str, Any]) -> Optional[str]:
+        try:
+            return self.template.format(**context)
+        except KeyError:
+            return None
+    
+    def __repr__(self):
+        return f"context_key({self.template!r})"
+
+
+def set_invalidation_context(**values: Any) -> None:
+    """
+    Expose values of the mutated entity to the context_key templates of the
+    running @cache_invalidate method. Call it with data the method already
+    loaded (before a delete, the row is still in hand). No-op outside a
+    decorated method.
+    
+    Example:
+        set_invalidation_context(user_id=existing_invoice.user_id)
+    """
+    context = _invalidation_context.get()
+    if context is not None:
+        context.update(values)
+
+
+def call_after_commit(callback: Callable[[], Any]) -> None:
+    """
+    Run callback once the request's session commits; dropped on rollback.
+    
+    For Redis state that must only change if the transaction lands (e.g. a
+    Redis cart removed at checkout). Without an open session the callback
+    runs immediately. Callbacks must not use the session.
+    
+    Args:
+        callback: Function without arguments
+    """
+    if not (has_app_context() and 'db' in g):
+        callback()
+        return
+    g.db.info.setdefault('after_commit_callbacks', []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    full_keys = session.info.pop('cache_invalidations', None)
+    if full_keys:
+        try:
+            deleted = get_cache().delete_many(sorted(full_keys))
+            logger.info("Cache invalidated after commit: %s of %s key(s)", deleted, len(full_keys))
+        except Exception as e:
+            logger.error("Failed to invalidate %s cache keys after commit: %s", len(full_keys), e)
+    for callback in session.info.pop('after_commit_callbacks', ()):
+        try:
+            callback()
+        except Exception as e:
+            logger.error("After-commit callback %r failed: %s", callback, e)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session):
+    session.info.pop('cache_invalidations', None)
+    session.info.pop('after_commit_callbacks', None)
+
+
 def cache_invalidate(cache_key_funcs: List[Callable]):
     """
     Decorator to invalidate cache keys after a mutation method.
     
     This decorator clears specific cache entries after data modifications.
     Works properly even when caching is disabled in cache_get.
+    Keys are deleted through self.cache_manager, or through the service's
+    CacheHelper when it has no cache_manager.
     
     Args:
-        cache_key_funcs: List of functions to generate cache keys from args/kwargs
+        cache_key_funcs: Functions generating cache keys from args/kwargs, or
+            context_key templates filled from set_invalidation_context()
         
     Example:
         @cache_invalidate([
@@ -188,18 +361,33 @@ def cache_invalidate(cache_key_funcs: List[Callable]):
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         def wrapper(self, *args, **kwargs) -> Any:
-            result = func(self, *args, **kwargs)
+            token = _invalidation_context.set({})
+            try:
+                result = func(self, *args, **kwargs)
+                context = _invalidation_context.get()
+            finally:
+                _invalidation_context.reset(token)
+            
+            cache = getattr(self, 'cache_manager', None)
+            if not cache and getattr(self, 'cache_helper', None) is not None:
+                cache = self.cache_helper.cache
             
             # Invalidate all specified cache keys
             for key_func in cache_key_funcs:
                 try:
-                    cache_key = key_func(self, *args, **kwargs)
-                    if hasattr(self, 'cache_manager') and self.cache_manager:
-                        deleted = self.cache_manager.delete_data(cache_key)
+                    if isinstance(key_func, context_key):
+                        cache_key = key_func(context)
+                        if cache_key is None:
+                            self.logger.debug("No invalidation context for %r, skipped", key_func)
+                            continue
+                    else:
+                        cache_key = key_func(self, *args, **kwargs)
+                    if cache:
+                        deleted = cache.delete_data(cache_key)
                         if deleted:
-                            self.logger.info(f"Cache invalidated: {cache_key}")
+                            self.logger.info("Cache invalidated: %s", cache_key)
                         else:
-                            self.logger.debug(f"Cache key not found or already deleted: {cache_key}")
+                            self.logger.debug("Cache key not found or already deleted: %s", cache_key)
                 except Exception as e:
                     self.logger.error(f"Failed to invalidate cache: {e}")
             
@@ -0,0 +1,119 @@
+"""
+Monitoring Routes Module
+
+Operational endpoints for scrapers and operators. Requests authenticated
+with METRICS_TOKEN never touch the database session, so scraping does not
+consume pool connections.
+
+Endpoints:
+- GET /metrics - All metrics in the Prometheus text format
+- GET /metrics/pools - Connection pool snapshot (JSON) for sizing decisions
+- GET /metrics/profiles - Stored request profiles (ids, newest first)
+- GET /metrics/profiles/<profile_id> - pstats report of one profile
+
+Access:
+    Closed by default. Scrapers send "Authorization: Bearer <METRICS_TOKEN>"
+    (METRICS_TOKEN must be set for them); an admin JWT is accepted as well.
+    Stored profiles expose code paths and timings, so they need what
+    recording one needs: "X-Profile-Token: <PROFILING_TOKEN>" or an admin JWT.
+
+Usage:
+    from app.core.monitoring import monitoring_bp
+    app.register_blueprint(monitoring_bp, url_prefix='')
+"""
+import hmac
+from flask import Blueprint, Response, jsonify, request
+from flask.views import MethodView
+from app.core.metrics import render_metrics
+from app.core.pool_metrics import pool_status
+from app.core.request_metrics import is_admin_request, list_profiles, profile_report, profiling_authorized
+from config.settings import METRICS_TOKEN
+
+# Blueprint for monitoring routes
+monitoring_bp = Blueprint('monitoring', __name__)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _authorized() -> bool:
+    """METRICS_TOKEN bearer (when configured) or an admin JWT; never open."""
+    header = request.headers.get('Authorization', '')
+    if METRICS_TOKEN and hmac.compare_digest(header, f"Bearer {METRICS_TOKEN}"):
+        return True
+    return is_admin_request()
+
+
+class MetricsAPI(MethodView):
+    """
+    Prometheus scrape endpoint.
+
+    Endpoints:
+        GET /metrics - Render the metrics registry
+    """
+
+    def get(self):
+        """
+        Returns:
+            200: Prometheus text exposition
+            401: {"error": "Unauthorized"}
+        """
+        if not _authorized():
+            return jsonify({"error": "Unauthorized"}), 401
+        return Response(render_metrics(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+
+class PoolStatusAPI(MethodView):
+    """
+    Connection pool snapshot.
+
+    Endpoints:
+        GET /metrics/pools - Per-pool size, usage, timeouts and latency p95
+    """
+
+    def get(self):
+        """
+        Returns:
+            200: {"pools": {"primary": {...}, "replica-1": {...}}}
+            401: {"error": "Unauthorized"}
+        """
+        if not _authorized():
+            return jsonify({"error": "Unauthorized"}), 401
+        return jsonify({"pools": pool_status()}), 200
+
+
+class ProfileAPI(MethodView):
+    """
+    Stored request profiles (see app.core.request_metrics).
+
+    Endpoints:
+        GET /metrics/profiles - List profile ids
+        GET /metrics/profiles/<profile_id> - Text report (top functions by cumulative time)
+    """
+
+    def get(self, profile_id=None):
+        """
+        Returns:
+            200: {"profiles": [...]} or text/plain report
+            401: {"error": "Unauthorized"}
+            404: {"error": "Profile not found"}
+        """
+        if not profiling_authorized():
+            return jsonify({"error": "Unauthorized"}), 401
+        if profile_id is None:
+            return jsonify({"profiles": list_profiles()}), 200
+        report = profile_report(profile_id)
+        if report is None:
+            return jsonify({"error": "Profile not found"}), 404
+        return Response(report, content_type="text/plain; charset=utf-8")
+
+
+# Register route views
+metrics_view = MetricsAPI.as_view('metrics_api')
+pool_status_view = PoolStatusAPI.as_view('pool_status_api')
+profile_view = ProfileAPI.as_view('profile_api')
+
+# Map routes to views
+monitoring_bp.add_url_rule('/metrics', view_func=metrics_view, methods=['GET'])
+monitoring_bp.add_url_rule('/metrics/pools', view_func=pool_status_view, methods=['GET'])
+monitoring_bp.add_url_rule('/metrics/profiles', view_func=profile_view, methods=['GET'])
+monitoring_bp.add_url_rule('/metrics/profiles/<profile_id>', view_func=profile_view, methods=['GET'])
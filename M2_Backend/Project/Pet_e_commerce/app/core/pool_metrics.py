@@ -0,0 +1,175 @@
+"""
+Connection Pool Metrics Module
+
+Instrumented QueuePool plus pool event hooks that feed app.core.metrics.
+
+Exposed metrics (label ``pool``: "primary", "replica-1", ...):
+- db_pool_size / db_pool_checked_out / db_pool_checked_in / db_pool_overflow:
+  Live pool state, read at scrape time
+- db_pool_wait_seconds: Time to obtain a connection from the pool (queue wait,
+  or opening a new connection when the pool can grow)
+- db_pool_checkout_seconds: Full checkout latency (wait + pre-ping + events)
+- db_pool_timeouts_total: Checkouts that gave up after DB_POOL_TIMEOUT
+- db_pool_pre_ping_failures_total: Stale connections detected by the pre-ping
+
+Pre-ping modes (DB_POOL_PRE_PING):
+- always: Ping on every checkout (one extra round trip per request)
+- idle: Ping only connections idle for DB_POOL_PRE_PING_IDLE_SECONDS or more;
+  connections returned moments ago are handed out as-is
+- off: Never ping
+
+A failed ping raises DisconnectionError, so the pool discards the connection
+and transparently retries with a new one.
+
+Sizing:
+    Sustained db_pool_wait_seconds above a few ms together with
+    db_pool_checked_out at DB_POOL_SIZE + DB_MAX_OVERFLOW means requests queue
+    for connections (raise the pool or lower per-request DB time); a pool
+    that never reaches DB_POOL_SIZE can be shrunk.
+
+Usage:
+    engine = create_engine(url, poolclass=InstrumentedQueuePool, ...)
+    install_pool_hooks(engine, "primary")
+"""
+import logging
+import time
+from typing import Any, Dict
+from sqlalchemy import event
+from sqlalchemy.exc import DisconnectionError, TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+from app.core.metrics import counter, gauge, histogram
+from config.settings import DB_POOL_PRE_PING, DB_POOL_PRE_PING_IDLE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Pool name -> engine (engine.pool is read at scrape time; dispose() replaces it)
+_engines: Dict[str, Any] = {}
+
+# Latency buckets tuned for pool operations (100us .. 30s pool timeout)
+POOL_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0)
+
+POOL_WAIT = histogram(
+    "db_pool_wait_seconds", "Time to obtain a connection from the pool", ["pool"], buckets=POOL_BUCKETS
+)
+POOL_CHECKOUT = histogram(
+    "db_pool_checkout_seconds", "Connection checkout latency including pre-ping", ["pool"], buckets=POOL_BUCKETS
+)
+POOL_TIMEOUTS = counter("db_pool_timeouts_total", "Checkouts that timed out waiting for a connection", ["pool"])
+PRE_PING_FAILURES = counter("db_pool_pre_ping_failures_total", "Stale connections detected by pre-ping", ["pool"])
+
+
+def _collect(method_name: str):
+    def collect():
+        values = {}
+        for name, engine in list(_engines.items()):
+            method = getattr(engine.pool, method_name, None)
+            if callable(method):
+                values[(name,)] = method()
+        return values
+    return collect
+
+
+gauge("db_pool_size", "Configured pool size", ["pool"], collect=_collect("size"))
+gauge("db_pool_checked_out", "Connections currently checked out", ["pool"], collect=_collect("checkedout"))
+gauge("db_pool_checked_in", "Idle connections in the pool", ["pool"], collect=_collect("checkedin"))
+gauge("db_pool_overflow", "Connections opened beyond the pool size", ["pool"], collect=_collect("overflow"))
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records wait time, checkout latency and timeouts."""
+
+    metrics_name = "primary"
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            POOL_CHECKOUT.observe(time.perf_counter() - start, pool=self.metrics_name)
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            POOL_TIMEOUTS.inc(pool=self.metrics_name)
+            logger.warning(f"Connection pool '{self.metrics_name}' exhausted: {self.status()}")
+            raise
+        finally:
+            POOL_WAIT.observe(time.perf_counter() - start, pool=self.metrics_name)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics_name = self.metrics_name
+        return pool
+
+
+def install_pool_hooks(engine, name: str, pre_ping: str = DB_POOL_PRE_PING,
+                       idle_seconds: float = DB_POOL_PRE_PING_IDLE_SECONDS) -> None:
+    """
+    Register an engine's pool for metrics and install the pre-ping hook.
+
+    Args:
+        engine: SQLAlchemy Engine (ideally created with poolclass=InstrumentedQueuePool)
+        name: Pool label used in metrics
+        pre_ping: "always", "idle" or "off"
+        idle_seconds: Idle time after which "idle" mode pings a connection
+    """
+    if pre_ping not in ("always", "idle", "off"):
+        raise ValueError(f"Invalid pre-ping mode: {pre_ping}")
+
+    if isinstance(engine.pool, InstrumentedQueuePool):
+        engine.pool.metrics_name = name
+    _engines[name] = engine
+
+    if pre_ping == "off":
+        return
+    threshold = 0 if pre_ping == "always" else idle_seconds
+    dialect = engine.dialect
+
+    @event.listens_for(engine, "connect")
+    def _mark_new(dbapi_connection, connection_record):
+        connection_record.info["last_used"] = time.monotonic()
+
+    @event.listens_for(engine, "checkin")
+    def _mark_returned(dbapi_connection, connection_record):
+        if connection_record is not None:
+            connection_record.info["last_used"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def _pre_ping(dbapi_connection, connection_record, connection_proxy):
+        last_used = connection_record.info.get("last_used")
+        if threshold and last_used is not None and time.monotonic() - last_used < threshold:
+            return
+        try:
+            alive = dialect.do_ping(dbapi_connection)
+        except Exception as e:
+            logger.warning(f"Pre-ping failed on pool '{name}', reconnecting: {e}")
+            alive = False
+        if not alive:
+            PRE_PING_FAILURES.inc(pool=name)
+            raise DisconnectionError("Connection failed pre-ping")
+
+
+def pool_status() -> Dict[str, Dict[str, Any]]:
+    """
+    Snapshot of every registered pool, for the monitoring endpoint.
+
+    Returns:
+        {pool name: {size, checked_out, checked_in, overflow, timeouts,
+        pre_ping_failures, wait_p95_seconds, checkout_p95_seconds}}
+    """
+    status = {}
+    for name, engine in list(_engines.items()):
+        pool = engine.pool
+        status[name] = {
+            "size": pool.size() if hasattr(pool, "size") else None,
+            "checked_out": pool.checkedout() if hasattr(pool, "checkedout") else None,
+            "checked_in": pool.checkedin() if hasattr(pool, "checkedin") else None,
+            "overflow": pool.overflow() if hasattr(pool, "overflow") else None,
+            "timeouts": POOL_TIMEOUTS.value(pool=name),
+            "pre_ping_failures": PRE_PING_FAILURES.value(pool=name),
+            "wait_p95_seconds": POOL_WAIT.quantile(0.95, pool=name),
+            "checkout_p95_seconds": POOL_CHECKOUT.quantile(0.95, pool=name)
+        }
+    return status
@@ -0,0 +1,298 @@
+"""
+Rate Limiter Module
+
+Token-bucket rate limiting shared by all application processes through Redis.
+
+Each policy is a bucket of ``burst`` tokens (default: ``limit``) refilled at
+``limit / period`` tokens per second; a request takes one token. Buckets are
+keyed by policy and principal:
+- Authenticated requests: ``user_id`` from the JWT (scope "principal")
+- Anonymous requests, or scope "ip": client IP
+
+The check-and-take runs as one Lua script (atomic, one round trip) using the
+Redis server clock, so every process sees the same bucket. If Redis is down
+the limiter falls back to in-process buckets (limits then apply per process)
+and retries Redis after RATE_LIMIT_REDIS_RETRY_SECONDS.
+
+Responses carry the IETF draft headers ``RateLimit-Limit``,
+``RateLimit-Remaining``, ``RateLimit-Reset`` and ``RateLimit-Policy``;
+rejected requests get 429 with ``Retry-After``.
+
+Policies are configured per endpoint in app/blueprints.py.
+
+Configuration (config/settings.py):
+- RATE_LIMIT_ENABLED: Turn the limiter on/off (default: true). The Flask
+  config key RATELIMIT_ENABLED overrides it per app (tests)
+- RATE_LIMIT_TRUST_PROXY: Use the first X-Forwarded-For address as client IP
+- RATE_LIMIT_REDIS_RETRY_SECONDS: Back-off before retrying Redis after errors
+
+Usage:
+    # app/blueprints.py
+    rate_limits = {'auth.auth_api': RateLimitPolicy('login', limit=10, period=60, scope='ip')}
+
+    # app/__init__.py
+    init_rate_limiting(app, rate_limits, default_rate_limit, rate_limit_exempt)
+"""
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple
+from flask import Flask, current_app, g, jsonify, request
+from app.core.cache_manager import get_cache
+from app.core.lib.jwt import verify_jwt_token
+from app.core.metrics import counter
+from config.settings import (
+    RATE_LIMIT_ENABLED,
+    RATE_LIMIT_TRUST_PROXY,
+    RATE_LIMIT_REDIS_RETRY_SECONDS
+)
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on in-process fallback buckets (least recently used evicted first)
+LOCAL_MAX_BUCKETS = 10000
+
+RATE_LIMITED = counter("rate_limit_rejected_total", "Requests rejected by the rate limiter", ["policy"])
+RATE_LIMIT_FALLBACKS = counter("rate_limit_local_fallback_total", "Checks served by in-process buckets (Redis unavailable)")
+
+# KEYS[1] bucket key; ARGV capacity, refill rate (tokens/s), cost.
+# Returns {allowed, tokens left}; tokens as a string (Lua numbers become integers)
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000) + 1000)
+return {allowed, tostring(tokens)}
+"""
+
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    """
+    Token-bucket policy.
+
+    Attributes:
+        name: Bucket namespace (endpoints sharing a name share buckets)
+        limit: Requests allowed per period (sustained rate)
+        period: Period in seconds
+        burst: Bucket capacity (default: limit)
+        scope: "principal" (user id, IP when anonymous) or "ip"
+        methods: HTTP methods the policy applies to (None: all)
+    """
+
+    name: str
+    limit: int
+    period: float
+    burst: Optional[int] = None
+    scope: str = "principal"
+    methods: Optional[Tuple[str, ...]] = None
+
+    def __post_init__(self):
+        if self.scope not in ("principal", "ip"):
+            raise ValueError(f"Invalid rate limit scope: {self.scope}")
+
+    @property
+    def capacity(self) -> int:
+        return self.burst or self.limit
+
+    @property
+    def rate(self) -> float:
+        return self.limit / self.period
+
+    def applies_to(self, method: str) -> bool:
+        return self.methods is None or method in self.methods
+
+    def header(self) -> str:
+        return f"{self.limit};w={int(self.period)}"
+
+
+@dataclass
+class RateLimitResult:
+    """Outcome of one bucket check."""
+
+    policy: RateLimitPolicy
+    allowed: bool
+    remaining: float
+
+    @property
+    def retry_after(self) -> int:
+        """Seconds until one token is available."""
+        return max(1, math.ceil((1 - self.remaining) / self.policy.rate))
+
+    @property
+    def reset(self) -> int:
+        """Seconds until the bucket is full again."""
+        return max(0, math.ceil((self.policy.capacity - self.remaining) / self.policy.rate))
+
+
+class LocalTokenBuckets:
+    """In-process token buckets used while Redis is unavailable."""
+
+    def __init__(self, max_buckets: int = LOCAL_MAX_BUCKETS):
+        self.max_buckets = max_buckets
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, policy: RateLimitPolicy, cost: int = 1) -> Tuple[bool, float]:
+        now = time.monotonic()
+        with self._lock:
+            tokens, ts = self._buckets.get(key, (policy.capacity, now))
+            tokens = min(policy.capacity, tokens + max(0.0, now - ts) * policy.rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_buckets:
+                self._buckets.popitem(last=False)
+        return allowed, tokens
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+class RateLimiter:
+    """Checks requests against Redis token buckets, with a local fallback."""
+
+    def __init__(self, retry_seconds: float = RATE_LIMIT_REDIS_RETRY_SECONDS):
+        self.retry_seconds = retry_seconds
+        self.local = LocalTokenBuckets()
+        self._script = None
+        self._script_client = None
+        self._redis_down_until = 0.0
+
+    def _redis_script(self):
+        client = get_cache().redis_client
+        if self._script is None or self._script_client is not client:
+            # register_script runs EVALSHA and loads the script on NOSCRIPT
+            self._script = client.register_script(TOKEN_BUCKET_SCRIPT)
+            self._script_client = client
+        return self._script
+
+    def take(self, key: str, policy: RateLimitPolicy, cost: int = 1) -> RateLimitResult:
+        """
+        Take `cost` tokens from the bucket `key`.
+
+        Returns:
+            RateLimitResult with allowed flag and tokens left
+        """
+        if time.monotonic() >= self._redis_down_until:
+            try:
+                allowed, tokens = self._redis_script()(keys=[key], args=[policy.capacity, policy.rate, cost])
+                return RateLimitResult(policy, bool(int(allowed)), float(tokens))
+            except Exception as e:
+                self._redis_down_until = time.monotonic() + self.retry_seconds
+                logger.warning(f"Rate limiter using local buckets for {self.retry_seconds}s: {e}")
+
+        RATE_LIMIT_FALLBACKS.inc()
+        allowed, tokens = self.local.take(key, policy, cost)
+        return RateLimitResult(policy, allowed, tokens)
+
+
+_limiter = RateLimiter()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide RateLimiter."""
+    return _limiter
+
+
+def _client_ip() -> str:
+    if RATE_LIMIT_TRUST_PROXY and request.access_route:
+        return request.access_route[0]
+    return request.remote_addr or "unknown"
+
+
+def _identity(policy: RateLimitPolicy) -> str:
+    """Bucket identity: user id from a valid JWT, otherwise client IP."""
+    if policy.scope == "principal":
+        auth_header = request.headers.get('Authorization', '')
+        if auth_header.startswith('Bearer '):
+            payload = verify_jwt_token(auth_header[7:])
+            if payload and payload.get('user_id') is not None:
+                return f"user:{payload['user_id']}"
+    return f"ip:{_client_ip()}"
+
+
+def _bucket_key(policy: RateLimitPolicy, identity: str) -> str:
+    return f"ratelimit:v1:{policy.name}:{identity}"
+
+
+def _rate_limit_headers(result: RateLimitResult) -> Dict[str, str]:
+    return {
+        "RateLimit-Limit": str(result.policy.capacity),
+        "RateLimit-Remaining": str(int(result.remaining)),
+        "RateLimit-Reset": str(result.reset),
+        "RateLimit-Policy": result.policy.header()
+    }
+
+
+def init_rate_limiting(
+    app: Flask,
+    policies: Dict[str, RateLimitPolicy],
+    default_policy: Optional[RateLimitPolicy] = None,
+    exempt_blueprints: Iterable[str] = ()
+) -> None:
+    """
+    Register rate limiting hooks on the Flask app.
+
+    Args:
+        app: Flask application
+        policies: Endpoint name (e.g. "auth.auth_api") -> policy
+        default_policy: Policy for endpoints without their own (None: unlimited)
+        exempt_blueprints: Blueprint names never limited (e.g. monitoring)
+    """
+    if not RATE_LIMIT_ENABLED:
+        return
+    exempt = set(exempt_blueprints)
+
+    def _policy_for_request() -> Optional[RateLimitPolicy]:
+        if request.endpoint is None or request.blueprint in exempt:
+            return None
+        policy = policies.get(request.endpoint, default_policy)
+        if policy is None or not policy.applies_to(request.method):
+            return None
+        return policy
+
+    @app.before_request
+    def _check_rate_limit():
+        if not current_app.config.get('RATELIMIT_ENABLED', True):
+            return None
+        policy = _policy_for_request()
+        if policy is None:
+            return None
+
+        result = _limiter.take(_bucket_key(policy, _identity(policy)), policy)
+        g.rate_limit = result
+        if result.allowed:
+            return None
+
+        RATE_LIMITED.inc(policy=policy.name)
+        logger.warning(f"Rate limit exceeded: policy={policy.name} endpoint={request.endpoint}")
+        headers = _rate_limit_headers(result)
+        headers["Retry-After"] = str(result.retry_after)
+        return jsonify({"error": "Too many requests"}), 429, headers
+
+    @app.after_request
+    def _add_rate_limit_headers(response):
+        result = g.pop('rate_limit', None)
+        if result is not None:
+            for name, value in _rate_limit_headers(result).items():
+                response.headers.setdefault(name, value)
+        return response
@@ -7,141 +7,475 @@ This bridges the gap between:
 - Normalized database IDs (e.g., product_category_id=1)
 
 Features:
-- Lazy loading from database (cached after first use)
-- Bidirectional lookups (name→ID and ID→name)
-- Validation helpers
-- Thread-safe singleton pattern
+- Immutable snapshot (ReferenceSnapshot) of all six lookup tables, swapped
+  atomically on refresh: a lookup is one dict access, with no locking or
+  initialization check, and never sees a half-loaded snapshot
+- Startup preload from a Redis blob (one GET instead of six queries)
+- Cross-process refresh (ReferenceDataRefresher): on a schedule and when
+  another process signals a change, via Redis pub/sub or Postgres NOTIFY
+- Bidirectional lookups (name→ID and ID→name) and validation helpers
+
+Lifecycle:
+    create_app() loads the snapshot at startup (ReferenceDataCache.initialize)
+    and starts the refresher thread. Lookups before the first load return None.
+    Tests call ReferenceDataCache.initialize() after seeding data.
+
+Change signals (REFERENCE_DATA_NOTIFY):
+- "redis": processes subscribe to ``refdata:changed:<DB_NAME>``; a process whose
+  snapshot changes publishes the new version (ReferenceDataCache.refresh(publish=True),
+  see scripts/refresh_reference_data.py after editing lookup tables)
+- "postgres": processes LISTEN on ``reference_data_changed``; triggers
+  installed by scripts/init_db.py NOTIFY on every change to a lookup table
+- "off": scheduled refresh only (REFERENCE_DATA_REFRESH_SECONDS)
 
 Usage:
     # Convert name to ID for database operations
     category_id = ReferenceData.get_product_category_id("food")  # Returns 1
-    
+
     # Convert ID to name for API responses
     category_name = ReferenceData.get_product_category_name(1)   # Returns "food"
-    
+
     # Validate if a category exists
     is_valid = ReferenceData.is_valid_product_category("toys")   # Returns True/False
 """
-from typing import Optional, Dict
-from sqlalchemy.exc import SQLAlchemyError
+import hashlib
+import json
 import logging
+import os
+import select
+import threading
+import time
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional
+from sqlalchemy.exc import SQLAlchemyError
+from app.core.cache_manager import get_cache
+from app.core.metrics import counter
+from config.settings import (
+    REFERENCE_DATA_REFRESH_SECONDS,
+    REFERENCE_DATA_NOTIFY,
+    REFERENCE_DATA_PRELOAD,
+    REFERENCE_DATA_BLOB_TTL_SECONDS
+)
 
 logger = logging.getLogger(__name__)
 
+# Redis blob holding the last snapshot loaded from the database, per database name
+SNAPSHOT_KEY = "refdata:snapshot:v1:{database}"
+# Redis pub/sub channel (payload: snapshot version), per database name
+REDIS_CHANNEL = "refdata:changed:{database}"
+# Postgres NOTIFY channel (payload: table name)
+POSTGRES_CHANNEL = "reference_data_changed"
+# Seconds between stop checks while waiting for signals
+LISTEN_POLL_SECONDS = 1.0
+# Back-off after the signal connection fails
+LISTEN_RETRY_SECONDS = 5.0
+
+TABLES = (
+    "product_categories",
+    "pet_types",
+    "roles",
+    "order_statuses",
+    "return_statuses",
+    "invoice_statuses",
+)
+
+REFERENCE_DATA_LOADS = counter(
+    "reference_data_loads_total", "Reference data snapshots loaded", ["source"]
+)
+
+
+@dataclass(frozen=True)
+class ReferenceSnapshot:
+    """
+    Read-only name ↔ ID maps of all lookup tables.
+
+    Never mutated after construction; refreshes build a new snapshot and
+    replace the reference to it.
+
+    Attributes:
+        tables: Table name (see TABLES) -> {name: id}
+        version: Content hash (equal data, equal version in every process)
+        loaded_at: time.time() when the data was read from the database
+    """
+
+    tables: Mapping[str, Mapping[str, int]]
+    version: str = ""
+    loaded_at: float = 0.0
+    product_categories: Mapping[str, int] = field(init=False, repr=False)
+    product_categories_reverse: Mapping[int, str] = field(init=False, repr=False)
+    pet_types: Mapping[str, int] = field(init=False, repr=False)
+    pet_types_reverse: Mapping[int, str] = field(init=False, repr=False)
+    roles: Mapping[str, int] = field(init=False, repr=False)
+    roles_reverse: Mapping[int, str] = field(init=False, repr=False)
+    order_statuses: Mapping[str, int] = field(init=False, repr=False)
+    order_statuses_reverse: Mapping[int, str] = field(init=False, repr=False)
+    return_statuses: Mapping[str, int] = field(init=False, repr=False)
+    return_statuses_reverse: Mapping[int, str] = field(init=False, repr=False)
+    invoice_statuses: Mapping[str, int] = field(init=False, repr=False)
+    invoice_statuses_reverse: Mapping[int, str] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        tables = {}
+        for table in TABLES:
+            forward = {str(name).lower(): int(id_) for name, id_ in self.tables.get(table, {}).items()}
+            tables[table] = MappingProxyType(forward)
+            object.__setattr__(self, table, tables[table])
+            object.__setattr__(self, f"{table}_reverse", MappingProxyType({id_: name for name, id_ in forward.items()}))
+        object.__setattr__(self, "tables", MappingProxyType(tables))
+        if not self.version:
+            object.__setattr__(self, "version", self.compute_version(tables))
+
+    @property
+    def loaded(self) -> bool:
+        return self.loaded_at > 0
+
+    @staticmethod
+    def compute_version(tables: Mapping[str, Mapping[str, int]]) -> str:
+        canonical = json.dumps({table: dict(rows) for table, rows in tables.items()}, sort_keys=True)
+        return hashlib.sha1(canonical.encode()).hexdigest()[:16]
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "version": self.version,
+            "loaded_at": self.loaded_at,
+            "tables": {table: dict(rows) for table, rows in self.tables.items()}
+        })
+
+    @classmethod
+    def from_json(cls, raw) -> "ReferenceSnapshot":
+        data = json.loads(raw)
+        snapshot = cls(tables=data["tables"], loaded_at=float(data["loaded_at"]))
+        if snapshot.version != data.get("version"):
+            raise ValueError("Reference data blob version does not match its content")
+        return snapshot
+
+
+EMPTY_SNAPSHOT = ReferenceSnapshot(tables={}, version="empty")
+
+
+def _query_tables(db) -> Dict[str, Dict[str, int]]:
+    from app.products.models.product import ProductCategory, PetType
+    from app.auth.models.user import Role
+    from app.sales.models.order import OrderStatus
+    from app.sales.models.returns import ReturnStatus
+    from app.sales.models.invoice import InvoiceStatus
+
+    columns = {
+        "product_categories": (ProductCategory.category, ProductCategory.id),
+        "pet_types": (PetType.type, PetType.id),
+        "roles": (Role.name, Role.id),
+        "order_statuses": (OrderStatus.status, OrderStatus.id),
+        "return_statuses": (ReturnStatus.status, ReturnStatus.id),
+        "invoice_statuses": (InvoiceStatus.name, InvoiceStatus.id),
+    }
+    return {table: dict(db.query(name, id_).all()) for table, (name, id_) in columns.items()}
+
+
+def _load_from_database() -> ReferenceSnapshot:
+    from flask import g, has_app_context
+    from app.core.database import get_db, session_scope
+
+    if has_app_context():
+        # Use g.db if available (for tests), otherwise get_db()
+        db = g.db if getattr(g, 'db', None) is not None else get_db()
+        tables = _query_tables(db)
+    else:
+        # Refresher thread: no request/app context
+        with session_scope() as session:
+            tables = _query_tables(session)
+    REFERENCE_DATA_LOADS.inc(source="database")
+    return ReferenceSnapshot(tables=tables, loaded_at=time.time())
+
+
+def _database_name() -> str:
+    # Read at call time, like get_database_url(): the test database has its own blob
+    return os.getenv('DB_NAME', 'lyfter')
+
+
+def _redis_client():
+    try:
+        return get_cache().redis_client
+    except Exception as e:
+        logger.warning(f"Reference data blob unavailable: {e}")
+        return None
+
+
+def _read_blob() -> Optional[ReferenceSnapshot]:
+    client = _redis_client()
+    if client is None:
+        return None
+    try:
+        raw = client.get(SNAPSHOT_KEY.format(database=_database_name()))
+        if not raw:
+            return None
+        snapshot = ReferenceSnapshot.from_json(raw)
+    except Exception as e:
+        logger.warning(f"Ignoring reference data blob: {e}")
+        return None
+    REFERENCE_DATA_LOADS.inc(source="redis")
+    return snapshot
+
+
+def _write_blob(snapshot: ReferenceSnapshot) -> None:
+    client = _redis_client()
+    if client is None:
+        return
+    try:
+        client.set(SNAPSHOT_KEY.format(database=_database_name()), snapshot.to_json(), ex=REFERENCE_DATA_BLOB_TTL_SECONDS)
+    except Exception as e:
+        logger.warning(f"Failed to store reference data blob: {e}")
+
 
 class ReferenceDataCache:
     """
-    Singleton cache for reference data lookups.
-    Loads data once from database and caches in memory.
+    Holder of the current ReferenceSnapshot.
+
+    Readers use ``ReferenceDataCache.snapshot`` without locking; loads are
+    serialized and publish a new snapshot with a single assignment.
     """
-    _instance = None
-    _initialized = False
-    
-    # Cache dictionaries (name → ID and ID → name)
-    _product_categories: Dict[str, int] = {}
-    _product_categories_reverse: Dict[int, str] = {}
-    
-    _pet_types: Dict[str, int] = {}
-    _pet_types_reverse: Dict[int, str] = {}
-    
-    _roles: Dict[str, int] = {}
-    _roles_reverse: Dict[int, str] = {}
-    
-    _order_statuses: Dict[str, int] = {}
-    _order_statuses_reverse: Dict[int, str] = {}
-    
-    _return_statuses: Dict[str, int] = {}
-    _return_statuses_reverse: Dict[int, str] = {}
-    
-    _invoice_statuses: Dict[str, int] = {}
-    _invoice_statuses_reverse: Dict[int, str] = {}
-    
-    def __new__(cls):
-        """Ensure singleton pattern."""
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-        return cls._instance
-    
+    snapshot: ReferenceSnapshot = EMPTY_SNAPSHOT
+    _load_lock = threading.Lock()
+
+    @classmethod
+    def _swap(cls, snapshot: ReferenceSnapshot, source: str) -> bool:
+        """Install `snapshot`; returns True if the content changed."""
+        changed = snapshot.version != cls.snapshot.version
+        cls.snapshot = snapshot
+        if changed:
+            logger.info(
+                "Reference data snapshot %s loaded from %s (%s)", snapshot.version, source,
+                ", ".join(f"{table}={len(snapshot.tables[table])}" for table in TABLES)
+            )
+        return changed
+
     @classmethod
-    def initialize(cls):
-        """Load all reference data from database into cache."""
-        if cls._initialized:
+    def initialize(cls, prefer_blob: bool = False):
+        """
+        Load the snapshot if none is loaded yet.
+
+        Args:
+            prefer_blob: Try the Redis blob before querying the database
+                (startup; tests always read their own seeded database)
+        """
+        if cls.snapshot.loaded:
             return
-        
-        try:
-            from flask import g, has_app_context
-            from app.core.database import get_db
-            from app.products.models.product import ProductCategory, PetType
-            from app.auth.models.user import Role
-            from app.sales.models.order import OrderStatus
-            from app.sales.models.returns import ReturnStatus
-            from app.sales.models.invoice import InvoiceStatus
-            
-            # Use g.db if available (for tests), otherwise get_db()
-            if has_app_context() and hasattr(g, 'db') and g.db is not None:
-                db = g.db
-            else:
-                db = get_db()
-            
-            # Load Product Categories
-            categories = db.query(ProductCategory).all()
-            for cat in categories:
-                cls._product_categories[cat.category.lower()] = cat.id
-                cls._product_categories_reverse[cat.id] = cat.category.lower()
-            
-            # Load Pet Types
-            pet_types = db.query(PetType).all()
-            for pet in pet_types:
-                cls._pet_types[pet.type.lower()] = pet.id
-                cls._pet_types_reverse[pet.id] = pet.type.lower()
-            
-            # Load Roles
-            roles = db.query(Role).all()
-            for role in roles:
-                cls._roles[role.name.lower()] = role.id
-                cls._roles_reverse[role.id] = role.name.lower()
-            
-            # Load Order Statuses
-            order_statuses = db.query(OrderStatus).all()
-            for status in order_statuses:
-                cls._order_statuses[status.status.lower()] = status.id
-                cls._order_statuses_reverse[status.id] = status.status.lower()
-            
-            # Load Return Statuses
-            return_statuses = db.query(ReturnStatus).all()
-            for status in return_statuses:
-                cls._return_statuses[status.status.lower()] = status.id
-                cls._return_statuses_reverse[status.id] = status.status.lower()
-            
-            # Load Invoice Statuses
-            invoice_statuses = db.query(InvoiceStatus).all()
-            for status in invoice_statuses:
-                cls._invoice_statuses[status.name.lower()] = status.id
-                cls._invoice_statuses_reverse[status.id] = status.name.lower()
-            
-            cls._initialized = True
-            logger.info("Reference data cache initialized successfully")
-            
-        except SQLAlchemyError as e:
-            logger.error(f"Failed to initialize reference data cache: {e}")
-            raise
-    
+        with cls._load_lock:
+            if cls.snapshot.loaded:
+                return
+            snapshot = _read_blob() if prefer_blob else None
+            if snapshot is not None:
+                cls._swap(snapshot, "redis")
+                return
+            try:
+                snapshot = _load_from_database()
+            except SQLAlchemyError as e:
+                logger.error(f"Failed to initialize reference data cache: {e}")
+                raise
+            cls._swap(snapshot, "database")
+        _write_blob(snapshot)
+
+    @classmethod
+    def refresh(cls, publish: bool = False) -> bool:
+        """
+        Reload the snapshot from the database.
+
+        The blob is rewritten when the data changed. With `publish`, or when
+        the data changed, other processes are signalled (Redis mode).
+
+        Returns:
+            True if the data changed
+        """
+        with cls._load_lock:
+            snapshot = _load_from_database()
+            changed = cls._swap(snapshot, "database")
+        if changed:
+            _write_blob(snapshot)
+        if changed or publish:
+            publish_reference_data_change(snapshot.version)
+        return changed
+
+    @classmethod
+    def apply_remote_version(cls, version: str) -> None:
+        """Catch up with a version published by another process."""
+        if version == cls.snapshot.version:
+            return
+        with cls._load_lock:
+            blob = _read_blob()
+            if blob is not None and blob.version == version:
+                cls._swap(blob, "redis")
+                return
+            cls._swap(_load_from_database(), "database")
+
     @classmethod
     def reset(cls):
-        """Reset cache (useful for testing or when reference data changes)."""
-        cls._initialized = False
-        cls._product_categories.clear()
-        cls._product_categories_reverse.clear()
-        cls._pet_types.clear()
-        cls._pet_types_reverse.clear()
-        cls._roles.clear()
-        cls._roles_reverse.clear()
-        cls._order_statuses.clear()
-        cls._order_statuses_reverse.clear()
-        cls._return_statuses.clear()
-        cls._return_statuses_reverse.clear()
-        cls._invoice_statuses.clear()
-        cls._invoice_statuses_reverse.clear()
+        """Drop the snapshot (tests; lookups return None until the next load)."""
+        with cls._load_lock:
+            cls.snapshot = EMPTY_SNAPSHOT
+
+
+def publish_reference_data_change(version: Optional[str] = None) -> None:
+    """
+    Tell other processes to reload reference data (Redis mode).
+
+    In Postgres mode the table triggers send NOTIFY themselves.
+
+    Args:
+        version: Snapshot version to announce (default: current)
+    """
+    if REFERENCE_DATA_NOTIFY != "redis":
+        return
+    client = _redis_client()
+    if client is None:
+        return
+    try:
+        client.publish(REDIS_CHANNEL.format(database=_database_name()), version or ReferenceDataCache.snapshot.version)
+    except Exception as e:
+        logger.warning(f"Failed to publish reference data change: {e}")
+
+
+class ReferenceDataRefresher(threading.Thread):
+    """
+    Background thread keeping this process's snapshot current.
+
+    Waits for change signals (mode "redis" or "postgres") and reloads from the
+    database every `interval` seconds (0: signals only).
+    """
+
+    def __init__(self, interval: float = REFERENCE_DATA_REFRESH_SECONDS, mode: str = REFERENCE_DATA_NOTIFY):
+        super().__init__(name="reference-data-refresher", daemon=True)
+        if mode not in ("redis", "postgres", "off"):
+            raise ValueError(f"Invalid REFERENCE_DATA_NOTIFY mode: {mode}")
+        self.interval = interval
+        self.mode = mode
+        self._stopped = threading.Event()
+        self._next_refresh = time.monotonic() + interval
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def _refresh_if_due(self) -> None:
+        now = time.monotonic()
+        if now < self._next_refresh:
+            return
+        # Also retries a failed startup load when only signals are enabled
+        if self.interval > 0 or not ReferenceDataCache.snapshot.loaded:
+            self._next_refresh = now + (self.interval if self.interval > 0 else LISTEN_RETRY_SECONDS)
+            ReferenceDataCache.refresh()
+
+    def _wait_timeout(self) -> float:
+        if self.interval <= 0:
+            return LISTEN_POLL_SECONDS
+        return max(0.0, min(LISTEN_POLL_SECONDS, self._next_refresh - time.monotonic()))
+
+    def _listen_redis(self) -> None:
+        pubsub = get_cache().redis_client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(REDIS_CHANNEL.format(database=_database_name()))
+        try:
+            while not self._stopped.is_set():
+                timeout = self._wait_timeout()
+                started = time.monotonic()
+                message = pubsub.get_message(timeout=timeout)
+                if isinstance(message, dict):
+                    if message.get("type") == "message":
+                        data = message["data"]
+                        ReferenceDataCache.apply_remote_version(data.decode() if isinstance(data, bytes) else str(data))
+                else:
+                    # get_message may return at once (no connection yet, stub clients): never spin
+                    self._stopped.wait(max(0.0, timeout - (time.monotonic() - started)))
+                self._refresh_if_due()
+        finally:
+            pubsub.close()
+
+    def _listen_postgres(self) -> None:
+        import psycopg2
+        from config.settings import get_database_url
+
+        # Dedicated connection: LISTEN holds it for the thread's lifetime
+        conn = psycopg2.connect(get_database_url())
+        try:
+            conn.autocommit = True
+            with conn.cursor() as cursor:
+                cursor.execute(f"LISTEN {POSTGRES_CHANNEL}")
+            while not self._stopped.is_set():
+                if select.select([conn], [], [], self._wait_timeout())[0]:
+                    conn.poll()
+                    if conn.notifies:
+                        tables = {notify.payload for notify in conn.notifies}
+                        conn.notifies.clear()
+                        logger.info("Reference tables changed: %s", ", ".join(sorted(tables)))
+                        ReferenceDataCache.refresh()
+                self._refresh_if_due()
+        finally:
+            conn.close()
+
+    def _run_schedule(self) -> None:
+        while not self._stopped.wait(self._wait_timeout()):
+            self._refresh_if_due()
+
+    def run(self) -> None:
+        listen = {"redis": self._listen_redis, "postgres": self._listen_postgres}.get(self.mode, self._run_schedule)
+        if not ReferenceDataCache.snapshot.loaded:
+            self._next_refresh = time.monotonic()
+        while not self._stopped.is_set():
+            try:
+                listen()
+            except Exception as e:
+                logger.warning(f"Reference data refresher ({self.mode}) failed, retrying in {LISTEN_RETRY_SECONDS}s: {e}")
+                self._stopped.wait(LISTEN_RETRY_SECONDS)
+                # Changes may have been missed while disconnected
+                self._next_refresh = time.monotonic()
+
+
+_refresher: Optional[ReferenceDataRefresher] = None
+_refresher_lock = threading.Lock()
+
+
+def init_reference_data(app) -> None:
+    """
+    Load the reference data snapshot and start the refresher thread with the
+    first request served.
+
+    The thread is not started here: create_app() also runs in scripts and in
+    test sessions that only set TESTING afterwards. Serving processes (run.py,
+    WSGI workers, including forked ones) start it on their first request.
+    Skipped in testing mode: tests initialize the snapshot after seeding.
+
+    Args:
+        app: Flask application
+    """
+    if app.config.get('TESTING', False):
+        logger.info("Skipping ReferenceData cache initialization (testing mode) - will be initialized after test data seeding")
+        return
+
+    try:
+        with app.app_context():
+            ReferenceDataCache.initialize(prefer_blob=REFERENCE_DATA_PRELOAD)
+    except Exception as e:
+        logger.error(f"Failed to initialize ReferenceData cache: {e}", exc_info=True)
+        # Continue anyway - the refresher retries the load
+
+    @app.before_request
+    def _start_reference_data_refresher():
+        if _refresher is None and not app.testing:
+            start_reference_data_refresher()
+
+
+def start_reference_data_refresher() -> None:
+    """Start this process's refresher thread if it is not running."""
+    global _refresher
+    with _refresher_lock:
+        if _refresher is None or not _refresher.is_alive():
+            _refresher = ReferenceDataRefresher()
+            _refresher.start()
+
+
+def stop_reference_data_refresher() -> None:
+    """Stop the background refresher (tests, shutdown)."""
+    global _refresher
+    if _refresher is not None:
+        _refresher.stop()
+        _refresher = None
 
 
 class ReferenceData:
@@ -149,216 +483,200 @@ class ReferenceData:
     Static helper class for reference data lookups.
     Provides clean API for converting between names and IDs.
     """
-    
+
     # ============================================
     # PRODUCT CATEGORIES
     # ============================================
-    
+
     @staticmethod
     def get_product_category_id(category_name: str) -> Optional[int]:
         """
         Get product category ID from category name.
-        
+
         Args:
             category_name: Category name (e.g., "food", "toys")
-            
+
         Returns:
             Category ID or None if not found
         """
-        ReferenceDataCache.initialize()
-        return ReferenceDataCache._product_categories.get(category_name.lower())
-    
+        return ReferenceDataCache.snapshot.product_categories.get(category_name.lower())
+
     @staticmethod
     def get_product_category_name(category_id: int) -> Optional[str]:
         """
         Get product category name from category ID.
-        
+
         Args:
             category_id: Category ID
-            
+
         Returns:
             Category name or None if not found
         """
-        ReferenceDataCache.initialize()
-        return ReferenceDataCache._product_categories_reverse.get(category_id)
-    
+        return ReferenceDataCache.snapshot.product_categories_reverse.get(category_id)
+
     @staticmethod
     def is_valid_product_category(category_name: str) -> bool:
         """Check if category name is valid."""
         return ReferenceData.get_product_category_id(category_name) is not None
-    
+
     @staticmethod
-    def get_all_product_categories() -> Dict[str, int]:
-        """Get all product categories (name → ID mapping)."""
-        ReferenceDataCache.initialize()
-        return ReferenceDataCache._product_categories.copy()
-    
+    def get_all_product_categories() -> Mapping[str, int]:
+        """Get all product categories (read-only name → ID mapping)."""
+        return ReferenceDataCache.snapshot.product_categories
+
     # ============================================
     # PET TYPES
     # ============================================
-    
+
     @staticmethod
     def get_pet_type_id(type_name: str) -> Optional[int]:
         """
         Get pet type ID from type name.
-        
+
         Args:
             type_name: Pet type name (e.g., "dog", "cat")
-            
+
         Returns:
             Pet type ID or None if not found
         """
-        ReferenceDataCache.initialize()
-        return ReferenceDataCache._pet_types.get(type_name.lower())
-    
+        return ReferenceDataCache.snapshot.pet_types.get(type_name.lower())
+
     @staticmethod
     def get_pet_type_name(type_id: int) -> Optional[str]:
         """
         Get pet type name from type ID.
-        
+
         Args:
             type_id: Pet type ID
-            
+
         Returns:
             Pet type name or None if not found
         """
-        ReferenceDataCache.initialize()
-        return ReferenceDataCache._pet_types_reverse.get(type_id)
-    
+        return ReferenceDataCache.snapshot.pet_types_reverse.get(type_id)
+
     @staticmethod
     def is_valid_pet_type(type_name: str) -> bool:
         """Check if pet type name is valid."""
         return ReferenceData.get_pet_type_id(type_name) is not None
-    
+
     @staticmethod
-    def get_all_pet_types() -> Dict[str, int]:
-        """Get all pet types (name → ID mapping)."""
-        ReferenceDataCache.initialize()
-        return ReferenceDataCache._pet_types.copy()
-    
+    def get_all_pet_types() -> Mapping[str, int]:
+        """Get all pet types (read-only name → ID mapping)."""
+        return ReferenceDataCache.snapshot.pet_types
+
     # ============================================
     # USER ROLES
     # ============================================
-    
+
     @staticmethod
     def get_role_id(role_name: str) -> Optional[int]:
         """
         Get role ID from role name.
-        
+
         Args:
             role_name: Role name (e.g., "admin", "user")
-            
+
         Returns:
             Role ID or None if not found
         """
-        ReferenceDataCache.initialize()
-        return ReferenceDataCache._roles.get(role_name.lower())
-    
+        return ReferenceDataCache.snapshot.roles.get(role_name.lower())
+
     @staticmethod
     def get_role_name(role_id: int) -> Optional[str]:
         """
         Get role name from role ID.
-        
+
         Args:
             role_id: Role ID
-            
+
         Returns:
             Role name or None if not found
         """
-        ReferenceDataCache.initialize()
-        return ReferenceDataCache._roles_reverse.get(role_id)
-    
+        return ReferenceDataCache.snapshot.roles_reverse.get(role_id)
+
     @staticmethod
     def is_valid_role(role_name: str) -> bool:
         """Check if role name is valid."""
         return ReferenceData.get_role_id(role_name) is not None
-    
+
     @staticmethod
-    def get_all_roles() -> Dict[str, int]:
-        """Get all roles (name → ID mapping)."""
-        ReferenceDataCache.initialize()
-        return ReferenceDataCache._roles.copy()
-    
+    def get_all_roles() -> Mapping[str, int]:
+        """Get all roles (read-only name → ID mapping)."""
+        return ReferenceDataCache.snapshot.roles
+
     # ============================================
     # ORDER STATUSES
     # ============================================
-    
+
     @staticmethod
     def get_order_status_id(status_name: str) -> Optional[int]:
         """
         Get order status ID from status name.
-        
+
         Args:
             status_name: Status name (e.g., "pending", "shipped")
-            
+
         Returns:
             Status ID or None if not found
         """
-        ReferenceDataCache.initialize()
-        return ReferenceDataCache._order_statuses.get(status_name.lower())
-    
+        return ReferenceDataCache.snapshot.order_statuses.get(status_name.lower())
+
     @staticmethod
     def get_order_status_name(status_id: int) -> Optional[str]:
         """
         Get order status name from status ID.
-        
+
         Args:
             status_id: Status ID
-            
+
         Returns:
             Status name or None if not found
         """
-        ReferenceDataCache.initialize()
-        return ReferenceDataCache._order_statuses_reverse.get(status_id)
-    
+        return ReferenceDataCache.snapshot.order_statuses_reverse.get(status_id)
+
     @staticmethod
     def is_valid_order_status(status_name: str) -> bool:
         """Check if order status name is valid."""
         return ReferenceData.get_order_status_id(status_name) is not None
-    
+
     @staticmethod
-    def get_all_order_statuses() -> Dict[str, int]:
-        """Get all order statuses (name → ID mapping)."""
-        ReferenceDataCache.initialize()
-        return ReferenceDataCache._order_statuses.copy()
-    
+    def get_all_order_statuses() -> Mapping[str, int]:
+        """Get all order statuses (read-only name → ID mapping)."""
+        return ReferenceDataCache.snapshot.order_statuses
+
     # ============================================
     # RETURN STATUSES
     # ============================================
-    
+
     @staticmethod
     def get_return_status_id(status_name: str) -> Optional[int]:
         """Get return status ID from status name."""
-        ReferenceDataCache.initialize()
-        return ReferenceDataCache._return_statuses.get(status_name.lower())
-    
+        return ReferenceDataCache.snapshot.return_statuses.get(status_name.lower())
+
     @staticmethod
     def get_return_status_name(status_id: int) -> Optional[str]:
         """Get return status name from status ID."""
-        ReferenceDataCache.initialize()
-        return ReferenceDataCache._return_statuses_reverse.get(status_id)
-    
+        return ReferenceDataCache.snapshot.return_statuses_reverse.get(status_id)
+
     @staticmethod
     def is_valid_return_status(status_name: str) -> bool:
         """Check if return status name is valid."""
         return ReferenceData.get_return_status_id(status_name) is not None
-    
+
     # ============================================
     # INVOICE STATUSES
     # ============================================
-    
+
     @staticmethod
     def get_invoice_status_id(status_name: str) -> Optional[int]:
         """Get invoice status ID from status name."""
-        ReferenceDataCache.initialize()
-        return ReferenceDataCache._invoice_statuses.get(status_name.lower())
-    
+        return ReferenceDataCache.snapshot.invoice_statuses.get(status_name.lower())
+
     @staticmethod
     def get_invoice_status_name(status_id: int) -> Optional[str]:
         """Get invoice status name from status ID."""
-        ReferenceDataCache.initialize()
-        return ReferenceDataCache._invoice_statuses_reverse.get(status_id)
-    
+        return ReferenceDataCache.snapshot.invoice_statuses_reverse.get(status_id)
+
     @staticmethod
     def is_valid_invoice_status(status_name: str) -> bool:
         """Check if invoice status name is valid."""
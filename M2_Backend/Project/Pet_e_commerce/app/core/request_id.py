@@ -0,0 +1,63 @@
+"""
+Request ID Module
+
+Assigns every request an id that is attached to all of its log records
+(``request_id`` field, see config/logging.py) and returned to the client.
+
+- Incoming ``X-Request-ID`` headers (e.g. from a load balancer) are reused
+  when they are short and contain only letters, digits, "-", "_" or "."
+- Otherwise a random id is generated
+- The id is sent back in the ``X-Request-ID`` response header
+
+Also exposes logging_dropped_records_total (records dropped because the
+log queue was full) on GET /metrics.
+
+Usage:
+    # app/__init__.py (first request hook, so every log line has the id)
+    init_request_id(app)
+"""
+import re
+import uuid
+from flask import Flask, g, request
+from app.core.metrics import gauge
+from config.logging import request_id_var, dropped_records
+
+REQUEST_ID_HEADER = "X-Request-ID"
+VALID_REQUEST_ID = re.compile(r"^[\w.\-]{1,64}$")
+
+gauge(
+    "logging_dropped_records_total", "Log records dropped because the log queue was full",
+    collect=lambda: {(): dropped_records()}
+)
+
+
+def _assign_request_id():
+    incoming = request.headers.get(REQUEST_ID_HEADER, '')
+    request_id = incoming if VALID_REQUEST_ID.match(incoming) else uuid.uuid4().hex
+    g.request_id = request_id
+    g.request_id_token = request_id_var.set(request_id)
+
+
+def _add_request_id_header(response):
+    request_id = g.get('request_id')
+    if request_id:
+        response.headers[REQUEST_ID_HEADER] = request_id
+    return response
+
+
+def _reset_request_id(exception=None):
+    token = g.pop('request_id_token', None)
+    if token is not None:
+        request_id_var.reset(token)
+
+
+def init_request_id(app: Flask) -> None:
+    """
+    Register request id hooks on the Flask app.
+
+    Args:
+        app: Flask application
+    """
+    app.before_request(_assign_request_id)
+    app.after_request(_add_request_id_header)
+    app.teardown_request(_reset_request_id)
@@ -0,0 +1,219 @@
+"""
+Request Metrics Module
+
+Per-route latency histograms, in-flight gauge and on-demand profiling.
+
+Exposed metrics (served by GET /metrics, see app.core.monitoring):
+- http_request_duration_seconds{endpoint, method, status}: Request latency
+  from the first before_request hook to the response (endpoint is the Flask
+  endpoint name, e.g. "products.products"; "unmatched" for 404s so unknown
+  URLs can't create new series)
+- http_requests_in_flight: Requests currently being handled by this process
+
+Profiling (cProfile):
+    A request is profiled when it sends ``X-Profile`` and is authorized by
+    either ``X-Profile-Token: <PROFILING_TOKEN>`` or an admin JWT:
+    - ``X-Profile: 1`` stores the profile in PROFILE_DIR and returns its id
+      in the ``X-Profile-Id`` header (GET /metrics/profiles/<id> shows it)
+    - ``X-Profile: text`` replaces the response with the pstats report
+    Additionally PROFILE_SAMPLE_RATE (0..1) stores profiles for a random
+    fraction of requests. Profile files are standard pstats dumps (snakeviz,
+    ``python -m pstats``).
+
+Configuration (config/settings.py):
+- REQUEST_METRICS_ENABLED: Turn the hooks on/off (default: true)
+- PROFILING_TOKEN: Shared secret for X-Profile-Token (empty: admins only)
+- PROFILE_SAMPLE_RATE: Fraction of requests profiled automatically (default: 0)
+- PROFILE_DIR: Where profiles are stored (default: logs/profiles)
+
+Usage:
+    # app/__init__.py (before other request hooks, so they are timed too)
+    init_request_metrics(app)
+"""
+import cProfile
+import hmac
+import io
+import logging
+import os
+import pstats
+import random
+import re
+import time
+import uuid
+from datetime import datetime
+from typing import List, Optional
+from flask import Flask, Response, g, request
+from app.core.metrics import gauge, histogram
+from config.settings import (
+    REQUEST_METRICS_ENABLED,
+    PROFILING_TOKEN,
+    PROFILE_SAMPLE_RATE,
+    PROFILE_DIR
+)
+
+logger = logging.getLogger(__name__)
+
+# Functions listed in text reports
+PROFILE_REPORT_LINES = 40
+# Stored profile ids: "<timestamp>-<endpoint>-<random>"
+PROFILE_ID_PATTERN = re.compile(r"^[\w.\-]+$")
+
+REQUEST_LATENCY = histogram(
+    "http_request_duration_seconds", "Request latency by endpoint", ["endpoint", "method", "status"]
+)
+REQUESTS_IN_FLIGHT = gauge("http_requests_in_flight", "Requests currently being handled")
+
+
+def _endpoint() -> str:
+    return request.url_rule.endpoint if request.url_rule is not None else "unmatched"
+
+
+def is_admin_request() -> bool:
+    """True when the request carries a valid JWT of an admin user."""
+    # Imported lazily: app.core.lib must not load before app.auth
+    from app.core.lib.jwt import verify_jwt_token
+    from app.core.lib.principals import get_principal
+
+    auth_header = request.headers.get('Authorization', '')
+    if not auth_header.startswith('Bearer '):
+        return False
+    payload = verify_jwt_token(auth_header[7:])
+    if not payload or payload.get('user_id') is None:
+        return False
+    principal = get_principal(payload['user_id'])
+    return principal is not None and principal.has_role('admin')
+
+
+def profiling_authorized() -> bool:
+    """True for a valid X-Profile-Token (when PROFILING_TOKEN is set) or an admin JWT."""
+    token = request.headers.get('X-Profile-Token', '')
+    if PROFILING_TOKEN and hmac.compare_digest(token, PROFILING_TOKEN):
+        return True
+    return is_admin_request()
+
+
+def _profile_mode() -> Optional[str]:
+    """Return "store"/"text" when this request should be profiled."""
+    requested = request.headers.get('X-Profile')
+    if requested:
+        if not profiling_authorized():
+            logger.warning(f"Unauthorized profiling request for {request.path}")
+            return None
+        return "text" if requested.lower() == "text" else "store"
+    if PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE:
+        return "store"
+    return None
+
+
+def _report(profiler: cProfile.Profile) -> str:
+    buffer = io.StringIO()
+    stats = pstats.Stats(profiler, stream=buffer)
+    stats.sort_stats("cumulative").print_stats(PROFILE_REPORT_LINES)
+    return buffer.getvalue()
+
+
+def _store_profile(profiler: cProfile.Profile) -> Optional[str]:
+    profile_id = "{}-{}-{}".format(
+        datetime.utcnow().strftime("%Y%m%dT%H%M%S"),
+        re.sub(r"[^\w.\-]", "_", _endpoint()),
+        uuid.uuid4().hex[:8]
+    )
+    try:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        profiler.dump_stats(os.path.join(PROFILE_DIR, f"{profile_id}.prof"))
+    except OSError as e:
+        logger.error(f"Failed to store profile {profile_id}: {e}")
+        return None
+    logger.info(f"Stored profile {profile_id} ({request.method} {request.path})")
+    return profile_id
+
+
+def _start_request():
+    g.request_started = time.perf_counter()
+    REQUESTS_IN_FLIGHT.inc()
+
+    mode = _profile_mode()
+    if mode:
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as e:
+            # Another profiler is already active on this thread
+            logger.warning(f"Profiling skipped: {e}")
+            return None
+        g.profiler, g.profile_mode = profiler, mode
+    return None
+
+
+def _finish_request(response):
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profiler.disable()
+        if g.pop('profile_mode', None) == "text":
+            report = Response(_report(profiler), status=response.status_code, mimetype="text/plain")
+            for name, value in response.headers:
+                if name.lower() not in ("content-type", "content-length"):
+                    report.headers.add(name, value)
+            response = report
+        else:
+            profile_id = _store_profile(profiler)
+            if profile_id:
+                response.headers["X-Profile-Id"] = profile_id
+
+    started = g.get('request_started')
+    if started is not None:
+        REQUEST_LATENCY.observe(
+            time.perf_counter() - started,
+            endpoint=_endpoint(), method=request.method, status=str(response.status_code)
+        )
+        g.request_observed = True
+    return response
+
+
+def _teardown_request(exception=None):
+    started = g.pop('request_started', None)
+    if started is None:
+        return
+    REQUESTS_IN_FLIGHT.dec()
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profiler.disable()
+    if not g.pop('request_observed', False):
+        # after_request did not run (unhandled exception)
+        REQUEST_LATENCY.observe(
+            time.perf_counter() - started, endpoint=_endpoint(), method=request.method, status="500"
+        )
+
+
+def list_profiles() -> List[str]:
+    """Ids of stored profiles, newest first."""
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+    names = [name[:-5] for name in os.listdir(PROFILE_DIR) if name.endswith(".prof")]
+    return sorted(names, reverse=True)
+
+
+def profile_report(profile_id: str) -> Optional[str]:
+    """pstats text report of a stored profile (None if unknown)."""
+    if not PROFILE_ID_PATTERN.match(profile_id):
+        return None
+    path = os.path.join(PROFILE_DIR, f"{profile_id}.prof")
+    if not os.path.isfile(path):
+        return None
+    buffer = io.StringIO()
+    pstats.Stats(path, stream=buffer).sort_stats("cumulative").print_stats(PROFILE_REPORT_LINES)
+    return buffer.getvalue()
+
+
+def init_request_metrics(app: Flask) -> None:
+    """
+    Register latency/in-flight hooks and on-demand profiling on the Flask app.
+
+    Args:
+        app: Flask application
+    """
+    if not REQUEST_METRICS_ENABLED:
+        return
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    app.teardown_request(_teardown_request)
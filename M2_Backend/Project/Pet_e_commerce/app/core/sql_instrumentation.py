@@ -0,0 +1,192 @@
+"""
+SQL Instrumentation Module
+
+Per-request SQL statistics collected through SQLAlchemy engine events.
+
+For every request this records the number of statements, the total time spent
+in the database and the slowest statements (parameters redacted). At the end
+of the request the summary is:
+- Added as a ``Server-Timing`` response header (visible in browser dev tools)
+- Logged as one structured line on the ``app.core.sql_instrumentation`` logger
+
+Statements slower than SLOW_QUERY_THRESHOLD_MS are logged individually on the
+``app.sql.slow`` logger together with the route that issued them, also outside
+of requests (scripts, background jobs).
+
+Configuration (config/settings.py):
+- SQL_INSTRUMENTATION_ENABLED: Turn the hooks on/off (default: true)
+- SLOW_QUERY_THRESHOLD_MS: Slow-query log threshold in ms (default: 200)
+- SQL_SLOWEST_STATEMENTS: Slowest statements kept per request (default: 3)
+
+Usage:
+    # app/core/database.py
+    install_engine_hooks(engine)
+
+    # app/__init__.py
+    init_sql_instrumentation(app)
+"""
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from flask import Flask, g, has_app_context, has_request_context, request
+from sqlalchemy import event
+from config.settings import (
+    SQL_INSTRUMENTATION_ENABLED,
+    SLOW_QUERY_THRESHOLD_MS,
+    SQL_SLOWEST_STATEMENTS
+)
+
+logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger("app.sql.slow")
+
+# Statements are truncated in logs and headers to keep lines bounded
+MAX_STATEMENT_LENGTH = 500
+
+
+class RequestSQLStats:
+    """Accumulates SQL statistics for a single request."""
+
+    def __init__(self, keep_slowest: int = SQL_SLOWEST_STATEMENTS):
+        self.count = 0
+        self.total_ms = 0.0
+        self.keep_slowest = keep_slowest
+        self.slowest: List[Tuple[float, str, Any]] = []
+
+    def record(self, statement: str, parameters: Any, elapsed_ms: float) -> None:
+        """Record one executed statement."""
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if self.keep_slowest <= 0:
+            return
+        if len(self.slowest) < self.keep_slowest or elapsed_ms > self.slowest[-1][0]:
+            self.slowest.append((elapsed_ms, _truncate(statement), redact_parameters(parameters)))
+            self.slowest.sort(key=lambda entry: entry[0], reverse=True)
+            del self.slowest[self.keep_slowest:]
+
+    def summary(self) -> Dict[str, Any]:
+        """Summary dict suitable for structured logging."""
+        return {
+            "queries": self.count,
+            "db_ms": round(self.total_ms, 2),
+            "slowest": [
+                {"ms": round(ms, 2), "statement": statement, "params": params}
+                for ms, statement, params in self.slowest
+            ]
+        }
+
+    def server_timing(self) -> str:
+        """Value for the Server-Timing response header."""
+        return f'db;dur={self.total_ms:.2f};desc="{self.count} queries"'
+
+
+def redact_parameters(parameters: Any) -> Any:
+    """
+    Replace bound parameter values with their type names.
+
+    Statements are parameterized, so values (emails, password hashes, tokens)
+    only appear in the parameters. Keeping the shape and types is enough to
+    reason about a slow query without leaking data into logs.
+
+    Args:
+        parameters: DBAPI parameters (dict, sequence, or list of them for executemany)
+
+    Returns:
+        Same structure with every value replaced by "<type>"
+    """
+    if parameters is None:
+        return None
+    if isinstance(parameters, dict):
+        return {key: f"<{type(value).__name__}>" for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            # executemany: describe the first row and the batch size
+            return {"rows": len(parameters), "first": redact_parameters(parameters[0])}
+        return [f"<{type(value).__name__}>" for value in parameters]
+    return f"<{type(parameters).__name__}>"
+
+
+def _truncate(statement: str) -> str:
+    statement = " ".join(statement.split())
+    if len(statement) > MAX_STATEMENT_LENGTH:
+        return statement[:MAX_STATEMENT_LENGTH] + "..."
+    return statement
+
+
+def _current_route() -> Optional[str]:
+    if not has_request_context():
+        return None
+    rule = request.url_rule.rule if request.url_rule else request.path
+    return f"{request.method} {rule}"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Stored on the execution context so failed statements don't leak timers
+    context._sql_start_time = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, "_sql_start_time", None)
+    if start is None:
+        return
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    if has_app_context():
+        stats = g.get("sql_stats")
+        if stats is not None:
+            stats.record(statement, parameters, elapsed_ms)
+
+    if elapsed_ms >= SLOW_QUERY_THRESHOLD_MS:
+        route = _current_route() or "-"
+        slow_query_logger.warning(
+            "Slow query route=%s ms=%.2f statement=%s params=%s",
+            route, elapsed_ms, _truncate(statement), redact_parameters(parameters),
+            extra={"route": route, "db_ms": round(elapsed_ms, 2)}
+        )
+
+
+def install_engine_hooks(engine) -> None:
+    """
+    Register the timing hooks on an engine (idempotent).
+
+    Args:
+        engine: SQLAlchemy Engine
+    """
+    if not SQL_INSTRUMENTATION_ENABLED:
+        return
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _start_request_stats():
+    g.sql_stats = RequestSQLStats()
+
+
+def _finish_request_stats(response):
+    stats = g.pop("sql_stats", None)
+    if stats is None:
+        return response
+
+    response.headers.add("Server-Timing", stats.server_timing())
+
+    summary = stats.summary()
+    route = _current_route()
+    logger.info(
+        "SQL summary route=%s status=%s queries=%s db_ms=%s",
+        route, response.status_code, summary['queries'], summary['db_ms'],
+        extra={"route": route, "status": response.status_code, "sql": summary}
+    )
+    return response
+
+
+def init_sql_instrumentation(app: Flask) -> None:
+    """
+    Register per-request SQL statistics hooks on the Flask app.
+
+    Args:
+        app: Flask application
+    """
+    if not SQL_INSTRUMENTATION_ENABLED:
+        return
+    app.before_request(_start_request_stats)
+    app.after_request(_finish_request_stats)
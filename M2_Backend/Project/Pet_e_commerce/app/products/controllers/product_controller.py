@@ -6,25 +6,48 @@ Features:
 - Optional authentication for role-based responses
 - Advanced filtering support (category, pet_type, brand, search, etc.)
 - Role-based schema configuration (admin users see more data)
+- Streaming bulk import (CSV/NDJSON) with per-row error report
+- Bulk price/stock adjustments (one set-based UPDATE)
+- "Frequently bought together" lists from the precomputed index
 - Centralized error handling and logging
 """
 from flask import jsonify, request, g
 from marshmallow import ValidationError
 from config.logging import get_logger, EXC_INFO_LOG_ERRORS
 from app.core.lib.error_utils import error_response
+from config.settings import RELATED_PRODUCTS_TOP_K
 
 # Auth imports
 from app.core.lib.auth import is_admin_user
 from app.core.lib.jwt import verify_jwt_token
-from app.core.lib.users import get_user_by_id
+from app.core.lib.users import get_principal
 
 # Products domain imports
 from app.products.services.product_service import ProductService
-from app.products.schemas.product_schema import ProductRegistrationSchema, ProductResponseSchema
+from app.products.services.product_import_service import ProductImportService, SUPPORTED_FORMATS
+from app.products.schemas.product_schema import (
+    ProductRegistrationSchema,
+    ProductResponseSchema,
+    ProductBulkUpdateSchema
+)
 
 # Get logger for this module
 logger = get_logger(__name__)
 
+# Upload content types / file extensions → import format
+IMPORT_FORMATS_BY_TYPE = {
+    'text/csv': 'csv',
+    'application/csv': 'csv',
+    'application/x-ndjson': 'ndjson',
+    'application/ndjson': 'ndjson',
+    'application/jsonl': 'ndjson',
+}
+IMPORT_FORMATS_BY_EXTENSION = {
+    'csv': 'csv',
+    'ndjson': 'ndjson',
+    'jsonl': 'ndjson',
+}
+
 
 class ProductController:
     """
@@ -62,8 +85,8 @@ class ProductController:
             if not data:
                 return  # Invalid token, but don't fail
             
-            # Get user from database
-            current_user = get_user_by_id(data['user_id'])
+            # Resolve identity and roles (principal cache, DB on miss)
+            current_user = get_principal(data['user_id'])
             if not current_user:
                 return  # User not found, but don't fail
             
@@ -197,6 +220,36 @@ class ProductController:
             self.logger.error(f"Error retrieving product {product_id}: {e}", exc_info=EXC_INFO_LOG_ERRORS)
             return error_response("Failed to retrieve product data", e)
 
+    def get_related(self, product_id):
+        """
+        GET /products/<id>/related endpoint. Returns the products most often bought
+        together with this one (public access, ?limit=1..RELATED_PRODUCTS_TOP_K).
+        """
+        try:
+            limit = request.args.get('limit', RELATED_PRODUCTS_TOP_K)
+            try:
+                limit = int(limit)
+            except ValueError:
+                limit = 0
+            if not 1 <= limit <= RELATED_PRODUCTS_TOP_K:
+                return jsonify({"error": f"limit must be between 1 and {RELATED_PRODUCTS_TOP_K}"}), 400
+            
+            related = self.product_service.get_related_products_cached(product_id, limit)
+            
+            if related is None:
+                self.logger.error(f"Related products lookup failed for product {product_id}")
+                return jsonify({"error": "Failed to retrieve related products"}), 500
+            if not related and self.product_service.get_product_by_id(product_id) is None:
+                self.logger.warning(f"Related products requested for non-existent product: {product_id}")
+                return jsonify({"error": "Product not found"}), 404
+            
+            self.logger.info(f"Retrieved {len(related)} related product(s) for product {product_id}")
+            return jsonify(related), 200
+            
+        except Exception as e:
+            self.logger.error(f"Error retrieving related products of {product_id}: {e}", exc_info=EXC_INFO_LOG_ERRORS)
+            return error_response("Failed to retrieve related products", e)
+
     def post(self):
         """
         POST endpoint. Validates input, adds creator info, and creates product.
@@ -286,3 +339,72 @@ class ProductController:
         except Exception as e:
             self.logger.error(f"Error deleting product {product_id}: {e}", exc_info=EXC_INFO_LOG_ERRORS)
             return error_response("Product deletion failed", e)
+
+    def import_products(self):
+        """
+        POST /products/import endpoint. Streams a CSV or NDJSON catalog file into
+        a staged upsert keyed by SKU. Admin access required (enforced by decorator in routes).
+
+        The file is the raw request body (Content-Type text/csv or application/x-ndjson)
+        or a multipart "file" field; ?format=csv|ndjson overrides detection.
+        """
+        try:
+            upload = request.files.get('file') if request.mimetype == 'multipart/form-data' else None
+            file_format = request.args.get('format')
+            if not file_format and upload is not None and '.' in (upload.filename or ''):
+                file_format = IMPORT_FORMATS_BY_EXTENSION.get(upload.filename.rsplit('.', 1)[1].lower())
+            if not file_format:
+                content_type = upload.mimetype if upload is not None else request.mimetype
+                file_format = IMPORT_FORMATS_BY_TYPE.get(content_type)
+            if file_format not in SUPPORTED_FORMATS:
+                return jsonify({
+                    "error": f"Unknown import format. Send text/csv or application/x-ndjson, or use ?format={'|'.join(SUPPORTED_FORMATS)}"
+                }), 400
+
+            created_by = g.current_user.username if hasattr(g, 'current_user') else None
+            stream = upload.stream if upload is not None else request.stream
+            report = ProductImportService().import_products(stream, file_format, created_by=created_by)
+
+            if report is None:
+                self.logger.error("Product import failed in service layer")
+                return jsonify({"error": "Product import failed"}), 500
+
+            self.logger.info(f"Product import: {report['processed']} row(s), {report['failed']} failed")
+            return jsonify({"message": "Product import completed", "report": report}), 200
+
+        except ValueError as e:
+            self.logger.warning(f"Product import rejected: {e}")
+            return jsonify({"error": str(e)}), 400
+        except Exception as e:
+            self.logger.error(f"Error importing products: {e}", exc_info=EXC_INFO_LOG_ERRORS)
+            return error_response("Product import failed", e)
+
+    def bulk_update(self):
+        """
+        POST /products/bulk-update endpoint. Applies price/stock adjustments to a
+        filtered set of products or to an explicit list of changes.
+        Admin access required (enforced by decorator in routes).
+        """
+        try:
+            data = request.get_json()
+            validated = ProductBulkUpdateSchema().load(data)
+
+            result = self.product_service.bulk_adjust_products(
+                filters=validated.get('filter'),
+                adjustment=validated.get('adjustment'),
+                changes=validated.get('changes')
+            )
+
+            if result is None:
+                self.logger.error("Bulk product update failed in service layer")
+                return jsonify({"error": "Bulk product update failed"}), 500
+
+            self.logger.info(f"Bulk product update: {result['updated']} product(s) updated")
+            return jsonify({"message": "Products updated successfully", **result}), 200
+
+        except ValidationError as err:
+            self.logger.warning(f"Bulk product update validation error: {err.messages}")
+            return jsonify({"errors": err.messages}), 400
+        except Exception as e:
+            self.logger.error(f"Error in bulk product update: {e}", exc_info=EXC_INFO_LOG_ERRORS)
+            return error_response("Bulk product update failed", e)
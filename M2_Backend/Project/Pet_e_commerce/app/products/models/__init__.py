@@ -2,7 +2,7 @@
 Products models package - exports product-related models.
 """
 
-from .product import Product, ProductCategory, PetType
+from .product import Product, ProductCategory, PetType, RelatedProduct
 
 # This allows: from app.products.models import Product, ProductCategory, PetType
 # Instead of: from app.products.models.product import Product, ProductCategory, PetType
\ No newline at end of file
@@ -8,6 +8,7 @@ Models:
 - ProductCategory: Reference table for product categories (food, toys, etc.)
 - PetType: Reference table for pet types (dog, cat, bird, etc.)
 - Product: Main product catalog with relationships
+- RelatedProduct: Precomputed "frequently bought together" neighbours
 
 Features:
 - SQLAlchemy ORM with normalized reference tables
@@ -21,7 +22,7 @@ Migration Notes:
 - Enums replaced with reference tables (normalized design)
 - Serialization now handled by Marshmallow schemas
 """
-from sqlalchemy import String, Integer, Float, Boolean, DateTime, ForeignKey, CHAR
+from sqlalchemy import String, Integer, SmallInteger, Float, Boolean, DateTime, ForeignKey, CHAR
 from sqlalchemy.orm import Mapped, mapped_column, relationship, declared_attr
 from app.core.database import Base, get_schema
 from typing import Optional, List
@@ -124,3 +125,33 @@ class Product(Base):
     
     def __repr__(self):
         return f"<Product(id={self.id}, sku='{self.sku}', description='{self.description}')>"
+
+
+class RelatedProduct(Base):
+    """
+    Top-K products bought together with a product (built offline from order items).
+    
+    Keyed by (product_id, rank): the related list of a product is one
+    primary key range scan, independent of order history size.
+    """
+    __tablename__ = "related_products"
+    
+    @declared_attr
+    def __table_args__(cls):
+        return {'schema': get_schema()}
+    
+    product_id: Mapped[int] = mapped_column(
+        ForeignKey(f"{get_schema()}.products.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    rank: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    related_product_id: Mapped[int] = mapped_column(
+        ForeignKey(f"{get_schema()}.products.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    # Orders (not cancelled) containing both products
+    order_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    built_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    
+    def __repr__(self):
+        return f"<RelatedProduct(product_id={self.product_id}, rank={self.rank}, related_product_id={self.related_product_id})>"
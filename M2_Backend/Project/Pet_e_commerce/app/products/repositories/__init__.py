@@ -3,9 +3,12 @@ Products Repositories Module
 
 Exports:
 - ProductRepository: Data access layer for products
+- RelatedProductRepository: "Frequently bought together" index
 """
 from app.products.repositories.product_repository import ProductRepository
+from app.products.repositories.related_product_repository import RelatedProductRepository
 
 __all__ = [
     'ProductRepository',
+    'RelatedProductRepository',
 ]
@@ -8,6 +8,8 @@ Responsibilities:
 - Database queries and operations (SELECT, INSERT, UPDATE, DELETE)
 - Product lookups by different fields (id, sku)
 - Advanced filtering capabilities
+- Bulk import: COPY into a temp staging table, merged with one upsert
+- Bulk price/stock adjustments: one UPDATE ... FROM (VALUES ...)
 - Transaction management via get_db (session per request)
 
 Usage:
@@ -15,16 +17,41 @@ Usage:
     product = repo.get_by_id(1)
     all_products = repo.get_all()
 """
-from typing import Optional, List, Dict, Any
+import csv
+import io
+from functools import lru_cache
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Sequence
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import and_, or_
-from app.core.database import get_db
+from sqlalchemy import (
+    Float, Integer, Numeric, String, and_, bindparam, case, cast, column, func, or_, select, text, update, values
+)
+from app.core.database import get_db, get_schema
 from app.products.models.product import Product, ProductCategory, PetType
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+# Staged columns of a bulk import, in COPY order ("line" = source line number)
+IMPORT_COLUMNS = (
+    "line", "sku", "description", "product_category_id", "pet_type_id", "stock_quantity", "price",
+    "brand", "weight", "is_active", "internal_cost", "supplier_info", "created_by", "last_updated"
+)
+
+# Columns an import overwrites on existing SKUs (created_by keeps the original creator)
+_IMPORT_UPDATED_COLUMNS = (
+    "description", "product_category_id", "pet_type_id", "stock_quantity", "price",
+    "brand", "weight", "is_active", "internal_cost", "supplier_info"
+)
+
+
+@lru_cache(maxsize=None)
+def _product_by_id_statement():
+    """Hot lookup built once on first use; calls only bind parameters and hit the compiled cache."""
+    return select(Product).where(Product.id == bindparam('product_id')).limit(1)
+
+
 class ProductRepository:
     """Repository for Product database operations."""
     
@@ -40,7 +67,7 @@ class ProductRepository:
         """
         try:
             db = get_db()
-            return db.query(Product).filter_by(id=product_id).first()
+            return db.scalars(_product_by_id_statement(), {'product_id': product_id}).first()
         except SQLAlchemyError as e:
             logger.error(f"Error fetching product by id {product_id}: {e}")
             return None
@@ -239,3 +266,203 @@ class ProductRepository:
         except SQLAlchemyError as e:
             logger.error(f"Error fetching pet type {pet_type_name}: {e}")
             return None
+
+    # ============ BULK IMPORT (STAGED UPSERT) ============
+
+    def create_import_staging(self) -> bool:
+        """
+        Create the temp staging table of a bulk import (dropped at commit).
+        
+        Returns:
+            True if created, False on error
+        """
+        try:
+            db = get_db()
+            db.execute(text("DROP TABLE IF EXISTS pg_temp.product_import_staging"))
+            db.execute(text("""
+                CREATE TEMP TABLE product_import_staging (
+                    line integer NOT NULL,
+                    sku char(5) NOT NULL,
+                    description varchar(255) NOT NULL,
+                    product_category_id integer NOT NULL,
+                    pet_type_id integer NOT NULL,
+                    stock_quantity integer NOT NULL,
+                    price double precision NOT NULL,
+                    brand varchar(100),
+                    weight double precision,
+                    is_active boolean,
+                    internal_cost double precision,
+                    supplier_info varchar(255),
+                    created_by varchar(100),
+                    last_updated timestamp
+                ) ON COMMIT DROP
+            """))
+            return True
+        except SQLAlchemyError as e:
+            logger.error(f"Error creating product import staging table: {e}")
+            return False
+
+    def copy_into_import_staging(self, rows: Sequence[tuple]) -> bool:
+        """
+        Stream one batch of rows into the staging table with COPY.
+        
+        Args:
+            rows: Tuples in IMPORT_COLUMNS order (None for NULL)
+            
+        Returns:
+            True if copied, False on error
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        for row in rows:
+            writer.writerow(["t" if v is True else "f" if v is False else v for v in row])
+        buffer.seek(0)
+        try:
+            db = get_db()
+            # COPY needs the DBAPI cursor of the session's connection (same transaction)
+            cursor = db.connection().connection.cursor()
+            try:
+                cursor.copy_expert(
+                    f"COPY product_import_staging ({', '.join(IMPORT_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                    buffer
+                )
+            finally:
+                cursor.close()
+            return True
+        except Exception as e:
+            logger.error(f"Error copying {len(rows)} rows into product import staging: {e}")
+            return False
+
+    def merge_import_staging(self) -> Optional[Dict[str, int]]:
+        """
+        Merge staged rows into products with one INSERT ... ON CONFLICT (sku) DO UPDATE.
+        The last staged line wins for repeated SKUs; rows identical to the stored
+        product are skipped (no dead tuple).
+        
+        Returns:
+            Dict with inserted/updated/unchanged counts, or None on error
+        """
+        columns = IMPORT_COLUMNS[1:]
+        statement = text(f"""
+            WITH latest AS (
+                SELECT DISTINCT ON (sku) * FROM product_import_staging ORDER BY sku, line DESC
+            ), merged AS (
+                INSERT INTO {get_schema()}.products AS p ({', '.join(columns)})
+                SELECT {', '.join(columns)} FROM latest ORDER BY sku
+                ON CONFLICT (sku) DO UPDATE SET
+                    {', '.join(f'{c} = EXCLUDED.{c}' for c in _IMPORT_UPDATED_COLUMNS)},
+                    last_updated = EXCLUDED.last_updated
+                WHERE ({', '.join(f'p.{c}' for c in _IMPORT_UPDATED_COLUMNS)})
+                    IS DISTINCT FROM ({', '.join(f'EXCLUDED.{c}' for c in _IMPORT_UPDATED_COLUMNS)})
+                RETURNING (xmax = 0) AS inserted
+            )
+            SELECT
+                (SELECT count(*) FROM latest) AS staged,
+                count(*) FILTER (WHERE inserted) AS inserted,
+                count(*) FILTER (WHERE NOT inserted) AS updated
+            FROM merged
+        """)
+        try:
+            db = get_db()
+            staged, inserted, updated = db.execute(statement).one()
+            return {
+                "inserted": inserted,
+                "updated": updated,
+                "unchanged": staged - inserted - updated
+            }
+        except SQLAlchemyError as e:
+            logger.error(f"Error merging product import staging: {e}")
+            return None
+
+    # ============ BULK ADJUSTMENTS (SET-BASED UPDATE) ============
+
+    @staticmethod
+    def _adjustment_values(rows: Sequence[tuple], with_id: bool):
+        """
+        VALUES list of adjustments: (product_id,) price_mode, price_value, stock_delta.
+        price_mode is 'set', 'percent' or 'keep'.
+        """
+        columns = [
+            column("price_mode", String),
+            column("price_value", Float),
+            column("stock_delta", Integer),
+        ]
+        if with_id:
+            columns.insert(0, column("product_id", Integer))
+        return values(*columns, name="adjustment").data(list(rows))
+
+    @staticmethod
+    def _adjusted_update(adjustment, conditions: List, updated_at: datetime):
+        """UPDATE products FROM the adjustment values; stock never goes below zero."""
+        new_price = case(
+            (adjustment.c.price_mode == 'set', adjustment.c.price_value),
+            (adjustment.c.price_mode == 'percent',
+             cast(func.round(cast(Product.price * (1 + adjustment.c.price_value / 100), Numeric), 2), Float)),
+            else_=Product.price
+        )
+        return (
+            update(Product)
+            .values(
+                price=new_price,
+                stock_quantity=Product.stock_quantity + adjustment.c.stock_delta,
+                last_updated=updated_at
+            )
+            .where(*conditions, Product.stock_quantity + adjustment.c.stock_delta >= 0)
+            .returning(Product.id)
+            .execution_options(synchronize_session=False)
+        )
+
+    def bulk_adjust_by_ids(self, rows: Sequence[tuple], updated_at: datetime) -> Optional[List[int]]:
+        """
+        Apply per-product adjustments in one UPDATE ... FROM (VALUES ...).
+        
+        Args:
+            rows: (product_id, price_mode, price_value, stock_delta) tuples, one per product
+            updated_at: Timestamp stored in last_updated
+            
+        Returns:
+            IDs of updated products (missing IDs and stock underflows are skipped), or None on error
+        """
+        try:
+            db = get_db()
+            adjustment = self._adjustment_values(rows, with_id=True)
+            statement = self._adjusted_update(adjustment, [Product.id == adjustment.c.product_id], updated_at)
+            return list(db.scalars(statement))
+        except SQLAlchemyError as e:
+            logger.error(f"Error bulk adjusting {len(rows)} products: {e}")
+            return None
+
+    def bulk_adjust_by_filter(self, filters: Dict[str, Any], price_mode: str, price_value: float,
+                              stock_delta: int, updated_at: datetime) -> Optional[List[int]]:
+        """
+        Apply one adjustment to every product matching the filters, in one statement.
+        
+        Args:
+            filters: category_id, pet_type_id, brand (case-insensitive exact match), ids
+            price_mode: 'set', 'percent' or 'keep'
+            price_value: New price or percentage
+            stock_delta: Added to stock_quantity (rows that would go negative are skipped)
+            updated_at: Timestamp stored in last_updated
+            
+        Returns:
+            IDs of updated products, or None on error
+        """
+        conditions = []
+        if 'category_id' in filters:
+            conditions.append(Product.product_category_id == filters['category_id'])
+        if 'pet_type_id' in filters:
+            conditions.append(Product.pet_type_id == filters['pet_type_id'])
+        if 'brand' in filters:
+            conditions.append(func.lower(Product.brand) == filters['brand'].lower())
+        if 'ids' in filters:
+            conditions.append(Product.id.in_(filters['ids']))
+        if not conditions:
+            raise ValueError("Bulk adjustment requires at least one filter")
+
+        try:
+            db = get_db()
+            adjustment = self._adjustment_values([(price_mode, price_value, stock_delta)], with_id=False)
+            return list(db.scalars(self._adjusted_update(adjustment, conditions, updated_at)))
+        except SQLAlchemyError as e:
+            logger.error(f"Error bulk adjusting products with filters {filters}: {e}")
+            return None
@@ -0,0 +1,107 @@
+"""
+Related Product Repository Module
+
+Reads and rebuilds the "frequently bought together" index (related_products).
+
+Responsibilities:
+- Related products of one product: a primary key range scan on
+  (product_id, rank) joined to at most K products
+- Offline rebuild in batches of anchor products
+
+Build model:
+    For a batch of anchor products, order_item is self-joined on order_id
+    (uq_product_order and the order_id index) to count the non-cancelled
+    orders containing each (product, other product) pair. Only this batch's
+    slice of the sparse co-occurrence matrix is ever materialized, inside
+    PostgreSQL; row_number() keeps the top K neighbours per product. The
+    batch's old rows are replaced in the same transaction, so readers see
+    either the previous or the new list.
+
+Usage:
+    repo = RelatedProductRepository()
+    related = repo.get_related(product_id=1, limit=10)
+    rebuilt = repo.rebuild(after_product_id=0, limit=500, top_k=10, built_at=datetime.utcnow())
+"""
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import Integer, bindparam, delete, select, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.exc import SQLAlchemyError
+from app.core.database import get_db, get_schema
+from app.products.models.product import Product, RelatedProduct
+import logging
+
+logger = logging.getLogger(__name__)
+
+_IDS = bindparam("ids", type_=ARRAY(Integer))
+
+
+class RelatedProductRepository:
+    """Repository for the precomputed related products index."""
+
+    def get_related(self, product_id: int, limit: int) -> Optional[List[Product]]:
+        """
+        Active products most often bought with product_id, best first.
+
+        Returns:
+            List of products (empty before the first build), or None on error
+        """
+        try:
+            db = get_db()
+            return list(db.scalars(
+                select(Product)
+                .join(RelatedProduct, RelatedProduct.related_product_id == Product.id)
+                .where(RelatedProduct.product_id == product_id, Product.is_active.isnot(False))
+                .order_by(RelatedProduct.rank)
+                .limit(limit)
+            ))
+        except SQLAlchemyError as e:
+            logger.error(f"Error reading related products of product {product_id}: {e}")
+            return None
+
+    def rebuild(self, after_product_id: int, limit: int, top_k: int,
+                built_at: datetime) -> Optional[List[int]]:
+        """
+        Rebuild the related lists of the next `limit` products with id > after_product_id.
+
+        Runs in the caller's transaction (commit per batch).
+
+        Returns:
+            Rebuilt product ids (empty when done), or None on error
+        """
+        schema = get_schema()
+        try:
+            db = get_db()
+            product_ids = list(db.scalars(text(f"""
+                SELECT id FROM {schema}.products WHERE id > :after ORDER BY id LIMIT :limit
+            """), {"after": after_product_id, "limit": limit}))
+            if not product_ids:
+                return []
+
+            db.execute(delete(RelatedProduct).where(RelatedProduct.product_id.in_(product_ids)))
+            db.execute(text(f"""
+                WITH pairs AS (
+                    SELECT a.product_id, b.product_id AS related_product_id, count(*) AS order_count
+                    FROM {schema}.order_item a
+                    JOIN {schema}.order_item b ON b.order_id = a.order_id AND b.product_id <> a.product_id
+                    JOIN {schema}.orders o ON o.id = a.order_id
+                    JOIN {schema}.order_status st ON st.id = o.order_status_id
+                    WHERE a.product_id = ANY(:ids) AND st.status <> 'cancelled'
+                    GROUP BY a.product_id, b.product_id
+                ), ranked AS (
+                    SELECT product_id, related_product_id, order_count,
+                           row_number() OVER (
+                               PARTITION BY product_id ORDER BY order_count DESC, related_product_id
+                           ) AS rank
+                    FROM pairs
+                )
+                INSERT INTO {schema}.related_products
+                    (product_id, rank, related_product_id, order_count, built_at)
+                SELECT product_id, rank, related_product_id, order_count, :built_at
+                FROM ranked WHERE rank <= :top_k
+            """).bindparams(_IDS), {"ids": product_ids, "top_k": top_k, "built_at": built_at})
+
+            return product_ids
+        except SQLAlchemyError as e:
+            logger.error(f"Error rebuilding related products after product {after_product_id}: {e}")
+            return None
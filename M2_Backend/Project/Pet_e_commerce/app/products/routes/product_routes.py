@@ -4,9 +4,12 @@ Product Routes Module
 Provides RESTful API endpoints for product management:
 - GET /products - List all products with filtering (public access)
 - GET /products/<id> - Get specific product (public access)  
+- GET /products/<id>/related - Frequently bought together (public access)
 - POST /products - Create new product (admin only)
 - PUT /products/<id> - Update product (admin only)
 - DELETE /products/<id> - Delete product (admin only)
+- POST /products/import - Bulk import CSV/NDJSON upsert by SKU (admin only)
+- POST /products/bulk-update - Bulk price/stock adjustments (admin only)
 
 Features:
 - Public access for product browsing (e-commerce)
@@ -66,6 +69,38 @@ class ProductAPI(MethodView):
         controller = ProductController()
         return controller.delete(product_id)
 
+class RelatedProductsAPI(MethodView):
+    """Frequently bought together products - public access"""
+
+    init_every_request = False
+
+    def get(self, product_id):
+        from app.products.controllers.product_controller import ProductController
+        controller = ProductController()
+        return controller.get_related(product_id)
+
+class ProductImportAPI(MethodView):
+    """Bulk product import (CSV/NDJSON) - admin only"""
+
+    init_every_request = False
+
+    @admin_required_with_repo
+    def post(self):
+        from app.products.controllers.product_controller import ProductController
+        controller = ProductController()
+        return controller.import_products()
+
+class ProductBulkUpdateAPI(MethodView):
+    """Bulk price/stock adjustments - admin only"""
+
+    init_every_request = False
+
+    @admin_required_with_repo
+    def post(self):
+        from app.products.controllers.product_controller import ProductController
+        controller = ProductController()
+        return controller.bulk_update()
+
 # Register routes when this module is imported by products/__init__.py
 def register_product_routes(products_bp):
     """Register all product routes with the products blueprint"""
@@ -81,3 +116,21 @@ def register_product_routes(products_bp):
         view_func=ProductAPI.as_view('product'),
         methods=['GET', 'PUT', 'DELETE']
     )
+    # Products frequently bought together (precomputed index)
+    products_bp.add_url_rule(
+        '/<int:product_id>/related',
+        view_func=RelatedProductsAPI.as_view('product_related'),
+        methods=['GET']
+    )
+    # Bulk import (streamed CSV/NDJSON body or multipart file)
+    products_bp.add_url_rule(
+        '/import',
+        view_func=ProductImportAPI.as_view('product_import'),
+        methods=['POST']
+    )
+    # Bulk price/stock adjustments (filter + adjustment, or explicit changes)
+    products_bp.add_url_rule(
+        '/bulk-update',
+        view_func=ProductBulkUpdateAPI.as_view('product_bulk_update'),
+        methods=['POST']
+    )
@@ -4,6 +4,10 @@ Products schemas package - exports product-related schemas.
 
 from .product_schema import (
     product_registration_schema,
+    product_import_schema,
+    product_bulk_update_schema,
+    ProductImportSchema,
+    ProductBulkUpdateSchema,
     ProductResponseSchema
 )
 
@@ -1,5 +1,6 @@
 from marshmallow import Schema, fields, validate, validates, validates_schema, ValidationError, post_load, post_dump
 from app.core.reference_data import ReferenceData
+from config.settings import PRODUCT_BULK_MAX_CHANGES
 
 
 class ProductRegistrationSchema(Schema):
@@ -68,6 +69,97 @@ class ProductRegistrationSchema(Schema):
         
         return data
 
+class ProductImportSchema(ProductRegistrationSchema):
+    """
+    Schema for one row of a bulk product import (CSV or NDJSON).
+    Same fields and validation as registration, plus the SKU the row is upserted on.
+    """
+    sku = fields.Str(required=True, validate=validate.Length(equal=5))
+    # Rows are COPYed straight into products.description (VARCHAR(255))
+    description = fields.Str(required=True, validate=validate.Length(min=1, max=255))
+
+
+class ProductAdjustmentSchema(Schema):
+    """
+    Price/stock adjustment applied by a bulk update.
+    price sets an absolute price, price_percent scales it (-10 = 10% off);
+    stock_delta is added to the stock quantity.
+    """
+    price = fields.Float(validate=validate.Range(min=0))
+    price_percent = fields.Float(validate=validate.Range(min=-99.99, max=1000))
+    stock_delta = fields.Int()
+
+    @validates_schema
+    def validate_adjustment(self, data, **kwargs):
+        """Require one change; absolute and percentage price are exclusive."""
+        if 'price' in data and 'price_percent' in data:
+            raise ValidationError("Use either price or price_percent, not both")
+        if not any(key in data for key in ('price', 'price_percent', 'stock_delta')):
+            raise ValidationError("Provide price, price_percent or stock_delta")
+
+
+class ProductChangeSchema(ProductAdjustmentSchema):
+    """One explicit change of a bulk update (by product ID)."""
+    id = fields.Int(required=True, validate=validate.Range(min=1))
+
+
+class ProductBulkFilterSchema(Schema):
+    """Products selected by a bulk update (criteria are combined with AND)."""
+    category = fields.Str()
+    pet_type = fields.Str()
+    brand = fields.Str(validate=validate.Length(min=1, max=100))
+    ids = fields.List(
+        fields.Int(validate=validate.Range(min=1)),
+        validate=validate.Length(min=1, max=PRODUCT_BULK_MAX_CHANGES)
+    )
+
+    @validates('category')
+    def validate_category(self, value, **kwargs):
+        """Validate category exists in database reference table."""
+        if not ReferenceData.is_valid_product_category(value):
+            raise ValidationError(f"Invalid category '{value}'")
+
+    @validates('pet_type')
+    def validate_pet_type(self, value, **kwargs):
+        """Validate pet type exists in database reference table."""
+        if not ReferenceData.is_valid_pet_type(value):
+            raise ValidationError(f"Invalid pet_type '{value}'")
+
+    @validates_schema
+    def validate_not_empty(self, data, **kwargs):
+        """An empty filter would select the whole catalog."""
+        if not data:
+            raise ValidationError("Filter needs at least one of: category, pet_type, brand, ids")
+
+
+class ProductBulkUpdateSchema(Schema):
+    """
+    Schema for bulk price/stock updates. Either a filter with one adjustment:
+    {"filter": {"category": "food", "pet_type": "dog"}, "adjustment": {"price_percent": -10}}
+
+    or explicit per-product changes:
+    {"changes": [{"id": 1, "price": 19.99}, {"id": 2, "stock_delta": 50}]}
+    """
+    filter = fields.Nested(ProductBulkFilterSchema)
+    adjustment = fields.Nested(ProductAdjustmentSchema)
+    changes = fields.List(
+        fields.Nested(ProductChangeSchema),
+        validate=validate.Length(min=1, max=PRODUCT_BULK_MAX_CHANGES)
+    )
+
+    @validates_schema
+    def validate_mode(self, data, **kwargs):
+        """Exactly one mode; each product at most once."""
+        if 'changes' in data:
+            if 'filter' in data or 'adjustment' in data:
+                raise ValidationError("Use either changes or filter + adjustment, not both")
+            ids = [change['id'] for change in data['changes']]
+            if len(ids) != len(set(ids)):
+                raise ValidationError("Each product id may appear only once", field_name='changes')
+        elif 'filter' not in data or 'adjustment' not in data:
+            raise ValidationError("Provide changes, or filter and adjustment")
+
+
 class ProductResponseSchema(Schema):
     """
     Schema for product API responses.
@@ -151,4 +243,6 @@ class ProductResponseSchema(Schema):
         return admin_data
 
 # Schema instances for easy import
-product_registration_schema = ProductRegistrationSchema()
\ No newline at end of file
+product_registration_schema = ProductRegistrationSchema()
+product_import_schema = ProductImportSchema(many=True)
+product_bulk_update_schema = ProductBulkUpdateSchema()
\ No newline at end of file
@@ -3,9 +3,12 @@ Products Services Module
 
 Exports:
 - ProductService: Business logic for product management
+- ProductImportService: Streaming bulk import (CSV/NDJSON staged upsert)
 """
 from app.products.services.product_service import ProductService
+from app.products.services.product_import_service import ProductImportService
 
 __all__ = [
     'ProductService',
+    'ProductImportService',
 ]
\ No newline at end of file
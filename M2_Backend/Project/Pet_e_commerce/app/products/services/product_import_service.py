@@ -0,0 +1,208 @@
+"""
+Product Import Service Module
+
+Bulk import of supplier catalog files (CSV or NDJSON) as one staged upsert.
+
+Flow:
+1. Rows are read lazily from the uploaded stream (the file is never held in memory)
+2. Every PRODUCT_IMPORT_BATCH_SIZE rows are validated together with
+   ProductImportSchema (ProductRegistrationSchema + sku); invalid rows go to
+   the per-row error report
+3. Valid rows get their category/pet_type IDs and are COPYed into a temp table
+4. One INSERT ... ON CONFLICT (sku) DO UPDATE merges the staged rows
+5. Product caches are invalidated once, not per row, after the import commits
+
+Rows are keyed by SKU: new SKUs are inserted, existing ones updated. When a
+file repeats a SKU the last line wins and the earlier line is reported.
+
+Usage:
+    service = ProductImportService()
+    with open("catalog.csv", "rb") as stream:
+        report = service.import_products(stream, "csv", created_by="admin")
+"""
+import csv
+import io
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from marshmallow import ValidationError
+from app.products.repositories import ProductRepository
+from app.products.schemas.product_schema import ProductImportSchema
+from app.core.reference_data import ReferenceData
+from app.core.middleware.cache_decorators import CacheHelper
+from config.settings import PRODUCT_IMPORT_BATCH_SIZE, PRODUCT_IMPORT_MAX_ERRORS
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_FORMATS = ("csv", "ndjson")
+
+# (line number, parsed record or None, parse error or None)
+ImportRow = Tuple[int, Optional[Any], Optional[str]]
+
+
+def iter_csv_rows(stream) -> Iterator[ImportRow]:
+    """Read CSV rows (header line first); empty cells are treated as missing."""
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding="utf-8-sig", newline=""))
+    for record in reader:
+        yield reader.line_num, {
+            key.strip(): value.strip()
+            for key, value in record.items()
+            if key and isinstance(value, str) and value.strip()
+        }, None
+
+
+def iter_ndjson_rows(stream) -> Iterator[ImportRow]:
+    """Read one JSON object per line; blank lines are skipped."""
+    for line_number, raw in enumerate(stream, start=1):
+        raw = raw.strip()
+        if not raw:
+            continue
+        try:
+            yield line_number, json.loads(raw), None
+        except ValueError:
+            yield line_number, None, "Invalid JSON"
+
+
+ROW_READERS = {
+    "csv": iter_csv_rows,
+    "ndjson": iter_ndjson_rows,
+}
+
+
+class ProductImportService:
+    """Service class for streaming bulk product imports."""
+
+    def __init__(self, batch_size: int = PRODUCT_IMPORT_BATCH_SIZE,
+                 max_errors: int = PRODUCT_IMPORT_MAX_ERRORS):
+        self.product_repo = ProductRepository()
+        self.schema = ProductImportSchema(many=True)
+        self.cache_helper = CacheHelper(resource_name="product", version="v1")
+        self.batch_size = batch_size
+        self.max_errors = max_errors
+        self.logger = logger
+
+    def import_products(self, stream, file_format: str,
+                        created_by: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Import products from a CSV or NDJSON byte stream.
+
+        Args:
+            stream: Binary file-like object (upload stream or open file)
+            file_format: "csv" or "ndjson"
+            created_by: Username recorded on new products (overrides the file)
+
+        Returns:
+            Report dict (processed/failed/inserted/updated/unchanged counts and
+            per-row errors), or None if staging or merging failed
+
+        Raises:
+            ValueError: Unsupported format or undecodable file
+        """
+        if file_format not in ROW_READERS:
+            raise ValueError(f"Unsupported import format '{file_format}'. Use one of: {', '.join(SUPPORTED_FORMATS)}")
+
+        report = {
+            "format": file_format,
+            "processed": 0,
+            "failed": 0,
+            "duplicates": 0,
+            "inserted": 0,
+            "updated": 0,
+            "unchanged": 0,
+            "errors": [],
+            "errors_truncated": False
+        }
+        now = datetime.utcnow()
+        last_line_by_sku: Dict[str, int] = {}
+
+        if not self.product_repo.create_import_staging():
+            return None
+
+        try:
+            for batch in self._batches(ROW_READERS[file_format](stream)):
+                rows = self._validate_batch(batch, report, last_line_by_sku, created_by, now)
+                if rows and not self.product_repo.copy_into_import_staging(rows):
+                    return None
+        except (UnicodeDecodeError, csv.Error) as e:
+            raise ValueError(f"Could not read {file_format} file: {e}")
+
+        counts = self.product_repo.merge_import_staging()
+        if counts is None:
+            return None
+        report.update(counts)
+
+        # One pass over the product cache instead of per-row invalidation,
+        # after the merge commits so readers cannot re-cache pre-import rows
+        if counts["inserted"] or counts["updated"]:
+            self.cache_helper.invalidate_all_after_commit()
+
+        self.logger.info(
+            "Product import (%s): %s rows, %s inserted, %s updated, %s unchanged, %s failed",
+            file_format, report["processed"], counts["inserted"], counts["updated"],
+            counts["unchanged"], report["failed"]
+        )
+        return report
+
+    def _batches(self, rows: Iterable[ImportRow]) -> Iterator[List[ImportRow]]:
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _validate_batch(self, batch: List[ImportRow], report: Dict[str, Any],
+                        last_line_by_sku: Dict[str, int], created_by: Optional[str],
+                        now: datetime) -> List[tuple]:
+        """Validate one batch; returns staging rows of the valid records."""
+        lines, records = [], []
+        for line, record, parse_error in batch:
+            report["processed"] += 1
+            if parse_error:
+                self._add_error(report, line, None, {"_row": [parse_error]})
+            else:
+                lines.append(line)
+                records.append(record)
+
+        if not records:
+            return []
+        try:
+            loaded, errors = self.schema.load(records), {}
+        except ValidationError as err:
+            loaded, errors = err.valid_data, err.messages
+
+        rows = []
+        for index, (line, data) in enumerate(zip(lines, loaded)):
+            if index in errors:
+                sku = records[index].get("sku") if isinstance(records[index], dict) else None
+                self._add_error(report, line, sku, errors[index])
+                continue
+
+            sku = data["sku"]
+            if sku in last_line_by_sku:
+                report["duplicates"] += 1
+                self._add_error(report, last_line_by_sku[sku], sku, {"sku": [f"Superseded by line {line}"]},
+                                failed=False)
+            last_line_by_sku[sku] = line
+
+            rows.append((
+                line, sku, data["description"],
+                ReferenceData.get_product_category_id(data["category"]),
+                ReferenceData.get_pet_type_id(data["pet_type"]),
+                data["stock_quantity"], data["price"], data.get("brand"), data.get("weight"),
+                data.get("is_active", True), data.get("internal_cost"), data.get("supplier_info"),
+                created_by or data.get("created_by"), now
+            ))
+        return rows
+
+    def _add_error(self, report: Dict[str, Any], line: int, sku: Optional[str],
+                   messages: Dict[str, Any], failed: bool = True) -> None:
+        if failed:
+            report["failed"] += 1
+        if len(report["errors"]) >= self.max_errors:
+            report["errors_truncated"] = True
+            return
+        report["errors"].append({"line": line, "sku": sku, "errors": messages})
@@ -15,9 +15,11 @@ Responsibilities:
 - Business logic and validation rules
 - Orchestrates repository operations
 - Cache management for frequently accessed data
+- "Frequently bought together" lists (precomputed related_products index)
 
 Dependencies:
 - ProductRepository: Database operations
+- RelatedProductRepository: Related products index (read and offline rebuild)
 - ReferenceData: Name ↔ ID conversions for reference tables
 - CacheManager: Redis caching for performance optimization
 
@@ -28,22 +30,32 @@ Usage:
 """
 import logging
 import json
+import time
 from typing import Optional, List, Dict, Any
 from datetime import datetime
-from app.products.repositories import ProductRepository
+from app.products.repositories import ProductRepository, RelatedProductRepository
 from app.products.models.product import Product
 from app.core.reference_data import ReferenceData
 from app.core.cache_manager import get_cache
 from app.core.middleware.cache_decorators import cache_invalidate, CacheHelper
+from app.core.database import read_only
+from app.core.metrics import counter, histogram
+from config.settings import (
+    RELATED_PRODUCTS_TOP_K, RELATED_PRODUCTS_BATCH_SIZE, RELATED_PRODUCTS_CACHE_TTL_SECONDS
+)
 
 logger = logging.getLogger(__name__)
 
+RELATED_BUILD_SECONDS = histogram("related_products_build_seconds", "Duration of one related products rebuild batch")
+RELATED_PRODUCTS_REBUILT = counter("related_products_rebuilt_total", "Products whose related list was rebuilt")
+
 
 class ProductService:
     """Service class for product management business logic with caching support."""
     
     def __init__(self):
         self.product_repo = ProductRepository()
+        self.related_repo = RelatedProductRepository()
         self.logger = logger
         # Get global cache manager instance (singleton pattern)
         self.cache_manager = get_cache()
@@ -131,6 +143,7 @@ class ProductService:
         self.logger.debug(f"Fetching product with SKU {sku}")
         return self.product_repo.get_by_sku(sku)
     
+    @read_only
     def get_all_products(self) -> List[Product]:
         """
         Get all products (returns ORM objects).
@@ -142,6 +155,7 @@ class ProductService:
         self.logger.debug("Fetching all products")
         return self.product_repo.get_all()
     
+    @read_only
     def get_all_products_cached(self, include_admin_data: bool = False,
                                  show_exact_stock: bool = False) -> List[dict]:
         """
@@ -169,6 +183,7 @@ class ProductService:
             many=True
         )
     
+    @read_only
     def get_products_by_filters(self, filters: Dict[str, Any]) -> List[Product]:
         """
         Get products with filters applied.
@@ -424,6 +439,140 @@ class ProductService:
             self.logger.error(f"Error deleting product {product_id}: {e}")
             return False
 
+    # ============ RELATED PRODUCTS ============
+
+    @read_only
+    def get_related_products_cached(self, product_id: int,
+                                    limit: int = RELATED_PRODUCTS_TOP_K) -> Optional[List[dict]]:
+        """
+        Get the products most often bought together with a product (public data).
+        The full top-K list is cached per product and sliced to `limit`.
+        
+        Args:
+            product_id: Product ID
+            limit: Maximum related products returned
+        
+        Returns:
+            List of serialized product dicts (empty before the first build), or None on error
+        """
+        from app.products.schemas.product_schema import ProductResponseSchema
+        
+        related = self.cache_helper.get_or_set(
+            cache_key=f"{product_id}:related",
+            fetch_func=lambda: self.related_repo.get_related(product_id, RELATED_PRODUCTS_TOP_K),
+            schema_class=ProductResponseSchema,
+            ttl=RELATED_PRODUCTS_CACHE_TTL_SECONDS,
+            many=True
+        )
+        return related[:limit] if related is not None else None
+
+    def rebuild_related_products(self, after_product_id: int = 0,
+                                 batch_size: int = RELATED_PRODUCTS_BATCH_SIZE) -> Optional[Dict[str, Any]]:
+        """
+        Rebuild the related lists of the next batch of products (in the current transaction)
+        and invalidate their cached lists in one round trip once the caller commits.
+        
+        Args:
+            after_product_id: Last product ID of the previous batch (0 to start)
+            batch_size: Products rebuilt
+        
+        Returns:
+            Dict with product_ids and duration_ms (no ids when done), or None on error
+        """
+        started = time.perf_counter()
+        try:
+            product_ids = self.related_repo.rebuild(
+                after_product_id, batch_size, RELATED_PRODUCTS_TOP_K, datetime.utcnow()
+            )
+            if product_ids is None:
+                return None
+            
+            if product_ids:
+                self.cache_helper.invalidate_many_after_commit(f"{product_id}:related" for product_id in product_ids)
+            
+            duration = time.perf_counter() - started
+            RELATED_BUILD_SECONDS.observe(duration)
+            RELATED_PRODUCTS_REBUILT.inc(len(product_ids))
+            self.logger.info(
+                "Related products: rebuilt %s product(s) after id %s in %.1fms",
+                len(product_ids), after_product_id, duration * 1000
+            )
+            return {"product_ids": product_ids, "duration_ms": round(duration * 1000, 2)}
+        except Exception as e:
+            self.logger.error(f"Error rebuilding related products after {after_product_id}: {e}", exc_info=True)
+            return None
+
+    # ============ BULK ADJUSTMENTS ============
+
+    @staticmethod
+    def _price_change(adjustment: Dict[str, Any]) -> tuple:
+        """(price_mode, price_value) of an adjustment: absolute, percentage or unchanged."""
+        if 'price' in adjustment:
+            return 'set', float(adjustment['price'])
+        if 'price_percent' in adjustment:
+            return 'percent', float(adjustment['price_percent'])
+        return 'keep', 0.0
+
+    def bulk_adjust_products(self, filters: Optional[Dict[str, Any]] = None,
+                             adjustment: Optional[Dict[str, Any]] = None,
+                             changes: Optional[List[Dict[str, Any]]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Apply price/stock adjustments to many products with one set-based UPDATE.
+        Converts category and pet_type names to IDs; invalidates product caches once.
+        
+        Args:
+            filters: category, pet_type, brand and/or ids (used with adjustment)
+            adjustment: price, price_percent and/or stock_delta for every filtered product
+            changes: Explicit per-product adjustments ({"id": ..., "price": ...})
+            
+        Returns:
+            Dict with requested/updated counts and not_updated IDs (explicit changes:
+            unknown products or stock that would drop below zero), or None on error
+        """
+        try:
+            updated_at = datetime.utcnow()
+
+            if changes is not None:
+                rows = [
+                    (change['id'], *self._price_change(change), change.get('stock_delta', 0))
+                    for change in changes
+                ]
+                updated_ids = self.product_repo.bulk_adjust_by_ids(rows, updated_at)
+                if updated_ids is None:
+                    return None
+                updated = set(updated_ids)
+                result = {
+                    "requested": len(rows),
+                    "updated": len(updated),
+                    "not_updated": [row[0] for row in rows if row[0] not in updated]
+                }
+            else:
+                repo_filters = {key: filters[key] for key in ('brand', 'ids') if key in filters}
+                if 'category' in filters:
+                    repo_filters['category_id'] = ReferenceData.get_product_category_id(filters['category'])
+                if 'pet_type' in filters:
+                    repo_filters['pet_type_id'] = ReferenceData.get_pet_type_id(filters['pet_type'])
+
+                price_mode, price_value = self._price_change(adjustment)
+                updated_ids = self.product_repo.bulk_adjust_by_filter(
+                    repo_filters, price_mode, price_value, adjustment.get('stock_delta', 0), updated_at
+                )
+                if updated_ids is None:
+                    return None
+                result = {"updated": len(updated_ids)}
+
+            # One pass over the product cache instead of per-product invalidation,
+            # after the request commits so readers cannot re-cache old prices
+            if result["updated"]:
+                self.cache_helper.invalidate_all_after_commit()
+
+            self.logger.info(f"Bulk adjustment updated {result['updated']} product(s)")
+            return result
+
+        except Exception as e:
+            self.logger.error(f"Error bulk adjusting products: {e}", exc_info=True)
+            return None
+
     # ============ REFERENCE DATA HELPER METHODS ============
     
     def get_category_id_by_name(self, category_name: str) -> Optional[int]:
@@ -6,6 +6,7 @@ This module provides comprehensive e-commerce sales functionality including:
 - Order processing and tracking
 - Invoice and payment tracking
 - Returns and refunds processing
+- Streaming CSV/NDJSON exports
 
 The module is organized into:
 - Models: Data structures for carts, orders, invoices, returns
@@ -26,12 +27,14 @@ from app.sales.routes.cart_routes import register_cart_routes
 from app.sales.routes.order_routes import register_orders_routes
 from app.sales.routes.invoice_routes import register_invoice_routes
 from app.sales.routes.returns_routes import register_returns_routes
+from app.sales.routes.export_routes import register_export_routes
 
 # Register all routes with the blueprint
 register_cart_routes(sales_bp)
 register_orders_routes(sales_bp)
 register_invoice_routes(sales_bp)
 register_returns_routes(sales_bp)
+register_export_routes(sales_bp)
 
 # Export main components for easy importing
 __all__ = [
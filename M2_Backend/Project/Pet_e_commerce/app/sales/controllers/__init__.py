@@ -14,6 +14,7 @@ Exports:
 - OrderController: Order management (to be added)
 - InvoiceController: Invoice operations (to be added)
 - ReturnController: Returns and refunds (to be added)
+- SalesExportController: Streaming exports
 
 Note: Controllers do not contain business logic - they delegate to services.
 """
@@ -22,10 +23,12 @@ from app.sales.controllers.cart_controller import CartController
 from app.sales.controllers.order_controller import OrderController
 from app.sales.controllers.invoice_controller import InvoiceController
 from app.sales.controllers.return_controller import ReturnController
+from app.sales.controllers.export_controller import SalesExportController
 
 __all__ = [
     'CartController',
     'OrderController',
     'InvoiceController',
-    'ReturnController'
+    'ReturnController',
+    'SalesExportController'
 ]
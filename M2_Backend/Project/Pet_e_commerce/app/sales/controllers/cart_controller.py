@@ -26,7 +26,7 @@ from flask import request, jsonify, g
 from marshmallow import ValidationError
 from typing import Tuple, Optional
 from config.logging import get_logger, EXC_INFO_LOG_ERRORS
-from app.core.lib.error_utils import error_response
+from app.core.lib.error_utils import error_response, ConcurrencyConflictError
 
 # Service imports
 from app.sales.services.cart_service import CartService
@@ -212,6 +212,9 @@ class CartController:
         except ValidationError as err:
             self.logger.warning(f"Cart update validation error for user {user_id}: {err.messages}")
             return jsonify({"errors": err.messages}), 400
+        except ConcurrencyConflictError as e:
+            self.logger.warning(f"Concurrent modification rejected: {e.description}")
+            return error_response("Cart was modified by another request", e, status_code=409)
         except Exception as e:
             self.logger.error(f"Error updating cart for user {user_id}: {e}", exc_info=EXC_INFO_LOG_ERRORS)
             return error_response("Failed to update cart", e)
@@ -291,6 +294,9 @@ class CartController:
                 "cart": cart_response_schema.dump(updated_cart)
             }), 200
             
+        except ConcurrencyConflictError as e:
+            self.logger.warning(f"Concurrent modification rejected: {e.description}")
+            return error_response("Cart was modified by another request", e, status_code=409)
         except Exception as e:
             self.logger.error(f"Error adding item to cart: {e}", exc_info=EXC_INFO_LOG_ERRORS)
             return error_response("Failed to add item to cart", e)
@@ -337,6 +343,9 @@ class CartController:
                 "cart": cart_response_schema.dump(updated_cart)
             }), 200
             
+        except ConcurrencyConflictError as e:
+            self.logger.warning(f"Concurrent modification rejected: {e.description}")
+            return error_response("Cart was modified by another request", e, status_code=409)
         except Exception as e:
             self.logger.error(f"Error updating item quantity: {e}", exc_info=EXC_INFO_LOG_ERRORS)
             return error_response("Failed to update item quantity", e)
@@ -368,6 +377,9 @@ class CartController:
             self.logger.info(f"Item {product_id} removed from cart for user {user_id}")
             return jsonify({"message": "Item removed from cart successfully"}), 200
             
+        except ConcurrencyConflictError as e:
+            self.logger.warning(f"Concurrent modification rejected: {e.description}")
+            return error_response("Cart was modified by another request", e, status_code=409)
         except Exception as e:
             self.logger.error(f"Error removing item: {e}", exc_info=EXC_INFO_LOG_ERRORS)
             return error_response("Failed to remove item", e)
@@ -0,0 +1,91 @@
+"""
+Sales Export Controller Module
+
+HTTP request processing layer for streaming sales exports.
+Delegates to SalesExportService for querying and encoding.
+
+Responsibilities:
+- Query parameter parsing (format, from/to date range)
+- Streamed response with download headers
+- Error handling and logging
+
+Usage:
+    controller = SalesExportController()
+    response = controller.export("orders")
+"""
+from datetime import datetime, timedelta
+from typing import Optional
+from flask import request, jsonify, Response, stream_with_context
+from config.logging import get_logger, EXC_INFO_LOG_ERRORS
+from app.core.lib.error_utils import error_response
+
+# Service imports
+from app.sales.services.export_service import SalesExportService, EXPORT_FORMATS
+
+logger = get_logger(__name__)
+
+
+def parse_export_date(value: Optional[str], end_of_range: bool = False) -> Optional[datetime]:
+    """
+    Parse an ISO date or datetime query parameter.
+
+    A date-only upper bound ("to=2025-01-31") covers that whole day, so it is
+    returned as the next midnight and used as an exclusive bound.
+
+    Raises:
+        ValueError: Value is not ISO 8601
+    """
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value)
+    if end_of_range and len(value) == 10:
+        parsed += timedelta(days=1)
+    return parsed
+
+
+class SalesExportController:
+    """Controller for sales export HTTP operations."""
+
+    def __init__(self):
+        """Initialize export controller with service dependency."""
+        self.export_service = SalesExportService()
+        self.logger = logger
+
+    def export(self, resource: str):
+        """
+        GET /orders/export, /invoices/export, /returns/export endpoints.
+        Admin access required (enforced by decorator in routes).
+
+        Query params:
+            format: csv (default) or ndjson
+            from: ISO date/datetime, inclusive
+            to: ISO date/datetime, exclusive (a plain date includes that day)
+        """
+        try:
+            file_format = request.args.get('format', 'csv').lower()
+            if file_format not in EXPORT_FORMATS:
+                return jsonify({"error": f"Invalid format. Use one of: {', '.join(EXPORT_FORMATS)}"}), 400
+
+            try:
+                start_date = parse_export_date(request.args.get('from'))
+                end_date = parse_export_date(request.args.get('to'), end_of_range=True)
+            except ValueError:
+                return jsonify({"error": "Invalid date. Use ISO format (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)"}), 400
+            if start_date and end_date and start_date >= end_date:
+                return jsonify({"error": "'from' must be before 'to'"}), 400
+
+            chunks = self.export_service.export(resource, file_format, start_date=start_date, end_date=end_date)
+            if chunks is None:
+                self.logger.error(f"{resource.capitalize()} export failed in service layer")
+                return jsonify({"error": f"Failed to export {resource}"}), 500
+
+            filename = f"{resource}-{datetime.utcnow():%Y%m%dT%H%M%S}.{file_format}"
+            return Response(
+                stream_with_context(chunks),
+                mimetype=EXPORT_FORMATS[file_format],
+                headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+            )
+
+        except Exception as e:
+            self.logger.error(f"Error exporting {resource}: {e}", exc_info=EXC_INFO_LOG_ERRORS)
+            return error_response(f"Failed to export {resource}", e)
@@ -27,7 +27,7 @@ from flask import request, jsonify, g
 from marshmallow import ValidationError
 from typing import Tuple, Optional
 from config.logging import get_logger, EXC_INFO_LOG_ERRORS
-from app.core.lib.error_utils import error_response
+from app.core.lib.error_utils import error_response, ConcurrencyConflictError
 
 # Service imports
 from app.sales.services.invoice_service import InvoiceService
@@ -143,6 +143,9 @@ class InvoiceController:
         """
         Create new invoice (admin only).
         
+        Idempotent per order: if the order already has an invoice (e.g. created
+        by the ORDER_AUTO_INVOICE job), it is returned with 200.
+        
         Expected JSON:
             {
                 "user_id": 123,
@@ -158,13 +161,19 @@ class InvoiceController:
             # Validate request data
             invoice_data = invoice_registration_schema.load(request.json)
             
-            # Create invoice
-            created_invoice = self.invoice_service.create_invoice(**invoice_data)
+            # Create invoice (or get the order's existing one)
+            created_invoice, created = self.invoice_service.create_or_get_invoice(**invoice_data)
             
             if created_invoice is None:
                 self.logger.error(f"Invoice creation failed")
                 return jsonify({"error": "Failed to create invoice"}), 400
             
+            if not created:
+                return jsonify({
+                    "message": "Invoice already exists",
+                    "invoice": invoice_response_schema.dump(created_invoice)
+                }), 200
+            
             self.logger.info(f"Invoice created: {created_invoice.id if hasattr(created_invoice, 'id') else 'unknown'}")
             return jsonify({
                 "message": "Invoice created successfully",
@@ -221,6 +230,9 @@ class InvoiceController:
         except ValidationError as err:
             self.logger.warning(f"Invoice update validation error: {err.messages}")
             return jsonify({"errors": err.messages}), 400
+        except ConcurrencyConflictError as e:
+            self.logger.warning(f"Concurrent modification rejected: {e.description}")
+            return error_response("Invoice was modified by another request", e, status_code=409)
         except Exception as e:
             self.logger.error(f"Error updating invoice {invoice_id}: {e}", exc_info=EXC_INFO_LOG_ERRORS)
             return error_response("Failed to update invoice", e)
@@ -259,6 +271,9 @@ class InvoiceController:
         except ValidationError as err:
             self.logger.warning(f"Invoice status update validation error: {err.messages}")
             return jsonify({"errors": err.messages}), 400
+        except ConcurrencyConflictError as e:
+            self.logger.warning(f"Concurrent modification rejected: {e.description}")
+            return error_response("Invoice was modified by another request", e, status_code=409)
         except Exception as e:
             self.logger.error(f"Error updating invoice status for {invoice_id}: {e}", exc_info=EXC_INFO_LOG_ERRORS)
             return error_response("Failed to update invoice status", e)
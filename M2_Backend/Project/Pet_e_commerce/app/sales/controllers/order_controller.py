@@ -27,7 +27,7 @@ from flask import request, jsonify, g
 from marshmallow import ValidationError
 from typing import Tuple, Optional
 from config.logging import get_logger, EXC_INFO_LOG_ERRORS
-from app.core.lib.error_utils import error_response
+from app.core.lib.error_utils import error_response, ConcurrencyConflictError
 
 # Service imports
 from app.sales.services.order_service import OrderService
@@ -223,6 +223,9 @@ class OrderController:
         except ValidationError as err:
             self.logger.warning(f"Order update validation error: {err.messages}")
             return jsonify({"errors": err.messages}), 400
+        except ConcurrencyConflictError as e:
+            self.logger.warning(f"Concurrent modification rejected: {e.description}")
+            return error_response("Order was modified by another request", e, status_code=409)
         except Exception as e:
             self.logger.error(f"Error updating order {order_id}: {e}", exc_info=EXC_INFO_LOG_ERRORS)
             return error_response("Failed to update order", e)
@@ -261,6 +264,9 @@ class OrderController:
         except ValidationError as err:
             self.logger.warning(f"Order status update validation error: {err.messages}")
             return jsonify({"errors": err.messages}), 400
+        except ConcurrencyConflictError as e:
+            self.logger.warning(f"Concurrent modification rejected: {e.description}")
+            return error_response("Order was modified by another request", e, status_code=409)
         except Exception as e:
             self.logger.error(f"Error updating order status for {order_id}: {e}", exc_info=EXC_INFO_LOG_ERRORS)
             return error_response("Failed to update order status", e)
@@ -325,6 +331,9 @@ class OrderController:
                 "order": order_response_schema.dump(updated_order)
             }), 200
             
+        except ConcurrencyConflictError as e:
+            self.logger.warning(f"Concurrent modification rejected: {e.description}")
+            return error_response("Order was modified by another request", e, status_code=409)
         except Exception as e:
             self.logger.error(f"Error cancelling order {order_id}: {e}", exc_info=EXC_INFO_LOG_ERRORS)
             return error_response("Failed to cancel order", e)
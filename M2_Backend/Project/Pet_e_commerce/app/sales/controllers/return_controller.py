@@ -27,7 +27,7 @@ from flask import request, jsonify, g
 from marshmallow import ValidationError
 from typing import Tuple, Optional
 from config.logging import get_logger, EXC_INFO_LOG_ERRORS
-from app.core.lib.error_utils import error_response
+from app.core.lib.error_utils import error_response, ConcurrencyConflictError
 
 # Service imports
 from app.sales.services.returns_service import ReturnService
@@ -227,6 +227,9 @@ class ReturnController:
         except ValidationError as err:
             self.logger.warning(f"Return update validation error: {err.messages}")
             return jsonify({"errors": err.messages}), 400
+        except ConcurrencyConflictError as e:
+            self.logger.warning(f"Concurrent modification rejected: {e.description}")
+            return error_response("Return was modified by another request", e, status_code=409)
         except Exception as e:
             self.logger.error(f"Error updating return {return_id}: {e}", exc_info=EXC_INFO_LOG_ERRORS)
             return error_response("Failed to update return", e)
@@ -265,6 +268,9 @@ class ReturnController:
         except ValidationError as err:
             self.logger.warning(f"Return status update validation error: {err.messages}")
             return jsonify({"errors": err.messages}), 400
+        except ConcurrencyConflictError as e:
+            self.logger.warning(f"Concurrent modification rejected: {e.description}")
+            return error_response("Return was modified by another request", e, status_code=409)
         except Exception as e:
             self.logger.error(f"Error updating return status for {return_id}: {e}", exc_info=EXC_INFO_LOG_ERRORS)
             return error_response("Failed to update return status", e)
@@ -86,6 +86,10 @@ class Cart(Base):
     # Optional fields
     created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     
+    # Optimistic concurrency (bumped by CartRepository on every write)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    __mapper_args__ = {"version_id_col": version, "version_id_generator": False}
+    
     # Relationships
     user: Mapped["User"] = relationship(back_populates="carts")
     items: Mapped[List["CartItem"]] = relationship(
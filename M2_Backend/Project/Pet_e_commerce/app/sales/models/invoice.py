@@ -19,7 +19,7 @@ Migration Notes:
 - InvoiceStatus reference table for normalized status values
 - Serialization handled by Marshmallow schemas
 """
-from sqlalchemy import String, Integer, Float, DateTime, ForeignKey
+from sqlalchemy import String, Integer, Float, DateTime, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship, declared_attr
 from app.core.database import Base, get_schema
 from typing import Optional, List
@@ -50,7 +50,11 @@ class Invoice(Base):
     
     @declared_attr
     def __table_args__(cls):
-        return {'schema': get_schema()}
+        return (
+            # Overdue sweep: pending invoices by due date
+            Index("ix_invoices_status_due_date", "invoice_status_id", "due_date"),
+            {'schema': get_schema()}
+        )
     
     # Primary key
     id: Mapped[int] = mapped_column(primary_key=True)
@@ -63,7 +67,8 @@ class Invoice(Base):
     )
     user_id: Mapped[int] = mapped_column(
         ForeignKey(f"{get_schema()}.users.id"),
-        nullable=False
+        nullable=False,
+        index=True
     )
     invoice_status_id: Mapped[int] = mapped_column(
         ForeignKey(f"{get_schema()}.invoice_status.id"),
@@ -77,6 +82,10 @@ class Invoice(Base):
     created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     due_date: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     
+    # Optimistic concurrency (bumped by InvoiceRepository on every write)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    __mapper_args__ = {"version_id_col": version, "version_id_generator": False}
+    
     # Relationships
     status: Mapped["InvoiceStatus"] = relationship(back_populates="invoices")
     order: Mapped["Order"] = relationship(back_populates="invoice")
@@ -67,7 +67,8 @@ class OrderItem(Base):
     )
     order_id: Mapped[int] = mapped_column(
         ForeignKey(f"{get_schema()}.orders.id"),
-        nullable=False
+        nullable=False,
+        index=True
     )
     
     # Item details
@@ -101,7 +102,8 @@ class Order(Base):
     )
     user_id: Mapped[int] = mapped_column(
         ForeignKey(f"{get_schema()}.users.id"),
-        nullable=False
+        nullable=False,
+        index=True
     )
     order_status_id: Mapped[int] = mapped_column(
         ForeignKey(f"{get_schema()}.order_status.id"),
@@ -112,9 +114,13 @@ class Order(Base):
     total_amount: Mapped[float] = mapped_column(Float, nullable=False)
     
     # Optional fields
-    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True, index=True)
     shipping_address: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     
+    # Optimistic concurrency (bumped by OrderRepository on every write)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    __mapper_args__ = {"version_id_col": version, "version_id_generator": False}
+    
     # Relationships
     status: Mapped["OrderStatus"] = relationship(back_populates="orders")
     user: Mapped["User"] = relationship(back_populates="orders")
@@ -64,7 +64,8 @@ class ReturnItem(Base):
     )
     return_id: Mapped[int] = mapped_column(
         ForeignKey(f"{get_schema()}.returns.id"),
-        nullable=False
+        nullable=False,
+        index=True
     )
     
     # Item details
@@ -98,7 +99,8 @@ class Return(Base):
     )
     user_id: Mapped[int] = mapped_column(
         ForeignKey(f"{get_schema()}.users.id"),
-        nullable=False
+        nullable=False,
+        index=True
     )
     return_status_id: Mapped[int] = mapped_column(
         ForeignKey(f"{get_schema()}.return_status.id"),
@@ -109,7 +111,11 @@ class Return(Base):
     total_amount: Mapped[float] = mapped_column(Float, nullable=False)  # Total refund amount
     
     # Optional fields
-    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True, index=True)
+    
+    # Optimistic concurrency (bumped by ReturnRepository on every write)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    __mapper_args__ = {"version_id_col": version, "version_id_generator": False}
     
     # Relationships
     status: Mapped["ReturnStatus"] = relationship(back_populates="returns")
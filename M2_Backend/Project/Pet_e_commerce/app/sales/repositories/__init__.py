@@ -6,12 +6,14 @@ Repositories handle data access layer operations using SQLAlchemy ORM.
 """
 
 from app.sales.repositories.cart_repository import CartRepository
+from app.sales.repositories.cart_redis_repository import CartRedisRepository
 from app.sales.repositories.order_repository import OrderRepository
 from app.sales.repositories.invoice_repository import InvoiceRepository
 from app.sales.repositories.return_repository import ReturnRepository
 
 __all__ = [
     'CartRepository',
+    'CartRedisRepository',
     'OrderRepository',
     'InvoiceRepository',
     'ReturnRepository'
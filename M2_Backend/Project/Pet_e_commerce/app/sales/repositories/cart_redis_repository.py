@@ -0,0 +1,532 @@
+"""
+Cart Redis Repository Module
+
+Redis-resident storage for open (non-finalized) shopping carts.
+Used by CartService when CART_STORAGE_MODE=redis so that cart writes
+(add, update, remove) never touch PostgreSQL.
+
+Storage Layout:
+- cart:open:v1:{user_id}  Hash: "_meta" -> JSON {user_id, cart_id, created_at}
+                                 "_version" -> write counter (compare-and-set)
+                                 "{product_id}" -> JSON {quantity, price, amount}
+- cart:open:v1:index      Set of user IDs that have an open Redis cart
+- cart:open:v1:dirty      Set of user IDs changed since the last flush
+
+Persistence:
+- Checkout: persist() writes the cart to carts/cart_items; the Redis cart is
+  dropped after the transaction commits, and only if it is still at the version
+  that was persisted (a rolled back checkout or a later change keeps it)
+- Write-behind: flush_dirty_carts() copies changed carts to PostgreSQL in batches
+- Abandoned carts expire after CART_REDIS_TTL_SECONDS; the flusher removes their
+  PostgreSQL copy when it finds the hash gone
+
+Writes:
+- Every write is a compare-and-set (Lua script): the hash is replaced only if
+  its "_version" still equals the version the cart was read at, and the
+  version is incremented. A concurrent change to the same cart (double-click,
+  two tabs) raises ConcurrencyConflictError instead of being overwritten.
+
+Carts returned by this repository are transient Cart/CartItem objects (never
+added to a session). Operations by cart ID (get_by_id, delete, finalize_cart)
+target persisted carts and are delegated to CartRepository.
+
+Usage:
+    repo = CartRedisRepository()
+    cart = repo.get_by_user_id(1)
+    persisted = repo.persist(1)
+"""
+import json
+from datetime import datetime
+from typing import Optional, List, Dict
+import redis
+from app.core.cache_manager import get_cache
+from app.core.database import get_db
+from app.sales.models.cart import Cart, CartItem
+from app.sales.repositories.cart_repository import CartRepository
+from app.core.lib.error_utils import ConcurrencyConflictError
+from app.core.middleware.cache_decorators import call_after_commit
+from config.settings import CART_REDIS_TTL_SECONDS
+import logging
+
+logger = logging.getLogger(__name__)
+
+# KEYS: cart hash, index set, dirty set
+# ARGV: expected version, ttl, user_id, field, value, field, value, ...
+# Returns the new version, or -1 if the cart changed since it was read
+_WRITE_CART_SCRIPT = """
+local current = tonumber(redis.call('HGET', KEYS[1], '_version') or '0')
+if current ~= tonumber(ARGV[1]) then
+    return -1
+end
+redis.call('DEL', KEYS[1])
+redis.call('HSET', KEYS[1], '_version', current + 1, unpack(ARGV, 4))
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+redis.call('SADD', KEYS[2], ARGV[3])
+redis.call('SADD', KEYS[3], ARGV[3])
+return current + 1
+"""
+
+# KEYS: cart hash, index set, dirty set
+# ARGV: expected version, user_id
+# Returns 1 if the cart was removed, 0 if it changed since it was read
+_RELEASE_CART_SCRIPT = """
+local current = tonumber(redis.call('HGET', KEYS[1], '_version') or '0')
+if current ~= tonumber(ARGV[1]) then
+    return 0
+end
+redis.call('DEL', KEYS[1])
+redis.call('SREM', KEYS[2], ARGV[2])
+redis.call('SREM', KEYS[3], ARGV[2])
+return 1
+"""
+
+
+class CartRedisRepository:
+    """Repository for open carts stored in Redis hashes."""
+
+    KEY_PREFIX = "cart:open:v1"
+    META_FIELD = "_meta"
+    VERSION_FIELD = "_version"
+
+    def __init__(self, db_repository: Optional[CartRepository] = None, ttl: int = CART_REDIS_TTL_SECONDS):
+        """
+        Initialize Redis cart repository.
+
+        Args:
+            db_repository: Repository used for persisted carts (default: new CartRepository)
+            ttl: Seconds an untouched cart lives in Redis
+        """
+        self.db_repository = db_repository or CartRepository()
+        self.ttl = ttl
+
+    # ============ KEY HELPERS ============
+
+    @property
+    def redis(self):
+        """Raw Redis client from the global CacheManager."""
+        return get_cache().redis_client
+
+    def _key(self, user_id: int) -> str:
+        return f"{self.KEY_PREFIX}:{user_id}"
+
+    @property
+    def index_key(self) -> str:
+        return f"{self.KEY_PREFIX}:index"
+
+    @property
+    def dirty_key(self) -> str:
+        return f"{self.KEY_PREFIX}:dirty"
+
+    # ============ SERIALIZATION ============
+
+    def _serialize(self, cart: Cart) -> Dict[str, str]:
+        """Convert a cart into the hash mapping stored in Redis."""
+        created_at = cart.created_at or datetime.utcnow()
+        mapping = {
+            self.META_FIELD: json.dumps({
+                'user_id': cart.user_id,
+                'cart_id': cart.id,
+                'created_at': created_at.isoformat()
+            })
+        }
+        for item in cart.items:
+            price = item.amount / item.quantity if item.quantity else item.amount
+            mapping[str(item.product_id)] = json.dumps({
+                'quantity': item.quantity,
+                'price': price,
+                'amount': item.amount
+            })
+        return mapping
+
+    def _hydrate(self, raw: Dict[bytes, bytes]) -> Optional[Cart]:
+        """Rebuild a transient Cart from a Redis hash (None if hash is empty)."""
+        if not raw:
+            return None
+
+        fields = {
+            (k.decode('utf-8') if isinstance(k, bytes) else k): json.loads(v)
+            for k, v in raw.items()
+        }
+        meta = fields.pop(self.META_FIELD, None)
+        version = fields.pop(self.VERSION_FIELD, 0)
+        if meta is None:
+            return None
+
+        cart = Cart(
+            id=meta.get('cart_id'),
+            user_id=meta['user_id'],
+            finalized=False,
+            created_at=datetime.fromisoformat(meta['created_at']),
+            version=version
+        )
+        for product_id, snapshot in sorted(fields.items(), key=lambda kv: int(kv[0])):
+            cart.items.append(CartItem(
+                product_id=int(product_id),
+                cart_id=cart.id,
+                quantity=snapshot['quantity'],
+                amount=snapshot['amount']
+            ))
+        return cart
+
+    def _write(self, cart: Cart) -> None:
+        """
+        Replace the cart hash if it is still at the version the cart was read at
+        (0 for new carts), refresh its TTL and mark it dirty, in one script call.
+
+        Raises:
+            ConcurrencyConflictError: The cart was changed by another request
+        """
+        expected_version = cart.version or 0
+        fields = [part for field in self._serialize(cart).items() for part in field]
+        new_version = self.redis.register_script(_WRITE_CART_SCRIPT)(
+            keys=[self._key(cart.user_id), self.index_key, self.dirty_key],
+            args=[expected_version, self.ttl, cart.user_id, *fields]
+        )
+        if new_version == -1:
+            logger.warning(f"Concurrent update detected for Redis cart of user {cart.user_id}")
+            raise ConcurrencyConflictError(f"Cart of user {cart.user_id} was modified by another request")
+        cart.version = new_version
+
+    # ============ READ OPERATIONS ============
+
+    def get_by_id(self, cart_id: int) -> Optional[Cart]:
+        """
+        Get persisted cart by ID (delegated to CartRepository).
+
+        Args:
+            cart_id: Cart ID to search for
+
+        Returns:
+            Cart object or None if not found
+        """
+        return self.db_repository.get_by_id(cart_id)
+
+    def get_by_user_id(self, user_id: int) -> Optional[Cart]:
+        """
+        Get open cart for a user from Redis.
+
+        Args:
+            user_id: User ID to search for
+
+        Returns:
+            Transient Cart object or None if not found
+        """
+        try:
+            return self._hydrate(self.redis.hgetall(self._key(user_id)))
+        except (redis.RedisError, ValueError, KeyError) as e:
+            logger.error(f"Error fetching Redis cart for user {user_id}: {e}")
+            return None
+
+    def get_all(self) -> List[Cart]:
+        """
+        Get all open carts stored in Redis.
+
+        Returns:
+            List of transient Cart objects
+        """
+        try:
+            user_ids = sorted(int(uid) for uid in self.redis.smembers(self.index_key))
+            if not user_ids:
+                return []
+            pipe = self.redis.pipeline(transaction=False)
+            for user_id in user_ids:
+                pipe.hgetall(self._key(user_id))
+            carts = [self._hydrate(raw) for raw in pipe.execute()]
+            return [cart for cart in carts if cart is not None]
+        except (redis.RedisError, ValueError, KeyError) as e:
+            logger.error(f"Error fetching all Redis carts: {e}")
+            return []
+
+    def exists_by_user_id(self, user_id: int) -> bool:
+        """
+        Check if an open cart exists in Redis for a user.
+
+        Args:
+            user_id: User ID to check
+
+        Returns:
+            True if exists, False otherwise
+        """
+        try:
+            return bool(self.redis.exists(self._key(user_id)))
+        except redis.RedisError as e:
+            logger.error(f"Error checking if Redis cart exists for user {user_id}: {e}")
+            return False
+
+    # ============ WRITE OPERATIONS ============
+
+    def create(self, cart: Cart) -> Optional[Cart]:
+        """
+        Store a new open cart in Redis.
+
+        Args:
+            cart: Cart object to store
+
+        Returns:
+            The stored Cart object, or None on error
+
+        Raises:
+            ConcurrencyConflictError: Another request created the cart first
+        """
+        try:
+            if cart.created_at is None:
+                cart.created_at = datetime.utcnow()
+            self._write(cart)
+            return cart
+        except redis.RedisError as e:
+            logger.error(f"Error creating Redis cart for user {cart.user_id}: {e}")
+            return None
+
+    def update(self, cart: Cart, expected_version: Optional[int] = None) -> Optional[Cart]:
+        """
+        Overwrite an open cart in Redis.
+
+        Args:
+            cart: Cart object with updated data
+            expected_version: Version the client last read (optional)
+
+        Returns:
+            The stored Cart object, or None on error
+
+        Raises:
+            ConcurrencyConflictError: The cart is no longer at expected_version,
+                or was changed since it was read
+        """
+        if expected_version is not None and (cart.version or 0) != expected_version:
+            raise ConcurrencyConflictError(
+                f"Cart of user {cart.user_id} is at version {cart.version or 0}, expected {expected_version}"
+            )
+        try:
+            self._write(cart)
+            return cart
+        except redis.RedisError as e:
+            logger.error(f"Error updating Redis cart for user {cart.user_id}: {e}")
+            return None
+
+    def delete(self, cart_id: int) -> bool:
+        """
+        Delete a persisted cart by ID (delegated to CartRepository).
+
+        Args:
+            cart_id: ID of cart to delete
+
+        Returns:
+            True if deleted, False on error or not found
+        """
+        return self.db_repository.delete(cart_id)
+
+    def delete_by_user_id(self, user_id: int) -> bool:
+        """
+        Delete a user's open cart from Redis and its persisted copy, if any.
+
+        The PostgreSQL copy is removed immediately so a stale row cannot be
+        picked up again at checkout.
+
+        Args:
+            user_id: User ID whose cart to delete
+
+        Returns:
+            True if a cart was deleted, False on error or not found
+        """
+        try:
+            pipe = self.redis.pipeline(transaction=True)
+            pipe.delete(self._key(user_id))
+            pipe.srem(self.index_key, user_id)
+            pipe.srem(self.dirty_key, user_id)
+            deleted = pipe.execute()[0] == 1
+        except redis.RedisError as e:
+            logger.error(f"Error deleting Redis cart for user {user_id}: {e}")
+            return False
+        persisted_deleted = self.db_repository.delete_by_user_id(user_id)
+        return deleted or persisted_deleted
+
+    def finalize_cart(self, cart_id: int) -> Optional[Cart]:
+        """
+        Mark a persisted cart as finalized (delegated to CartRepository).
+
+        Args:
+            cart_id: ID of cart to finalize
+
+        Returns:
+            Updated Cart object or None on error
+        """
+        return self.db_repository.finalize_cart(cart_id)
+
+    # ============ PERSISTENCE ============
+
+    def _write_to_database(self, cart: Cart) -> Optional[Cart]:
+        """
+        Copy a Redis cart into the user's open PostgreSQL cart.
+
+        Args:
+            cart: Transient cart read from Redis
+
+        Returns:
+            Persisted Cart object or None on error
+        """
+        db_cart = self.db_repository.get_by_user_id(cart.user_id)
+        if db_cart is None:
+            db_cart = self.db_repository.create(
+                Cart(user_id=cart.user_id, finalized=False, created_at=cart.created_at)
+            )
+            if db_cart is None:
+                return None
+
+        # Flush deletions before re-adding to avoid uq_product_cart violations
+        db_cart.items.clear()
+        get_db().flush()
+        for item in cart.items:
+            db_cart.items.append(CartItem(
+                product_id=item.product_id,
+                quantity=item.quantity,
+                amount=item.amount
+            ))
+        return self.db_repository.update(db_cart)
+
+    def _release(self, user_id: int, version: int) -> bool:
+        """
+        Remove a checked out cart from Redis if it is still at `version`.
+
+        Returns:
+            True if removed, False if it changed since checkout or on error
+        """
+        try:
+            released = self.redis.register_script(_RELEASE_CART_SCRIPT)(
+                keys=[self._key(user_id), self.index_key, self.dirty_key],
+                args=[version, user_id]
+            )
+        except redis.RedisError as e:
+            logger.error("Error removing checked out Redis cart of user %s: %s", user_id, e)
+            return False
+        if released != 1:
+            logger.warning("Redis cart of user %s changed during checkout, kept for the flusher", user_id)
+            return False
+        return True
+
+    def persist(self, user_id: int) -> Optional[Cart]:
+        """
+        Persist a user's open cart to PostgreSQL for checkout.
+
+        The Redis cart (if any) is written to carts/cart_items. It is removed
+        from Redis once the caller's transaction commits, and only if it is
+        still at the version read here: a rolled back checkout keeps the cart,
+        and items added meanwhile stay in Redis. When the user has no Redis
+        cart, the existing open PostgreSQL cart is returned, or an empty one
+        is created.
+
+        Args:
+            user_id: User ID whose cart to persist
+
+        Returns:
+            Persisted Cart object or None on error
+        """
+        try:
+            cart = self.get_by_user_id(user_id)
+            if cart is None:
+                persisted = self.db_repository.get_by_user_id(user_id)
+                if persisted is None:
+                    persisted = self.db_repository.create(
+                        Cart(user_id=user_id, finalized=False, created_at=datetime.utcnow())
+                    )
+                return persisted
+
+            persisted = self._write_to_database(cart)
+            if persisted is None:
+                return None
+
+            version = cart.version or 0
+            call_after_commit(lambda: self._release(user_id, version))
+            return persisted
+        except redis.RedisError as e:
+            logger.error(f"Error persisting Redis cart for user {user_id}: {e}")
+            return None
+
+    def mark_dirty(self, user_ids: List[int]) -> None:
+        """
+        Re-queue user IDs for the write-behind flusher.
+
+        Args:
+            user_ids: User IDs whose carts should be flushed again
+        """
+        if not user_ids:
+            return
+        try:
+            self.redis.sadd(self.dirty_key, *user_ids)
+        except redis.RedisError as e:
+            logger.error(f"Error re-queueing dirty carts {user_ids}: {e}")
+
+    def flush_dirty_carts(self, batch_size: int) -> List[int]:
+        """
+        Write-behind: copy up to batch_size changed carts to PostgreSQL.
+
+        Claims user IDs from the dirty set with SPOP, so concurrent flushers
+        never process the same cart. Carts whose hash has expired get their
+        PostgreSQL copy removed. The caller commits the session and should
+        call mark_dirty() with the returned IDs if the commit fails.
+
+        Args:
+            batch_size: Maximum number of carts to flush
+
+        Returns:
+            List of user IDs flushed in this batch
+        """
+        try:
+            claimed = [int(uid) for uid in (self.redis.spop(self.dirty_key, batch_size) or [])]
+        except redis.RedisError as e:
+            logger.error(f"Error claiming dirty carts: {e}")
+            return []
+
+        flushed = []
+        for user_id in claimed:
+            cart = self.get_by_user_id(user_id)
+            if cart is None:
+                self.db_repository.delete_by_user_id(user_id)
+                flushed.append(user_id)
+                continue
+
+            persisted = self._write_to_database(cart)
+            if persisted is None:
+                logger.error(f"Failed to flush Redis cart for user {user_id}, re-queueing")
+                self.mark_dirty([user_id])
+                continue
+
+            # Remember the PostgreSQL ID so API responses expose it
+            if cart.id != persisted.id and self.exists_by_user_id(user_id):
+                try:
+                    meta = json.dumps({
+                        'user_id': user_id,
+                        'cart_id': persisted.id,
+                        'created_at': cart.created_at.isoformat()
+                    })
+                    pipe = self.redis.pipeline(transaction=True)
+                    pipe.hset(self._key(user_id), self.META_FIELD, meta)
+                    pipe.expire(self._key(user_id), self.ttl)
+                    pipe.execute()
+                except redis.RedisError as e:
+                    logger.warning(f"Could not record cart id for user {user_id}: {e}")
+            flushed.append(user_id)
+
+        return flushed
+
+    def sweep_expired(self) -> List[int]:
+        """
+        Queue carts that expired in Redis so the flusher removes their copy.
+
+        Returns:
+            List of user IDs whose Redis cart has expired
+        """
+        try:
+            user_ids = sorted(int(uid) for uid in self.redis.smembers(self.index_key))
+            if not user_ids:
+                return []
+            pipe = self.redis.pipeline(transaction=False)
+            for user_id in user_ids:
+                pipe.exists(self._key(user_id))
+            expired = [uid for uid, exists in zip(user_ids, pipe.execute()) if not exists]
+            if expired:
+                self.redis.srem(self.index_key, *expired)
+                self.mark_dirty(expired)
+            return expired
+        except redis.RedisError as e:
+            logger.error(f"Error sweeping expired Redis carts: {e}")
+            return []
@@ -9,21 +9,50 @@ Responsibilities:
 - Cart lookups by different fields (id, user_id)
 - Cart item management
 - Transaction management via session_scope
+- Eager loading via named list/detail profiles (load_profiles)
+- Optimistic concurrency: update/finalize bump carts.version (compare-and-swap)
 
 Usage:
     repo = CartRepository()
     cart = repo.get_by_user_id(1)
     all_carts = repo.get_all()
 """
+from functools import lru_cache
 from typing import Optional, List
+from sqlalchemy import bindparam, select
 from sqlalchemy.exc import SQLAlchemyError
-from app.core.database import get_db
+from sqlalchemy.orm.exc import StaleDataError
+from app.core.database import get_db, bump_version
+from app.core.lib.error_utils import ConcurrencyConflictError
 from app.sales.models.cart import Cart, CartItem
+from app.sales.repositories.load_profiles import load_options, LIST_VIEW, DETAIL_VIEW
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=None)
+def _cart_by_id_statement():
+    """Hot lookup built once on first use; calls only bind parameters and hit the compiled cache."""
+    return (
+        select(Cart)
+        .options(*load_options(Cart, DETAIL_VIEW))
+        .where(Cart.id == bindparam('cart_id'))
+        .limit(1)
+    )
+
+
+@lru_cache(maxsize=None)
+def _open_cart_by_user_statement():
+    """Hot lookup built once on first use; calls only bind parameters and hit the compiled cache."""
+    return (
+        select(Cart)
+        .options(*load_options(Cart, DETAIL_VIEW))
+        .where(Cart.user_id == bindparam('user_id'), Cart.finalized.is_(False))
+        .limit(1)
+    )
+
+
 class CartRepository:
     """Repository for Cart database operations."""
     
@@ -39,7 +68,7 @@ class CartRepository:
         """
         try:
             db = get_db()
-            return db.query(Cart).filter_by(id=cart_id).first()
+            return db.scalars(_cart_by_id_statement(), {'cart_id': cart_id}).first()
         except SQLAlchemyError as e:
             logger.error(f"Error fetching cart by id {cart_id}: {e}")
             return None
@@ -56,7 +85,7 @@ class CartRepository:
         """
         try:
             db = get_db()
-            return db.query(Cart).filter_by(user_id=user_id, finalized=False).first()
+            return db.scalars(_open_cart_by_user_statement(), {'user_id': user_id}).first()
         except SQLAlchemyError as e:
             logger.error(f"Error fetching cart by user_id {user_id}: {e}")
             return None
@@ -70,7 +99,7 @@ class CartRepository:
         """
         try:
             db = get_db()
-            return db.query(Cart).all()
+            return db.query(Cart).options(*load_options(Cart, LIST_VIEW)).all()
         except SQLAlchemyError as e:
             logger.error(f"Error fetching all carts: {e}")
             return []
@@ -95,15 +124,19 @@ class CartRepository:
             logger.error(f"Error creating cart for user {cart.user_id}: {e}")
             return None
     
-    def update(self, cart: Cart) -> Optional[Cart]:
+    def update(self, cart: Cart, expected_version: Optional[int] = None) -> Optional[Cart]:
         """
-        Update an existing cart.
+        Update an existing cart (compare-and-swap on carts.version).
         
         Args:
             cart: Cart object with updated data
+            expected_version: Version the client last read (optional)
             
         Returns:
             Updated Cart object or None on error
+            
+        Raises:
+            ConcurrencyConflictError: Cart was modified by another request
         """
         try:
             db = get_db()
@@ -112,9 +145,13 @@ class CartRepository:
                 updated_cart = db.merge(cart)
             else:
                 updated_cart = cart
+            bump_version(updated_cart, expected_version)
             db.flush()
             db.refresh(updated_cart)
             return updated_cart
+        except StaleDataError as e:
+            logger.warning(f"Concurrent update detected for cart {cart.id}: {e}")
+            raise ConcurrencyConflictError(f"Cart {cart.id} was modified by another request") from e
         except SQLAlchemyError as e:
             logger.error(f"Error updating cart {cart.id}: {e}")
             return None
@@ -177,10 +214,14 @@ class CartRepository:
             cart = db.query(Cart).filter_by(id=cart_id).first()
             if cart:
                 cart.finalized = True
+                bump_version(cart)
                 db.flush()
                 db.refresh(cart)
                 return cart
             return None
+        except StaleDataError as e:
+            logger.warning(f"Concurrent update detected while finalizing cart {cart_id}: {e}")
+            raise ConcurrencyConflictError(f"Cart {cart_id} was modified by another request") from e
         except SQLAlchemyError as e:
             logger.error(f"Error finalizing cart {cart_id}: {e}")
             return None
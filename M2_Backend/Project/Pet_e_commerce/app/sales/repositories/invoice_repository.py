@@ -9,16 +9,22 @@ Responsibilities:
 - Invoice lookups by different fields (id, order_id, user_id)
 - Advanced filtering capabilities (status)
 - Transaction management via session_scope
+- Eager loading via named list/detail profiles (load_profiles)
 
 Usage:
     repo = InvoiceRepository()
     invoice = repo.get_by_order_id(1)
     user_invoices = repo.get_by_user_id(1)
 """
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable
 from sqlalchemy.exc import SQLAlchemyError
-from app.core.database import get_db
+from sqlalchemy import select, update
+from sqlalchemy.orm.exc import StaleDataError
+from app.core.database import get_db, bump_version
+from app.core.lib.error_utils import ConcurrencyConflictError
 from app.sales.models.invoice import Invoice, InvoiceStatus
+from app.sales.repositories.load_profiles import load_options, LIST_VIEW, DETAIL_VIEW
+from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
@@ -39,7 +45,7 @@ class InvoiceRepository:
         """
         try:
             db = get_db()
-            return db.query(Invoice).filter_by(id=invoice_id).first()
+            return db.query(Invoice).options(*load_options(Invoice, DETAIL_VIEW)).filter_by(id=invoice_id).first()
         except SQLAlchemyError as e:
             logger.error(f"Error fetching invoice by id {invoice_id}: {e}")
             return None
@@ -56,7 +62,7 @@ class InvoiceRepository:
         """
         try:
             db = get_db()
-            return db.query(Invoice).filter_by(order_id=order_id).first()
+            return db.query(Invoice).options(*load_options(Invoice, DETAIL_VIEW)).filter_by(order_id=order_id).first()
         except SQLAlchemyError as e:
             logger.error(f"Error fetching invoice by order_id {order_id}: {e}")
             return None
@@ -73,7 +79,7 @@ class InvoiceRepository:
         """
         try:
             db = get_db()
-            return db.query(Invoice).filter_by(user_id=user_id).all()
+            return db.query(Invoice).options(*load_options(Invoice, LIST_VIEW)).filter_by(user_id=user_id).all()
         except SQLAlchemyError as e:
             logger.error(f"Error fetching invoices by user_id {user_id}: {e}")
             return []
@@ -87,7 +93,7 @@ class InvoiceRepository:
         """
         try:
             db = get_db()
-            return db.query(Invoice).all()
+            return db.query(Invoice).options(*load_options(Invoice, LIST_VIEW)).all()
         except SQLAlchemyError as e:
             logger.error(f"Error fetching all invoices: {e}")
             return []
@@ -112,7 +118,7 @@ class InvoiceRepository:
         """
         try:
             db = get_db()
-            query = db.query(Invoice)
+            query = db.query(Invoice).options(*load_options(Invoice, LIST_VIEW))
             
             # Apply filters
             if 'user_id' in filters:
@@ -146,6 +152,32 @@ class InvoiceRepository:
             logger.error(f"Error fetching invoices with filters: {e}")
             return []
     
+    def stream_for_export(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None,
+                          batch_size: int = 1000) -> Optional[Iterable[Invoice]]:
+        """
+        Stream invoices for exports through a server-side cursor.
+        Rows are fetched batch_size at a time (yield_per), so memory stays flat regardless of the row count.
+        
+        Args:
+            start_date: Only invoices created at or after this time
+            end_date: Only invoices created before this time (exclusive)
+            batch_size: Rows fetched per round trip
+            
+        Returns:
+            Iterable of Invoice objects ordered by id, or None on error
+        """
+        try:
+            db = get_db()
+            statement = select(Invoice).options(*load_options(Invoice, LIST_VIEW)).order_by(Invoice.id)
+            if start_date is not None:
+                statement = statement.where(Invoice.created_at >= start_date)
+            if end_date is not None:
+                statement = statement.where(Invoice.created_at < end_date)
+            return db.scalars(statement.execution_options(yield_per=batch_size))
+        except SQLAlchemyError as e:
+            logger.error(f"Error streaming invoices for export: {e}")
+            return None
+    
     def create(self, invoice: Invoice) -> Optional[Invoice]:
         """
         Create a new invoice in the database.
@@ -166,27 +198,75 @@ class InvoiceRepository:
             logger.error(f"Error creating invoice for order {invoice.order_id}: {e}")
             return None
     
-    def update(self, invoice: Invoice) -> Optional[Invoice]:
+    def update(self, invoice: Invoice, expected_version: Optional[int] = None) -> Optional[Invoice]:
         """
-        Update an existing invoice.
+        Update an existing invoice (compare-and-swap on invoices.version).
         
         Args:
             invoice: Invoice object with updated data
+            expected_version: Version the client last read (optional)
             
         Returns:
             Updated Invoice object or None on error
+            
+        Raises:
+            ConcurrencyConflictError: Invoice was modified by another request
         """
         try:
             db = get_db()
             # Merge the detached invoice object into the session
             updated_invoice = db.merge(invoice)
+            bump_version(updated_invoice, expected_version)
             db.flush()
             db.refresh(updated_invoice)
             return updated_invoice
+        except StaleDataError as e:
+            logger.warning(f"Concurrent update detected for invoice {invoice.id}: {e}")
+            raise ConcurrencyConflictError(f"Invoice {invoice.id} was modified by another request") from e
         except SQLAlchemyError as e:
             logger.error(f"Error updating invoice {invoice.id}: {e}")
             return None
     
+    def mark_overdue(self, pending_status_id: int, overdue_status_id: int, now: datetime,
+                     limit: int) -> Optional[List[Any]]:
+        """
+        Move up to `limit` past-due pending invoices to overdue in one UPDATE ... RETURNING.
+        
+        Rows are claimed oldest due date first with FOR UPDATE SKIP LOCKED, so
+        concurrent sweeps never block each other or an invoice being edited.
+        Bumps version so clients holding the old version get a conflict.
+        
+        Args:
+            pending_status_id: ID of the 'pending' status
+            overdue_status_id: ID of the 'overdue' status
+            now: Invoices with due_date before this are overdue
+            limit: Maximum invoices updated
+            
+        Returns:
+            (id, user_id) rows of updated invoices, or None on error
+        """
+        try:
+            db = get_db()
+            claimed = (
+                select(Invoice.id)
+                .where(Invoice.invoice_status_id == pending_status_id, Invoice.due_date < now)
+                .order_by(Invoice.due_date)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+                .scalar_subquery()
+            )
+            statement = (
+                update(Invoice)
+                .where(Invoice.id.in_(claimed))
+                .values(invoice_status_id=overdue_status_id, version=Invoice.version + 1)
+                .returning(Invoice.id, Invoice.user_id)
+                .execution_options(synchronize_session=False)
+            )
+            return db.execute(statement).all()
+        except SQLAlchemyError as e:
+            logger.error(f"Error marking overdue invoices: {e}")
+            return None
+    
     def delete(self, invoice_id: int) -> bool:
         """
         Delete an invoice by ID.
@@ -0,0 +1,82 @@
+"""
+Loading Profiles Module
+
+Named eager-loading profiles for the sales aggregates (Cart, Order, Invoice,
+Return). Repositories apply them with ``query.options(*load_options(...))`` so
+serializing a list of aggregates does not lazy-load relationships row by row
+(N+1 queries).
+
+Profiles:
+- LIST_VIEW: What list endpoints serialize (items collections via selectinload,
+  one extra query per collection regardless of row count)
+- DETAIL_VIEW: What single-aggregate endpoints and services touch
+  (items plus the status row via joinedload)
+
+Status names in responses come from ReferenceData, so list views do not need
+the status relationship.
+
+Usage:
+    from app.sales.repositories.load_profiles import load_options, LIST_VIEW
+    db.query(Order).options(*load_options(Order, LIST_VIEW)).all()
+"""
+from typing import Tuple
+from sqlalchemy.orm import selectinload, joinedload
+from app.sales.models.cart import Cart
+from app.sales.models.order import Order
+from app.sales.models.invoice import Invoice
+from app.sales.models.returns import Return
+
+LIST_VIEW = "list"
+DETAIL_VIEW = "detail"
+
+
+def _cart_options(profile: str) -> Tuple:
+    return (selectinload(Cart.items),)
+
+
+def _order_options(profile: str) -> Tuple:
+    if profile == DETAIL_VIEW:
+        return (selectinload(Order.items), joinedload(Order.status))
+    return (selectinload(Order.items),)
+
+
+def _invoice_options(profile: str) -> Tuple:
+    if profile == DETAIL_VIEW:
+        return (joinedload(Invoice.status),)
+    return ()
+
+
+def _return_options(profile: str) -> Tuple:
+    if profile == DETAIL_VIEW:
+        return (selectinload(Return.items), joinedload(Return.status))
+    return (selectinload(Return.items),)
+
+
+_PROFILE_BUILDERS = {
+    Cart: _cart_options,
+    Order: _order_options,
+    Invoice: _invoice_options,
+    Return: _return_options,
+}
+
+
+def load_options(model, profile: str = LIST_VIEW) -> Tuple:
+    """
+    Get loader options for a sales aggregate and view profile.
+
+    Options are built on each call so mappers are only inspected once all
+    models have been imported.
+
+    Args:
+        model: Aggregate root model class (Cart, Order, Invoice, Return)
+        profile: LIST_VIEW or DETAIL_VIEW
+
+    Returns:
+        Tuple of loader options for Query.options()
+
+    Raises:
+        ValueError: If the profile name is unknown
+    """
+    if profile not in (LIST_VIEW, DETAIL_VIEW):
+        raise ValueError(f"Unknown loading profile: {profile}")
+    return _PROFILE_BUILDERS[model](profile)
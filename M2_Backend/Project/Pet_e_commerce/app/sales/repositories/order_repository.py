@@ -9,17 +9,21 @@ Responsibilities:
 - Order lookups by different fields (id, user_id, cart_id)
 - Advanced filtering capabilities (status, date range)
 - Transaction management via session_scope
+- Eager loading via named list/detail profiles (load_profiles)
 
 Usage:
     repo = OrderRepository()
     order = repo.get_by_id(1)
     user_orders = repo.get_by_user_id(1)
 """
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import and_
-from app.core.database import get_db
+from sqlalchemy import and_, select
+from sqlalchemy.orm.exc import StaleDataError
+from app.core.database import get_db, bump_version
+from app.core.lib.error_utils import ConcurrencyConflictError
 from app.sales.models.order import Order, OrderItem, OrderStatus
+from app.sales.repositories.load_profiles import load_options, LIST_VIEW, DETAIL_VIEW
 from datetime import datetime
 import logging
 
@@ -41,7 +45,7 @@ class OrderRepository:
         """
         try:
             db = get_db()
-            return db.query(Order).filter_by(id=order_id).first()
+            return db.query(Order).options(*load_options(Order, DETAIL_VIEW)).filter_by(id=order_id).first()
         except SQLAlchemyError as e:
             logger.error(f"Error fetching order by id {order_id}: {e}")
             return None
@@ -58,7 +62,7 @@ class OrderRepository:
         """
         try:
             db = get_db()
-            return db.query(Order).filter_by(user_id=user_id).all()
+            return db.query(Order).options(*load_options(Order, LIST_VIEW)).filter_by(user_id=user_id).all()
         except SQLAlchemyError as e:
             logger.error(f"Error fetching orders by user_id {user_id}: {e}")
             return []
@@ -75,7 +79,7 @@ class OrderRepository:
         """
         try:
             db = get_db()
-            return db.query(Order).filter_by(cart_id=cart_id).first()
+            return db.query(Order).options(*load_options(Order, DETAIL_VIEW)).filter_by(cart_id=cart_id).first()
         except SQLAlchemyError as e:
             logger.error(f"Error fetching order by cart_id {cart_id}: {e}")
             return None
@@ -89,7 +93,7 @@ class OrderRepository:
         """
         try:
             db = get_db()
-            return db.query(Order).all()
+            return db.query(Order).options(*load_options(Order, LIST_VIEW)).all()
         except SQLAlchemyError as e:
             logger.error(f"Error fetching all orders: {e}")
             return []
@@ -113,7 +117,7 @@ class OrderRepository:
         """
         try:
             db = get_db()
-            query = db.query(Order)
+            query = db.query(Order).options(*load_options(Order, LIST_VIEW))
             
             # Apply filters
             if 'user_id' in filters:
@@ -142,6 +146,33 @@ class OrderRepository:
             logger.error(f"Error fetching orders with filters: {e}")
             return []
     
+    def stream_for_export(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None,
+                          batch_size: int = 1000) -> Optional[Iterable[Order]]:
+        """
+        Stream orders (with items) for exports through a server-side cursor.
+        Rows are fetched batch_size at a time (yield_per); items are loaded per
+        batch (selectinload), so memory stays flat regardless of the row count.
+        
+        Args:
+            start_date: Only orders created at or after this time
+            end_date: Only orders created before this time (exclusive)
+            batch_size: Rows fetched per round trip
+            
+        Returns:
+            Iterable of Order objects ordered by id, or None on error
+        """
+        try:
+            db = get_db()
+            statement = select(Order).options(*load_options(Order, LIST_VIEW)).order_by(Order.id)
+            if start_date is not None:
+                statement = statement.where(Order.created_at >= start_date)
+            if end_date is not None:
+                statement = statement.where(Order.created_at < end_date)
+            return db.scalars(statement.execution_options(yield_per=batch_size))
+        except SQLAlchemyError as e:
+            logger.error(f"Error streaming orders for export: {e}")
+            return None
+    
     def create(self, order: Order) -> Optional[Order]:
         """
         Create a new order in the database.
@@ -162,23 +193,31 @@ class OrderRepository:
             logger.error(f"Error creating order for user {order.user_id}: {e}")
             return None
     
-    def update(self, order: Order) -> Optional[Order]:
+    def update(self, order: Order, expected_version: Optional[int] = None) -> Optional[Order]:
         """
-        Update an existing order.
+        Update an existing order (compare-and-swap on orders.version).
         
         Args:
             order: Order object with updated data
+            expected_version: Version the client last read (optional)
             
         Returns:
             Updated Order object or None on error
+            
+        Raises:
+            ConcurrencyConflictError: Order was modified by another request
         """
         try:
             db = get_db()
             # Merge the detached order object into the session
             updated_order = db.merge(order)
+            bump_version(updated_order, expected_version)
             db.flush()
             db.refresh(updated_order)
             return updated_order
+        except StaleDataError as e:
+            logger.warning(f"Concurrent update detected for order {order.id}: {e}")
+            raise ConcurrencyConflictError(f"Order {order.id} was modified by another request") from e
         except SQLAlchemyError as e:
             logger.error(f"Error updating order {order.id}: {e}")
             return None
@@ -9,16 +9,22 @@ Responsibilities:
 - Return lookups by different fields (id, order_id, user_id)
 - Advanced filtering capabilities (status)
 - Transaction management via session_scope
+- Eager loading via named list/detail profiles (load_profiles)
 
 Usage:
     repo = ReturnRepository()
     return_obj = repo.get_by_order_id(1)
     user_returns = repo.get_by_user_id(1)
 """
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable
 from sqlalchemy.exc import SQLAlchemyError
-from app.core.database import get_db
+from sqlalchemy import select
+from sqlalchemy.orm.exc import StaleDataError
+from app.core.database import get_db, bump_version
+from app.core.lib.error_utils import ConcurrencyConflictError
 from app.sales.models.returns import Return, ReturnItem, ReturnStatus
+from app.sales.repositories.load_profiles import load_options, LIST_VIEW, DETAIL_VIEW
+from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
@@ -39,7 +45,7 @@ class ReturnRepository:
         """
         try:
             db = get_db()
-            return db.query(Return).filter_by(id=return_id).first()
+            return db.query(Return).options(*load_options(Return, DETAIL_VIEW)).filter_by(id=return_id).first()
         except SQLAlchemyError as e:
             logger.error(f"Error fetching return by id {return_id}: {e}")
             return None
@@ -56,7 +62,7 @@ class ReturnRepository:
         """
         try:
             db = get_db()
-            return db.query(Return).filter_by(order_id=order_id).all()
+            return db.query(Return).options(*load_options(Return, LIST_VIEW)).filter_by(order_id=order_id).all()
         except SQLAlchemyError as e:
             logger.error(f"Error fetching returns by order_id {order_id}: {e}")
             return []
@@ -73,7 +79,7 @@ class ReturnRepository:
         """
         try:
             db = get_db()
-            return db.query(Return).filter_by(user_id=user_id).all()
+            return db.query(Return).options(*load_options(Return, LIST_VIEW)).filter_by(user_id=user_id).all()
         except SQLAlchemyError as e:
             logger.error(f"Error fetching returns by user_id {user_id}: {e}")
             return []
@@ -87,7 +93,7 @@ class ReturnRepository:
         """
         try:
             db = get_db()
-            return db.query(Return).all()
+            return db.query(Return).options(*load_options(Return, LIST_VIEW)).all()
         except SQLAlchemyError as e:
             logger.error(f"Error fetching all returns: {e}")
             return []
@@ -112,7 +118,7 @@ class ReturnRepository:
         """
         try:
             db = get_db()
-            query = db.query(Return)
+            query = db.query(Return).options(*load_options(Return, LIST_VIEW))
             
             # Apply filters
             if 'user_id' in filters:
@@ -144,6 +150,33 @@ class ReturnRepository:
             logger.error(f"Error fetching returns with filters: {e}")
             return []
     
+    def stream_for_export(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None,
+                          batch_size: int = 1000) -> Optional[Iterable[Return]]:
+        """
+        Stream returns (with items) for exports through a server-side cursor.
+        Rows are fetched batch_size at a time (yield_per); items are loaded per
+        batch (selectinload), so memory stays flat regardless of the row count.
+        
+        Args:
+            start_date: Only returns created at or after this time
+            end_date: Only returns created before this time (exclusive)
+            batch_size: Rows fetched per round trip
+            
+        Returns:
+            Iterable of Return objects ordered by id, or None on error
+        """
+        try:
+            db = get_db()
+            statement = select(Return).options(*load_options(Return, LIST_VIEW)).order_by(Return.id)
+            if start_date is not None:
+                statement = statement.where(Return.created_at >= start_date)
+            if end_date is not None:
+                statement = statement.where(Return.created_at < end_date)
+            return db.scalars(statement.execution_options(yield_per=batch_size))
+        except SQLAlchemyError as e:
+            logger.error(f"Error streaming returns for export: {e}")
+            return None
+    
     def create(self, return_obj: Return) -> Optional[Return]:
         """
         Create a new return in the database.
@@ -164,23 +197,31 @@ class ReturnRepository:
             logger.error(f"Error creating return for order {return_obj.order_id}: {e}")
             return None
     
-    def update(self, return_obj: Return) -> Optional[Return]:
+    def update(self, return_obj: Return, expected_version: Optional[int] = None) -> Optional[Return]:
         """
-        Update an existing return.
+        Update an existing return (compare-and-swap on returns.version).
         
         Args:
             return_obj: Return object with updated data
+            expected_version: Version the client last read (optional)
             
         Returns:
             Updated Return object or None on error
+            
+        Raises:
+            ConcurrencyConflictError: Return was modified by another request
         """
         try:
             db = get_db()
             # Merge the detached return object into the session
             updated_return = db.merge(return_obj)
+            bump_version(updated_return, expected_version)
             db.flush()
             db.refresh(updated_return)
             return updated_return
+        except StaleDataError as e:
+            logger.warning(f"Concurrent update detected for return {return_obj.id}: {e}")
+            raise ConcurrencyConflictError(f"Return {return_obj.id} was modified by another request") from e
         except SQLAlchemyError as e:
             logger.error(f"Error updating return {return_obj.id}: {e}")
             return None
@@ -6,6 +6,7 @@ This package contains all RESTful API route definitions for the sales module:
 - order_routes: Order processing and tracking endpoints  
 - invoice_routes: Invoicing and payment tracking endpoints
 - returns_routes: Returns and refunds processing endpoints
+- export_routes: Streaming CSV/NDJSON export endpoints
 
 Each route module provides:
 - RESTful CRUD operations
@@ -20,10 +21,12 @@ from . import cart_routes
 from . import order_routes
 from . import invoice_routes  
 from . import returns_routes
+from . import export_routes
 
 __all__ = [
     'cart_routes',
     'order_routes',
     'invoice_routes',
-    'returns_routes'
+    'returns_routes',
+    'export_routes'
 ]
\ No newline at end of file
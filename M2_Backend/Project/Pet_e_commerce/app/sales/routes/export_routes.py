@@ -0,0 +1,46 @@
+"""
+Sales Export Routes Module
+
+Provides streaming export endpoints (admin only):
+- GET /orders/export - Orders with items as CSV or NDJSON
+- GET /invoices/export - Invoices as CSV or NDJSON
+- GET /returns/export - Returns with items as CSV or NDJSON
+
+Query params: format=csv|ndjson, from/to (ISO date or datetime).
+
+Features:
+- Server-side cursor: rows are fetched in batches, never loaded all at once
+- Response is streamed chunk by chunk as a file download
+- Export logic delegated to SalesExportController
+"""
+# Common imports
+from flask.views import MethodView
+
+# Auth imports (for decorators)
+from app.core.middleware import admin_required_with_repo
+
+# Controller imports
+from app.sales.controllers.export_controller import SalesExportController
+
+
+class SalesExportAPI(MethodView):
+    """Streaming export of one sales resource (orders, invoices or returns)."""
+    init_every_request = False
+
+    def __init__(self):
+        self.controller = SalesExportController()
+
+    @admin_required_with_repo
+    def get(self, resource):
+        """Stream the export file (admin only)."""
+        return self.controller.export(resource)
+
+
+def register_export_routes(sales_bp):
+    # Streaming exports (static paths; the int converters on /<id> routes never match "export")
+    sales_bp.add_url_rule('/orders/export', defaults={'resource': 'orders'},
+                          view_func=SalesExportAPI.as_view('order_export'))
+    sales_bp.add_url_rule('/invoices/export', defaults={'resource': 'invoices'},
+                          view_func=SalesExportAPI.as_view('invoice_export'))
+    sales_bp.add_url_rule('/returns/export', defaults={'resource': 'returns'},
+                          view_func=SalesExportAPI.as_view('return_export'))
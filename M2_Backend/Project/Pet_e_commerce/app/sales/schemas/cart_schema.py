@@ -103,6 +103,7 @@ class CartResponseSchema(Schema):
     total = fields.Method("get_total", dump_only=True)
     item_count = fields.Method("get_item_count", dump_only=True)
     created_at = fields.DateTime(dump_only=True)
+    version = fields.Integer(dump_only=True)
     
     def get_total(self, obj):
         """
@@ -139,6 +140,7 @@ class CartUpdateSchema(Schema):
     Validates new item list for cart updates.
     """
     items = fields.List(fields.Nested(CartItemSchema), required=True)
+    version = fields.Integer(validate=Range(min=1))  # Optional: expected version (409 on mismatch)
 
 # Schema instances for easy import
 cart_registration_schema = CartRegistrationSchema()
@@ -67,6 +67,7 @@ class InvoiceUpdateSchema(Schema):
 	"""
 	due_date = fields.DateTime()
 	status = fields.String()
+	version = fields.Integer(validate=Range(min=1))  # Optional: expected version (409 on mismatch)
 	
 	@validates('status')
 	def validate_status(self, value, **kwargs):
@@ -120,6 +121,7 @@ class InvoiceResponseSchema(Schema):
 	due_date = fields.DateTime()
 	status = fields.Method("get_status_name", dump_only=True)
 	created_at = fields.DateTime(dump_only=True)
+	version = fields.Integer(dump_only=True)
 	is_overdue = fields.Method("get_is_overdue", dump_only=True)
     
 	def get_status_name(self, obj):
@@ -131,6 +131,7 @@ class OrderUpdateSchema(Schema):
     items = fields.List(fields.Nested(OrderItemSchema), validate=Length(min=1, max=50))
     status = fields.String()
     shipping_address = fields.String(validate=Length(min=5, max=500))
+    version = fields.Integer(validate=Range(min=1))  # Optional: expected version (409 on mismatch)
     
     @validates('status')
     def validate_status(self, value, **kwargs):
@@ -187,6 +188,7 @@ class OrderResponseSchema(Schema):
     shipping_address = fields.String()
     order_date = fields.DateTime(dump_only=True)
     estimated_delivery = fields.DateTime(dump_only=True)
+    version = fields.Integer(dump_only=True)
     
     def get_status_name(self, obj):
         """Convert status ID to user-friendly name."""
@@ -151,6 +151,7 @@ class ReturnUpdateSchema(Schema):
     """
     items = fields.List(fields.Nested(ReturnItemSchema), validate=Length(min=1, max=50))
     status = fields.String()
+    version = fields.Integer(validate=Range(min=1))  # Optional: expected version (409 on mismatch)
     
     @validates('status')
     def validate_status(self, value, **kwargs):
@@ -201,6 +202,7 @@ class ReturnResponseSchema(Schema):
     status = fields.Method("get_status_name", dump_only=True)
     total_refund = fields.Float(dump_only=True)  # ✅ Read-only: calculated from items
     created_at = fields.DateTime(dump_only=True)
+    version = fields.Integer(dump_only=True)
     
     def get_status_name(self, obj):
         """Convert return_status_id to status name for API response."""
@@ -6,6 +6,7 @@ This package contains all business logic services for the sales module:
 - OrderService: Order processing and lifecycle management
 - InvoiceService: Invoice and payment tracking
 - ReturnService: Returns and refunds processing
+- SalesExportService: Streaming CSV/NDJSON exports
 
 Each service handles:
 - CRUD operations for their respective domain
@@ -18,10 +19,12 @@ from .cart_service import CartService
 from .order_service import OrderService
 from .invoice_service import InvoiceService
 from .returns_service import ReturnService
+from .export_service import SalesExportService
 
 __all__ = [
     'CartService',
     'OrderService', 
     'InvoiceService',
-    'ReturnService'
+    'ReturnService',
+    'SalesExportService'
 ]
\ No newline at end of file
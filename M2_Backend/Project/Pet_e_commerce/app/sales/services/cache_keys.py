@@ -0,0 +1,19 @@
+"""
+Sales Cache Keys Module
+
+Cache keys of other resources that sales mutations must invalidate.
+
+- USER_SUMMARY_KEYS: User profile and user list entries embed the
+  user_stats account summary (order count, spend, open invoices, pending
+  returns), which changes with the user's orders, invoices and returns.
+  Used in @cache_invalidate lists; the owner comes from
+  set_invalidation_context(user_id=...).
+"""
+from app.core.middleware.cache_decorators import context_key
+
+USER_SUMMARY_KEYS = [
+    context_key("user:v1:{user_id}:sensitive=True"),
+    context_key("user:v1:{user_id}:sensitive=False"),
+    lambda self, *args, **kwargs: "user:v1:all:sensitive=True",
+    lambda self, *args, **kwargs: "user:v1:all:sensitive=False",
+]
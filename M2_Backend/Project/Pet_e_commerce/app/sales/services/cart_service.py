@@ -6,7 +6,8 @@ This module provides comprehensive cart management functionality including:
 - Cart item management (add, update, remove items)
 - Business logic for cart calculations and validation
 - Caching support for improved performance
-- Uses CartRepository for data access layer
+- Uses CartRepository (PostgreSQL) or CartRedisRepository (Redis-resident
+  open carts) depending on CART_STORAGE_MODE
 
 Used by: CartController for API operations
 Dependencies: Cart models, CartRepository, CacheHelper
@@ -16,12 +17,21 @@ Cache Strategy:
 - Keys: "cart:v1:{user_id}" for single carts, "cart:v1:all" for all carts
 - TTL: 300s (5 min - carts change frequently)
 - Invalidation: On create, update, delete, and item modifications
+
+Storage Modes (CART_STORAGE_MODE):
+- "database": every cart write goes through CartRepository into PostgreSQL
+- "redis": open carts live in Redis hashes with a TTL and reach PostgreSQL
+  only at checkout (checkout_cart) or via the write-behind flusher
+  (scripts/flush_carts.py). Carts created for orders (force_create) are
+  always persisted.
 """
 from datetime import datetime
 from typing import List, Optional, Dict, Any
 import logging
 from config.logging import EXC_INFO_LOG_ERRORS
+from config.settings import CART_STORAGE_MODE
 from app.sales.repositories.cart_repository import CartRepository
+from app.sales.repositories.cart_redis_repository import CartRedisRepository
 from app.sales.models.cart import Cart, CartItem
 from app.sales.schemas.cart_schema import (
     cart_response_schema, 
@@ -29,6 +39,7 @@ from app.sales.schemas.cart_schema import (
     CartResponseSchema
 )
 from app.core.middleware.cache_decorators import CacheHelper, cache_invalidate
+from app.core.lib.error_utils import ConcurrencyConflictError
 
 logger = logging.getLogger(__name__)
 
@@ -40,11 +51,21 @@ class CartService:
     and data validation. Provides a clean interface for controllers.
     """
 
-    def __init__(self):
-        """Initialize cart service with repository and cache helper."""
-        self.repository = CartRepository()
+    def __init__(self, storage_mode: str = CART_STORAGE_MODE):
+        """
+        Initialize cart service with repository and cache helper.
+        
+        Args:
+            storage_mode: "database" or "redis" (default: CART_STORAGE_MODE setting)
+        """
+        self.storage_mode = storage_mode
+        self.database_repository = CartRepository()
+        if storage_mode == "redis":
+            self.repository = CartRedisRepository(self.database_repository)
+        else:
+            self.repository = self.database_repository
         self.logger = logger
-        self.cache = CacheHelper(resource_name="cart", version="v1")
+        self.cache_helper = CacheHelper(resource_name="cart", version="v1")
 
     # ============================================
     # CACHED RETRIEVAL METHODS
@@ -55,13 +76,19 @@ class CartService:
         Retrieve cart by user ID with caching.
         Returns Marshmallow-serialized dict for consistent caching.
         
+        In redis storage mode the open cart already lives in Redis, so it is
+        read directly instead of being copied into a second cache key.
+        
         Args:
             user_id: User ID to retrieve cart for
             
         Returns:
             Serialized cart dict or None if not found
         """
-        return self.cache.get_or_set(
+        if self.storage_mode == "redis":
+            cart = self.repository.get_by_user_id(user_id)
+            return CartResponseSchema().dump(cart) if cart else None
+        return self.cache_helper.get_or_set(
             cache_key=str(user_id),
             fetch_func=lambda: self.repository.get_by_user_id(user_id),
             schema_class=CartResponseSchema,
@@ -76,7 +103,7 @@ class CartService:
         Returns:
             List of serialized cart dicts
         """
-        return self.cache.get_or_set(
+        return self.cache_helper.get_or_set(
             cache_key="all",
             fetch_func=lambda: self.repository.get_all(),
             schema_class=CartResponseSchema,
@@ -154,7 +181,7 @@ class CartService:
             if not force_create:
                 existing_cart = self.repository.get_by_user_id(user_id)
                 if existing_cart:
-                    self.logger.warning(f"Attempt to create duplicate cart for user {user_id}")
+                    self.logger.warning("Attempt to create duplicate cart for user %s", user_id)
                     return None
             
             # Extract and convert items from dicts to CartItem objects
@@ -176,18 +203,19 @@ class CartService:
                 )
                 cart.items.append(cart_item)
             
-            # Save to database
-            created_cart = self.repository.create(cart)
+            # Save cart (carts created for orders always go to the database)
+            repository = self.database_repository if force_create else self.repository
+            created_cart = repository.create(cart)
             
             if created_cart:
-                self.logger.info(f"Cart created successfully for user {user_id} with {len(items_data)} items")
+                self.logger.info("Cart created successfully for user %s with %s items", user_id, len(items_data))
             else:
-                self.logger.error(f"Failed to create cart for user {user_id}")
+                self.logger.error("Failed to create cart for user %s", user_id)
             
             return created_cart
             
         except Exception as e:
-            self.logger.error(f"Error creating cart: {e}", exc_info=EXC_INFO_LOG_ERRORS)
+            self.logger.error("Error creating cart: %s", e, exc_info=EXC_INFO_LOG_ERRORS)
             return None
 
     @cache_invalidate([
@@ -201,14 +229,19 @@ class CartService:
         Args:
             user_id: User ID whose cart to update
             **updates: Fields to update (items, finalized, etc.)
+                - version: optional expected cart version (compare-and-swap)
             
         Returns:
             Updated Cart object or None on error
+            
+        Raises:
+            ConcurrencyConflictError: Cart was modified by another request
         """
         try:
+            expected_version = updates.pop('version', None)
             existing_cart = self.repository.get_by_user_id(user_id)
             if not existing_cart:
-                self.logger.warning(f"Attempt to update non-existent cart for user {user_id}")
+                self.logger.warning("Attempt to update non-existent cart for user %s", user_id)
                 return None
             
             # Update items if provided
@@ -217,10 +250,12 @@ class CartService:
                 existing_cart.items.clear()
                 
                 # Flush to ensure items are deleted before adding new ones
-                # This prevents unique constraint violations
-                from app.core.database import get_db
-                db = get_db()
-                db.flush()
+                # This prevents unique constraint violations (Redis carts are
+                # transient and must not open a database transaction)
+                if self.storage_mode == "database":
+                    from app.core.database import get_db
+                    db = get_db()
+                    db.flush()
                 
                 # Convert item dicts to CartItem objects and append to cart
                 items_data = updates['items']
@@ -232,23 +267,25 @@ class CartService:
                     )
                     existing_cart.items.append(cart_item)
                 
-                self.logger.info(f"Updated cart items for user {user_id}: {len(items_data)} items")
+                self.logger.info("Updated cart items for user %s: %s items", user_id, len(items_data))
             
             if 'finalized' in updates:
                 existing_cart.finalized = updates['finalized']
             
             # Save updated cart
-            updated_cart = self.repository.update(existing_cart)
+            updated_cart = self.repository.update(existing_cart, expected_version=expected_version)
             
             if updated_cart:
-                self.logger.info(f"Cart updated successfully for user {user_id}")
+                self.logger.info("Cart updated successfully for user %s", user_id)
             else:
-                self.logger.error(f"Failed to update cart for user {user_id}")
+                self.logger.error("Failed to update cart for user %s", user_id)
             
             return updated_cart
             
+        except ConcurrencyConflictError:
+            raise
         except Exception as e:
-            self.logger.error(f"Error updating cart: {e}", exc_info=EXC_INFO_LOG_ERRORS)
+            self.logger.error("Error updating cart: %s", e, exc_info=EXC_INFO_LOG_ERRORS)
             return None
 
     @cache_invalidate([
@@ -269,14 +306,14 @@ class CartService:
             deleted = self.repository.delete_by_user_id(user_id)
             
             if deleted:
-                self.logger.info(f"Cart deleted successfully for user {user_id}")
+                self.logger.info("Cart deleted successfully for user %s", user_id)
             else:
-                self.logger.warning(f"Attempt to delete non-existent cart for user {user_id}")
+                self.logger.warning("Attempt to delete non-existent cart for user %s", user_id)
             
             return deleted
             
         except Exception as e:
-            self.logger.error(f"Error deleting cart: {e}", exc_info=EXC_INFO_LOG_ERRORS)
+            self.logger.error("Error deleting cart: %s", e, exc_info=EXC_INFO_LOG_ERRORS)
             return False
 
     @cache_invalidate([
@@ -302,17 +339,17 @@ class CartService:
             # Get or create cart for user
             cart = self.repository.get_by_user_id(user_id)
             if not cart:
-                self.logger.info(f"Creating new cart for user {user_id}")
+                self.logger.info("Creating new cart for user %s", user_id)
                 cart_data = {'user_id': user_id, 'finalized': False, 'created_at': datetime.utcnow()}
                 cart = Cart(**cart_data)
                 cart = self.repository.create(cart)
                 if not cart:
-                    self.logger.error(f"Failed to create cart for user {user_id}")
+                    self.logger.error("Failed to create cart for user %s", user_id)
                     return None
             
             # Check if cart is finalized
             if cart.finalized:
-                self.logger.warning(f"Attempt to modify finalized cart for user {user_id}")
+                self.logger.warning("Attempt to modify finalized cart for user %s", user_id)
                 return None
             
             # Get product and validate
@@ -320,15 +357,18 @@ class CartService:
             product = product_service.get_product_by_id(product_id)
             
             if not product:
-                self.logger.warning(f"Product {product_id} not found")
+                self.logger.warning("Product %s not found", product_id)
                 return None
             
             if not product.is_active:
-                self.logger.warning(f"Attempt to add inactive product {product_id}")
+                self.logger.warning("Attempt to add inactive product %s", product_id)
                 return None
             
             if product.stock_quantity < quantity:
-                self.logger.warning(f"Insufficient stock for product {product_id}. Requested: {quantity}, Available: {product.stock_quantity}")
+                self.logger.warning(
+                    "Insufficient stock for product %s. Requested: %s, Available: %s",
+                    product_id, quantity, product.stock_quantity
+                )
                 return None
             
             # Check if item already exists in cart
@@ -342,7 +382,7 @@ class CartService:
             if existing_item:
                 existing_item.quantity += quantity
                 existing_item.amount = product.price * existing_item.quantity
-                self.logger.info(f"Updated quantity for product {product_id} in cart for user {user_id}")
+                self.logger.info("Updated quantity for product %s in cart for user %s", product_id, user_id)
             else:
                 new_item = CartItem(
                     product_id=product_id,
@@ -351,20 +391,22 @@ class CartService:
                     quantity=quantity
                 )
                 cart.items.append(new_item)
-                self.logger.info(f"Added product {product_id} to cart for user {user_id}")
+                self.logger.info("Added product %s to cart for user %s", product_id, user_id)
             
             # Save updated cart
             updated_cart = self.repository.update(cart)
             
             if updated_cart:
-                self.logger.info(f"Cart updated successfully for user {user_id}")
+                self.logger.info("Cart updated successfully for user %s", user_id)
             else:
-                self.logger.error(f"Failed to update cart for user {user_id}")
+                self.logger.error("Failed to update cart for user %s", user_id)
             
             return updated_cart
             
+        except ConcurrencyConflictError:
+            raise
         except Exception as e:
-            self.logger.error(f"Error adding item to cart: {e}", exc_info=EXC_INFO_LOG_ERRORS)
+            self.logger.error("Error adding item to cart: %s", e, exc_info=EXC_INFO_LOG_ERRORS)
             return None
 
     @cache_invalidate([
@@ -386,11 +428,11 @@ class CartService:
         try:
             cart = self.repository.get_by_user_id(user_id)
             if not cart:
-                self.logger.warning(f"Cart not found for user {user_id}")
+                self.logger.warning("Cart not found for user %s", user_id)
                 return None
             
             if cart.finalized:
-                self.logger.warning(f"Attempt to modify finalized cart for user {user_id}")
+                self.logger.warning("Attempt to modify finalized cart for user %s", user_id)
                 return None
             
             # Find the item
@@ -401,7 +443,7 @@ class CartService:
                     if quantity <= 0:
                         # Remove item if quantity is 0 or negative
                         cart.items.remove(item)
-                        self.logger.info(f"Removed product {product_id} from cart (quantity <= 0)")
+                        self.logger.info("Removed product %s from cart (quantity <= 0)", product_id)
                     else:
                         from app.products.services.product_service import ProductService
                         prod_service = ProductService()
@@ -409,28 +451,30 @@ class CartService:
                         if product:
                             item.quantity = quantity
                             item.amount = product.price * quantity
-                            self.logger.info(f"Updated quantity to {quantity} for product {product_id}")
+                            self.logger.info("Updated quantity to %s for product %s", quantity, product_id)
                         else:
-                            self.logger.error(f"Product {product_id} not found during quantity update")
+                            self.logger.error("Product %s not found during quantity update", product_id)
                             return None
                     break
             
             if not item_found:
-                self.logger.warning(f"Product {product_id} not found in cart for user {user_id}")
+                self.logger.warning("Product %s not found in cart for user %s", product_id, user_id)
                 return None
             
             # Save updated cart
             updated_cart = self.repository.update(cart)
             
             if updated_cart:
-                self.logger.info(f"Cart updated successfully for user {user_id}")
+                self.logger.info("Cart updated successfully for user %s", user_id)
             else:
-                self.logger.error(f"Failed to update cart for user {user_id}")
+                self.logger.error("Failed to update cart for user %s", user_id)
             
             return updated_cart
             
+        except ConcurrencyConflictError:
+            raise
         except Exception as e:
-            self.logger.error(f"Error updating item quantity: {e}", exc_info=EXC_INFO_LOG_ERRORS)
+            self.logger.error("Error updating item quantity: %s", e, exc_info=EXC_INFO_LOG_ERRORS)
             return None
 
     @cache_invalidate([
@@ -451,30 +495,63 @@ class CartService:
         try:
             cart = self.repository.get_by_user_id(user_id)
             if not cart:
-                self.logger.warning(f"Attempt to remove item from non-existent cart for user {user_id}")
+                self.logger.warning("Attempt to remove item from non-existent cart for user %s", user_id)
                 return False
             
             original_count = len(cart.items)
             cart.items = [item for item in cart.items if item.product_id != product_id]
             
             if len(cart.items) == original_count:
-                self.logger.warning(f"Attempt to remove non-existent product {product_id} from cart for user {user_id}")
+                self.logger.warning("Attempt to remove non-existent product %s from cart for user %s", product_id, user_id)
                 return False
             
             # Save updated cart
             updated_cart = self.repository.update(cart)
             
             if updated_cart:
-                self.logger.info(f"Item {product_id} removed from cart for user {user_id}")
+                self.logger.info("Item %s removed from cart for user %s", product_id, user_id)
                 return True
             else:
-                self.logger.error(f"Failed to update cart after removing item for user {user_id}")
+                self.logger.error("Failed to update cart after removing item for user %s", user_id)
                 return False
                 
+        except ConcurrencyConflictError:
+            raise
         except Exception as e:
-            self.logger.error(f"Error removing item: {e}", exc_info=EXC_INFO_LOG_ERRORS)
+            self.logger.error("Error removing item: %s", e, exc_info=EXC_INFO_LOG_ERRORS)
             return False
 
+    # ========== CHECKOUT ==========
+    @cache_invalidate([
+        lambda self, user_id, **kwargs: f"cart:v1:{user_id}",
+        lambda self, *args, **kwargs: "cart:v1:all"
+    ])
+    def checkout_cart(self, user_id: int) -> Optional[Cart]:
+        """
+        Get the user's open cart as a persisted row, ready to attach to an order.
+        
+        In redis storage mode the Redis cart is written to PostgreSQL and
+        removed from Redis (an empty cart is created if the user has none).
+        In database mode this is the user's open cart.
+        
+        Args:
+            user_id: User ID whose cart to check out
+            
+        Returns:
+            Persisted Cart object or None if not found / on error
+        """
+        try:
+            if self.storage_mode == "redis":
+                cart = self.repository.persist(user_id)
+                if cart:
+                    self.logger.info("Persisted Redis cart for user %s as cart %s", user_id, cart.id)
+                return cart
+            return self.repository.get_by_user_id(user_id)
+            
+        except Exception as e:
+            self.logger.error("Error checking out cart: %s", e, exc_info=EXC_INFO_LOG_ERRORS)
+            return None
+
     # ========== CART FINALIZATION ==========
     def finalize_cart(self, cart_id: int) -> Optional[Cart]:
         """
@@ -490,14 +567,16 @@ class CartService:
             finalized_cart = self.repository.finalize_cart(cart_id)
             
             if finalized_cart:
-                self.logger.info(f"Cart {cart_id} finalized successfully")
+                self.logger.info("Cart %s finalized successfully", cart_id)
             else:
-                self.logger.warning(f"Failed to finalize cart {cart_id}")
+                self.logger.warning("Failed to finalize cart %s", cart_id)
             
             return finalized_cart
             
+        except ConcurrencyConflictError:
+            raise
         except Exception as e:
-            self.logger.error(f"Error finalizing cart: {e}", exc_info=EXC_INFO_LOG_ERRORS)
+            self.logger.error("Error finalizing cart: %s", e, exc_info=EXC_INFO_LOG_ERRORS)
             return None
 
     # ========== VALIDATION HELPERS ==========
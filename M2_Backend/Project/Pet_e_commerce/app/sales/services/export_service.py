@@ -0,0 +1,188 @@
+"""
+Sales Export Service Module
+
+Streaming CSV/NDJSON exports of orders, invoices and returns.
+
+Flow:
+1. The repository opens a server-side cursor (yield_per=EXPORT_BATCH_SIZE)
+   filtered by created_at range and ordered by id
+2. Each ORM row is converted to a flat dict (status names from ReferenceData)
+3. Rows are encoded one at a time and flushed in ~64KB chunks
+
+Nothing is accumulated, so memory stays flat regardless of export size. The
+returned generator is meant for a streamed Flask response
+(stream_with_context keeps the session open while it is consumed).
+
+Usage:
+    service = SalesExportService()
+    chunks = service.export("orders", "csv", start_date=start, end_date=end)
+    if chunks is not None:
+        return Response(stream_with_context(chunks), mimetype="text/csv")
+"""
+import csv
+import io
+import json
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+from app.sales.repositories.order_repository import OrderRepository
+from app.sales.repositories.invoice_repository import InvoiceRepository
+from app.sales.repositories.return_repository import ReturnRepository
+from app.core.reference_data import ReferenceData
+from config.settings import EXPORT_BATCH_SIZE
+
+logger = logging.getLogger(__name__)
+
+# Format -> mimetype
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+# Encoded output is buffered up to this size before being yielded
+CHUNK_SIZE = 64 * 1024
+
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def order_row(order) -> Dict[str, Any]:
+    return {
+        "id": order.id,
+        "user_id": order.user_id,
+        "status": ReferenceData.get_order_status_name(order.order_status_id),
+        "total_amount": order.total_amount,
+        "created_at": _iso(order.created_at),
+        "shipping_address": order.shipping_address,
+        "items": [
+            {"product_id": item.product_id, "quantity": item.quantity, "amount": item.amount}
+            for item in order.items
+        ],
+    }
+
+
+def invoice_row(invoice) -> Dict[str, Any]:
+    return {
+        "id": invoice.id,
+        "order_id": invoice.order_id,
+        "user_id": invoice.user_id,
+        "status": ReferenceData.get_invoice_status_name(invoice.invoice_status_id),
+        "total_amount": invoice.total_amount,
+        "created_at": _iso(invoice.created_at),
+        "due_date": _iso(invoice.due_date),
+    }
+
+
+def return_row(return_obj) -> Dict[str, Any]:
+    return {
+        "id": return_obj.id,
+        "order_id": return_obj.order_id,
+        "user_id": return_obj.user_id,
+        "status": ReferenceData.get_return_status_name(return_obj.return_status_id),
+        "total_amount": return_obj.total_amount,
+        "created_at": _iso(return_obj.created_at),
+        "items": [
+            {"product_id": item.product_id, "quantity": item.quantity,
+             "amount": item.amount, "reason": item.reason}
+            for item in return_obj.items
+        ],
+    }
+
+
+# Resource -> (CSV columns, row builder)
+EXPORT_RESOURCES: Dict[str, tuple] = {
+    "orders": (["id", "user_id", "status", "total_amount", "created_at", "shipping_address", "items"], order_row),
+    "invoices": (["id", "order_id", "user_id", "status", "total_amount", "created_at", "due_date"], invoice_row),
+    "returns": (["id", "order_id", "user_id", "status", "total_amount", "created_at", "items"], return_row),
+}
+
+
+def encode_csv(rows: Iterable[Dict[str, Any]], columns: List[str]) -> Iterator[str]:
+    """Encode rows as CSV (header first); list cells such as items are JSON-encoded."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, lineterminator="\n")
+    writer.writeheader()
+    for row in rows:
+        writer.writerow({
+            key: json.dumps(value) if isinstance(value, list) else value
+            for key, value in row.items()
+        })
+        if buffer.tell() >= CHUNK_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def encode_ndjson(rows: Iterable[Dict[str, Any]], columns: List[str]) -> Iterator[str]:
+    """Encode rows as one JSON object per line."""
+    parts, size = [], 0
+    for row in rows:
+        line = json.dumps(row, default=str) + "\n"
+        parts.append(line)
+        size += len(line)
+        if size >= CHUNK_SIZE:
+            yield "".join(parts)
+            parts, size = [], 0
+    if parts:
+        yield "".join(parts)
+
+
+ENCODERS: Dict[str, Callable[[Iterable[Dict[str, Any]], List[str]], Iterator[str]]] = {
+    "csv": encode_csv,
+    "ndjson": encode_ndjson,
+}
+
+
+class SalesExportService:
+    """Service class for streaming sales exports."""
+
+    def __init__(self, batch_size: int = EXPORT_BATCH_SIZE):
+        self.repositories = {
+            "orders": OrderRepository(),
+            "invoices": InvoiceRepository(),
+            "returns": ReturnRepository(),
+        }
+        self.batch_size = batch_size
+        self.logger = logger
+
+    def export(self, resource: str, file_format: str, start_date: Optional[datetime] = None,
+               end_date: Optional[datetime] = None) -> Optional[Iterator[str]]:
+        """
+        Open an export stream for orders, invoices or returns.
+
+        The query is started here (not lazily) so a database error can still be
+        reported as a normal error response before streaming begins.
+
+        Args:
+            resource: "orders", "invoices" or "returns"
+            file_format: "csv" or "ndjson"
+            start_date: Only rows created at or after this time
+            end_date: Only rows created before this time (exclusive)
+
+        Returns:
+            Generator of encoded text chunks, or None if the query failed
+
+        Raises:
+            ValueError: Unknown resource or format
+        """
+        if resource not in EXPORT_RESOURCES:
+            raise ValueError(f"Unknown export resource '{resource}'")
+        if file_format not in ENCODERS:
+            raise ValueError(f"Unsupported export format '{file_format}'. Use one of: {', '.join(EXPORT_FORMATS)}")
+
+        try:
+            records = self.repositories[resource].stream_for_export(
+                start_date=start_date, end_date=end_date, batch_size=self.batch_size
+            )
+            if records is None:
+                return None
+
+            columns, build_row = EXPORT_RESOURCES[resource]
+            self.logger.info(f"Streaming {resource} export ({file_format}, from={start_date}, to={end_date})")
+            return ENCODERS[file_format]((build_row(record) for record in records), columns)
+        except Exception as e:
+            self.logger.error(f"Error starting {resource} export: {e}")
+            return None
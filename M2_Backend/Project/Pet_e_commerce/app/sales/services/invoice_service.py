@@ -13,18 +13,24 @@ Key Changes:
 - Validates status using ReferenceData instead of enums
 - Added caching for invoice retrieval operations (TTL: 900s / 15 min)
 - Cache invalidation on mutations (create, update, delete, status change)
+- Set-based overdue sweep (one UPDATE per batch, one cache round trip)
 
 Used by: Invoice routes for API operations
 Dependencies: Invoice models, InvoiceRepository, ReferenceData, CacheHelper
 """
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 import logging
+import time
 from config.logging import EXC_INFO_LOG_ERRORS
 from app.sales.repositories.invoice_repository import InvoiceRepository
 from app.sales.models.invoice import Invoice
 from app.core.reference_data import ReferenceData
-from app.core.middleware.cache_decorators import CacheHelper, cache_invalidate
+from app.core.middleware.cache_decorators import CacheHelper, cache_invalidate, context_key, set_invalidation_context
+from app.sales.services.cache_keys import USER_SUMMARY_KEYS
+from app.core.lib.error_utils import ConcurrencyConflictError
+from app.core.metrics import counter, histogram
+from config.settings import INVOICE_SWEEP_BATCH_SIZE
 from app.sales.schemas.invoice_schema import (
     invoice_response_schema, 
     invoices_response_schema,
@@ -33,6 +39,9 @@ from app.sales.schemas.invoice_schema import (
 
 logger = logging.getLogger(__name__)
 
+OVERDUE_SWEEP_SECONDS = histogram("invoice_overdue_sweep_seconds", "Duration of one overdue invoice sweep batch")
+INVOICES_MARKED_OVERDUE = counter("invoices_marked_overdue_total", "Invoices moved to overdue by the sweep")
+
 
 class InvoiceService:
     """
@@ -171,44 +180,53 @@ class InvoiceService:
     # ============ INVOICE CREATION ============
     @cache_invalidate([
         lambda self, **invoice_data: f"invoice:v1:user:{invoice_data.get('user_id')}:all",
-        lambda self, **invoice_data: "invoice:v1:all"
+        lambda self, **invoice_data: "invoice:v1:all",
+        *USER_SUMMARY_KEYS
     ])
-    def create_invoice(self, **invoice_data) -> Optional[Invoice]:
+    def create_or_get_invoice(self, **invoice_data) -> Tuple[Optional[Invoice], bool]:
         """
         Create a new invoice with validation.
         
+        Idempotent per order: if the order already has an invoice, that
+        invoice is returned unchanged.
+        
         Args:
             **invoice_data: Invoice fields (order_id, user_id, total_amount, etc.)
             
         Returns:
-            Created Invoice object or None on error
+            Tuple of (Invoice, created): created is False when the order's
+            existing invoice is returned; (None, False) on error
         """
         try:
             # Validate required fields
             if not invoice_data.get('order_id'):
                 self.logger.error("Cannot create invoice without order_id")
-                return None
+                return None, False
             
             if not invoice_data.get('user_id'):
                 self.logger.error("Cannot create invoice without user_id")
-                return None
+                return None, False
+            set_invalidation_context(user_id=invoice_data['user_id'])
             
             # Check if invoice already exists for this order
             existing_invoice = self.repository.get_by_order_id(invoice_data['order_id'])
             if existing_invoice:
-                self.logger.warning(f"Invoice already exists for order {invoice_data['order_id']}")
-                return None
+                if existing_invoice.user_id != invoice_data['user_id']:
+                    self.logger.error(f"Invoice for order {invoice_data['order_id']} belongs to another user")
+                    return None, False
+                self.logger.info(f"Invoice already exists for order {invoice_data['order_id']}: {existing_invoice.id}")
+                return existing_invoice, False
             
             from app.sales.services.order_service import OrderService
             order_service = OrderService()
             order = order_service.get_order_by_id(invoice_data['order_id'])
             if not order:
                 self.logger.error(f"Order {invoice_data['order_id']} not found")
-                return None
+                return None, False
             
             if order.user_id != invoice_data['user_id']:
                 self.logger.error(f"Order {order.id} does not belong to user {invoice_data['user_id']}")
-                return None
+                return None, False
             
             invoice_data['total_amount'] = order.total_amount
             
@@ -217,7 +235,7 @@ class InvoiceService:
                 status_id = ReferenceData.get_invoice_status_id(status_name)
                 if status_id is None:
                     self.logger.error(f"Invalid invoice status: {status_name}")
-                    return None
+                    return None, False
                 invoice_data['invoice_status_id'] = status_id
             else:
                 # Set default status to 'draft' if not provided
@@ -227,7 +245,7 @@ class InvoiceService:
                     self.logger.debug(f"Set default invoice status to 'draft' (ID: {draft_id})")
                 else:
                     self.logger.error("Could not find 'draft' status in invoice_status table")
-                    return None
+                    return None, False
             
             invoice_data.setdefault('created_at', datetime.utcnow())
             
@@ -245,12 +263,12 @@ class InvoiceService:
             validation_errors = self.validate_invoice_data(invoice)
             if validation_errors:
                 self.logger.warning(f"Invoice validation failed: {'; '.join(validation_errors)}")
-                return None
+                return None, False
             
             integrity_errors = self._validate_total_integrity(invoice)
             if integrity_errors:
                 self.logger.error(f"Invoice total integrity check failed: {'; '.join(integrity_errors)}")
-                return None
+                return None, False
             
             created_invoice = self.repository.create(invoice)
             
@@ -259,17 +277,28 @@ class InvoiceService:
             else:
                 self.logger.error("Failed to create invoice")
             
-            return created_invoice
+            return created_invoice, created_invoice is not None
             
         except Exception as e:
             self.logger.error(f"Error creating invoice: {e}", exc_info=EXC_INFO_LOG_ERRORS)
-            return None
+            return None, False
+
+    def create_invoice(self, **invoice_data) -> Optional[Invoice]:
+        """
+        Create a new invoice, or return the order's existing one.
+        
+        Returns:
+            Created (or existing) Invoice object or None on error
+        """
+        invoice, _ = self.create_or_get_invoice(**invoice_data)
+        return invoice
 
     # ============ INVOICE UPDATE ============
     @cache_invalidate([
         lambda self, invoice_id, **updates: f"invoice:v1:{invoice_id}",
-        lambda self, invoice_id, **updates: f"invoice:v1:user:{self.repository.get_by_id(invoice_id).user_id if self.repository.get_by_id(invoice_id) else 0}:all",
-        lambda self, *args, **kwargs: "invoice:v1:all"
+        context_key("invoice:v1:user:{user_id}:all"),
+        lambda self, *args, **kwargs: "invoice:v1:all",
+        *USER_SUMMARY_KEYS
     ])
     def update_invoice(self, invoice_id: int, **updates) -> Optional[Invoice]:
         """
@@ -278,15 +307,21 @@ class InvoiceService:
         Args:
             invoice_id: Invoice ID to update
             **updates: Fields to update (total_amount, status, due_date, etc.)
+                - version: optional expected version (compare-and-swap)
             
         Returns:
             Updated Invoice object or None on error
+            
+        Raises:
+            ConcurrencyConflictError: Invoice was modified by another request
         """
         try:
+            expected_version = updates.pop('version', None)
             existing_invoice = self.repository.get_by_id(invoice_id)
             if not existing_invoice:
                 self.logger.warning(f"Attempt to update non-existent invoice {invoice_id}")
                 return None
+            set_invalidation_context(user_id=existing_invoice.user_id)
             
             if 'status' in updates:
                 status_name = updates.pop('status')
@@ -326,7 +361,7 @@ class InvoiceService:
                 return None
             
             # Save updated invoice
-            updated_invoice = self.repository.update(existing_invoice)
+            updated_invoice = self.repository.update(existing_invoice, expected_version=expected_version)
             
             if updated_invoice:
                 self.logger.info(f"Invoice updated successfully: {invoice_id}")
@@ -335,6 +370,8 @@ class InvoiceService:
             
             return updated_invoice
             
+        except ConcurrencyConflictError:
+            raise
         except Exception as e:
             self.logger.error(f"Error updating invoice: {e}", exc_info=EXC_INFO_LOG_ERRORS)
             return None
@@ -342,8 +379,9 @@ class InvoiceService:
     # ============ INVOICE DELETION ============
     @cache_invalidate([
         lambda self, invoice_id: f"invoice:v1:{invoice_id}",
-        lambda self, invoice_id: f"invoice:v1:user:{self.repository.get_by_id(invoice_id).user_id if self.repository.get_by_id(invoice_id) else 0}:all",
-        lambda self, *args, **kwargs: "invoice:v1:all"
+        context_key("invoice:v1:user:{user_id}:all"),
+        lambda self, *args, **kwargs: "invoice:v1:all",
+        *USER_SUMMARY_KEYS
     ])
     def delete_invoice(self, invoice_id: int) -> bool:
         """
@@ -360,6 +398,7 @@ class InvoiceService:
             if not invoice:
                 self.logger.warning(f"Attempt to delete non-existent invoice {invoice_id}")
                 return False
+            set_invalidation_context(user_id=invoice.user_id)
             
             deleted = self.repository.delete(invoice_id)
             
@@ -394,6 +433,60 @@ class InvoiceService:
         
         return self.update_invoice(invoice_id, invoice_status_id=status_id)
 
+    def sweep_overdue_invoices(self, batch_size: int = INVOICE_SWEEP_BATCH_SIZE,
+                               now: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+        """
+        Move one batch of past-due pending invoices to overdue (in the current transaction).
+        
+        The status change is a single UPDATE ... RETURNING; the affected invoice
+        and per-user list caches are invalidated in one round trip once the
+        caller commits.
+        
+        Args:
+            batch_size: Maximum invoices updated
+            now: Cut-off for due_date (default: current UTC time)
+            
+        Returns:
+            Dict with updated count, invoice_ids, user_ids and duration_ms, or None on error
+        """
+        started = time.perf_counter()
+        try:
+            pending_id = ReferenceData.get_invoice_status_id('pending')
+            overdue_id = ReferenceData.get_invoice_status_id('overdue')
+            if pending_id is None or overdue_id is None:
+                self.logger.error("Invoice statuses 'pending'/'overdue' are not configured")
+                return None
+            
+            rows = self.repository.mark_overdue(pending_id, overdue_id, now or datetime.utcnow(), batch_size)
+            if rows is None:
+                return None
+            
+            invoice_ids = [row.id for row in rows]
+            user_ids = sorted({row.user_id for row in rows})
+            if invoice_ids:
+                self.cache_helper.invalidate_many_after_commit(
+                    [str(invoice_id) for invoice_id in invoice_ids]
+                    + [f"user:{user_id}:all" for user_id in user_ids]
+                    + ["all"]
+                )
+            
+            duration = time.perf_counter() - started
+            OVERDUE_SWEEP_SECONDS.observe(duration)
+            INVOICES_MARKED_OVERDUE.inc(len(invoice_ids))
+            self.logger.info(
+                "Overdue sweep: %s invoice(s) of %s user(s) marked overdue in %.1fms",
+                len(invoice_ids), len(user_ids), duration * 1000
+            )
+            return {
+                "updated": len(invoice_ids),
+                "invoice_ids": invoice_ids,
+                "user_ids": user_ids,
+                "duration_ms": round(duration * 1000, 2)
+            }
+        except Exception as e:
+            self.logger.error(f"Error sweeping overdue invoices: {e}", exc_info=EXC_INFO_LOG_ERRORS)
+            return None
+
     # ============ VALIDATION HELPERS ============
     def validate_invoice_data(self, invoice: Invoice) -> List[str]:
         """
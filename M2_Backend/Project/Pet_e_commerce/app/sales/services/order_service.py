@@ -13,9 +13,10 @@ Key Changes:
 - Validates status using ReferenceData instead of enums
 - Added caching for order retrieval operations (TTL: 600s / 10 min)
 - Cache invalidation on mutations (create, update, delete, status change)
+- Optional invoice creation by a background job enqueued with the new order (ORDER_AUTO_INVOICE)
 
 Used by: Order routes for API operations
-Dependencies: Order models, OrderRepository, ReferenceData, CacheHelper
+Dependencies: Order models, OrderRepository, ReferenceData, CacheHelper, JobQueue
 """
 from datetime import datetime
 from typing import List, Optional, Dict, Any
@@ -24,7 +25,11 @@ from config.logging import EXC_INFO_LOG_ERRORS
 from app.sales.repositories.order_repository import OrderRepository
 from app.sales.models.order import Order, OrderItem
 from app.core.reference_data import ReferenceData
-from app.core.middleware.cache_decorators import CacheHelper, cache_invalidate
+from app.core.middleware.cache_decorators import CacheHelper, cache_invalidate, context_key, set_invalidation_context
+from app.sales.services.cache_keys import USER_SUMMARY_KEYS
+from app.core.lib.error_utils import ConcurrencyConflictError
+from app.core.jobs import JobQueue
+from config.settings import ORDER_AUTO_INVOICE
 from app.sales.schemas.order_schema import (
     order_response_schema, 
     orders_response_schema,
@@ -46,11 +51,18 @@ class OrderService:
     - Invalidation: On create, update, delete, status change
     """
 
-    def __init__(self):
-        """Initialize order service with repository and cache helper."""
+    def __init__(self, auto_invoice: bool = ORDER_AUTO_INVOICE):
+        """
+        Initialize order service with repository and cache helper.
+        
+        Args:
+            auto_invoice: Enqueue an invoice job with each new order (default: ORDER_AUTO_INVOICE setting)
+        """
         self.repository = OrderRepository()
         self.logger = logger
         self.cache_helper = CacheHelper(resource_name="order", version="v1")
+        self.job_queue = JobQueue()
+        self.auto_invoice = auto_invoice
 
     # ============ ORDER RETRIEVAL METHODS ============
     
@@ -172,7 +184,8 @@ class OrderService:
     # ============ ORDER CREATION ============
     @cache_invalidate([
         lambda self, **order_data: f"order:v1:user:{order_data.get('user_id')}:all",
-        lambda self, **order_data: "order:v1:all"
+        lambda self, **order_data: "order:v1:all",
+        *USER_SUMMARY_KEYS
     ])
     def create_order(self, **order_data) -> Optional[Order]:
         """
@@ -198,7 +211,7 @@ class OrderService:
                     return None
                 
                 order_data['order_status_id'] = status_id
-                self.logger.debug(f"Converted status '{status_name}' to ID {status_id}")
+                self.logger.debug("Converted status '%s' to ID %s", status_name, status_id)
             
             # Extract items before creating Order
             items_data = order_data.pop('items', [])
@@ -206,6 +219,7 @@ class OrderService:
             if not order_data.get('user_id'):
                 self.logger.error("Cannot create order without user_id")
                 return None
+            set_invalidation_context(user_id=order_data['user_id'])
             
             if not items_data:
                 self.logger.error("Cannot create order without items")
@@ -217,35 +231,35 @@ class OrderService:
                 from app.sales.services.cart_service import CartService  # Lazy import to avoid circular import
                 cart_service = CartService()
                 
-                # Check if user has an existing cart
-                existing_cart = cart_service.get_cart_by_user_id(order_data['user_id'])
+                # Check if user has an existing cart (persisted first when carts live in Redis)
+                existing_cart = cart_service.checkout_cart(order_data['user_id'])
                 
                 if existing_cart:
                     # Check if cart already has an order
                     existing_order = self.repository.get_by_cart_id(existing_cart.id)
                     if existing_order:
                         # Cart already has an order, delete the order first (cascading), then delete cart
-                        self.logger.debug(f"Cart {existing_cart.id} already has order {existing_order.id}, deleting both")
+                        self.logger.debug("Cart %s already has order %s, deleting both", existing_cart.id, existing_order.id)
                         self.repository.delete(existing_order.id)  # Delete order first
                         cart_service.delete_cart(order_data['user_id'])  # Then delete cart
                         # Create new cart with force_create=True to bypass duplicate check
                         new_cart = cart_service.create_cart(force_create=True, user_id=order_data['user_id'], items=[])
                         if new_cart:
                             order_data['cart_id'] = new_cart.id
-                            self.logger.debug(f"Created new cart {new_cart.id} for order")
+                            self.logger.debug("Created new cart %s for order", new_cart.id)
                         else:
                             self.logger.error(f"Failed to create new cart for user {order_data['user_id']}")
                             return None
                     else:
                         # Cart doesn't have an order yet, use it
                         order_data['cart_id'] = existing_cart.id
-                        self.logger.debug(f"Using existing cart {existing_cart.id} for order")
+                        self.logger.debug("Using existing cart %s for order", existing_cart.id)
                 else:
                     # No existing cart, create new one
                     new_cart = cart_service.create_cart(user_id=order_data['user_id'], items=[])
                     if new_cart:
                         order_data['cart_id'] = new_cart.id
-                        self.logger.debug(f"Created new cart {new_cart.id} for order")
+                        self.logger.debug("Created new cart %s for order", new_cart.id)
                     else:
                         self.logger.error(f"Failed to create cart for user {order_data['user_id']}")
                         return None
@@ -284,9 +298,15 @@ class OrderService:
                 cart_service = CartService()
                 finalized_cart = cart_service.finalize_cart(created_order.cart_id)
                 if finalized_cart:
-                    self.logger.debug(f"Cart {created_order.cart_id} marked as finalized")
+                    self.logger.debug("Cart %s marked as finalized", created_order.cart_id)
+                
+                # Invoice is created by a job worker; the job commits with the order
+                if self.auto_invoice:
+                    from app.sales.tasks import CREATE_INVOICE_TASK
+                    if self.job_queue.enqueue(CREATE_INVOICE_TASK, {"order_id": created_order.id}) is None:
+                        self.logger.warning(f"Invoice job not enqueued for order {created_order.id}")
                 
-                self.logger.info(f"Order created successfully: {created_order.id} with {len(items_data)} items")
+                self.logger.info("Order created successfully: %s with %s items", created_order.id, len(items_data))
             else:
                 self.logger.error("Failed to create order")
             
@@ -299,8 +319,9 @@ class OrderService:
     # ============ ORDER UPDATE ============
     @cache_invalidate([
         lambda self, order_id, **updates: f"order:v1:{order_id}",
-        lambda self, order_id, **updates: f"order:v1:user:{self.repository.get_by_id(order_id).user_id if self.repository.get_by_id(order_id) else 0}:all",
-        lambda self, *args, **kwargs: "order:v1:all"
+        context_key("order:v1:user:{user_id}:all"),
+        lambda self, *args, **kwargs: "order:v1:all",
+        *USER_SUMMARY_KEYS
     ])
     def update_order(self, order_id: int, **updates) -> Optional[Order]:
         """
@@ -311,15 +332,21 @@ class OrderService:
             order_id: Order ID to update
             **updates: Fields to update (items, status, shipping_address, etc.)
                 - status can be a string name - will be converted to order_status_id
+                - version: optional expected version (compare-and-swap)
             
         Returns:
             Updated Order object or None on error
+            
+        Raises:
+            ConcurrencyConflictError: Order was modified by another request
         """
         try:
+            expected_version = updates.pop('version', None)
             existing_order = self.repository.get_by_id(order_id)
             if not existing_order:
                 self.logger.warning(f"Attempt to update non-existent order {order_id}")
                 return None
+            set_invalidation_context(user_id=existing_order.user_id)
             
             if 'status' in updates:
                 status_name = updates.pop('status')
@@ -330,7 +357,7 @@ class OrderService:
                     return None
                 
                 updates['order_status_id'] = status_id
-                self.logger.debug(f"Converted status '{status_name}' to ID {status_id}")
+                self.logger.debug("Converted status '%s' to ID %s", status_name, status_id)
             
             if 'items' in updates:
                 # Extract items before processing
@@ -355,7 +382,7 @@ class OrderService:
                 
                 # Recalculate total from items (never trust input)
                 existing_order.total_amount = sum(item_data['amount'] for item_data in items_data)
-                self.logger.info(f"Updated order items for order {order_id}: {len(items_data)} items")
+                self.logger.info("Updated order items for order %s: %s items", order_id, len(items_data))
             
             if 'order_status_id' in updates:
                 existing_order.order_status_id = updates['order_status_id']
@@ -374,15 +401,17 @@ class OrderService:
                 self.logger.error(f"Order total integrity check failed: {'; '.join(integrity_errors)}")
                 return None
             
-            updated_order = self.repository.update(existing_order)
+            updated_order = self.repository.update(existing_order, expected_version=expected_version)
             
             if updated_order:
-                self.logger.info(f"Order updated successfully: {order_id}")
+                self.logger.info("Order updated successfully: %s", order_id)
             else:
                 self.logger.error(f"Failed to update order {order_id}")
             
             return updated_order
             
+        except ConcurrencyConflictError:
+            raise
         except Exception as e:
             self.logger.error(f"Error updating order: {e}", exc_info=EXC_INFO_LOG_ERRORS)
             return None
@@ -390,8 +419,9 @@ class OrderService:
     # ============ ORDER DELETION ============
     @cache_invalidate([
         lambda self, order_id: f"order:v1:{order_id}",
-        lambda self, order_id: f"order:v1:user:{self.repository.get_by_id(order_id).user_id if self.repository.get_by_id(order_id) else 0}:all",
-        lambda self, *args, **kwargs: "order:v1:all"
+        context_key("order:v1:user:{user_id}:all"),
+        lambda self, *args, **kwargs: "order:v1:all",
+        *USER_SUMMARY_KEYS
     ])
     def delete_order(self, order_id: int) -> bool:
         """
@@ -408,6 +438,7 @@ class OrderService:
             if not order:
                 self.logger.warning(f"Attempt to delete non-existent order {order_id}")
                 return False
+            set_invalidation_context(user_id=order.user_id)
             
             # Check if order can be deleted based on status
             # Only allow deletion of pending or cancelled orders
@@ -420,7 +451,7 @@ class OrderService:
             deleted = self.repository.delete(order_id)
             
             if deleted:
-                self.logger.info(f"Order deleted successfully: {order_id}")
+                self.logger.info("Order deleted successfully: %s", order_id)
             else:
                 self.logger.error(f"Failed to delete order {order_id}")
             
@@ -24,7 +24,9 @@ from config.logging import EXC_INFO_LOG_ERRORS
 from app.sales.repositories.return_repository import ReturnRepository
 from app.sales.models.returns import Return, ReturnItem
 from app.core.reference_data import ReferenceData
-from app.core.middleware.cache_decorators import CacheHelper, cache_invalidate
+from app.core.middleware.cache_decorators import CacheHelper, cache_invalidate, context_key, set_invalidation_context
+from app.sales.services.cache_keys import USER_SUMMARY_KEYS
+from app.core.lib.error_utils import ConcurrencyConflictError
 from app.sales.schemas.returns_schema import (
     return_response_schema, 
     returns_response_schema,
@@ -172,7 +174,8 @@ class ReturnService:
     # ============ RETURN CREATION ============
     @cache_invalidate([
         lambda self, **return_data: f"return:v1:user:{return_data.get('user_id')}:all",
-        lambda self, **return_data: "return:v1:all"
+        lambda self, **return_data: "return:v1:all",
+        *USER_SUMMARY_KEYS
     ])
     def create_return(self, **return_data) -> Optional[Return]:
         """
@@ -193,6 +196,7 @@ class ReturnService:
             if not return_data.get('user_id'):
                 self.logger.error("Cannot create return without user_id")
                 return None
+            set_invalidation_context(user_id=return_data['user_id'])
 
             if 'status' in return_data:
                 status_name = return_data.pop('status')
@@ -235,8 +239,9 @@ class ReturnService:
 
     @cache_invalidate([
         lambda self, return_id, **updates: f"return:v1:{return_id}",
-        lambda self, return_id, **updates: f"return:v1:user:{self.repository.get_by_id(return_id).user_id if self.repository.get_by_id(return_id) else 0}:all",
-        lambda self, *args, **kwargs: "return:v1:all"
+        context_key("return:v1:user:{user_id}:all"),
+        lambda self, *args, **kwargs: "return:v1:all",
+        *USER_SUMMARY_KEYS
     ])
     def update_return(self, return_id: int, **updates) -> Optional[Return]:
         """
@@ -245,15 +250,21 @@ class ReturnService:
         Args:
             return_id: Return ID to update
             **updates: Fields to update (items, status, total_refund, etc.)
+                - version: optional expected version (compare-and-swap)
             
         Returns:
             Updated Return object or None on error
+            
+        Raises:
+            ConcurrencyConflictError: Return was modified by another request
         """
         try:
+            expected_version = updates.pop('version', None)
             existing_return = self.repository.get_by_id(return_id)
             if not existing_return:
                 self.logger.warning(f"Attempt to update non-existent return {return_id}")
                 return None
+            set_invalidation_context(user_id=existing_return.user_id)
             
             if 'status' in updates:
                 status_name = updates.pop('status')
@@ -288,7 +299,7 @@ class ReturnService:
                 return None
                 
             # Save updated return
-            updated_return = self.repository.update(existing_return)
+            updated_return = self.repository.update(existing_return, expected_version=expected_version)
             
             if updated_return:
                 self.logger.info(f"Return updated successfully: {return_id}")
@@ -297,6 +308,8 @@ class ReturnService:
                 
             return updated_return
             
+        except ConcurrencyConflictError:
+            raise
         except Exception as e:
             self.logger.error(f"Error updating return: {e}", exc_info=EXC_INFO_LOG_ERRORS)
             return None
@@ -305,8 +318,9 @@ class ReturnService:
 
     @cache_invalidate([
         lambda self, return_id: f"return:v1:{return_id}",
-        lambda self, return_id: f"return:v1:user:{self.repository.get_by_id(return_id).user_id if self.repository.get_by_id(return_id) else 0}:all",
-        lambda self, *args, **kwargs: "return:v1:all"
+        context_key("return:v1:user:{user_id}:all"),
+        lambda self, *args, **kwargs: "return:v1:all",
+        *USER_SUMMARY_KEYS
     ])
     def delete_return(self, return_id: int) -> bool:
         """
@@ -326,6 +340,7 @@ class ReturnService:
             if not return_obj:
                 self.logger.warning(f"Attempt to delete non-existent return {return_id}")
                 return False
+            set_invalidation_context(user_id=return_obj.user_id)
                 
             # Check if return can be deleted based on status
             # Only allow deletion of requested or rejected returns
@@ -0,0 +1,41 @@
+"""
+Sales Background Tasks
+
+Deferred sales work run by the job workers (scripts/run_jobs.py).
+
+Tasks:
+- sales.create_invoice: Create the pending invoice of a new order
+
+Handlers are idempotent (a retried job must not duplicate work) and raise
+to signal a failure that should be retried.
+"""
+import logging
+from typing import Any, Dict
+from app.core.jobs import job_task
+from app.sales.repositories.invoice_repository import InvoiceRepository
+from app.sales.repositories.order_repository import OrderRepository
+
+logger = logging.getLogger(__name__)
+
+CREATE_INVOICE_TASK = "sales.create_invoice"
+
+
+@job_task(CREATE_INVOICE_TASK)
+def create_order_invoice(payload: Dict[str, Any]) -> None:
+    """Create the pending invoice for payload['order_id'] unless it already exists."""
+    from app.sales.services.invoice_service import InvoiceService  # Lazy import to avoid circular import
+
+    order_id = payload["order_id"]
+    if InvoiceRepository().get_by_order_id(order_id):
+        logger.debug("Invoice for order %s already exists, skipping", order_id)
+        return
+
+    order = OrderRepository().get_by_id(order_id)
+    if order is None:
+        logger.warning(f"Order {order_id} no longer exists, no invoice created")
+        return
+
+    invoice = InvoiceService().create_invoice(order_id=order.id, user_id=order.user_id, status="pending")
+    if invoice is None:
+        raise RuntimeError(f"Invoice creation failed for order {order_id}")
+    logger.info("Invoice %s created for order %s", invoice.id, order_id)
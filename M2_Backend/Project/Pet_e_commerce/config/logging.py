@@ -13,6 +13,24 @@ LOG_LEVEL controls the minimum severity of messages that will be logged (applies
 EXC_INFO_LOG_ERRORS controls whether stack traces are included in error logs across the app.
 Set to True for debugging, False for production if you want to hide stack traces.
 
+Pipeline:
+    Request threads only put records on a bounded queue (QueueHandler); a
+    background QueueListener formats and writes them. When the queue is full
+    records are dropped (counted in logging_dropped_records_total) instead of
+    blocking the request. Before a record is queued:
+    - Records below the logger's level are discarded without formatting
+      (use lazy arguments: logger.debug("Cart %s", cart_id), not f-strings)
+    - DEBUG/INFO records of sampled loggers are kept with their sample rate
+    - The current request id is attached
+
+Environment Variables:
+- LOG_LEVEL: Root level name (default: INFO)
+- LOG_LEVELS: Per-logger levels, e.g. "app.sales=DEBUG,sqlalchemy.engine=WARNING"
+- LOG_SAMPLE_RATES: DEBUG/INFO sampling per logger prefix, e.g. "app.core.middleware.cache_decorators=0.01"
+- LOG_FORMAT: "json" (default, one JSON object per line) or "text"
+- LOG_ASYNC: "true" (default) to write from the background listener
+- LOG_QUEUE_SIZE: Queued records before dropping (default: 10000)
+
 Security Considerations:
 - In production, use LOG_LEVEL=logging.WARNING or higher to avoid logging sensitive debug information.
 - Always store logs securely and restrict access to authorized personnel only.
@@ -20,22 +38,147 @@ Security Considerations:
 - If using EXC_INFO_LOG_ERRORS=True, ensure logs are not accessible to the public, as stack traces may reveal sensitive implementation details.
 """
 
+import atexit
+import contextvars
+import copy
+import json
 import logging
+import os
+import queue
+import random
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
 
 # === GLOBAL LOGGING CONFIGURATION VARIABLES ===
-LOG_LEVEL = logging.DEBUG  # Change this to set the global log level
+LOG_LEVEL = logging.getLevelName(os.getenv('LOG_LEVEL', 'INFO').upper())  # Set the LOG_LEVEL env var to change the global log level
 EXC_INFO_LOG_ERRORS = False  # Change this to control exc_info for error logs globally
 
-import os
-from datetime import datetime
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'json').lower()
+LOG_ASYNC = os.getenv('LOG_ASYNC', 'true').lower() == 'true'
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', 10000))
+
+# Request id of the current request ("-" outside requests), set by app.core.request_id
+request_id_var = contextvars.ContextVar('request_id', default='-')
+
+# Attributes every LogRecord has; anything else came from extra={...}
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime', 'request_id'}
+
+_listener = None
+_dropped = {'count': 0}
+_dropped_lock = threading.Lock()
+
+
+def _parse_mapping(value):
+    """Parse "name=value,name2=value2" into a dict."""
+    mapping = {}
+    for item in (value or '').split(','):
+        if '=' in item:
+            name, _, setting = item.partition('=')
+            mapping[name.strip()] = setting.strip()
+    return mapping
+
+
+class RequestIdFilter(logging.Filter):
+    """Attach the current request id to every record."""
+
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep only a fraction of DEBUG/INFO records for high-volume loggers.
+
+    Rates apply to the logger and its children; the most specific prefix
+    wins. WARNING and above are never sampled.
+    """
+
+    def __init__(self, rates):
+        super().__init__()
+        # Longest prefix first
+        self.rates = sorted(((name, float(rate)) for name, rate in rates.items()), key=lambda item: -len(item[0]))
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        for name, rate in self.rates:
+            if record.name == name or record.name.startswith(name + '.'):
+                return random.random() < rate
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, request id, extras."""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'request_id': getattr(record, 'request_id', '-'),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc_info'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler that drops records instead of blocking when the queue is full."""
+
+    def prepare(self, record):
+        # Resolve the message on the calling thread (arguments may change or be
+        # bound to a DB session); formatting and I/O happen on the listener thread
+        message = record.getMessage()
+        record = copy.copy(record)
+        record.message = message
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with _dropped_lock:
+                _dropped['count'] += 1
+
+
+def dropped_records():
+    """Records dropped because the log queue was full."""
+    return _dropped['count']
+
+
+def _build_formatter(log_format, date_format):
+    if LOG_FORMAT == 'json':
+        return JsonFormatter()
+    return logging.Formatter(log_format, date_format)
+
+
+def stop_logging():
+    """Flush queued records and stop the background listener."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
 
 
 def setup_logging(log_level=LOG_LEVEL, log_file=None):
     """
     Configure logging for the entire application.
-    
+
     Args:
-        log_level: Logging level (default: INFO)
+        log_level: Logging level (default: LOG_LEVEL env, INFO)
         log_file: Optional log file path. If None, logs only to console.
     """
     # Create logs directory if it doesn't exist
@@ -43,40 +186,59 @@ def setup_logging(log_level=LOG_LEVEL, log_file=None):
         log_dir = os.path.dirname(log_file)
         if log_dir and not os.path.exists(log_dir):
             os.makedirs(log_dir)
-    
-    # Define log format
-    log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+    # Define log format (text mode)
+    log_format = '%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s'
     date_format = '%Y-%m-%d %H:%M:%S'
-    
-    # Configure logging
-    logging.basicConfig(
-        level=log_level,
-        format=log_format,
-        datefmt=date_format,
-        filename=log_file,
-        filemode='a' if log_file else None,
-        force=True  # This ensures we override any existing configuration
-    )
-    
-    # Also log to console if we're logging to file
+    formatter = _build_formatter(log_format, date_format)
+
+    # Writers: console, plus file if requested
+    handlers = [logging.StreamHandler()]
     if log_file:
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(log_level)
-        console_formatter = logging.Formatter(log_format, date_format)
-        console_handler.setFormatter(console_formatter)
-        
-        # Add console handler to root logger
-        root_logger = logging.getLogger()
-        root_logger.addHandler(console_handler)
+        handlers.append(logging.FileHandler(log_file, mode='a'))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    # Replace any previous configuration (and its listener thread)
+    stop_logging()
+    root_logger = logging.getLogger()
+    for handler in root_logger.handlers[:]:
+        root_logger.removeHandler(handler)
+        handler.close()
+    root_logger.setLevel(log_level)
+
+    # Per-logger levels from the environment
+    for name, level in _parse_mapping(os.getenv('LOG_LEVELS')).items():
+        logging.getLogger(name).setLevel(level.upper())
+
+    filters = [RequestIdFilter(), SamplingFilter(_parse_mapping(os.getenv('LOG_SAMPLE_RATES')))]
+
+    if LOG_ASYNC:
+        global _listener
+        log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        queue_handler = NonBlockingQueueHandler(log_queue)
+        for log_filter in filters:
+            queue_handler.addFilter(log_filter)
+        root_logger.addHandler(queue_handler)
+        _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+    else:
+        for handler in handlers:
+            for log_filter in filters:
+                handler.addFilter(log_filter)
+            root_logger.addHandler(handler)
+
+
+atexit.register(stop_logging)
 
 
 def get_logger(name):
     """
     Get a logger instance for a specific module.
-    
+
     Args:
         name: Usually __name__ from the calling module
-        
+
     Returns:
         Logger instance
     """
@@ -88,7 +250,7 @@ def configure_app_logging(log_level=LOG_LEVEL, log_file=None, environment='devel
     """
     Default logging configuration for the application.
     Industry standard: Use parameters instead of hardcoded values.
-    
+
     Args:
         log_level: Logging level (default: INFO)
         log_file: Optional log file path. If None, uses environment-based default
@@ -97,5 +259,5 @@ def configure_app_logging(log_level=LOG_LEVEL, log_file=None, environment='devel
     # Set default log file based on environment if not specified
     if log_file is None and environment == 'production':
         log_file = f"logs/app_{datetime.now().strftime('%Y%m%d')}.log"
-    
+
     setup_logging(log_level=log_level, log_file=log_file)
@@ -18,6 +18,28 @@ JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'your-very-secure-secret-key-here')
 JWT_ALGORITHM = os.getenv('JWT_ALGORITHM', 'HS256')
 JWT_EXPIRATION_HOURS = int(os.getenv('JWT_EXPIRATION_HOURS', 24))
 
+# Principal Cache (auth decorators)
+# Roles/username of authenticated users cached in Redis and in process; role
+# changes reach other processes within PRINCIPAL_LOCAL_TTL_SECONDS
+PRINCIPAL_CACHE_ENABLED = os.getenv('PRINCIPAL_CACHE_ENABLED', 'true').lower() == 'true'
+PRINCIPAL_CACHE_TTL_SECONDS = int(os.getenv('PRINCIPAL_CACHE_TTL_SECONDS', 60))
+PRINCIPAL_LOCAL_TTL_SECONDS = float(os.getenv('PRINCIPAL_LOCAL_TTL_SECONDS', 2))
+
+# Password Hashing Configuration
+# bcrypt cost factor; existing hashes with another cost are upgraded on login
+BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', 14))
+# Worker processes for bcrypt (0 hashes on the request thread)
+PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', min(4, os.cpu_count() or 1)))
+# Running + queued hash/verify operations before answering 503
+PASSWORD_HASH_MAX_PENDING = int(os.getenv('PASSWORD_HASH_MAX_PENDING', 16))
+PASSWORD_HASH_TIMEOUT_SECONDS = float(os.getenv('PASSWORD_HASH_TIMEOUT_SECONDS', 10))
+
+# Rate Limiting (policies per endpoint in app/blueprints.py)
+RATE_LIMIT_ENABLED = os.getenv('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+# Only enable behind a proxy that sets X-Forwarded-For (clients can spoof it otherwise)
+RATE_LIMIT_TRUST_PROXY = os.getenv('RATE_LIMIT_TRUST_PROXY', 'false').lower() == 'true'
+RATE_LIMIT_REDIS_RETRY_SECONDS = float(os.getenv('RATE_LIMIT_REDIS_RETRY_SECONDS', 5))
+
 # Database Configuration
 DB_USER = os.getenv('DB_USER', 'postgres')
 DB_PASSWORD = os.getenv('DB_PASSWORD', 'postgres')
@@ -26,12 +48,108 @@ DB_PORT = int(os.getenv('DB_PORT', 5432))
 DB_NAME = os.getenv('DB_NAME', 'lyfter')
 DB_SCHEMA = os.getenv('DB_SCHEMA', 'lyfter_backend_project')
 
+# Connection Pool
+# Size from the db_pool_* metrics (GET /metrics/pools): see app/core/pool_metrics.py
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 10))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 20))
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 30))
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', -1))  # Seconds; -1 never recycles
+# Pre-ping: 'always' (every checkout), 'idle' (only after DB_POOL_PRE_PING_IDLE_SECONDS idle) or 'off'
+DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'idle').lower()
+DB_POOL_PRE_PING_IDLE_SECONDS = float(os.getenv('DB_POOL_PRE_PING_IDLE_SECONDS', 30))
+# Compiled SQL cache entries per engine (SQLAlchemy default 500)
+DB_QUERY_CACHE_SIZE = int(os.getenv('DB_QUERY_CACHE_SIZE', 500))
+
+# Metrics endpoints (GET /metrics, /metrics/pools): scrapers send "Authorization: Bearer <token>".
+# Must be set for Prometheus; when empty only admin JWTs can read metrics
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
+# Request Metrics and Profiling
+REQUEST_METRICS_ENABLED = os.getenv('REQUEST_METRICS_ENABLED', 'true').lower() == 'true'
+# Shared secret for X-Profile-Token (empty: only admin JWTs may request profiles)
+PROFILING_TOKEN = os.getenv('PROFILING_TOKEN', '')
+# Fraction of requests profiled automatically (0 disables sampling)
+PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', 0))
+PROFILE_DIR = os.getenv('PROFILE_DIR', 'logs/profiles')
+
+# Read Replicas (optional)
+# Comma-separated host[:port] list; empty disables replica routing.
+# Replicas use the same credentials and database name as the primary.
+DB_REPLICA_HOSTS = [h.strip() for h in os.getenv('DB_REPLICA_HOSTS', '').split(',') if h.strip()]
+DB_REPLICA_MAX_LAG_SECONDS = float(os.getenv('DB_REPLICA_MAX_LAG_SECONDS', 5))
+DB_REPLICA_LAG_CHECK_INTERVAL = float(os.getenv('DB_REPLICA_LAG_CHECK_INTERVAL', 10))
+READ_YOUR_WRITES_SECONDS = int(os.getenv('READ_YOUR_WRITES_SECONDS', 5))
+
+# Read-only transactions (GET requests)
+# DEFERRABLE runs reads as SERIALIZABLE READ ONLY DEFERRABLE (consistent snapshot, may wait briefly to start)
+DB_READ_ONLY_DEFERRABLE = os.getenv('DB_READ_ONLY_DEFERRABLE', 'false').lower() == 'true'
+
 # Redis Configuration
 REDIS_HOST = os.getenv('REDIS_HOST', 'localhost')
 REDIS_PORT = int(os.getenv('REDIS_PORT', 6379))
 REDIS_PASSWORD = os.getenv('REDIS_PASSWORD', '')
 REDIS_DB = int(os.getenv('REDIS_DB', 0))
 
+# Reference Data (categories, pet types, roles, statuses; app/core/reference_data.py)
+# Full reload interval per process (0: only on change signals)
+REFERENCE_DATA_REFRESH_SECONDS = float(os.getenv('REFERENCE_DATA_REFRESH_SECONDS', 300))
+# Change signal between processes: 'redis' (pub/sub), 'postgres' (LISTEN/NOTIFY,
+# triggers created by scripts/init_db.py) or 'off' (scheduled reload only)
+REFERENCE_DATA_NOTIFY = os.getenv('REFERENCE_DATA_NOTIFY', 'redis').lower()
+# Load the startup snapshot from the Redis blob instead of querying the six tables
+REFERENCE_DATA_PRELOAD = os.getenv('REFERENCE_DATA_PRELOAD', 'true').lower() == 'true'
+REFERENCE_DATA_BLOB_TTL_SECONDS = int(os.getenv('REFERENCE_DATA_BLOB_TTL_SECONDS', 24 * 3600))
+
+# Cart Storage Configuration
+# 'database' keeps open carts in PostgreSQL, 'redis' keeps them in Redis hashes
+# and persists them only at checkout or via the write-behind flusher.
+CART_STORAGE_MODE = os.getenv('CART_STORAGE_MODE', 'database').lower()
+CART_REDIS_TTL_SECONDS = int(os.getenv('CART_REDIS_TTL_SECONDS', 7 * 24 * 3600))
+CART_FLUSH_BATCH_SIZE = int(os.getenv('CART_FLUSH_BATCH_SIZE', 200))
+
+# Bulk Product Import (POST /products/import, scripts/import_products.py)
+# Rows validated and staged per batch; the per-row error report keeps at most PRODUCT_IMPORT_MAX_ERRORS entries
+PRODUCT_IMPORT_BATCH_SIZE = int(os.getenv('PRODUCT_IMPORT_BATCH_SIZE', 1000))
+PRODUCT_IMPORT_MAX_ERRORS = int(os.getenv('PRODUCT_IMPORT_MAX_ERRORS', 1000))
+# Bulk price/stock updates (POST /products/bulk-update): max explicit changes or filter ids per request
+PRODUCT_BULK_MAX_CHANGES = int(os.getenv('PRODUCT_BULK_MAX_CHANGES', 10000))
+
+# Related Products (GET /products/<id>/related, scripts/build_related_products.py)
+# Neighbours kept per product; products rebuilt per transaction; TTL of a cached related list
+RELATED_PRODUCTS_TOP_K = int(os.getenv('RELATED_PRODUCTS_TOP_K', 10))
+RELATED_PRODUCTS_BATCH_SIZE = int(os.getenv('RELATED_PRODUCTS_BATCH_SIZE', 500))
+RELATED_PRODUCTS_CACHE_TTL_SECONDS = int(os.getenv('RELATED_PRODUCTS_CACHE_TTL_SECONDS', 600))
+
+# Sales Exports (GET /orders|invoices|returns/export)
+# Rows fetched per server-side cursor round trip while streaming
+EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', 1000))
+
+# Sales Analytics (rollup tables, GET /analytics/*)
+# Dirty days recomputed per refresh transaction; default and maximum dashboard range
+ANALYTICS_REFRESH_BATCH_DAYS = int(os.getenv('ANALYTICS_REFRESH_BATCH_DAYS', 31))
+ANALYTICS_DEFAULT_RANGE_DAYS = int(os.getenv('ANALYTICS_DEFAULT_RANGE_DAYS', 30))
+ANALYTICS_MAX_RANGE_DAYS = int(os.getenv('ANALYTICS_MAX_RANGE_DAYS', 366))
+
+# Overdue Invoice Sweep (scripts/sweep_overdue_invoices.py)
+# Invoices moved to 'overdue' per UPDATE/transaction
+INVOICE_SWEEP_BATCH_SIZE = int(os.getenv('INVOICE_SWEEP_BATCH_SIZE', 1000))
+
+# Background Jobs (app/core/jobs.py, scripts/run_jobs.py)
+# Attempts before a job moves to dead_jobs; retry backoff base/cap; idle worker poll interval
+JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', 5))
+JOB_RETRY_BASE_SECONDS = int(os.getenv('JOB_RETRY_BASE_SECONDS', 10))
+JOB_RETRY_MAX_SECONDS = int(os.getenv('JOB_RETRY_MAX_SECONDS', 3600))
+JOB_POLL_INTERVAL_SECONDS = float(os.getenv('JOB_POLL_INTERVAL_SECONDS', 1))
+# Enqueue a sales.create_invoice job with every new order (needs a running worker);
+# off by default: invoices are created via POST /sales/invoices
+ORDER_AUTO_INVOICE = os.getenv('ORDER_AUTO_INVOICE', 'false').lower() == 'true'
+
+# SQL Instrumentation
+# Per-request query count/DB time (Server-Timing header + log line) and slow-query log
+SQL_INSTRUMENTATION_ENABLED = os.getenv('SQL_INSTRUMENTATION_ENABLED', 'true').lower() == 'true'
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv('SLOW_QUERY_THRESHOLD_MS', 200))
+SQL_SLOWEST_STATEMENTS = int(os.getenv('SQL_SLOWEST_STATEMENTS', 3))
+
 def get_jwt_secret():
     """Get the JWT secret key from environment or default."""
     return JWT_SECRET_KEY
@@ -54,6 +172,20 @@ def get_database_url():
     db_name = os.getenv('DB_NAME', 'lyfter')
     return f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{db_name}"
 
+def get_replica_urls():
+    """
+    Build read-replica database URLs from DB_REPLICA_HOSTS.
+    
+    NOTE: Reads DB_NAME at call time, like get_database_url().
+    """
+    db_name = os.getenv('DB_NAME', 'lyfter')
+    urls = []
+    for host in DB_REPLICA_HOSTS:
+        if ':' not in host:
+            host = f"{host}:{DB_PORT}"
+        urls.append(f"postgresql://{DB_USER}:{DB_PASSWORD}@{host}/{db_name}")
+    return urls
+
 def get_database_config():
     """Get database configuration as a dictionary."""
     return {
@@ -99,7 +99,8 @@ CREATE TABLE carts (
     id SERIAL PRIMARY KEY,
     user_id INTEGER UNIQUE NOT NULL REFERENCES users(id) ON DELETE RESTRICT,
     created_at TIMESTAMP, -- optional
-    finalized BOOLEAN NOT NULL
+    finalized BOOLEAN NOT NULL,
+    version INTEGER NOT NULL DEFAULT 1 -- optimistic concurrency
 );
 
 -- Cart Items (relation between carts and products)
@@ -124,7 +125,8 @@ CREATE TABLE orders (
     order_status_id INTEGER NOT NULL REFERENCES order_status(id) ON DELETE RESTRICT,
     total_amount REAL NOT NULL,
     created_at TIMESTAMP,
-    shipping_address VARCHAR(255)
+    shipping_address VARCHAR(255),
+    version INTEGER NOT NULL DEFAULT 1 -- optimistic concurrency
 );
 
 CREATE TABLE order_item (
@@ -146,7 +148,8 @@ CREATE TABLE returns (
     user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE RESTRICT,
     return_status_id INTEGER NOT NULL REFERENCES return_status(id) ON DELETE RESTRICT,
     total_amount REAL NOT NULL,
-    created_at TIMESTAMP
+    created_at TIMESTAMP,
+    version INTEGER NOT NULL DEFAULT 1 -- optimistic concurrency
 );
 
 CREATE TABLE return_item (
@@ -169,10 +172,16 @@ CREATE TABLE invoices (
     invoice_status_id INTEGER NOT NULL REFERENCES invoice_status(id) ON DELETE RESTRICT,
     user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE RESTRICT,
     created_at TIMESTAMP,
-    due_date TIMESTAMP
+    due_date TIMESTAMP,
+    version INTEGER NOT NULL DEFAULT 1 -- optimistic concurrency
 );
 
+-- =================================================
+-- UPGRADES FOR EXISTING DATABASES
+-- =================================================
 
-
-
-
+-- Optimistic concurrency (version_id_col on Cart, Order, Invoice, Return)
+ALTER TABLE carts ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;
+ALTER TABLE orders ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;
+ALTER TABLE returns ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;
+ALTER TABLE invoices ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;
@@ -0,0 +1,507 @@
+"""
+Benchmark: API Flows (Throughput and Latency Percentiles)
+
+Measures throughput and p50/p95/p99 latency of the main API flows:
+
+    browse       GET  /products?category=<name>
+    detail       GET  /products/<id>
+    search       GET  /products?search=<word>
+    add_to_cart  POST /sales/carts/<user_id>/items/<product_id>
+    checkout     POST /sales/orders
+    invoices     GET  /sales/invoices
+    login        POST /auth/login  (bcrypt verify at BCRYPT_ROUNDS)
+
+Each flow runs against two targets:
+- client: the Flask test client (application + database cost, no HTTP)
+- server: a real WSGI server over HTTP with keep-alive connections
+  (threaded werkzeug server started by the script, or any running server
+  via --base-url, e.g. gunicorn; set RATE_LIMIT_ENABLED=false there)
+
+Every worker thread uses its own benchmark user, so carts don't conflict.
+The rate limiter is disabled for in-process targets.
+
+Data:
+    --seed adds benchmark rows to the configured database (DB_NAME) until it
+    holds the requested volumes: products with SKU "B####" and brand "BenchBrand<n>", users
+    "bench_user_<n>" (password "bench-password") and orders with items and
+    invoices. Use a dedicated database; reference tables must exist
+    (scripts/init_db.py).
+
+Results are written as JSON (--output, default logs/benchmarks/<time>.json)
+so runs can be compared. --baseline compares the run with an earlier result
+and exits with status 1 when a flow's p95 latency grew, or its throughput
+dropped, by more than --threshold percent.
+
+Usage:
+    python scripts/benchmark_api.py --seed --products 5000 --users 200 --orders 2000
+    python scripts/benchmark_api.py --requests 500 --concurrency 8
+    python scripts/benchmark_api.py --targets server --base-url http://127.0.0.1:8000
+    python scripts/benchmark_api.py --scenarios browse detail --baseline logs/benchmarks/baseline.json
+    python scripts/benchmark_api.py --compare logs/benchmarks/a.json logs/benchmarks/b.json --threshold 15
+"""
+
+import argparse
+import http.client
+import json
+import logging
+import math
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit
+
+from app import create_app
+
+SCENARIOS = ("browse", "detail", "search", "add_to_cart", "checkout", "invoices", "login")
+TARGETS = ("client", "server")
+
+BENCH_PASSWORD = "bench-password"
+BENCH_USER_PREFIX = "bench_user_"
+SEARCH_WORDS = ("premium", "organic", "chew", "grain", "deluxe", "travel", "catnip", "dental")
+SKU_ALPHABET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+def bench_sku(n):
+    """5-character SKU (products.sku is CHAR(5)): "B" + 4 base-36 digits."""
+    digits = ""
+    for _ in range(4):
+        n, remainder = divmod(n, 36)
+        digits = SKU_ALPHABET[remainder] + digits
+    return "B" + digits
+
+
+# ============================================
+# SEEDING
+# ============================================
+
+def seed(app, products, users, orders, batch_size=1000):
+    """Add benchmark rows until the requested volumes exist."""
+    from app.core.database import get_db
+    from app.core.reference_data import ReferenceData
+    from app.auth.models.user import RoleUser, User
+    from app.auth.services.security_service import hash_password
+    from app.products.models.product import Product
+    from app.sales.models.cart import Cart
+    from app.sales.models.invoice import Invoice
+    from app.sales.models.order import Order, OrderItem
+
+    rng = random.Random(42)
+    with app.app_context():
+        db = get_db()
+        category_ids = list(ReferenceData.get_all_product_categories().values())
+        pet_type_ids = list(ReferenceData.get_all_pet_types().values())
+        role_id = ReferenceData.get_role_id('user')
+        order_status_id = ReferenceData.get_order_status_id('pending')
+        invoice_status_id = ReferenceData.get_invoice_status_id('pending')
+        if not category_ids or not pet_type_ids or role_id is None or order_status_id is None:
+            sys.exit("Reference tables are empty - run scripts/init_db.py first")
+
+        existing = db.query(Product).filter(Product.brand.like("BenchBrand%")).count()
+        for start in range(existing, products, batch_size):
+            db.add_all([
+                Product(
+                    sku=bench_sku(n),
+                    description=f"{rng.choice(SEARCH_WORDS).title()} {rng.choice(SEARCH_WORDS)} item {n}",
+                    product_category_id=rng.choice(category_ids),
+                    pet_type_id=rng.choice(pet_type_ids),
+                    stock_quantity=1_000_000,
+                    price=round(rng.uniform(2, 200), 2),
+                    brand=f"BenchBrand{n % 50}",
+                    is_active=True
+                )
+                for n in range(start, min(start + batch_size, products))
+            ])
+            db.commit()
+        print(f"   products: {max(existing, products)} ({max(0, products - existing)} added)")
+
+        existing = db.query(User).filter(User.username.like(f"{BENCH_USER_PREFIX}%")).count()
+        if existing < users:
+            password_hash = hash_password(BENCH_PASSWORD)
+            for start in range(existing, users, batch_size):
+                batch = [
+                    User(username=f"{BENCH_USER_PREFIX}{n}", email=f"{BENCH_USER_PREFIX}{n}@bench.local",
+                         password_hash=password_hash, first_name="Bench", last_name=str(n))
+                    for n in range(start, min(start + batch_size, users))
+                ]
+                db.add_all(batch)
+                db.flush()
+                db.add_all([RoleUser(role_id=role_id, user_id=user.id) for user in batch])
+                db.commit()
+        print(f"   users:    {max(existing, users)} ({max(0, users - existing)} added)")
+
+        user_ids = [row.id for row in db.query(User.id).filter(User.username.like(f"{BENCH_USER_PREFIX}%"))]
+        product_rows = db.query(Product.id, Product.price).filter(Product.brand.like("BenchBrand%")).all()
+        existing = db.query(Order).filter(Order.user_id.in_(user_ids)).count() if user_ids else 0
+        for start in range(existing, orders, batch_size):
+            for _ in range(start, min(start + batch_size, orders)):
+                user_id = rng.choice(user_ids)
+                created_at = datetime.utcnow() - timedelta(days=rng.randint(0, 365))
+                cart = Cart(user_id=user_id, finalized=True, created_at=created_at)
+                lines = rng.sample(product_rows, k=min(len(product_rows), rng.randint(1, 3)))
+                order = Order(
+                    cart=cart, user_id=user_id, order_status_id=order_status_id,
+                    total_amount=round(sum(price for _, price in lines), 2),
+                    created_at=created_at, shipping_address="1 Benchmark Way"
+                )
+                order.items = [OrderItem(product_id=product_id, amount=price, quantity=1) for product_id, price in lines]
+                db.add(order)
+                db.add(Invoice(order=order, user_id=user_id, invoice_status_id=invoice_status_id,
+                               total_amount=order.total_amount, created_at=created_at,
+                               due_date=created_at + timedelta(days=30)))
+            db.commit()
+        print(f"   orders:   {max(existing, orders)} ({max(0, orders - existing)} added)")
+
+
+class Dataset:
+    """Ids and values the scenarios pick from."""
+
+    def __init__(self, app):
+        from app.core.database import get_db
+        from app.core.reference_data import ReferenceData
+        from app.auth.models.user import User
+        from app.products.models.product import Product
+        from app.sales.models.order import Order
+
+        with app.app_context():
+            db = get_db()
+            self.product_ids = [row.id for row in db.query(Product.id).filter(Product.brand.like("BenchBrand%"))]
+            self.users = [(row.id, row.username) for row in
+                          db.query(User.id, User.username).filter(User.username.like(f"{BENCH_USER_PREFIX}%"))]
+            self.categories = list(ReferenceData.get_all_product_categories().keys())
+            self.orders = db.query(Order).filter(Order.user_id.in_([user_id for user_id, _ in self.users])).count() \
+                if self.users else 0
+        if not self.product_ids or not self.users:
+            sys.exit("No benchmark data - run with --seed first")
+
+    def describe(self):
+        return {"products": len(self.product_ids), "users": len(self.users), "orders": self.orders}
+
+
+# ============================================
+# TRANSPORTS
+# ============================================
+
+class TestClientTransport:
+    """In-process requests through the Flask test client."""
+
+    name = "client"
+
+    def __init__(self, app):
+        self.app = app
+
+    def connect(self):
+        client = self.app.test_client()
+
+        def send(method, path, body=None, headers=None):
+            return client.open(path, method=method, json=body, headers=headers).status_code
+        return send
+
+
+class HttpTransport:
+    """HTTP/1.1 keep-alive requests to a running WSGI server."""
+
+    name = "server"
+
+    def __init__(self, base_url):
+        parts = urlsplit(base_url)
+        self.host, self.port = parts.hostname, parts.port or 80
+
+    def connect(self):
+        connection = http.client.HTTPConnection(self.host, self.port, timeout=60)
+
+        def send(method, path, body=None, headers=None):
+            headers = dict(headers or {})
+            payload = None
+            if body is not None:
+                payload = json.dumps(body)
+                headers["Content-Type"] = "application/json"
+            connection.request(method, path, body=payload, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            return response.status
+        return send
+
+
+def start_server(app, port):
+    """Threaded werkzeug WSGI server in a daemon thread."""
+    from werkzeug.serving import make_server
+
+    server = make_server("127.0.0.1", port, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+# ============================================
+# SCENARIOS
+# ============================================
+
+def build_request(scenario, dataset, user, token, rng):
+    """(method, path, json body, headers) for one request of `scenario`."""
+    user_id, username = user
+    auth = {"Authorization": f"Bearer {token}"}
+    if scenario == "browse":
+        return "GET", f"/products?category={rng.choice(dataset.categories)}", None, None
+    if scenario == "detail":
+        return "GET", f"/products/{rng.choice(dataset.product_ids)}", None, None
+    if scenario == "search":
+        return "GET", f"/products?search={rng.choice(SEARCH_WORDS)}", None, None
+    if scenario == "add_to_cart":
+        return "POST", f"/sales/carts/{user_id}/items/{rng.choice(dataset.product_ids)}", {"quantity": 1}, auth
+    if scenario == "checkout":
+        items = [{"product_id": product_id, "quantity": 1}
+                 for product_id in rng.sample(dataset.product_ids, k=min(3, len(dataset.product_ids)))]
+        body = {"user_id": user_id, "items": items, "shipping_address": "1 Benchmark Way"}
+        return "POST", "/sales/orders", body, auth
+    if scenario == "invoices":
+        return "GET", "/sales/invoices", None, auth
+    if scenario == "login":
+        return "POST", "/auth/login", {"username": username, "password": BENCH_PASSWORD}, None
+    raise ValueError(f"Unknown scenario: {scenario}")
+
+
+def get_tokens(app, users):
+    """JWTs for the worker users (issued directly: login cost is its own scenario)."""
+    from app.auth.models.user import User
+    from app.core.database import get_db
+    from app.core.lib.jwt import generate_jwt_token
+
+    with app.app_context():
+        db = get_db()
+        return [generate_jwt_token(db.get(User, user_id)) for user_id, _ in users]
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(0, math.ceil(len(sorted_values) * fraction) - 1)]
+
+
+def run_scenario(scenario, transport, dataset, users, tokens, requests, concurrency, warmup):
+    """Run `requests` requests from `concurrency` threads; returns summary stats."""
+    latencies, errors = [], {}
+    lock = threading.Lock()
+    per_thread = [requests // concurrency + (1 if i < requests % concurrency else 0) for i in range(concurrency)]
+    ready = threading.Barrier(concurrency + 1)
+
+    def worker(index):
+        rng = random.Random(index)
+        send = transport.connect()
+        user, token = users[index % len(users)], tokens[index % len(tokens)]
+        for _ in range(warmup):
+            send(*build_request(scenario, dataset, user, token, rng))
+        ready.wait()
+        local = []
+        for _ in range(per_thread[index]):
+            request = build_request(scenario, dataset, user, token, rng)
+            start = time.perf_counter()
+            try:
+                status = send(*request)
+            except Exception as e:
+                status = type(e).__name__
+            local.append(time.perf_counter() - start)
+            if not isinstance(status, int) or status >= 400:
+                with lock:
+                    errors[str(status)] = errors.get(str(status), 0) + 1
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    ready.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": sum(errors.values()),
+        "error_statuses": errors,
+        "seconds": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+    }
+
+
+# ============================================
+# RESULTS
+# ============================================
+
+def run_metadata(args, dataset):
+    from config.settings import BCRYPT_ROUNDS, CART_STORAGE_MODE, DB_POOL_SIZE, DB_MAX_OVERFLOW
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "warmup": args.warmup,
+        "dataset": dataset.describe(),
+        "settings": {
+            "BCRYPT_ROUNDS": BCRYPT_ROUNDS,
+            "CART_STORAGE_MODE": CART_STORAGE_MODE,
+            "DB_POOL_SIZE": DB_POOL_SIZE,
+            "DB_MAX_OVERFLOW": DB_MAX_OVERFLOW,
+        },
+    }
+
+
+def compare_results(baseline, current, threshold, min_delta_ms=1.0):
+    """
+    Flows whose p95 grew or throughput dropped by more than `threshold` percent.
+
+    p95 changes smaller than `min_delta_ms` are ignored (timer noise on fast flows).
+
+    Returns:
+        List of (target, scenario, metric, baseline value, current value, change %)
+    """
+    regressions = []
+    for target, scenarios in current.get("results", {}).items():
+        for scenario, now in scenarios.items():
+            before = baseline.get("results", {}).get(target, {}).get(scenario)
+            if not before:
+                continue
+            if before["p95_ms"] > 0:
+                change = (now["p95_ms"] - before["p95_ms"]) / before["p95_ms"] * 100
+                if change > threshold and now["p95_ms"] - before["p95_ms"] >= min_delta_ms:
+                    regressions.append((target, scenario, "p95_ms", before["p95_ms"], now["p95_ms"], change))
+            if before["throughput_rps"] > 0:
+                change = (now["throughput_rps"] - before["throughput_rps"]) / before["throughput_rps"] * 100
+                if -change > threshold:
+                    regressions.append((target, scenario, "throughput_rps", before["throughput_rps"],
+                                        now["throughput_rps"], change))
+    return regressions
+
+
+def print_comparison(baseline, current, threshold, min_delta_ms):
+    """Print p95/throughput changes per flow; returns the regressions."""
+    print(f"\nComparison with baseline ({baseline.get('meta', {}).get('git_commit')}, "
+          f"{baseline.get('meta', {}).get('timestamp')}), threshold {threshold}%")
+    for target, scenarios in current.get("results", {}).items():
+        for scenario, now in scenarios.items():
+            before = baseline.get("results", {}).get(target, {}).get(scenario)
+            if before:
+                print(f"   {target:<7}{scenario:<13} p95 {before['p95_ms']:>9.2f} -> {now['p95_ms']:>9.2f} ms   "
+                      f"rps {before['throughput_rps']:>8.1f} -> {now['throughput_rps']:>8.1f}")
+    regressions = compare_results(baseline, current, threshold, min_delta_ms)
+    for target, scenario, metric, before, now, change in regressions:
+        print(f"   REGRESSION {target}/{scenario} {metric}: {before} -> {now} ({change:+.1f}%)")
+    if not regressions:
+        print("   No regressions")
+    return regressions
+
+
+def print_table(target, results):
+    print(f"\n[{target}]")
+    print(f"   {'flow':<13}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for scenario, stats in results.items():
+        print(f"   {scenario:<13}{stats['throughput_rps']:>9.1f}{stats['p50_ms']:>10.2f}"
+              f"{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}{stats['errors']:>8}")
+
+
+def load_json(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the main API flows")
+    parser.add_argument('--seed', action='store_true', help="Add benchmark data before running")
+    parser.add_argument('--products', type=int, default=2000, help="Benchmark products to seed")
+    parser.add_argument('--users', type=int, default=100, help="Benchmark users to seed")
+    parser.add_argument('--orders', type=int, default=1000, help="Benchmark orders (with invoices) to seed")
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument('--targets', nargs='+', choices=TARGETS, default=list(TARGETS))
+    parser.add_argument('--requests', type=int, default=200, help="Measured requests per flow and target")
+    parser.add_argument('--login-requests', type=int, default=20,
+                        help="Measured requests for the login flow (bcrypt-bound)")
+    parser.add_argument('--concurrency', type=int, default=4, help="Client threads")
+    parser.add_argument('--warmup', type=int, default=5, help="Unmeasured requests per thread")
+    parser.add_argument('--base-url', help="Benchmark this running server instead of starting one")
+    parser.add_argument('--port', type=int, default=0, help="Port of the started server (0: any free port)")
+    parser.add_argument('--output', help="Results file (default: logs/benchmarks/<time>.json)")
+    parser.add_argument('--baseline', help="Earlier results file to compare with")
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CURRENT'),
+                        help="Only compare two results files")
+    parser.add_argument('--threshold', type=float, default=10.0, help="Allowed regression in percent")
+    parser.add_argument('--min-delta-ms', type=float, default=1.0,
+                        help="Ignore p95 increases smaller than this")
+    parser.add_argument('--log-level', default='WARNING', help="Application log level during the run")
+    args = parser.parse_args()
+
+    if args.compare:
+        regressions = print_comparison(load_json(args.compare[0]), load_json(args.compare[1]),
+                                       args.threshold, args.min_delta_ms)
+        sys.exit(1 if regressions else 0)
+
+    app = create_app()
+    app.config['RATELIMIT_ENABLED'] = False
+    logging.getLogger().setLevel(args.log_level.upper())
+
+    if args.seed:
+        print(f"Seeding benchmark data into database '{os.getenv('DB_NAME', 'lyfter')}'")
+        seed(app, args.products, args.users, args.orders)
+
+    dataset = Dataset(app)
+    users = dataset.users[:args.concurrency]
+    tokens = get_tokens(app, users)
+    print(f"Dataset: {dataset.describe()}  concurrency={args.concurrency}")
+
+    results = {}
+    server = None
+    for target in args.targets:
+        if target == "client":
+            transport = TestClientTransport(app)
+        else:
+            base_url = args.base_url
+            if base_url is None:
+                server, base_url = start_server(app, args.port)
+            transport = HttpTransport(base_url)
+            print(f"WSGI server: {base_url}")
+
+        results[target] = {}
+        for scenario in args.scenarios:
+            requests = args.login_requests if scenario == "login" else args.requests
+            results[target][scenario] = run_scenario(
+                scenario, transport, dataset, users, tokens, requests, args.concurrency, args.warmup
+            )
+        print_table(target, results[target])
+
+    if server is not None:
+        server.shutdown()
+
+    report = {"meta": run_metadata(args, dataset), "results": results}
+    output = args.output or os.path.join("logs", "benchmarks", datetime.now().strftime("%Y%m%dT%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.baseline:
+        regressions = print_comparison(load_json(args.baseline), report, args.threshold, args.min_delta_ms)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Micro-benchmark: Python-side Overhead of Hot Repository Lookups
+
+Compares the per-call cost of the hot lookups (UserRepository.get_by_id,
+ProductRepository.get_by_id, CartRepository.get_by_user_id) built as a new
+``db.query(...)`` on every call (legacy) against the prebuilt statements the
+repositories now use.
+
+Runs against an in-memory SQLite database so network and server time are
+negligible and the numbers are dominated by SQLAlchemy statement construction,
+cache-key generation, compilation and ORM loading. Also reports how many
+executions were served from the compiled SQL cache.
+
+Requires Redis like the application (services connect at import time).
+
+Usage:
+    python scripts/benchmark_lookups.py
+    python scripts/benchmark_lookups.py --iterations 5000
+"""
+
+import argparse
+import time
+from datetime import datetime
+
+from app import create_app  # noqa: F401  (import order: app package first)
+from flask import Flask, g
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine.default import CACHE_HIT
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base, get_schema
+from app.auth.models.user import Role, RoleUser, User
+from app.auth.repositories.user_repository import UserRepository
+from app.products.models.product import PetType, Product, ProductCategory
+from app.products.repositories.product_repository import ProductRepository
+from app.sales.models.cart import Cart, CartItem
+from app.sales.repositories.cart_repository import CartRepository
+from app.sales.repositories.load_profiles import load_options, DETAIL_VIEW
+import app.sales.models  # noqa: F401  (register every mapper)
+
+
+def build_engine():
+    """In-memory SQLite with the application schema attached."""
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+
+    @event.listens_for(engine, "connect")
+    def attach_schema(dbapi_connection, connection_record):
+        dbapi_connection.execute(f"ATTACH DATABASE ':memory:' AS {get_schema()}")
+
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def seed(session):
+    """One user with a role, one product and an open cart with an item."""
+    session.add_all([
+        Role(id=1, name="user", description="Regular user"),
+        ProductCategory(id=1, category="food"),
+        PetType(id=1, type="dog")
+    ])
+    session.add(User(id=1, username="bench", email="bench@example.com", password_hash="x"))
+    session.add(RoleUser(id=1, role_id=1, user_id=1))
+    session.add(Product(id=1, sku="BENCH", description="Bench product", product_category_id=1,
+                        pet_type_id=1, stock_quantity=10, price=9.99))
+    session.add(Cart(id=1, user_id=1, finalized=False, created_at=datetime.utcnow()))
+    session.add(CartItem(id=1, cart_id=1, product_id=1, amount=9.99, quantity=1))
+    session.commit()
+
+
+def legacy_user(db):
+    return db.query(User).options(
+        selectinload(User.user_roles).selectinload(RoleUser.role)
+    ).filter_by(id=1).first()
+
+
+def legacy_product(db):
+    return db.query(Product).filter_by(id=1).first()
+
+
+def legacy_cart(db):
+    return db.query(Cart).options(*load_options(Cart, DETAIL_VIEW)).filter_by(user_id=1, finalized=False).first()
+
+
+def run(label, lookup, session, iterations, cache_stats):
+    """Time one lookup; the identity map is cleared so every call loads rows."""
+    lookup()
+    cache_stats.update(hits=0, total=0)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        assert lookup() is not None
+        session.expunge_all()
+    elapsed = time.perf_counter() - start
+    hit_rate = cache_stats["hits"] / cache_stats["total"] * 100 if cache_stats["total"] else 0
+    print(f"   {label:<34} {elapsed / iterations * 1e6:>8.1f} us/call   cache hits {hit_rate:5.1f}%")
+    return elapsed / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hot repository lookups")
+    parser.add_argument('--iterations', type=int, default=2000, help="Calls per lookup")
+    args = parser.parse_args()
+
+    engine = build_engine()
+    cache_stats = {"hits": 0, "total": 0}
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def count_cache_hits(conn, cursor, statement, parameters, context, executemany):
+        cache_stats["total"] += 1
+        if context.cache_hit == CACHE_HIT:
+            cache_stats["hits"] += 1
+
+    session = Session(engine)
+    seed(session)
+
+    flask_app = Flask(__name__)
+    cases = [
+        ("UserRepository.get_by_id", lambda: legacy_user(session), lambda: UserRepository().get_by_id(1)),
+        ("ProductRepository.get_by_id", lambda: legacy_product(session), lambda: ProductRepository().get_by_id(1)),
+        ("CartRepository.get_by_user_id", lambda: legacy_cart(session), lambda: CartRepository().get_by_user_id(1)),
+    ]
+
+    print(f"Hot lookup overhead ({args.iterations} calls each, SQLite in-memory)")
+    with flask_app.app_context():
+        g.db = session
+        for name, legacy, cached in cases:
+            print(f"\n{name}")
+            before = run("legacy db.query(...)", legacy, session, args.iterations, cache_stats)
+            after = run("prebuilt statement", cached, session, args.iterations, cache_stats)
+            print(f"   {'speedup':<34} {before / after:>8.2f}x")
+
+    session.close()
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark: Login Throughput vs Password Hashing Workers
+
+Simulates concurrent logins (bcrypt verify of a peppered password) through
+the PasswordHasher with different PASSWORD_HASH_WORKERS values and reports
+throughput, p50/p95 latency and how many logins were rejected with 503.
+
+Also times one hash per cost factor, to pick BCRYPT_ROUNDS for a target
+latency on the production hardware (stored hashes with another cost are
+upgraded on the next login).
+
+Usage:
+    python scripts/benchmark_password_hashing.py
+    python scripts/benchmark_password_hashing.py --rounds 12 --logins 64 --concurrency 32 --workers 0 1 2 4
+    python scripts/benchmark_password_hashing.py --costs 10 11 12 13 14
+"""
+
+import argparse
+import logging
+import math
+import os
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app import create_app  # noqa: F401  (import order: app package first)
+from app.auth.services.security_service import APP_PEPPER, PasswordHasher, _checkpw, _hashpw
+from app.core.lib.error_utils import PasswordHasherBusyError
+
+
+def time_costs(costs):
+    """Time a single hash for each cost factor."""
+    print("Cost factor timings (single hash, this machine)")
+    for cost in costs:
+        start = time.perf_counter()
+        _hashpw(b"benchmark", cost)
+        print(f"   rounds={cost:<3} {(time.perf_counter() - start) * 1000:>9.1f} ms")
+
+
+def run_logins(workers, hashed, logins, concurrency, max_pending):
+    """Run `logins` verifications from `concurrency` request threads."""
+    hasher = PasswordHasher(workers=workers, max_pending=max_pending, timeout=300)
+    peppered = ("benchmark" + APP_PEPPER).encode('utf-8')
+    latencies, rejected = [], 0
+    lock = threading.Lock()
+
+    # Start worker processes outside the measurement
+    if workers:
+        hasher.run('verify', _checkpw, peppered, hashed)
+
+    def login():
+        nonlocal rejected
+        start = time.perf_counter()
+        try:
+            assert hasher.run('verify', _checkpw, peppered, hashed)
+        except PasswordHasherBusyError:
+            with lock:
+                rejected += 1
+            return
+        with lock:
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(logins):
+            pool.submit(login)
+    elapsed = time.perf_counter() - start
+    hasher.shutdown()
+
+    latencies.sort()
+    p50 = statistics.median(latencies) if latencies else 0
+    p95 = latencies[math.ceil(len(latencies) * 0.95) - 1] if latencies else 0
+    label = "inline" if workers == 0 else f"{workers} proc"
+    print(f"   {label:<8} {len(latencies) / elapsed:>8.2f} logins/s   p50 {p50 * 1000:>8.1f} ms   "
+          f"p95 {p95 * 1000:>8.1f} ms   rejected {rejected}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark login throughput vs hashing workers")
+    parser.add_argument('--rounds', type=int, default=12, help="bcrypt cost of the stored hash")
+    parser.add_argument('--logins', type=int, default=32, help="Total login attempts per run")
+    parser.add_argument('--concurrency', type=int, default=16, help="Concurrent request threads")
+    parser.add_argument('--max-pending', type=int, default=1000, help="PASSWORD_HASH_MAX_PENDING for the runs")
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=sorted({0, 1, 2, os.cpu_count() or 1}), help="Worker counts to compare")
+    parser.add_argument('--costs', type=int, nargs='*', help="Only time these cost factors")
+    args = parser.parse_args()
+    # Rejections are counted in the summary instead of logged one by one
+    logging.getLogger('app.auth.services.security_service').setLevel(logging.ERROR)
+
+    if args.costs:
+        time_costs(args.costs)
+        return
+
+    hashed = _hashpw(("benchmark" + APP_PEPPER).encode('utf-8'), args.rounds)
+    print(f"Login throughput ({args.logins} logins, {args.concurrency} concurrent, "
+          f"rounds={args.rounds}, {os.cpu_count()} CPUs)")
+    for workers in args.workers:
+        run_logins(workers, hashed, args.logins, args.concurrency, args.max_pending)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Build Related Products Index
+
+Rebuilds the "frequently bought together" index (related_products) from
+order history. Products are processed in id order, in batches committed
+separately: each batch counts the non-cancelled orders shared with every
+other product, keeps the top RELATED_PRODUCTS_TOP_K neighbours and, once
+committed, invalidates the batch's cached related lists. Only one batch's slice of the
+co-occurrence counts exists at a time, so memory stays bounded by
+--batch-size, not by catalog or history size.
+
+Usage:
+    python scripts/build_related_products.py                       # Build once and exit
+    python scripts/build_related_products.py --interval 86400      # Rebuild daily
+    python scripts/build_related_products.py --batch-size 200
+"""
+
+import argparse
+import time
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from app import create_app
+from app.core.database import get_db
+from app.products.services.product_service import ProductService
+from config.settings import RELATED_PRODUCTS_BATCH_SIZE
+
+
+def build_once(app, service, batch_size):
+    """Rebuild all products in id order. Returns number of products rebuilt."""
+    total = 0
+    last_product_id = 0
+
+    while True:
+        with app.app_context():
+            result = service.rebuild_related_products(last_product_id, batch_size)
+            if not result or not result["product_ids"]:
+                if result is None:
+                    get_db().rollback()
+                    print(f"   Build failed after product {last_product_id}")
+                break
+            try:
+                get_db().commit()
+            except SQLAlchemyError as e:
+                get_db().rollback()
+                print(f"   Commit failed after product {last_product_id}: {e}")
+                break
+        product_ids = result["product_ids"]
+        total += len(product_ids)
+        last_product_id = product_ids[-1]
+        print(f"   Rebuilt products {product_ids[0]}..{last_product_id} in {result['duration_ms']}ms")
+
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the related products index from order history")
+    parser.add_argument('--batch-size', type=int, default=RELATED_PRODUCTS_BATCH_SIZE,
+                        help="Products per transaction")
+    parser.add_argument('--interval', type=int, default=0,
+                        help="Seconds between builds (0 = run once)")
+    args = parser.parse_args()
+
+    app = create_app()
+    service = ProductService()
+
+    while True:
+        started = time.perf_counter()
+        rebuilt = build_once(app, service, args.batch_size)
+        print(f"Rebuilt related products of {rebuilt} product(s) in {(time.perf_counter() - started) * 1000:.1f}ms")
+        if args.interval <= 0:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
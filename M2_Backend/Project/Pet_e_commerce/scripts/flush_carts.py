@@ -0,0 +1,76 @@
+"""
+Flush Redis Carts to PostgreSQL (Write-Behind)
+
+Copies open carts changed in Redis (CART_STORAGE_MODE=redis) into the
+carts/cart_items tables, and removes the PostgreSQL copy of carts that
+expired in Redis. Each batch is committed separately; carts from a batch
+whose commit fails are re-queued for the next run.
+
+Usage:
+    python scripts/flush_carts.py                  # Flush once and exit
+    python scripts/flush_carts.py --interval 60    # Flush every 60 seconds
+    python scripts/flush_carts.py --batch-size 500
+"""
+
+import argparse
+import time
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from app import create_app
+from app.core.database import get_db
+from app.sales.repositories.cart_redis_repository import CartRedisRepository
+from config.settings import CART_FLUSH_BATCH_SIZE, CART_STORAGE_MODE
+
+
+def flush_once(app, repository, batch_size):
+    """Flush all pending carts in batches. Returns number of carts flushed."""
+    total = 0
+
+    with app.app_context():
+        expired = repository.sweep_expired()
+        if expired:
+            print(f"   Queued {len(expired)} expired carts for removal")
+
+    while True:
+        with app.app_context():
+            flushed = repository.flush_dirty_carts(batch_size)
+            if not flushed:
+                break
+            try:
+                get_db().commit()
+            except SQLAlchemyError as e:
+                get_db().rollback()
+                repository.mark_dirty(flushed)
+                print(f"   Commit failed, re-queued {len(flushed)} carts: {e}")
+                break
+        total += len(flushed)
+
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Flush Redis carts to PostgreSQL")
+    parser.add_argument('--batch-size', type=int, default=CART_FLUSH_BATCH_SIZE,
+                        help="Carts per transaction")
+    parser.add_argument('--interval', type=int, default=0,
+                        help="Seconds between flushes (0 = run once)")
+    args = parser.parse_args()
+
+    if CART_STORAGE_MODE != 'redis':
+        print(f"CART_STORAGE_MODE is '{CART_STORAGE_MODE}', nothing to flush")
+        return
+
+    app = create_app()
+    repository = CartRedisRepository()
+
+    while True:
+        flushed = flush_once(app, repository, args.batch_size)
+        print(f"Flushed {flushed} carts to PostgreSQL")
+        if args.interval <= 0:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
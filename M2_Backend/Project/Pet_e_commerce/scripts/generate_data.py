@@ -0,0 +1,539 @@
+"""
+Generate Production-Scale Synthetic Data
+
+Loads millions of users, products, carts, orders (with items and invoices)
+and returns into PostgreSQL for scale testing. Rows are streamed through
+``COPY ... FROM STDIN`` by parallel worker processes, one transaction per
+chunk, and the loader reports rows per second per table.
+
+Realistic distributions:
+- Product popularity and user activity follow power laws (a few products
+  appear in most orders, a few users place most orders)
+- Order dates are seasonal: yearly wave, November/December peak, busier
+  weekends and evenings
+- Order/invoice/return statuses follow the order's age (recent orders are
+  pending, old ones delivered and paid, some overdue, cancelled or returned)
+- Prices are skewed towards cheap products
+
+Integrity:
+- Tables are loaded in foreign-key order (users, products, then orders with
+  their carts, items, invoices and returns in the same transaction)
+- Ids of users, products, carts, orders and returns are reserved up front by
+  advancing their sequences, so workers never collide with each other or
+  with rows the application inserts meanwhile
+- Unique columns derive from the reserved ids: SKU (5 lowercase base-36
+  characters of the product id), username/email (gen_<id>), orders.cart_id
+  (one finalized cart per order), invoices.order_id, distinct products per
+  order/cart
+- Reference tables must exist (scripts/init_db.py)
+
+All generated users share the password "generated-password".
+
+Usage:
+    python scripts/generate_data.py --users 100000 --products 50000 --orders 1000000
+    python scripts/generate_data.py --orders 5000000 --workers 8 --chunk-size 50000
+    python scripts/generate_data.py --users 1000 --products 500 --orders 10000 --seed 7 --days 730
+"""
+
+import argparse
+import csv
+import io
+import itertools
+import math
+import multiprocessing
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+import psycopg2
+
+from app import create_app  # noqa: F401  (import order: app package first)
+from app.auth.services.security_service import hash_password
+from config.settings import DB_SCHEMA, get_database_url
+
+GENERATED_PASSWORD = "generated-password"
+BASE36 = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+# Columns loaded per table (omitted ids come from the table's sequence)
+COLUMNS = {
+    "users": ("id", "username", "email", "password_hash", "first_name", "last_name", "phone"),
+    "role_user": ("role_id", "user_id"),
+    "products": ("id", "sku", "description", "product_category_id", "pet_type_id", "stock_quantity",
+                 "price", "brand", "weight", "is_active", "internal_cost", "supplier_info",
+                 "created_by", "last_updated"),
+    "carts": ("id", "user_id", "finalized", "created_at", "version"),
+    "cart_item": ("product_id", "cart_id", "amount", "quantity"),
+    "orders": ("id", "cart_id", "user_id", "order_status_id", "total_amount", "created_at",
+               "shipping_address", "version"),
+    "order_item": ("product_id", "order_id", "amount", "quantity"),
+    "invoices": ("order_id", "user_id", "invoice_status_id", "total_amount", "created_at", "due_date", "version"),
+    "returns": ("id", "order_id", "user_id", "return_status_id", "total_amount", "created_at", "version"),
+    "return_item": ("product_id", "return_id", "quantity", "reason", "amount"),
+}
+
+# Tables written by each phase, in foreign-key order
+PHASES = {
+    "users": ("users", "role_user"),
+    "products": ("products",),
+    "orders": ("carts", "orders", "order_item", "invoices", "returns", "return_item"),
+    "open_carts": ("carts", "cart_item"),
+}
+
+FIRST_NAMES = ("Ana", "Luis", "Maria", "Jose", "Sofia", "Carlos", "Valeria", "Diego", "Camila", "Andres")
+LAST_NAMES = ("Mora", "Rojas", "Vargas", "Jimenez", "Solano", "Castro", "Araya", "Quesada", "Brenes", "Chaves")
+ADJECTIVES = ("Premium", "Organic", "Deluxe", "Classic", "Natural", "Travel", "Dental", "Grain-free", "Soft", "Eco")
+NOUNS = ("food", "treats", "toy", "collar", "leash", "bed", "shampoo", "brush", "bowl", "litter")
+CITIES = ("San Jose", "Heredia", "Alajuela", "Cartago", "Liberia", "Limon", "Puntarenas")
+RETURN_REASONS = ("Damaged on arrival", "Wrong size", "Pet didn't like it", "Arrived late", "Not as described")
+
+
+@dataclass
+class Plan:
+    """Everything a worker needs to generate its chunks (pickled to each process)."""
+
+    database_url: str
+    schema: str
+    seed: int
+    users: int
+    products: int
+    orders: int
+    open_carts: int
+    user_base: int
+    product_base: int
+    cart_base: int
+    order_base: int
+    return_base: int
+    role_id: int
+    statuses: Dict[str, Dict[str, int]]
+    password_hash: str
+    now: datetime
+    days: int
+    product_skew: float
+    user_skew: float
+    max_items: int
+    return_ratio: float
+    day_weights: List[float] = field(default_factory=list)
+
+
+# ============================================
+# DISTRIBUTIONS
+# ============================================
+
+def zipf_rank(rng: random.Random, n: int, skew: float) -> int:
+    """Rank in [0, n) with P(rank) ~ 1 / (rank + 1) ** skew (inverse CDF of the continuous power law)."""
+    u = rng.random()
+    if abs(skew - 1.0) < 1e-9:
+        rank = n ** u
+    else:
+        rank = ((n ** (1 - skew) - 1) * u + 1) ** (1 / (1 - skew))
+    return min(n - 1, int(rank) - 1)
+
+
+def scatter(rank: int, n: int) -> int:
+    """Spread popular ranks over the id range (bijective for n < 2654435761)."""
+    return (rank * 2654435761) % n
+
+
+def seasonal_day_weights(now: datetime, days: int) -> List[float]:
+    """Cumulative weights of "days ago" values: yearly wave, holiday peak, weekends."""
+    cumulative, total = [], 0.0
+    for days_ago in range(days):
+        day = now - timedelta(days=days_ago)
+        weight = 1.0 + 0.3 * math.sin(2 * math.pi * (day.timetuple().tm_yday - 80) / 365)
+        if (day.month == 11 and day.day >= 15) or (day.month == 12 and day.day <= 24):
+            weight *= 2.0
+        if day.weekday() >= 5:
+            weight *= 1.25
+        # Growth: recent months are busier than a year ago
+        weight *= 1.0 + 0.5 * (1 - days_ago / days)
+        total += weight
+        cumulative.append(total)
+    return cumulative
+
+
+# Cumulative weights of the hour of day (evening peak)
+HOUR_WEIGHTS = list(itertools.accumulate(
+    [1, 1, 1, 1, 1, 1, 2, 3, 4, 5, 5, 6, 7, 6, 5, 5, 6, 7, 9, 10, 10, 8, 5, 2]
+))
+
+
+def order_time(rng: random.Random, plan: Plan) -> datetime:
+    days_ago = rng.choices(range(plan.days), cum_weights=plan.day_weights)[0]
+    hour = rng.choices(range(24), cum_weights=HOUR_WEIGHTS)[0]
+    day = plan.now - timedelta(days=days_ago)
+    moment = day.replace(hour=hour, minute=rng.randrange(60), second=rng.randrange(60), microsecond=0)
+    return min(moment, plan.now)
+
+
+def product_price(product_id: int, seed: int) -> float:
+    """Deterministic, skewed price of a product (same value in every worker)."""
+    u = ((product_id * 2654435761 + seed * 97) & 0xFFFFFFFF) / 2 ** 32
+    return round(2.5 + (u ** 3) * 250, 2)
+
+
+def to_base36(value: int, width: int = 5) -> str:
+    digits = ""
+    for _ in range(width):
+        value, remainder = divmod(value, 36)
+        digits = BASE36[remainder] + digits
+    return digits
+
+
+def pick(ids: Dict[str, int], *names: str) -> int:
+    """First existing status id among `names` (falls back to any status)."""
+    for name in names:
+        if name in ids:
+            return ids[name]
+    return next(iter(ids.values()))
+
+
+# ============================================
+# ROW GENERATORS
+# ============================================
+
+def user_rows(plan: Plan, rng: random.Random, start: int, count: int) -> Dict[str, Iterator[tuple]]:
+    ids = range(plan.user_base + start + 1, plan.user_base + start + count + 1)
+    return {
+        "users": (
+            (user_id, f"gen_{user_id}", f"gen_{user_id}@example.com", plan.password_hash,
+             rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES),
+             f"+506 {rng.randrange(6000, 9000)}-{rng.randrange(10000):04d}" if rng.random() < 0.6 else None)
+            for user_id in ids
+        ),
+        "role_user": ((plan.role_id, user_id) for user_id in ids),
+    }
+
+
+def product_rows(plan: Plan, rng: random.Random, start: int, count: int) -> Dict[str, Iterator[tuple]]:
+    categories = list(plan.statuses["product_categories"].values())
+    pet_types = list(plan.statuses["pet_types"].values())
+
+    def rows():
+        for product_id in range(plan.product_base + start + 1, plan.product_base + start + count + 1):
+            price = product_price(product_id, plan.seed)
+            yield (
+                product_id, to_base36(product_id),
+                f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} #{product_id}",
+                rng.choice(categories), rng.choice(pet_types),
+                int(rng.paretovariate(1.2) * 20), price, f"Brand{rng.randrange(300)}",
+                round(rng.uniform(0.05, 20), 2), rng.random() > 0.03, round(price * rng.uniform(0.4, 0.8), 2),
+                None, "generator", plan.now - timedelta(days=rng.randrange(plan.days))
+            )
+    return {"products": rows()}
+
+
+def order_rows(plan: Plan, rng: random.Random, start: int, count: int) -> Dict[str, Iterable[tuple]]:
+    """Orders with their finalized cart, items, invoice and (some) returns."""
+    order_status, invoice_status, return_status = (
+        plan.statuses["order_status"], plan.statuses["invoice_status"], plan.statuses["return_status"]
+    )
+    tables = {name: [] for name in PHASES["orders"]}
+
+    for index in range(start, start + count):
+        order_id, cart_id = plan.order_base + index + 1, plan.cart_base + index + 1
+        user_id = plan.user_base + 1 + scatter(zipf_rank(rng, plan.users, plan.user_skew), plan.users)
+        created_at = order_time(rng, plan)
+        age = (plan.now - created_at).days
+
+        product_ids = set()
+        for _ in range(rng.randint(1, plan.max_items)):
+            product_ids.add(plan.product_base + 1 + scatter(zipf_rank(rng, plan.products, plan.product_skew), plan.products))
+        items = [(product_id, product_price(product_id, plan.seed), rng.choices((1, 2, 3, 4), (70, 20, 7, 3))[0])
+                 for product_id in sorted(product_ids)]
+        total = round(sum(price * quantity for _, price, quantity in items), 2)
+
+        if age < 2:
+            status = rng.choice(("pending", "confirmed"))
+        elif age < 6:
+            status = rng.choice(("processing", "shipped"))
+        else:
+            status = "cancelled" if rng.random() < 0.05 else "delivered"
+
+        if status == "cancelled":
+            invoice = pick(invoice_status, "refunded", "pending")
+        elif age > 30 and rng.random() < 0.03:
+            invoice = pick(invoice_status, "overdue", "pending")
+        elif status in ("delivered", "shipped") or rng.random() < 0.7:
+            invoice = pick(invoice_status, "paid")
+        else:
+            invoice = pick(invoice_status, "pending")
+
+        tables["carts"].append((cart_id, user_id, True, created_at, 1))
+        tables["orders"].append((order_id, cart_id, user_id, pick(order_status, status, "pending"), total,
+                                 created_at, f"{rng.randrange(1, 999)} Calle {rng.randrange(1, 60)}, {rng.choice(CITIES)}", 1))
+        tables["order_item"].extend((product_id, order_id, price, quantity) for product_id, price, quantity in items)
+        tables["invoices"].append((order_id, user_id, invoice, total, created_at, created_at + timedelta(days=30), 1))
+
+        if status == "delivered" and rng.random() < plan.return_ratio:
+            return_id = plan.return_base + index + 1
+            product_id, price, quantity = rng.choice(items)
+            returned_at = min(plan.now, created_at + timedelta(days=rng.randint(3, 30)))
+            return_age = (plan.now - returned_at).days
+            state = "requested" if return_age < 3 else rng.choice(("approved", "processed", "processed", "rejected"))
+            tables["returns"].append((return_id, order_id, user_id, pick(return_status, state, "requested"),
+                                      round(price * quantity, 2), returned_at, 1))
+            tables["return_item"].append((product_id, return_id, quantity, rng.choice(RETURN_REASONS),
+                                          round(price * quantity, 2)))
+    return tables
+
+
+def open_cart_rows(plan: Plan, rng: random.Random, start: int, count: int) -> Dict[str, Iterable[tuple]]:
+    """Open (not finalized) carts for the first `open_carts` users, one each."""
+    tables = {"carts": [], "cart_item": []}
+    for index in range(start, start + count):
+        cart_id = plan.cart_base + plan.orders + index + 1
+        user_id = plan.user_base + 1 + scatter(index, plan.users)
+        tables["carts"].append((cart_id, user_id, False, plan.now - timedelta(hours=rng.randrange(24 * 14)), 1))
+        product_ids = {plan.product_base + 1 + scatter(zipf_rank(rng, plan.products, plan.product_skew), plan.products)
+                       for _ in range(rng.randint(1, 4))}
+        tables["cart_item"].extend((product_id, cart_id, product_price(product_id, plan.seed), rng.randint(1, 3))
+                                   for product_id in sorted(product_ids))
+    return tables
+
+
+GENERATORS = {
+    "users": user_rows,
+    "products": product_rows,
+    "orders": order_rows,
+    "open_carts": open_cart_rows,
+}
+
+
+# ============================================
+# COPY STREAMING
+# ============================================
+
+def _csv_value(value):
+    if value is True:
+        return "t"
+    if value is False:
+        return "f"
+    return value
+
+
+class CopyStream(io.TextIOBase):
+    """File-like object that renders rows as CSV on demand for COPY FROM STDIN."""
+
+    def __init__(self, rows: Iterable[tuple]):
+        self.rows = iter(rows)
+        self.count = 0
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer, lineterminator="\n")
+        self._pending = ""
+
+    def readable(self):
+        return True
+
+    def read(self, size: int = -1) -> str:
+        while size < 0 or len(self._pending) < size:
+            row = next(self.rows, None)
+            if row is None:
+                break
+            self._writer.writerow([_csv_value(value) for value in row])
+            self.count += 1
+            if self._buffer.tell() >= 65536:
+                self._pending += self._buffer.getvalue()
+                self._buffer.seek(0)
+                self._buffer.truncate()
+        self._pending += self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        if size < 0:
+            data, self._pending = self._pending, ""
+        else:
+            data, self._pending = self._pending[:size], self._pending[size:]
+        return data
+
+    readline = read
+
+
+def copy_rows(cursor, schema: str, table: str, rows: Iterable[tuple]) -> int:
+    """Stream rows into `table`; returns the number of rows."""
+    stream = CopyStream(rows)
+    cursor.copy_expert(
+        f"COPY {schema}.{table} ({', '.join(COLUMNS[table])}) FROM STDIN WITH (FORMAT csv)", stream, size=65536
+    )
+    return stream.count
+
+
+# ============================================
+# WORKERS
+# ============================================
+
+_plan = None
+_connection = None
+
+
+def _init_worker(plan: Plan) -> None:
+    global _plan, _connection
+    _plan = plan
+    _connection = psycopg2.connect(plan.database_url)
+
+
+def load_chunk(task: Tuple[str, int, int, int]) -> Dict[str, int]:
+    """Generate and COPY one chunk of a phase in one transaction; returns rows per table."""
+    phase, chunk_index, start, count = task
+    rng = random.Random(f"{_plan.seed}:{phase}:{chunk_index}")
+    tables = GENERATORS[phase](_plan, rng, start, count)
+    loaded = {}
+    try:
+        with _connection.cursor() as cursor:
+            for table in PHASES[phase]:
+                loaded[table] = copy_rows(cursor, _plan.schema, table, tables[table])
+        _connection.commit()
+    except Exception:
+        _connection.rollback()
+        raise
+    return loaded
+
+
+# ============================================
+# COORDINATOR
+# ============================================
+
+def reserve_ids(cursor, schema: str, table: str, count: int) -> int:
+    """Advance the table's id sequence by `count`; returns the id before the reserved range."""
+    cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", (f"{schema}.{table}",))
+    sequence = cursor.fetchone()[0]
+    cursor.execute(f"SELECT GREATEST((SELECT COALESCE(MAX(id), 0) FROM {schema}.{table}), "
+                   f"(SELECT last_value FROM {sequence}))")
+    base = cursor.fetchone()[0]
+    cursor.execute("SELECT setval(%s, %s)", (sequence, base + max(count, 1)))
+    return base
+
+
+def check_unique_ranges(cursor, schema: str, product_base: int, products: int, user_base: int, users: int) -> None:
+    """Fail if rows not written by this generator already use SKUs/usernames of the new id ranges."""
+    cursor.execute(f"SELECT id, sku FROM {schema}.products WHERE sku ~ '^[0-9a-z]{{5}}$'")
+    for row_id, sku in cursor.fetchall():
+        if int(sku, 36) != row_id and product_base < int(sku, 36) <= product_base + products:
+            raise SystemExit(f"SKU {sku} (product {row_id}) collides with the generated range")
+    cursor.execute(f"SELECT id, username FROM {schema}.users WHERE username ~ '^gen_[0-9]+$' "
+                   f"OR email ~ '^gen_[0-9]+@example\\.com$'")
+    for row_id, username in cursor.fetchall():
+        suffix = username[4:] if username.startswith("gen_") and username[4:].isdigit() else None
+        if suffix is None or int(suffix) != row_id:
+            if suffix is None or user_base < int(suffix) <= user_base + users:
+                raise SystemExit(f"User {row_id} ({username}) collides with generated usernames/emails")
+
+
+def load_reference_ids(cursor, schema: str) -> Dict[str, Dict[str, int]]:
+    queries = {
+        "product_categories": f"SELECT lower(category), id FROM {schema}.product_categories",
+        "pet_types": f"SELECT lower(type), id FROM {schema}.pet_types",
+        "roles": f"SELECT lower(name), id FROM {schema}.roles",
+        "order_status": f"SELECT lower(status), id FROM {schema}.order_status",
+        "invoice_status": f"SELECT lower(name), id FROM {schema}.invoice_status",
+        "return_status": f"SELECT lower(status), id FROM {schema}.return_status",
+    }
+    ids = {}
+    for name, query in queries.items():
+        cursor.execute(query)
+        ids[name] = dict(cursor.fetchall())
+        if not ids[name]:
+            raise SystemExit(f"Reference table for {name} is empty - run scripts/init_db.py first")
+    return ids
+
+
+def chunks(phase: str, total: int, chunk_size: int) -> List[Tuple[str, int, int, int]]:
+    return [(phase, index, start, min(chunk_size, total - start))
+            for index, start in enumerate(range(0, total, chunk_size))]
+
+
+def run_phase(pool, phase: str, total: int, chunk_size: int, totals: Dict[str, int]) -> None:
+    if total <= 0:
+        return
+    started = time.perf_counter()
+    phase_rows = {}
+    tasks = chunks(phase, total, chunk_size)
+    for done, loaded in enumerate(pool.imap_unordered(load_chunk, tasks), start=1):
+        for table, rows in loaded.items():
+            phase_rows[table] = phase_rows.get(table, 0) + rows
+        print(f"\r   {phase:<11} chunk {done}/{len(tasks)}", end="", flush=True)
+    elapsed = time.perf_counter() - started
+    rows = sum(phase_rows.values())
+    print(f"\r   {phase:<11} {rows:>12,} rows in {elapsed:8.1f}s  {rows / elapsed:>12,.0f} rows/s  "
+          + ", ".join(f"{table}={count:,}" for table, count in phase_rows.items()))
+    for table, count in phase_rows.items():
+        totals[table] = totals.get(table, 0) + count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate production-scale synthetic data with COPY")
+    parser.add_argument('--users', type=int, default=10000)
+    parser.add_argument('--products', type=int, default=5000)
+    parser.add_argument('--orders', type=int, default=100000, help="Orders (each with cart, items and invoice)")
+    parser.add_argument('--open-cart-ratio', type=float, default=0.2, help="Share of new users with an open cart")
+    parser.add_argument('--return-ratio', type=float, default=0.04, help="Share of delivered orders returned")
+    parser.add_argument('--max-items', type=int, default=5, help="Max distinct products per order")
+    parser.add_argument('--days', type=int, default=365, help="Order dates span this many days back")
+    parser.add_argument('--product-skew', type=float, default=1.1, help="Power-law exponent of product popularity")
+    parser.add_argument('--user-skew', type=float, default=0.8, help="Power-law exponent of orders per user")
+    parser.add_argument('--workers', type=int, default=multiprocessing.cpu_count())
+    parser.add_argument('--chunk-size', type=int, default=20000, help="Parent rows per COPY transaction")
+    parser.add_argument('--seed', type=int, default=1, help="Random seed (same seed, same data)")
+    parser.add_argument('--no-analyze', action='store_true', help="Skip ANALYZE after loading")
+    args = parser.parse_args()
+
+    if args.orders and (args.users <= 0 or args.products <= 0):
+        raise SystemExit("Orders need at least one generated user and product")
+    if args.products >= 36 ** 5:
+        raise SystemExit("At most 60,466,175 products (5-character SKUs)")
+
+    schema, database_url = DB_SCHEMA, get_database_url()
+    open_carts = int(args.users * args.open_cart_ratio)
+    now = datetime.utcnow().replace(microsecond=0)
+
+    with psycopg2.connect(database_url) as connection, connection.cursor() as cursor:
+        reference = load_reference_ids(cursor, schema)
+        role_id = reference["roles"].get("user")
+        if role_id is None:
+            raise SystemExit("Role 'user' not found - run scripts/init_db.py first")
+        user_base = reserve_ids(cursor, schema, "users", args.users)
+        product_base = reserve_ids(cursor, schema, "products", args.products)
+        check_unique_ranges(cursor, schema, product_base, args.products, user_base, args.users)
+        plan = Plan(
+            database_url=database_url, schema=schema, seed=args.seed,
+            users=args.users, products=args.products, orders=args.orders, open_carts=open_carts,
+            user_base=user_base, product_base=product_base,
+            cart_base=reserve_ids(cursor, schema, "carts", args.orders + open_carts),
+            order_base=reserve_ids(cursor, schema, "orders", args.orders),
+            # Sparse: return ids follow order positions, only some are used
+            return_base=reserve_ids(cursor, schema, "returns", args.orders),
+            role_id=role_id, statuses=reference,
+            password_hash=hash_password(GENERATED_PASSWORD), now=now, days=args.days,
+            product_skew=args.product_skew, user_skew=args.user_skew,
+            max_items=args.max_items, return_ratio=args.return_ratio,
+            day_weights=seasonal_day_weights(now, args.days)
+        )
+    connection.close()
+
+    print(f"Generating into {schema} with {args.workers} workers (seed {args.seed})")
+    print(f"   users {user_base + 1}..{user_base + args.users}, products {product_base + 1}..{product_base + args.products}")
+
+    totals = {}
+    started = time.perf_counter()
+    with multiprocessing.Pool(args.workers, initializer=_init_worker, initargs=(plan,)) as pool:
+        # Phases run one after another: later phases reference earlier rows
+        run_phase(pool, "users", args.users, args.chunk_size, totals)
+        run_phase(pool, "products", args.products, args.chunk_size, totals)
+        run_phase(pool, "orders", args.orders, args.chunk_size, totals)
+        run_phase(pool, "open_carts", open_carts, args.chunk_size, totals)
+    elapsed = time.perf_counter() - started
+
+    if not args.no_analyze and totals:
+        with psycopg2.connect(database_url) as connection:
+            connection.autocommit = True
+            with connection.cursor() as cursor:
+                for table in totals:
+                    cursor.execute(f"ANALYZE {schema}.{table}")
+        connection.close()
+
+    rows = sum(totals.values())
+    print(f"\nLoaded {rows:,} rows in {elapsed:.1f}s ({rows / elapsed if elapsed else 0:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Import Products from a Catalog File
+
+Streams a supplier CSV or NDJSON file into the catalog with the same staged
+upsert as POST /products/import: rows are validated in batches, COPYed into a
+temp table and merged by SKU with one INSERT ... ON CONFLICT (sku) DO UPDATE.
+Product caches are invalidated once, after the import commits.
+
+CSV files need a header row with the product fields (sku, name, description,
+category, pet_type, price, stock_quantity, brand, weight, ...); NDJSON files
+hold one product object per line.
+
+Usage:
+    python scripts/import_products.py catalog.csv
+    python scripts/import_products.py catalog.ndjson --created-by supplier_sync
+    python scripts/import_products.py catalog.txt --format csv --report report.json
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from app import create_app
+from app.core.reference_data import stop_reference_data_refresher
+from app.products.services.product_import_service import ProductImportService, SUPPORTED_FORMATS
+
+EXTENSIONS = {'.csv': 'csv', '.ndjson': 'ndjson', '.jsonl': 'ndjson'}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import products (upsert by SKU)")
+    parser.add_argument('path', help="CSV or NDJSON file")
+    parser.add_argument('--format', choices=SUPPORTED_FORMATS, help="File format (default: from extension)")
+    parser.add_argument('--created-by', default='import', help="Username recorded on new products")
+    parser.add_argument('--batch-size', type=int, help="Rows validated and staged per batch")
+    parser.add_argument('--report', help="Write the full JSON report to this file")
+    args = parser.parse_args()
+
+    file_format = args.format or EXTENSIONS.get(os.path.splitext(args.path)[1].lower())
+    if not file_format:
+        parser.error("Cannot tell the format from the file extension; pass --format")
+
+    app = create_app()
+    stop_reference_data_refresher()
+
+    # The app context commits the import at teardown (rolls back on error)
+    with app.app_context():
+        service = ProductImportService(**({'batch_size': args.batch_size} if args.batch_size else {}))
+        with open(args.path, 'rb') as stream:
+            report = service.import_products(stream, file_format, created_by=args.created_by)
+        if report is None:
+            raise SystemExit("Import failed - see log for details (nothing was written)")
+
+    print(f"Processed {report['processed']} row(s): {report['inserted']} inserted, "
+          f"{report['updated']} updated, {report['unchanged']} unchanged, {report['failed']} failed, "
+          f"{report['duplicates']} duplicate SKU(s)")
+    for error in report['errors'][:20]:
+        print(f"   line {error['line']} ({error['sku'] or '-'}): {json.dumps(error['errors'])}")
+    if len(report['errors']) > 20 or report['errors_truncated']:
+        print("   ... more errors" + (f" in {args.report}" if args.report else " (use --report)"))
+
+    if args.report:
+        with open(args.report, 'w') as output:
+            json.dump(report, output, indent=2)
+
+    sys.exit(1 if report['failed'] else 0)
+
+
+if __name__ == "__main__":
+    main()
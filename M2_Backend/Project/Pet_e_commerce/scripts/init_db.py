@@ -12,17 +12,27 @@ Reference Tables Initialized:
 - Return Status (requested, approved, rejected, processed)
 - Invoice Status (paid, pending, overdue, refunded)
 
+Also installs the reference data NOTIFY triggers, the analytics triggers
+that queue changed days for the rollup refresh (scripts/refresh_analytics.py)
+and the triggers that keep user_stats up to date (scripts/rebuild_user_stats.py
+backfills existing users).
+
 Usage:
     python scripts/init_db.py
 """
 
 from app.core.database import Base, set_schema, get_engine, session_scope
-from app.auth.models.user import Role, RoleUser, User
-from app.products.models.product import ProductCategory, PetType, Product
+from app.auth.models.user import Role, RoleUser, User, UserStats
+from app.products.models.product import ProductCategory, PetType, Product, RelatedProduct  # noqa: F401
 from app.sales.models.order import OrderStatus, OrderItem, Order
 from app.sales.models.cart import CartItem, Cart
 from app.sales.models.invoice import InvoiceStatus, Invoice  # ✅ Corrected import
 from app.sales.models.returns import ReturnStatus, ReturnItem, Return
+from app.analytics.models import AnalyticsDirtyDay  # rollup tables
+import app.core.jobs  # noqa: F401  (jobs / dead_jobs tables)
+from app.analytics.repositories.analytics_repository import install_analytics_triggers
+from app.auth.repositories.user_stats_repository import install_user_stats_triggers
+from app.core.reference_data import POSTGRES_CHANNEL
 from config.settings import get_database_url, DB_SCHEMA
 
 from sqlalchemy import text
@@ -100,6 +110,31 @@ def init_reference_tables(session):
     print("\n✅ All reference tables populated successfully!")
 
 
+def install_reference_notify_triggers(conn, schema_name):
+    """
+    NOTIFY reference_data_changed after any change to a reference table.
+
+    Running app processes LISTEN on this channel when REFERENCE_DATA_NOTIFY=postgres
+    and reload their reference data snapshot (app/core/reference_data.py).
+    """
+    conn.execute(text(f"""
+        CREATE OR REPLACE FUNCTION {schema_name}.notify_reference_data_changed() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('{POSTGRES_CHANNEL}', TG_TABLE_NAME);
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """))
+    for model in (Role, ProductCategory, PetType, OrderStatus, ReturnStatus, InvoiceStatus):
+        table = f"{schema_name}.{model.__tablename__}"
+        trigger = f"{model.__tablename__}_notify_reference_data"
+        conn.execute(text(f"DROP TRIGGER IF EXISTS {trigger} ON {table}"))
+        conn.execute(text(
+            f"CREATE TRIGGER {trigger} AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table} "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION {schema_name}.notify_reference_data_changed()"
+        ))
+
+
 def create_test_data(session):
     """Create sample test data (optional)."""
     
@@ -139,6 +174,28 @@ def main():
         Base.metadata.create_all(engine)
         print("✅ All tables created successfully!")
         
+        # Reference data change notifications (REFERENCE_DATA_NOTIFY=postgres)
+        with engine.connect() as conn:
+            install_reference_notify_triggers(conn, schema_name)
+            conn.commit()
+            print("✅ Reference data NOTIFY triggers ready")
+        
+        # Indexes added after the first release (create_all skips existing tables)
+        # and the triggers that mark analytics rollup days dirty
+        with engine.connect() as conn:
+            install_analytics_triggers(conn, schema_name)
+            for model in (Order, OrderItem, Invoice, Return, ReturnItem, AnalyticsDirtyDay):
+                for index in model.__table__.indexes:
+                    index.create(conn, checkfirst=True)
+            conn.commit()
+            print("✅ Analytics triggers ready (run scripts/refresh_analytics.py --rebuild to backfill rollups)")
+        
+        # Per-user account summary maintained by order/invoice/return triggers
+        with engine.connect() as conn:
+            install_user_stats_triggers(conn, schema_name)
+            conn.commit()
+            print("✅ User stats triggers ready (run scripts/rebuild_user_stats.py for existing users)")
+        
         # Initialize reference tables using session_scope
         with session_scope() as session:
             # Check if reference tables are already populated
@@ -0,0 +1,61 @@
+"""
+Rebuild User Account Summaries
+
+Recomputes user_stats (order count, lifetime spend, open invoices, pending
+returns) for every user, in batches of users committed separately. Needed
+once after installing the triggers on an existing database, or after bulk
+loads that bypassed them; afterwards the triggers keep the rows current.
+
+Usage:
+    python scripts/rebuild_user_stats.py
+    python scripts/rebuild_user_stats.py --batch-size 5000
+"""
+
+import argparse
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from app import create_app
+from app.core.database import get_db
+from app.auth.repositories.user_stats_repository import UserStatsRepository
+
+
+def rebuild_all(app, repository, batch_size):
+    """Rebuild all users in id order. Returns number of users rebuilt."""
+    total = 0
+    last_user_id = 0
+
+    while True:
+        with app.app_context():
+            user_ids = repository.rebuild(last_user_id, batch_size)
+            if not user_ids:
+                if user_ids is None:
+                    get_db().rollback()
+                    print(f"   Rebuild failed after user {last_user_id}")
+                break
+            try:
+                get_db().commit()
+            except SQLAlchemyError as e:
+                get_db().rollback()
+                print(f"   Commit failed after user {last_user_id}: {e}")
+                break
+        total += len(user_ids)
+        last_user_id = user_ids[-1]
+        print(f"   Rebuilt users {user_ids[0]}..{last_user_id}")
+
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild user_stats account summaries")
+    parser.add_argument('--batch-size', type=int, default=1000,
+                        help="Users per transaction")
+    args = parser.parse_args()
+
+    app = create_app()
+    rebuilt = rebuild_all(app, UserStatsRepository(), args.batch_size)
+    print(f"Rebuilt account summary of {rebuilt} user(s)")
+
+
+if __name__ == "__main__":
+    main()
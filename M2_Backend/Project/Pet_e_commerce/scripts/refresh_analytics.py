@@ -0,0 +1,96 @@
+"""
+Refresh Sales Analytics Rollups
+
+Recomputes the daily rollup tables (daily_sales, daily_product_sales,
+daily_category_sales, daily_returns) for the days marked in
+analytics_dirty_days by the order/return triggers (a day may be marked
+several times; all its marks are claimed together). Each batch of days is
+committed separately; a failed batch stays queued for the next run.
+
+--rebuild queues every day from the oldest order/return (or --from) up to
+today first, e.g. after installing the triggers on an existing database or
+after a bulk load.
+
+Usage:
+    python scripts/refresh_analytics.py                      # Refresh once and exit
+    python scripts/refresh_analytics.py --interval 60        # Refresh every 60 seconds
+    python scripts/refresh_analytics.py --rebuild            # Backfill all history
+    python scripts/refresh_analytics.py --rebuild --from 2025-01-01
+"""
+
+import argparse
+import time
+from datetime import date
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from app import create_app
+from app.core.database import get_db
+from app.analytics.repositories.analytics_repository import AnalyticsRepository
+from config.settings import ANALYTICS_REFRESH_BATCH_DAYS
+
+
+def queue_rebuild(app, repository, start_day):
+    """Queue every day from start_day (default: oldest order/return) to today."""
+    with app.app_context():
+        start_day = start_day or repository.get_history_start()
+        if start_day is None:
+            print("No orders or returns to rebuild")
+            return
+        queued = repository.mark_days_dirty(start_day, date.today())
+        get_db().commit()
+        print(f"Queued {queued} day(s) from {start_day} for rebuild")
+
+
+def refresh_once(app, repository, batch_days):
+    """Refresh all queued days in batches. Returns number of days refreshed."""
+    total = 0
+
+    while True:
+        with app.app_context():
+            days = repository.refresh_dirty_days(batch_days)
+            if not days:
+                if days is None:
+                    get_db().rollback()
+                    print("   Refresh failed, days stay queued")
+                break
+            try:
+                get_db().commit()
+            except SQLAlchemyError as e:
+                get_db().rollback()
+                print(f"   Commit failed, {len(days)} day(s) stay queued: {e}")
+                break
+        total += len(days)
+        print(f"   Refreshed {days[0]}..{days[-1]} ({len(days)} day(s))")
+
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh sales analytics rollups")
+    parser.add_argument('--batch-days', type=int, default=ANALYTICS_REFRESH_BATCH_DAYS,
+                        help="Days recomputed per transaction")
+    parser.add_argument('--interval', type=int, default=0,
+                        help="Seconds between refreshes (0 = run once)")
+    parser.add_argument('--rebuild', action='store_true',
+                        help="Queue every day of history before refreshing")
+    parser.add_argument('--from', dest='start_day', type=date.fromisoformat, default=None,
+                        help="First day to rebuild (YYYY-MM-DD, with --rebuild)")
+    args = parser.parse_args()
+
+    app = create_app()
+    repository = AnalyticsRepository()
+
+    if args.rebuild:
+        queue_rebuild(app, repository, args.start_day)
+
+    while True:
+        refreshed = refresh_once(app, repository, args.batch_days)
+        print(f"Refreshed {refreshed} day(s) of analytics rollups")
+        if args.interval <= 0:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
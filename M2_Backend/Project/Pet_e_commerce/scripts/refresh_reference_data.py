@@ -0,0 +1,35 @@
+"""
+Refresh Reference Data in Running Processes
+
+Reloads the reference tables (categories, pet types, roles, statuses) from
+PostgreSQL, stores the snapshot blob in Redis and announces the new version
+on the Redis channel, so every running app process swaps in the new snapshot
+(REFERENCE_DATA_NOTIFY=redis). Run it after editing reference tables by hand.
+
+With REFERENCE_DATA_NOTIFY=postgres the table triggers notify the processes
+directly; this script then only refreshes the Redis blob.
+
+Usage:
+    python scripts/refresh_reference_data.py
+"""
+
+from app import create_app
+from app.core.reference_data import ReferenceDataCache, stop_reference_data_refresher
+
+
+def main():
+    app = create_app()
+    # Only this one-off refresh is needed, not the background thread
+    stop_reference_data_refresher()
+
+    with app.app_context():
+        changed = ReferenceDataCache.refresh(publish=True)
+
+    snapshot = ReferenceDataCache.snapshot
+    print(f"Reference data version {snapshot.version} ({'changed' if changed else 'unchanged'})")
+    for table, rows in snapshot.tables.items():
+        print(f"   {table}: {len(rows)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Run Background Job Workers
+
+Processes the jobs table (app/core/jobs.py) in one or more worker
+processes, and inspects or requeues dead-lettered jobs.
+
+Workers claim jobs with FOR UPDATE SKIP LOCKED, so any number of processes
+(on any number of hosts) can run side by side. SIGINT/SIGTERM stop a worker
+after its current job.
+
+Usage:
+    python scripts/run_jobs.py work                       # One worker, runs until stopped
+    python scripts/run_jobs.py work --processes 4         # Four worker processes
+    python scripts/run_jobs.py work --once                # Drain due jobs and exit
+    python scripts/run_jobs.py stats                      # Pending jobs per queue
+    python scripts/run_jobs.py dead --limit 20            # Latest dead jobs
+    python scripts/run_jobs.py requeue 12 15              # Requeue dead jobs (all when no id)
+"""
+
+import argparse
+import multiprocessing
+import signal
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from app import create_app
+from app.core.database import get_db
+from app.core.jobs import DEFAULT_QUEUE, JobQueue, run_worker
+from config.settings import JOB_POLL_INTERVAL_SECONDS
+
+
+def work(queues, poll_interval, once):
+    """Worker process entry point (each process builds its own app and engine)."""
+    stopping = []
+
+    def request_stop(signum, frame):
+        stopping.append(signum)
+
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+
+    app = create_app()
+    processed = run_worker(app, queues, poll_interval=poll_interval, once=once,
+                           should_stop=lambda: bool(stopping))
+    print(f"Worker {multiprocessing.current_process().name} processed {processed} job(s)")
+
+
+def start_workers(args):
+    """Run one worker in-process, or --processes workers in child processes."""
+    if args.processes <= 1:
+        work(args.queues, args.poll_interval, args.once)
+        return
+
+    workers = [
+        multiprocessing.Process(target=work, args=(args.queues, args.poll_interval, args.once),
+                                name=f"job-worker-{number}")
+        for number in range(1, args.processes + 1)
+    ]
+    for worker in workers:
+        worker.start()
+    print(f"Started {len(workers)} job workers (queues: {', '.join(args.queues)})")
+    try:
+        for worker in workers:
+            worker.join()
+    except KeyboardInterrupt:
+        for worker in workers:
+            worker.join()
+
+
+def show_stats(app, job_queue):
+    with app.app_context():
+        stats = job_queue.stats()
+        if stats is None:
+            print("Could not read job stats")
+            return
+        if not stats["queues"]:
+            print("No pending jobs")
+        for queue, counts in stats["queues"].items():
+            print(f"   {queue}: {counts['pending']} pending, {counts['due']} due, oldest {counts['oldest']}")
+        print(f"   dead: {stats['dead']}")
+
+
+def show_dead(app, job_queue, limit):
+    with app.app_context():
+        dead_jobs = job_queue.list_dead(limit)
+        if dead_jobs is None:
+            print("Could not list dead jobs")
+            return
+        if not dead_jobs:
+            print("No dead jobs")
+        for dead in dead_jobs:
+            print(f"   #{dead.id} {dead.task} {dead.payload} failed {dead.failed_at:%Y-%m-%d %H:%M:%S} "
+                  f"after {dead.attempts} attempts: {dead.last_error}")
+
+
+def requeue(app, job_queue, dead_ids):
+    with app.app_context():
+        count = job_queue.requeue_dead(dead_ids or None)
+        if count is None:
+            get_db().rollback()
+            print("Requeue failed")
+            return
+        try:
+            get_db().commit()
+        except SQLAlchemyError as e:
+            get_db().rollback()
+            print(f"Commit failed, nothing requeued: {e}")
+            return
+        print(f"Requeued {count} dead job(s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run and inspect background jobs")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    work_parser = commands.add_parser("work", help="Process jobs")
+    work_parser.add_argument('--processes', type=int, default=1,
+                             help="Worker processes to start")
+    work_parser.add_argument('--queues', nargs='+', default=[DEFAULT_QUEUE],
+                             help="Queues to process")
+    work_parser.add_argument('--poll-interval', type=float, default=JOB_POLL_INTERVAL_SECONDS,
+                             help="Seconds to wait when no job is due")
+    work_parser.add_argument('--once', action='store_true',
+                             help="Exit when no job is due")
+
+    commands.add_parser("stats", help="Pending jobs per queue")
+
+    dead_parser = commands.add_parser("dead", help="List dead jobs")
+    dead_parser.add_argument('--limit', type=int, default=50)
+
+    requeue_parser = commands.add_parser("requeue", help="Requeue dead jobs")
+    requeue_parser.add_argument('ids', type=int, nargs='*',
+                                help="Dead job ids (all when omitted)")
+
+    args = parser.parse_args()
+
+    if args.command == "work":
+        start_workers(args)
+        return
+
+    app = create_app()
+    job_queue = JobQueue()
+    if args.command == "stats":
+        show_stats(app, job_queue)
+    elif args.command == "dead":
+        show_dead(app, job_queue, args.limit)
+    else:
+        requeue(app, job_queue, args.ids)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Sweep Overdue Invoices
+
+Moves every pending invoice whose due date has passed to 'overdue', one
+UPDATE ... RETURNING per batch (index ix_invoices_status_due_date). Each
+batch is committed separately; the affected invoice and per-user invoice
+list caches are invalidated in one round trip after its commit (not on
+rollback). The duration of every batch
+and sweep is printed (and logged / exported as invoice_overdue_sweep_seconds).
+
+Usage:
+    python scripts/sweep_overdue_invoices.py                   # Sweep once and exit
+    python scripts/sweep_overdue_invoices.py --interval 300    # Sweep every 5 minutes
+    python scripts/sweep_overdue_invoices.py --batch-size 500
+"""
+
+import argparse
+import time
+from datetime import datetime
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from app import create_app
+from app.core.database import get_db
+from app.sales.services.invoice_service import InvoiceService
+from config.settings import INVOICE_SWEEP_BATCH_SIZE
+
+
+def sweep_once(app, service, batch_size):
+    """Sweep all past-due invoices in batches. Returns number of invoices updated."""
+    total = 0
+    cutoff = datetime.utcnow()
+
+    while True:
+        with app.app_context():
+            result = service.sweep_overdue_invoices(batch_size, now=cutoff)
+            if not result or not result["updated"]:
+                if result is None:
+                    get_db().rollback()
+                    print("   Sweep failed, invoices stay pending")
+                break
+            try:
+                get_db().commit()
+            except SQLAlchemyError as e:
+                get_db().rollback()
+                print(f"   Commit failed, {result['updated']} invoice(s) stay pending: {e}")
+                break
+        total += result["updated"]
+        print(f"   Marked {result['updated']} invoice(s) overdue in {result['duration_ms']}ms")
+        if result["updated"] < batch_size:
+            break
+
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Move past-due pending invoices to overdue")
+    parser.add_argument('--batch-size', type=int, default=INVOICE_SWEEP_BATCH_SIZE,
+                        help="Invoices per transaction")
+    parser.add_argument('--interval', type=int, default=0,
+                        help="Seconds between sweeps (0 = run once)")
+    args = parser.parse_args()
+
+    app = create_app()
+    service = InvoiceService()
+
+    while True:
+        started = time.perf_counter()
+        swept = sweep_once(app, service, args.batch_size)
+        print(f"Marked {swept} invoice(s) overdue in {(time.perf_counter() - started) * 1000:.1f}ms")
+        if args.interval <= 0:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
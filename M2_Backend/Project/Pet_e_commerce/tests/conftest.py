@@ -66,6 +66,7 @@ def app(test_db_url):
     flask_app = create_app()
     flask_app.config['TESTING'] = True
     flask_app.config['WTF_CSRF_ENABLED'] = False
+    flask_app.config['RATELIMIT_ENABLED'] = False
     
     return flask_app
 
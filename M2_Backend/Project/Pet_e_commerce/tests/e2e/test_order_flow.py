@@ -223,6 +223,6 @@ class TestOrderFlow:
         assert 'orders' in all_orders_data or isinstance(all_orders_data, list), \
             "Admin should see list of orders"
     
-    # NOTE: Invoice auto-generation feature not implemented in backend
-    # Invoices must be created manually via POST /sales/invoices
-    # Skipping invoice lifecycle test until feature is implemented
+    # NOTE: Invoices are only generated automatically with ORDER_AUTO_INVOICE=true
+    # and a running job worker (scripts/run_jobs.py work); otherwise they are
+    # created via POST /sales/invoices, which returns the existing invoice if any
@@ -0,0 +1,65 @@
+"""
+Query Count Helpers
+~~~~~~~~~~~~~~~~~~~
+
+Count SQL statements executed against an engine, to catch N+1 regressions.
+
+Usage:
+    with assert_max_queries(test_db_engine, 2):
+        orders = order_service.get_all_orders()
+        order_response_schema.dump(orders, many=True)
+"""
+from contextlib import contextmanager
+from typing import List, Optional
+from sqlalchemy import event
+
+
+class QueryCounter:
+    """Collects SQL statements executed while active."""
+
+    def __init__(self):
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+
+@contextmanager
+def count_queries(engine):
+    """
+    Count statements executed on any connection of ``engine``.
+
+    Yields:
+        QueryCounter with the executed statements
+    """
+    counter = QueryCounter()
+    event.listen(engine, "before_cursor_execute", counter)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", counter)
+
+
+@contextmanager
+def assert_max_queries(engine, max_queries: int, message: Optional[str] = None):
+    """
+    Assert that the block executes at most ``max_queries`` statements.
+
+    Args:
+        engine: SQLAlchemy engine (events also apply to its connections)
+        max_queries: Maximum number of statements allowed
+        message: Optional label for the failure message (e.g. endpoint)
+    """
+    with count_queries(engine) as counter:
+        yield counter
+
+    if counter.count > max_queries:
+        label = f"{message}: " if message else ""
+        executed = "\n".join(f"  {i}. {s}" for i, s in enumerate(counter.statements, 1))
+        raise AssertionError(
+            f"{label}Expected at most {max_queries} queries, got {counter.count}\n{executed}"
+        )
@@ -0,0 +1,106 @@
+"""
+Integration Tests: Optimistic Concurrency
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Stress test for the version-column compare-and-swap on orders.
+
+Several threads repeatedly read-modify-write the same order, each through its
+own database session (one "request" per attempt). Lost updates would show up
+as a final total lower than expected; conflicts must surface as
+ConcurrencyConflictError and succeed on retry.
+
+Setup data is committed (not rolled back) because each worker needs its own
+connection to see it, and is deleted again at the end of the test.
+"""
+import threading
+import pytest
+from flask import g
+from sqlalchemy.orm import sessionmaker
+from app.auth.models import User
+from app.sales.models import Cart, Order
+from app.sales.repositories.order_repository import OrderRepository
+from app.core.lib.error_utils import ConcurrencyConflictError
+
+THREADS = 4
+INCREMENTS_PER_THREAD = 10
+MAX_ATTEMPTS = 200
+
+
+@pytest.mark.integration
+@pytest.mark.slow
+class TestOrderConcurrencyIntegration:
+    """Concurrent updates to one order must never be lost."""
+
+    @pytest.fixture
+    def committed_order(self, test_db_engine):
+        """Commit a user, cart and order visible to every worker session."""
+        Session = sessionmaker(bind=test_db_engine)
+        session = Session()
+        user = User(username='concurrencyuser', email='concurrency@test.com', password_hash='x')
+        session.add(user)
+        session.flush()
+        cart = Cart(user_id=user.id, finalized=True)
+        session.add(cart)
+        session.flush()
+        order = Order(cart_id=cart.id, user_id=user.id, order_status_id=1, total_amount=0.0)
+        session.add(order)
+        session.commit()
+        ids = (user.id, cart.id, order.id)
+        session.close()
+
+        yield ids[2]
+
+        session = Session()
+        session.query(Order).filter_by(id=ids[2]).delete()
+        session.query(Cart).filter_by(id=ids[1]).delete()
+        session.query(User).filter_by(id=ids[0]).delete()
+        session.commit()
+        session.close()
+
+    def test_concurrent_increments_are_not_lost(self, app, test_db_engine, committed_order):
+        """Every increment lands exactly once; conflicts are retried."""
+        Session = sessionmaker(bind=test_db_engine)
+        conflicts = []
+        errors = []
+
+        def worker():
+            repository = OrderRepository()
+            for _ in range(INCREMENTS_PER_THREAD):
+                for _attempt in range(MAX_ATTEMPTS):
+                    with app.app_context():
+                        session = Session()
+                        g.db = session
+                        try:
+                            order = repository.get_by_id(committed_order)
+                            order.total_amount += 1
+                            repository.update(order)
+                            session.commit()
+                            break
+                        except ConcurrencyConflictError:
+                            session.rollback()
+                            conflicts.append(1)
+                        except Exception as e:
+                            session.rollback()
+                            errors.append(e)
+                            return
+                        finally:
+                            g.pop('db', None)
+                            session.close()
+                else:
+                    errors.append(RuntimeError("Gave up after too many conflicts"))
+                    return
+
+        threads = [threading.Thread(target=worker) for _ in range(THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+
+        session = Session()
+        order = session.get(Order, committed_order)
+        expected = THREADS * INCREMENTS_PER_THREAD
+        assert order.total_amount == float(expected)
+        assert order.version == 1 + expected
+        session.close()
@@ -59,7 +59,7 @@ class TestInvoiceCreationIntegration:
             integration_db_session.commit()
     
     def test_create_invoice_prevents_duplicate(self, app, integration_db_session, test_user, test_order):
-        """Test that creating duplicate invoice for same order fails."""
+        """Test that creating duplicate invoice for same order returns the existing one."""
         # Arrange
         service = InvoiceService()
         invoice_data = {
@@ -77,9 +77,10 @@ class TestInvoiceCreationIntegration:
             integration_db_session.commit()
             assert invoice1 is not None
             
-            # Second invoice for same order should fail
+            # Second invoice for same order returns the first one
             invoice2 = service.create_invoice(**invoice_data)
-            assert invoice2 is None
+            assert invoice2 is not None
+            assert invoice2.id == invoice1.id
 
 
 @pytest.mark.integration
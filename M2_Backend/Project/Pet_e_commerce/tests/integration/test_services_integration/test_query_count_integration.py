@@ -0,0 +1,103 @@
+"""
+Integration Tests: Query Counts
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Guards against N+1 queries when listing sales aggregates.
+
+Each test builds several aggregates, clears the session identity map so
+nothing is already loaded, then fetches and serializes the list the way the
+list endpoints do. The number of statements must not grow with the number
+of rows.
+"""
+import pytest
+from flask import g
+from datetime import datetime
+from app.sales.models.cart import Cart, CartItem
+from app.sales.models.order import Order, OrderItem
+from app.sales.services.order_service import OrderService
+from app.sales.services.cart_service import CartService
+from app.sales.schemas.order_schema import orders_response_schema, order_response_schema
+from app.sales.schemas.cart_schema import carts_response_schema
+from tests.helpers.query_counter import assert_max_queries
+
+ORDER_COUNT = 5
+
+
+@pytest.fixture
+def many_orders(db_session, test_user, multiple_products, test_order_status_pending):
+    """Create ORDER_COUNT orders with two items each for test_user."""
+    orders = []
+    for i in range(ORDER_COUNT):
+        cart = Cart(user_id=test_user.id, finalized=True, created_at=datetime.utcnow())
+        db_session.add(cart)
+        db_session.flush()
+
+        order = Order(
+            cart_id=cart.id,
+            user_id=test_user.id,
+            order_status_id=test_order_status_pending.id,
+            total_amount=0.0,
+            created_at=datetime.utcnow()
+        )
+        for product in multiple_products[i:i + 2]:
+            order.items.append(OrderItem(product_id=product.id, amount=product.price, quantity=1))
+            order.total_amount += product.price
+        db_session.add(order)
+        orders.append(order)
+
+    db_session.flush()
+    db_session.expunge_all()
+    return orders
+
+
+@pytest.mark.integration
+class TestSalesQueryCounts:
+    """List and detail views load relationships in a fixed number of queries."""
+
+    def test_list_orders_query_count_is_constant(self, app, test_db_engine, integration_db_session, many_orders):
+        """Listing orders: one query for orders, one for all their items."""
+        with app.app_context():
+            g.db = integration_db_session
+            service = OrderService()
+
+            with assert_max_queries(test_db_engine, 2, "GET /sales/orders"):
+                data = orders_response_schema.dump(service.get_all_orders())
+
+            assert len(data) == ORDER_COUNT
+            assert all(len(order['items']) == 2 for order in data)
+
+    def test_user_orders_query_count_is_constant(self, app, test_db_engine, integration_db_session, test_user, many_orders):
+        """Listing a user's orders uses the same list profile."""
+        with app.app_context():
+            g.db = integration_db_session
+            service = OrderService()
+
+            with assert_max_queries(test_db_engine, 2, "GET /sales/orders (user)"):
+                data = orders_response_schema.dump(service.get_orders_by_user_id(test_user.id))
+
+            assert len(data) == ORDER_COUNT
+
+    def test_order_detail_loads_status_eagerly(self, app, test_db_engine, integration_db_session, many_orders):
+        """Order detail: order + status in one query, items in a second."""
+        with app.app_context():
+            g.db = integration_db_session
+            service = OrderService()
+
+            with assert_max_queries(test_db_engine, 2, "GET /sales/orders/<id>"):
+                order = service.get_order_by_id(many_orders[0].id)
+                data = order_response_schema.dump(order)
+                status_name = order.status.status
+
+            assert len(data['items']) == 2
+            assert status_name is not None
+
+    def test_list_carts_query_count_is_constant(self, app, test_db_engine, integration_db_session, many_orders):
+        """Listing carts: one query for carts, one for all their items."""
+        with app.app_context():
+            g.db = integration_db_session
+            service = CartService(storage_mode='database')
+
+            with assert_max_queries(test_db_engine, 2, "GET /sales/carts"):
+                data = carts_response_schema.dump(service.get_all_carts())
+
+            assert len(data) == ORDER_COUNT
@@ -0,0 +1,108 @@
+"""
+Integration Tests: User Stats Triggers
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Two connections insert an order for the same user at the same time. The
+second trigger must wait for the first transaction and count its order;
+without the per-user lock it would upsert totals from a snapshot taken
+before the first commit and the summary would lose an order.
+
+Setup data is committed (not rolled back) because both connections need to
+see it, and is deleted again at the end of the test.
+"""
+import threading
+import time
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+from app.auth.models import User
+from app.core.database import get_schema
+from app.sales.models import Cart, Order
+from app.auth.repositories.user_stats_repository import TRACKED_TABLES, install_user_stats_triggers
+
+WAIT_TIMEOUT_SECONDS = 10
+
+
+@pytest.mark.integration
+@pytest.mark.slow
+class TestUserStatsConcurrencyIntegration:
+    """Concurrent writes for one user must not lose summary updates."""
+
+    @pytest.fixture
+    def committed_user(self, test_db_engine):
+        """Install the triggers and commit a user with two finalized carts."""
+        schema = get_schema()
+        with test_db_engine.begin() as conn:
+            install_user_stats_triggers(conn, schema)
+
+        Session = sessionmaker(bind=test_db_engine)
+        session = Session()
+        user = User(username='statsuser', email='stats@test.com', password_hash='x')
+        session.add(user)
+        session.flush()
+        carts = [Cart(user_id=user.id, finalized=True) for _ in range(2)]
+        session.add_all(carts)
+        session.commit()
+        ids = (user.id, [cart.id for cart in carts])
+        session.close()
+
+        yield ids
+
+        with test_db_engine.begin() as conn:
+            conn.execute(text(f"DELETE FROM {schema}.orders WHERE user_id = :id"), {"id": ids[0]})
+            conn.execute(text(f"DELETE FROM {schema}.carts WHERE user_id = :id"), {"id": ids[0]})
+            conn.execute(text(f"DELETE FROM {schema}.user_stats WHERE user_id = :id"), {"id": ids[0]})
+            conn.execute(text(f"DELETE FROM {schema}.users WHERE id = :id"), {"id": ids[0]})
+            for table_name in TRACKED_TABLES:
+                for event in ("insert", "update", "delete"):
+                    conn.execute(text(f"DROP TRIGGER IF EXISTS {table_name}_user_stats_{event} ON {schema}.{table_name}"))
+
+    def test_concurrent_orders_are_both_counted(self, test_db_engine, committed_user):
+        """The waiting transaction recomputes from a snapshot that includes the first order."""
+        user_id, cart_ids = committed_user
+        Session = sessionmaker(bind=test_db_engine)
+        errors = []
+
+        first = Session()
+        first.add(Order(cart_id=cart_ids[0], user_id=user_id, order_status_id=1, total_amount=10.0))
+        first.flush()
+
+        def second_writer():
+            session = Session()
+            try:
+                session.add(Order(cart_id=cart_ids[1], user_id=user_id, order_status_id=1, total_amount=5.0))
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                errors.append(e)
+            finally:
+                session.close()
+
+        thread = threading.Thread(target=second_writer)
+        thread.start()
+        try:
+            # Wait until the second trigger is blocked on the first transaction's lock
+            deadline = time.monotonic() + WAIT_TIMEOUT_SECONDS
+            with test_db_engine.connect() as monitor:
+                while time.monotonic() < deadline:
+                    waiting = monitor.execute(text(
+                        "SELECT count(*) FROM pg_locks WHERE locktype = 'advisory' AND NOT granted"
+                    )).scalar()
+                    monitor.rollback()
+                    if waiting:
+                        break
+                    time.sleep(0.05)
+                else:
+                    pytest.fail("Second writer never waited for the first one")
+            first.commit()
+        finally:
+            first.close()
+            thread.join(WAIT_TIMEOUT_SECONDS)
+
+        assert errors == []
+        with test_db_engine.connect() as conn:
+            stats = conn.execute(text(
+                f"SELECT order_count, lifetime_spend FROM {get_schema()}.user_stats WHERE user_id = :id"
+            ), {"id": user_id}).one()
+        assert stats.order_count == 2
+        assert float(stats.lifetime_spend) == 15.0
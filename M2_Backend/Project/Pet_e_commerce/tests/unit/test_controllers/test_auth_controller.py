@@ -68,6 +68,20 @@ class TestAuthControllerLogin:
                 assert data['token'] == 'token_123'
                 assert data['token_type'] == 'Bearer'
                 assert 'user' in data
+            mock_auth_service.upgrade_password_hash.assert_called_once_with(mock_user, 'password123')
+    
+    def test_login_hashing_pool_busy_returns_503(self, app, controller, mock_auth_service):
+        """Test login returns 503 with Retry-After when the hashing pool is saturated."""
+        from app.core.lib.error_utils import PasswordHasherBusyError
+        with app.app_context():
+            mock_auth_service.get_user_by_username.return_value = Mock(id=123, username='testuser', password_hash='hashed')
+            
+            with app.test_request_context(json={'username': 'testuser', 'password': 'password123'}):
+                with patch('app.auth.controllers.auth_controller.verify_password', side_effect=PasswordHasherBusyError()):
+                    response, status, headers = controller.login()
+                
+                assert status == 503
+                assert headers['Retry-After'] == '1'
     
     def test_login_invalid_username_returns_401(self, app, controller, mock_auth_service):
         """Test login with invalid username returns 401."""
@@ -119,6 +133,20 @@ class TestAuthControllerRegistration:
                     response, status = controller.register()
                 
                 assert status == 400
+    
+    def test_register_hashing_pool_busy_returns_503(self, app, controller, mock_auth_service):
+        """Test registration returns 503 when the hashing pool is saturated."""
+        from app.core.lib.error_utils import PasswordHasherBusyError
+        with app.app_context():
+            mock_auth_service.get_user_by_email.return_value = None
+            mock_auth_service.create_user.side_effect = PasswordHasherBusyError()
+            user_data = Mock(username='new', email='new@example.com', first_name=None, last_name=None, phone=None)
+            
+            with app.test_request_context(json={'password': 'Password123!'}):
+                with patch('app.auth.controllers.auth_controller.user_registration_schema.load', return_value=user_data):
+                    response, status, headers = controller.register()
+                
+                assert status == 503
 
 
 class TestAuthControllerErrorHandling:
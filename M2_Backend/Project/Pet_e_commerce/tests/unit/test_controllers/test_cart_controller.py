@@ -217,7 +217,7 @@ class TestCartControllerPostOperations:
                 'items': [{'product_id': 1, 'quantity': 2}]
             }):
                 # Mock service response (returns ORM object, not dict)
-                mock_created_cart = Mock(id=1, user_id=123, items=[], created_at=None)
+                mock_created_cart = Mock(id=1, user_id=123, version=1, items=[], created_at=None)
                 mock_cart_service.create_cart.return_value = mock_created_cart
                 
                 # Mock schema validation to skip product lookup
@@ -282,7 +282,7 @@ class TestCartControllerPutOperations:
             
             # CartUpdateSchema requires 'items' field
             with app.test_request_context(json={'items': []}):
-                mock_updated_cart = Mock(id=1, user_id=123, items=[], created_at=None)
+                mock_updated_cart = Mock(id=1, user_id=123, version=1, items=[], created_at=None)
                 mock_cart_service.update_cart.return_value = mock_updated_cart
                 
                 with patch('app.sales.controllers.cart_controller.is_user_or_admin', return_value=True):
@@ -381,7 +381,7 @@ class TestCartControllerItemOperations:
             
             with app.test_request_context(json={'quantity': 2}):
                 # Mock needs .items attribute for schema serialization
-                mock_cart = Mock(id=1, user_id=123, items=[], created_at=None)
+                mock_cart = Mock(id=1, user_id=123, version=1, items=[], created_at=None)
                 mock_cart_service.add_item_to_cart.return_value = mock_cart
                 
                 with patch('app.sales.controllers.cart_controller.is_user_or_admin', return_value=True):
@@ -399,7 +399,7 @@ class TestCartControllerItemOperations:
             
             with app.test_request_context(json={'quantity': 5}):
                 # Mock needs .items attribute for schema serialization
-                mock_cart = Mock(id=1, user_id=123, items=[], created_at=None)
+                mock_cart = Mock(id=1, user_id=123, version=1, items=[], created_at=None)
                 mock_cart_service.update_item_quantity.return_value = mock_cart
                 
                 with patch('app.sales.controllers.cart_controller.is_user_or_admin', return_value=True):
@@ -31,7 +31,7 @@ def mock_invoice_service():
     mock.get_invoices_by_user_id_cached = Mock(return_value=[])
     mock.get_invoice_by_id_cached = Mock(return_value=None)
     mock.get_invoice_by_order_id_cached = Mock(return_value=None)
-    mock.create_invoice = Mock(return_value=None)
+    mock.create_or_get_invoice = Mock(return_value=(None, False))
     mock.update_invoice = Mock(return_value=None)
     mock.delete_invoice = Mock(return_value=False)
     return mock
@@ -130,13 +130,29 @@ class TestInvoiceControllerPostOperations:
                     user=None, order=None, status=None
                 )
                 mock_created_invoice.is_overdue.return_value = False
-                mock_invoice_service.create_invoice.return_value = mock_created_invoice
+                mock_invoice_service.create_or_get_invoice.return_value = (mock_created_invoice, True)
                 
                 with patch('app.sales.controllers.invoice_controller.is_user_or_admin', return_value=True):
                     response, status = controller.post()
                 
-                mock_invoice_service.create_invoice.assert_called_once()
+                mock_invoice_service.create_or_get_invoice.assert_called_once()
                 assert status == 201
+    
+    def test_post_returns_existing_invoice_for_order(self, app, controller, mock_invoice_service):
+        with app.app_context():
+            g.current_user = Mock(id=123)
+            
+            with app.test_request_context(json={'order_id': 1, 'user_id': 123}):
+                existing_invoice = Mock(id=7, user_id=123, order_id=1)
+                mock_invoice_service.create_or_get_invoice.return_value = (existing_invoice, False)
+                
+                with patch('app.sales.controllers.invoice_controller.invoice_response_schema.dump',
+                           return_value={'id': 7, 'user_id': 123, 'order_id': 1}):
+                    response, status = controller.post()
+                
+                mock_invoice_service.create_or_get_invoice.assert_called_once()
+                assert status == 200
+                assert response.get_json()['invoice']['id'] == 7
 
 
 class TestInvoiceControllerDeleteOperations:
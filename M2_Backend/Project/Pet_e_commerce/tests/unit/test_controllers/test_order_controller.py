@@ -217,6 +217,20 @@ class TestOrderControllerUpdateOperations:
             
             mock_order_service.update_order_status.assert_called_once()
 
+    
+    def test_put_concurrent_modification_returns_409(self, app, controller, mock_order_service):
+        """Test PUT maps a version conflict to 409 Conflict."""
+        from app.core.lib.error_utils import ConcurrencyConflictError
+        
+        with app.app_context():
+            g.current_user = Mock(id=999)
+            mock_order_service.get_order_by_id.return_value = Mock(id=1)
+            mock_order_service.update_order.side_effect = ConcurrencyConflictError()
+            
+            with app.test_request_context(json={'shipping_address': '456 Other St', 'version': 1}):
+                response, status = controller.put(order_id=1)
+            
+            assert status == 409
 
 class TestOrderControllerDeleteOperations:
     """Test DELETE operations."""
@@ -64,7 +64,7 @@ class TestProductControllerOptionalAuth:
                 mock_user = Mock(id=123, username='testuser')
                 
                 with patch('app.products.controllers.product_controller.verify_jwt_token', return_value={'user_id': 123}):
-                    with patch('app.products.controllers.product_controller.get_user_by_id', return_value=mock_user):
+                    with patch('app.products.controllers.product_controller.get_principal', return_value=mock_user):
                         controller._try_authenticate_user()
                 
                 assert hasattr(g, 'current_user')
@@ -252,3 +252,41 @@ class TestProductControllerDeleteOperations:
             
             mock_product_service.delete_product.assert_called_once_with(1)
             assert status == 200
+
+
+class TestProductControllerRelated:
+    """Test GET /products/<id>/related (public)."""
+    
+    def test_related_returns_cached_list(self, app, controller, mock_product_service):
+        mock_product_service.get_related_products_cached.return_value = [{'id': 2}, {'id': 3}]
+        
+        with app.test_request_context('/products/1/related?limit=2'):
+            response, status = controller.get_related(product_id=1)
+        
+        mock_product_service.get_related_products_cached.assert_called_once_with(1, 2)
+        assert status == 200
+        assert response.get_json() == [{'id': 2}, {'id': 3}]
+    
+    def test_related_invalid_limit(self, app, controller, mock_product_service):
+        with app.test_request_context('/products/1/related?limit=abc'):
+            response, status = controller.get_related(product_id=1)
+        
+        assert status == 400
+        mock_product_service.get_related_products_cached.assert_not_called()
+    
+    def test_related_unknown_product(self, app, controller, mock_product_service):
+        mock_product_service.get_related_products_cached.return_value = []
+        mock_product_service.get_product_by_id.return_value = None
+        
+        with app.test_request_context('/products/99/related'):
+            response, status = controller.get_related(product_id=99)
+        
+        assert status == 404
+    
+    def test_related_service_error(self, app, controller, mock_product_service):
+        mock_product_service.get_related_products_cached.return_value = None
+        
+        with app.test_request_context('/products/1/related'):
+            response, status = controller.get_related(product_id=1)
+        
+        assert status == 500
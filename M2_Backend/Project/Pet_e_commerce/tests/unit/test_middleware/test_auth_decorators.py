@@ -79,7 +79,7 @@ class TestTokenRequiredDecorator:
         assert "Invalid or expired token" in data['error']
         mock_verify.assert_called_once_with('invalid_token')
     
-    @patch('app.core.middleware.auth_decorators.get_user_by_id')
+    @patch('app.core.middleware.auth_decorators.get_principal')
     @patch('app.core.middleware.auth_decorators.verify_jwt_token')
     @patch('app.core.middleware.auth_decorators.request')
     def test_user_not_found_after_token_decode(self, mock_request, mock_verify, mock_get_user):
@@ -102,7 +102,7 @@ class TestTokenRequiredDecorator:
         assert "User not found" in data['error']
         mock_get_user.assert_called_once_with(999)
     
-    @patch('app.core.middleware.auth_decorators.get_user_by_id')
+    @patch('app.core.middleware.auth_decorators.get_principal')
     @patch('app.core.middleware.auth_decorators.verify_jwt_token')
     @patch('app.core.middleware.auth_decorators.request')
     def test_successful_authentication(self, mock_request, mock_verify, mock_get_user):
@@ -127,7 +127,7 @@ class TestTokenRequiredDecorator:
         assert result == {"user": "testuser"}
         assert g.current_user == mock_user
     
-    @patch('app.core.middleware.auth_decorators.get_user_by_id')
+    @patch('app.core.middleware.auth_decorators.get_principal')
     @patch('app.core.middleware.auth_decorators.verify_jwt_token')
     @patch('app.core.middleware.auth_decorators.request')
     def test_decorator_preserves_function_metadata(self, mock_request, mock_verify, mock_get_user):
@@ -179,7 +179,7 @@ class TestAdminRequiredDecorator:
         assert "Authorization header missing" in data['error']
     
     @patch('app.core.middleware.auth_decorators.user_has_role')
-    @patch('app.core.middleware.auth_decorators.get_user_by_id')
+    @patch('app.core.middleware.auth_decorators.get_principal')
     @patch('app.core.middleware.auth_decorators.verify_jwt_token')
     @patch('app.core.middleware.auth_decorators.request')
     def test_admin_user_not_authorized(self, mock_request, mock_verify, mock_get_user, mock_has_role):
@@ -207,7 +207,7 @@ class TestAdminRequiredDecorator:
         mock_has_role.assert_called_once_with(mock_user, 'admin')
     
     @patch('app.core.middleware.auth_decorators.user_has_role')
-    @patch('app.core.middleware.auth_decorators.get_user_by_id')
+    @patch('app.core.middleware.auth_decorators.get_principal')
     @patch('app.core.middleware.auth_decorators.verify_jwt_token')
     @patch('app.core.middleware.auth_decorators.request')
     def test_admin_successful_authentication(self, mock_request, mock_verify, mock_get_user, mock_has_role):
@@ -267,7 +267,7 @@ class TestDecoratorIntegration:
         """Cleanup Flask context."""
         self.app_context.pop()
     
-    @patch('app.core.middleware.auth_decorators.get_user_by_id')
+    @patch('app.core.middleware.auth_decorators.get_principal')
     @patch('app.core.middleware.auth_decorators.verify_jwt_token')
     @patch('app.core.middleware.auth_decorators.request')
     def test_token_extraction_with_bearer_prefix(self, mock_request, mock_verify, mock_get_user):
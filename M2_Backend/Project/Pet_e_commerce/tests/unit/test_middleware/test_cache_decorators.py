@@ -0,0 +1,90 @@
+"""
+Unit tests for cache invalidation deferred to the session commit.
+
+Tests that keys and callbacks are collected on the request's session, run
+after commit (keys deleted in one round trip) and dropped on rollback.
+"""
+from unittest.mock import MagicMock, patch
+from flask import Flask, g
+from app.core.middleware import cache_decorators
+from app.core.middleware.cache_decorators import CacheHelper
+
+
+def make_helper():
+    with patch.object(cache_decorators, 'get_cache', return_value=MagicMock()):
+        return CacheHelper(resource_name="invoice", version="v1")
+
+
+class TestInvalidateAfterCommit:
+    """Test CacheHelper.invalidate_many_after_commit."""
+
+    def test_keys_deleted_after_commit(self):
+        """Keys should be deleted once, in one call, when the session commits."""
+        helper = make_helper()
+        app = Flask(__name__)
+        with app.app_context():
+            g.db = MagicMock(info={})
+            helper.invalidate_many_after_commit(["1", "user:5:all"])
+            helper.invalidate_many_after_commit(["1", "all"])
+            helper.cache.delete_many.assert_not_called()
+
+            cache = MagicMock()
+            with patch.object(cache_decorators, 'get_cache', return_value=cache):
+                cache_decorators._invalidate_after_commit(g.db)
+
+            cache.delete_many.assert_called_once_with(["invoice:v1:1", "invoice:v1:all", "invoice:v1:user:5:all"])
+            assert 'cache_invalidations' not in g.db.info
+
+    def test_keys_dropped_on_rollback(self):
+        """A rolled back batch should not invalidate anything."""
+        helper = make_helper()
+        app = Flask(__name__)
+        with app.app_context():
+            g.db = MagicMock(info={})
+            helper.invalidate_many_after_commit(["1"])
+
+            cache_decorators._discard_after_rollback(g.db)
+
+            cache = MagicMock()
+            with patch.object(cache_decorators, 'get_cache', return_value=cache):
+                cache_decorators._invalidate_after_commit(g.db)
+            cache.delete_many.assert_not_called()
+
+    def test_invalidate_all_deferred_to_commit(self):
+        """The resource-wide pattern delete should wait for the commit."""
+        helper = make_helper()
+        app = Flask(__name__)
+        with app.app_context():
+            g.db = MagicMock(info={})
+            helper.invalidate_all_after_commit()
+            helper.cache.delete_data_with_pattern.assert_not_called()
+
+            cache_decorators._invalidate_after_commit(g.db)
+
+        helper.cache.delete_data_with_pattern.assert_called_once_with("invoice:v1:*")
+
+    def test_without_session_invalidates_now(self):
+        """Outside a request/app session the keys should be invalidated immediately."""
+        helper = make_helper()
+
+        helper.invalidate_many_after_commit(["1"])
+
+        helper.cache.delete_many.assert_called_once_with(["invoice:v1:1"])
+
+
+class TestCallAfterCommit:
+    """Test call_after_commit."""
+
+    def test_callbacks_run_after_commit_only(self):
+        """Callbacks should wait for the commit, and a failing one should not stop the rest."""
+        app = Flask(__name__)
+        calls = []
+        with app.app_context():
+            g.db = MagicMock(info={})
+            cache_decorators.call_after_commit(lambda: 1 / 0)
+            cache_decorators.call_after_commit(lambda: calls.append('released'))
+            assert calls == []
+
+            cache_decorators._invalidate_after_commit(g.db)
+
+        assert calls == ['released']
@@ -0,0 +1,159 @@
+"""
+Unit tests for read-replica routing (app.core.database.RoutingSession).
+
+Tests which engine a session binds to for reads and writes, read-your-writes
+pinning and replica lag handling, using in-memory SQLite engines.
+"""
+import pytest
+from unittest.mock import patch, MagicMock
+from flask import Flask, g
+from sqlalchemy import create_engine, select, literal, insert, Table, Column, Integer, MetaData
+from app.core import database
+from app.core.database import RoutingSession, read_only, close_db
+
+
+@pytest.fixture
+def primary():
+    engine = create_engine("sqlite://")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def replica():
+    engine = create_engine("sqlite://")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def routing(primary, replica):
+    """Configure one healthy replica and a routing session factory."""
+    with patch.object(database, 'get_replica_engines', return_value=[replica]), \
+            patch.object(database, '_replica_is_healthy', return_value=True), \
+            patch.object(database, 'has_recent_write', return_value=False) as mock_recent:
+        yield mock_recent
+
+
+@pytest.fixture
+def flask_app():
+    return Flask(__name__)
+
+
+def new_session(primary):
+    return RoutingSession(bind=primary)
+
+
+class TestRoutingSessionGetBind:
+    """Test RoutingSession.get_bind."""
+
+    def test_get_request_reads_from_replica(self, flask_app, primary, replica, routing):
+        """GET reads should use the replica."""
+        with flask_app.test_request_context('/products', method='GET'):
+            assert new_session(primary).get_bind(clause=select(literal(1))) is replica
+
+    def test_post_request_reads_from_primary(self, flask_app, primary, routing):
+        """Reads inside mutating requests should use the primary."""
+        with flask_app.test_request_context('/sales/orders', method='POST'):
+            assert new_session(primary).get_bind(clause=select(literal(1))) is primary
+
+    def test_writes_always_use_primary(self, flask_app, primary, routing):
+        """DML should never be sent to a replica."""
+        table = Table('t', MetaData(), Column('id', Integer, primary_key=True))
+        with flask_app.test_request_context('/products', method='GET'):
+            assert new_session(primary).get_bind(clause=insert(table)) is primary
+
+    def test_session_that_wrote_stays_on_primary(self, flask_app, primary, routing):
+        """After a flush the session must read its own writes."""
+        with flask_app.test_request_context('/products', method='GET'):
+            session = new_session(primary)
+            session.info['wrote'] = True
+            assert session.get_bind(clause=select(literal(1))) is primary
+
+    def test_recent_writer_pinned_to_primary(self, flask_app, primary, routing):
+        """Users who wrote recently read from the primary."""
+        routing.return_value = True
+        with flask_app.test_request_context('/sales/orders', method='GET'):
+            g.current_user = MagicMock(id=7)
+            assert new_session(primary).get_bind(clause=select(literal(1))) is primary
+        routing.assert_called_once_with(7)
+
+    def test_lagging_replica_falls_back_to_primary(self, flask_app, primary, replica):
+        """No healthy replica means the primary serves reads."""
+        with patch.object(database, 'get_replica_engines', return_value=[replica]), \
+                patch.object(database, 'replica_lag_seconds', return_value=60.0):
+            database._replica_health.clear()
+            with flask_app.test_request_context('/products', method='GET'):
+                assert new_session(primary).get_bind(clause=select(literal(1))) is primary
+        database._replica_health.clear()
+
+    def test_no_replicas_configured(self, flask_app, primary):
+        """Without replicas everything uses the primary."""
+        with patch.object(database, 'get_replica_engines', return_value=[]):
+            with flask_app.test_request_context('/products', method='GET'):
+                assert new_session(primary).get_bind(clause=select(literal(1))) is primary
+
+
+class TestReplicaPinning:
+    """Test that one transaction reads from a single replica."""
+
+    def test_replica_chosen_once_per_transaction(self, flask_app, primary, replica):
+        """All reads of a transaction should use the replica picked first."""
+        other = create_engine("sqlite://")
+        with patch.object(database, 'get_replica_engines', return_value=[replica, other]), \
+                patch.object(database, '_replica_is_healthy', return_value=True), \
+                patch.object(database, 'has_recent_write', return_value=False):
+            with flask_app.test_request_context('/products', method='GET'):
+                session = new_session(primary)
+                first = session.get_bind(clause=select(literal(1)))
+                assert all(session.get_bind(clause=select(literal(1))) is first for _ in range(3))
+        other.dispose()
+
+    def test_replica_released_when_transaction_ends(self, flask_app, primary, replica, routing):
+        """The next transaction should choose a replica again."""
+        with flask_app.test_request_context('/products', method='GET'):
+            session = new_session(primary)
+            session.execute(select(literal(1)))
+            assert session.info['replica'] is replica
+            session.rollback()
+            assert 'replica' not in session.info
+            session.close()
+
+
+class TestReadOnlyDecorator:
+    """Test @read_only outside GET requests."""
+
+    def test_read_only_method_uses_replica_in_post(self, flask_app, primary, replica, routing):
+        """Decorated reads should use the replica even in a POST request."""
+        session = new_session(primary)
+
+        @read_only
+        def lookup():
+            return session.get_bind(clause=select(literal(1)))
+
+        with flask_app.test_request_context('/sales/orders', method='POST'):
+            g.db = session
+            assert lookup() is replica
+            assert session.get_bind(clause=select(literal(1))) is primary
+
+
+class TestReadYourWrites:
+    """Test recent-write marking at teardown."""
+
+    def test_commit_marks_recent_write(self, flask_app):
+        """A committed write by a user should pin their reads to the primary."""
+        with patch.object(database, 'mark_recent_write') as mock_mark:
+            with flask_app.app_context():
+                g.db = MagicMock(info={})
+                g.db_write_user_id = 7
+                close_db()
+        mock_mark.assert_called_once_with(7)
+
+    def test_rollback_does_not_mark(self, flask_app):
+        """Failed requests should not pin reads."""
+        with patch.object(database, 'mark_recent_write') as mock_mark:
+            with flask_app.app_context():
+                g.db = MagicMock(info={})
+                g.db_write_user_id = 7
+                close_db(Exception("boom"))
+        mock_mark.assert_not_called()
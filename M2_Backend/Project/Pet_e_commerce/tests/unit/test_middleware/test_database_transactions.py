@@ -0,0 +1,138 @@
+"""
+Unit tests for request transaction modes (app.core.database).
+
+Tests that read requests get READ ONLY transactions ended by a rollback,
+write requests commit, and untouched sessions never start a transaction.
+"""
+import pytest
+from unittest.mock import patch, MagicMock
+from flask import Flask, g
+from sqlalchemy import create_engine, event, text
+from app.core import database
+from app.core.database import RoutingSession, get_db, close_db, _begin_read_only_transaction
+
+
+@pytest.fixture
+def flask_app():
+    return Flask(__name__)
+
+
+@pytest.fixture
+def sqlite_sessions():
+    """Make get_db() hand out RoutingSessions bound to in-memory SQLite."""
+    engine = create_engine("sqlite://")
+    with patch.object(database, 'get_session_local', return_value=lambda: RoutingSession(bind=engine)), \
+            patch.object(database, 'get_replica_engines', return_value=[]):
+        yield engine
+    engine.dispose()
+
+
+class TestGetDbTransactionMode:
+    """Test get_db() transaction mode selection."""
+
+    def test_get_request_is_read_only(self, flask_app, sqlite_sessions):
+        """GET sessions should be flagged read-only."""
+        with flask_app.test_request_context('/products', method='GET'):
+            assert get_db().info.get('read_only_tx') is True
+
+    def test_post_request_is_read_write(self, flask_app, sqlite_sessions):
+        """Mutating requests keep normal read-write transactions."""
+        with flask_app.test_request_context('/sales/orders', method='POST'):
+            assert not get_db().info.get('read_only_tx')
+
+    def test_untouched_session_has_no_transaction(self, flask_app, sqlite_sessions):
+        """Requests that never query should not begin a transaction or check out a connection."""
+        checkouts = []
+        event.listen(sqlite_sessions, "checkout", lambda *args: checkouts.append(args))
+        with flask_app.test_request_context('/products', method='GET'):
+            db = get_db()
+            close_db()
+        assert not db.in_transaction()
+        assert checkouts == []
+
+
+class TestCloseDb:
+    """Test teardown behaviour per transaction mode."""
+
+    def test_read_only_session_rolls_back(self, flask_app, sqlite_sessions):
+        """GET sessions should end with a rollback, not a commit."""
+        with flask_app.test_request_context('/products', method='GET'):
+            db = get_db()
+            db.execute(text("SELECT 1"))
+            with patch.object(db, 'commit') as mock_commit, patch.object(db, 'rollback') as mock_rollback:
+                close_db()
+        mock_commit.assert_not_called()
+        mock_rollback.assert_called_once()
+
+    def test_write_session_commits(self, flask_app, sqlite_sessions):
+        """POST sessions should commit."""
+        with flask_app.test_request_context('/sales/orders', method='POST'):
+            db = get_db()
+            db.execute(text("SELECT 1"))
+            with patch.object(db, 'commit') as mock_commit:
+                close_db()
+        mock_commit.assert_called_once()
+
+    def test_untouched_session_is_only_closed(self, flask_app):
+        """Sessions without a transaction are neither committed nor rolled back."""
+        with flask_app.app_context():
+            db = MagicMock(info={})
+            db.in_transaction.return_value = False
+            g.db = db
+            close_db()
+        db.commit.assert_not_called()
+        db.rollback.assert_not_called()
+        db.close.assert_called_once()
+
+
+class TestReadOnlyTransactionStatement:
+    """Test the after_begin hook."""
+
+    def make_connection(self, dialect):
+        connection = MagicMock()
+        connection.dialect.name = dialect
+        return connection
+
+    def test_sets_read_only_on_postgresql(self):
+        """Should issue SET TRANSACTION READ ONLY for read sessions."""
+        session = MagicMock(info={'read_only_tx': True})
+        connection = self.make_connection('postgresql')
+
+        with patch.object(database, 'DB_READ_ONLY_DEFERRABLE', False):
+            _begin_read_only_transaction(session, None, connection)
+
+        connection.exec_driver_sql.assert_called_once_with("SET TRANSACTION READ ONLY")
+
+    def test_deferrable_mode(self):
+        """Should request a deferrable serializable snapshot when configured."""
+        session = MagicMock(info={'read_only_tx': True})
+        connection = self.make_connection('postgresql')
+
+        with patch.object(database, 'DB_READ_ONLY_DEFERRABLE', True):
+            _begin_read_only_transaction(session, None, connection)
+
+        connection.exec_driver_sql.assert_called_once_with(
+            "SET TRANSACTION ISOLATION LEVEL SERIALIZABLE, READ ONLY, DEFERRABLE"
+        )
+
+    def test_deferrable_mode_skipped_on_replica(self):
+        """Hot standbys reject SERIALIZABLE, so replica reads only get READ ONLY."""
+        connection = self.make_connection('postgresql')
+        session = MagicMock(info={'read_only_tx': True, 'replica': connection.engine})
+
+        with patch.object(database, 'DB_READ_ONLY_DEFERRABLE', True):
+            _begin_read_only_transaction(session, None, connection)
+
+        connection.exec_driver_sql.assert_called_once_with("SET TRANSACTION READ ONLY")
+
+    def test_write_sessions_untouched(self):
+        """Should not change read-write transactions."""
+        connection = self.make_connection('postgresql')
+        _begin_read_only_transaction(MagicMock(info={}), None, connection)
+        connection.exec_driver_sql.assert_not_called()
+
+    def test_other_dialects_untouched(self):
+        """Should skip databases without SET TRANSACTION READ ONLY support."""
+        connection = self.make_connection('sqlite')
+        _begin_read_only_transaction(MagicMock(info={'read_only_tx': True}), None, connection)
+        connection.exec_driver_sql.assert_not_called()
@@ -0,0 +1,153 @@
+"""
+Unit tests for the logging pipeline (config.logging, app.core.request_id).
+
+Tests JSON formatting with request ids and extras, DEBUG/INFO sampling,
+non-blocking queueing, per-logger levels from the environment and the
+X-Request-ID header.
+"""
+import io
+import json
+import logging
+import queue
+import pytest
+from unittest.mock import patch
+from flask import Flask
+import config.logging as log_config
+from config.logging import (
+    JsonFormatter,
+    NonBlockingQueueHandler,
+    RequestIdFilter,
+    SamplingFilter,
+    request_id_var
+)
+from app.core.request_id import init_request_id
+
+
+def make_record(name='app.sales.services.cart_service', level=logging.INFO, msg='Cart %s updated', args=(7,), **extra):
+    record = logging.LogRecord(name, level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+@pytest.fixture
+def restore_logging():
+    """Put the root logger back the way the test session configured it."""
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    yield
+    log_config.stop_logging()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    for handler in handlers:
+        root.addHandler(handler)
+    root.setLevel(level)
+
+
+class TestJsonFormatter:
+    """Test structured output."""
+
+    def test_formats_message_request_id_and_extras(self):
+        """Should emit one JSON object with lazy args resolved and extra fields."""
+        token = request_id_var.set('req-123')
+        try:
+            record = make_record(route='sales.carts')
+            RequestIdFilter().filter(record)
+        finally:
+            request_id_var.reset(token)
+
+        entry = json.loads(JsonFormatter().format(record))
+
+        assert entry['message'] == 'Cart 7 updated'
+        assert entry['request_id'] == 'req-123'
+        assert entry['level'] == 'INFO'
+        assert entry['logger'] == 'app.sales.services.cart_service'
+        assert entry['route'] == 'sales.carts'
+
+
+class TestSamplingFilter:
+    """Test DEBUG/INFO sampling."""
+
+    def test_samples_matching_loggers_only(self):
+        """Should drop sampled INFO records, keep other loggers and warnings."""
+        sampler = SamplingFilter({'app.core.middleware': '0'})
+
+        assert sampler.filter(make_record(name='app.core.middleware.cache_decorators')) is False
+        assert sampler.filter(make_record(name='app.core.middleware.cache_decorators', level=logging.WARNING)) is True
+        assert sampler.filter(make_record(name='app.sales')) is True
+
+    def test_most_specific_prefix_wins(self):
+        """A child logger rate should override its parent's."""
+        sampler = SamplingFilter({'app': '0', 'app.sales': '1'})
+        assert sampler.filter(make_record(name='app.sales.services')) is True
+        assert sampler.filter(make_record(name='app.products')) is False
+
+
+class TestQueueHandler:
+    """Test the non-blocking queue handler."""
+
+    def test_prepare_resolves_message_without_touching_original(self):
+        """Queued copies carry the final message; the caller's record is unchanged."""
+        record = make_record()
+        prepared = NonBlockingQueueHandler(queue.Queue()).prepare(record)
+
+        assert prepared.msg == 'Cart 7 updated'
+        assert prepared.args is None
+        assert record.args == (7,)
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        """Should count dropped records when the queue is full."""
+        handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+        before = log_config.dropped_records()
+
+        handler.handle(make_record())
+        handler.handle(make_record())
+
+        assert log_config.dropped_records() == before + 1
+
+
+class TestSetupLogging:
+    """Test setup_logging wiring."""
+
+    def test_async_pipeline_writes_json_and_applies_levels(self, restore_logging, monkeypatch):
+        """Records should reach the writer thread as JSON; LOG_LEVELS applies per logger."""
+        stream = io.StringIO()
+        monkeypatch.setenv('LOG_LEVELS', 'app.noisy=WARNING')
+        with patch.object(log_config, 'LOG_FORMAT', 'json'), patch.object(log_config, 'LOG_ASYNC', True):
+            with patch('logging.StreamHandler', return_value=logging.StreamHandler(stream)):
+                log_config.setup_logging(log_level=logging.INFO)
+
+        logging.getLogger('app.noisy').info("hidden")
+        logging.getLogger('app.sales').info("Order %s placed", 42)
+        log_config.stop_logging()
+
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert [line['message'] for line in lines] == ['Order 42 placed']
+        assert isinstance(logging.getLogger().handlers[0], NonBlockingQueueHandler)
+        logging.getLogger('app.noisy').setLevel(logging.NOTSET)
+
+
+class TestRequestId:
+    """Test X-Request-ID handling."""
+
+    @pytest.fixture
+    def client(self):
+        app = Flask(__name__)
+        init_request_id(app)
+
+        @app.route('/ping')
+        def ping():
+            return {"request_id": request_id_var.get()}
+
+        return app.test_client()
+
+    def test_generates_and_returns_request_id(self, client):
+        """Should expose the id to logging and return it in the header."""
+        response = client.get('/ping')
+        assert response.headers['X-Request-ID'] == response.get_json()['request_id']
+        assert len(response.headers['X-Request-ID']) == 32
+        assert request_id_var.get() == '-'
+
+    def test_reuses_valid_incoming_id(self, client):
+        """Should keep a well-formed upstream id and replace malformed ones."""
+        assert client.get('/ping', headers={'X-Request-ID': 'lb-abc.123'}).headers['X-Request-ID'] == 'lb-abc.123'
+        assert client.get('/ping', headers={'X-Request-ID': 'bad id; drop'}).headers['X-Request-ID'] != 'bad id; drop'
@@ -0,0 +1,186 @@
+"""
+Unit tests for connection pool metrics (app.core.metrics, app.core.pool_metrics).
+
+Tests metric rendering, pool checkout instrumentation, the idle pre-ping
+mode and the monitoring endpoints, using SQLite engines.
+"""
+import pytest
+from unittest.mock import patch
+from flask import Flask
+from sqlalchemy import create_engine, text
+from app.core import pool_metrics, monitoring
+from app.core.metrics import Counter, Histogram, MetricsRegistry
+from app.core.monitoring import monitoring_bp
+from app.core.pool_metrics import (
+    InstrumentedQueuePool,
+    install_pool_hooks,
+    pool_status,
+    POOL_CHECKOUT,
+    POOL_WAIT,
+    PRE_PING_FAILURES
+)
+
+
+def make_engine(tmp_path, name, pre_ping="idle", idle_seconds=30):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=2,
+        max_overflow=1
+    )
+    install_pool_hooks(engine, name, pre_ping=pre_ping, idle_seconds=idle_seconds)
+    return engine
+
+
+@pytest.fixture(autouse=True)
+def clear_pools():
+    yield
+    pool_metrics._engines.clear()
+
+
+class TestMetricTypes:
+    """Test the metrics registry primitives."""
+
+    def test_counter_renders_labels(self):
+        """Should render counters with escaped labels."""
+        registry = MetricsRegistry()
+        failures = registry.register(Counter("failures_total", "Failures", ["pool"]))
+        failures.inc(pool='primary')
+        failures.inc(2, pool='primary')
+
+        output = registry.render()
+
+        assert "# TYPE failures_total counter" in output
+        assert 'failures_total{pool="primary"} 3' in output
+
+    def test_histogram_cumulative_buckets(self):
+        """Should render cumulative buckets, sum and count."""
+        latency = Histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+        latency.observe(0.05)
+        latency.observe(0.5)
+        latency.observe(5)
+
+        output = latency.render()
+
+        assert 'latency_seconds_bucket{le="0.1"} 1' in output
+        assert 'latency_seconds_bucket{le="1"} 2' in output
+        assert 'latency_seconds_bucket{le="+Inf"} 3' in output
+        assert 'latency_seconds_count 3' in output
+        assert latency.quantile(0.5) == 1.0
+
+    def test_registry_returns_existing_metric(self):
+        """Re-registering a name should return the existing metric."""
+        registry = MetricsRegistry()
+        first = registry.register(Counter("hits_total", "Hits"))
+        assert registry.register(Counter("hits_total", "Hits")) is first
+
+    def test_wrong_labels_rejected(self):
+        """Should reject observations with missing labels."""
+        with pytest.raises(ValueError):
+            Counter("c_total", "C", ["pool"]).inc()
+
+
+class TestPoolInstrumentation:
+    """Test InstrumentedQueuePool and pool hooks."""
+
+    def test_checkout_records_latency_and_status(self, tmp_path):
+        """Should time checkouts and expose live pool counters."""
+        engine = make_engine(tmp_path, 'test-checkout')
+        before = POOL_CHECKOUT.count(pool='test-checkout')
+
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            status = pool_status()['test-checkout']
+            assert status['checked_out'] == 1
+
+        assert POOL_CHECKOUT.count(pool='test-checkout') == before + 1
+        assert POOL_WAIT.count(pool='test-checkout') >= 1
+        assert pool_status()['test-checkout']['checked_out'] == 0
+        engine.dispose()
+
+    def test_idle_mode_skips_recently_used_connections(self, tmp_path):
+        """Connections returned moments ago should not be pinged."""
+        engine = make_engine(tmp_path, 'test-idle')
+        with patch.object(engine.dialect, 'do_ping', return_value=True) as mock_ping:
+            with engine.connect():
+                pass
+            with engine.connect():
+                pass
+        mock_ping.assert_not_called()
+        engine.dispose()
+
+    def test_always_mode_pings_every_checkout(self, tmp_path):
+        """'always' should ping on each checkout."""
+        engine = make_engine(tmp_path, 'test-always', pre_ping='always')
+        with patch.object(engine.dialect, 'do_ping', return_value=True) as mock_ping:
+            with engine.connect():
+                pass
+            with engine.connect():
+                pass
+        assert mock_ping.call_count == 2
+        engine.dispose()
+
+    def test_failed_ping_reconnects_and_counts(self, tmp_path):
+        """A stale idle connection should be replaced and counted."""
+        engine = make_engine(tmp_path, 'test-stale', idle_seconds=0.0001)
+        with engine.connect():
+            pass
+        before = PRE_PING_FAILURES.value(pool='test-stale')
+
+        with patch.object(engine.dialect, 'do_ping', side_effect=[Exception("server closed"), True]):
+            with engine.connect() as conn:
+                assert conn.execute(text("SELECT 1")).scalar() == 1
+
+        assert PRE_PING_FAILURES.value(pool='test-stale') == before + 1
+        engine.dispose()
+
+    def test_invalid_pre_ping_mode(self, tmp_path):
+        """Should reject unknown pre-ping modes."""
+        with pytest.raises(ValueError):
+            make_engine(tmp_path, 'test-invalid', pre_ping='sometimes')
+
+
+class TestMonitoringRoutes:
+    """Test the /metrics endpoints."""
+
+    @pytest.fixture
+    def client(self):
+        app = Flask(__name__)
+        app.register_blueprint(monitoring_bp, url_prefix='')
+        with patch.object(monitoring, 'METRICS_TOKEN', 'scrape-secret'):
+            client = app.test_client()
+            client.environ_base['HTTP_AUTHORIZATION'] = 'Bearer scrape-secret'
+            yield client
+
+    def test_metrics_exposes_pool_metrics(self, client, tmp_path):
+        """Should render pool gauges in the Prometheus format."""
+        engine = make_engine(tmp_path, 'test-scrape')
+        with engine.connect():
+            response = client.get('/metrics')
+
+        assert response.status_code == 200
+        assert response.content_type.startswith('text/plain')
+        assert 'db_pool_checked_out{pool="test-scrape"} 1' in response.get_data(as_text=True)
+        engine.dispose()
+
+    def test_pool_status_json(self, client, tmp_path):
+        """Should return a JSON snapshot per pool."""
+        engine = make_engine(tmp_path, 'test-json')
+        response = client.get('/metrics/pools')
+
+        assert response.status_code == 200
+        assert response.get_json()['pools']['test-json']['size'] == 2
+        engine.dispose()
+
+    def test_token_required_when_configured(self, client):
+        """Should require the bearer token when METRICS_TOKEN is set."""
+        assert client.get('/metrics', headers={'Authorization': 'Bearer wrong'}).status_code == 401
+        assert client.get('/metrics').status_code == 200
+
+    def test_closed_without_token(self, client):
+        """Without METRICS_TOKEN only admin JWTs may read metrics."""
+        with patch.object(monitoring, 'METRICS_TOKEN', ''):
+            assert client.get('/metrics', headers={'Authorization': ''}).status_code == 401
+            assert client.get('/metrics/pools', headers={'Authorization': ''}).status_code == 401
+            with patch.object(monitoring, 'is_admin_request', return_value=True):
+                assert client.get('/metrics/pools').status_code == 200
@@ -0,0 +1,171 @@
+"""
+Unit tests for the principal cache (app.core.lib.principals).
+
+Tests cache hits and misses, security-version invalidation, post-commit
+invalidation and Redis failure fallback, with a dict-backed Redis stand-in.
+"""
+import pytest
+from unittest.mock import Mock, MagicMock, patch
+from flask import Flask, g
+from app.core.lib import principals
+from app.core.lib.principals import Principal, get_principal, invalidate_principal
+from app.core.lib.auth import user_has_role, role_names
+
+
+class DictRedis:
+    """Minimal Redis stand-in for the commands the principal cache uses."""
+
+    def __init__(self):
+        self.data = {}
+
+    def mget(self, *keys):
+        return [self.data.get(key) for key in keys]
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value.encode() if isinstance(value, str) else value
+
+    def pipeline(self, transaction=True):
+        return DictPipeline(self)
+
+
+class DictPipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def incr(self, key):
+        self.commands.append(lambda: self.client.data.__setitem__(key, str(int(self.client.data.get(key, 0)) + 1).encode()))
+
+    def expire(self, key, seconds):
+        pass
+
+    def delete(self, key):
+        self.commands.append(lambda: self.client.data.pop(key, None))
+
+    def execute(self):
+        for command in self.commands:
+            command()
+
+
+def make_user(user_id=1, roles=('user',)):
+    user = Mock()
+    user.id = user_id
+    user.username = f'user{user_id}'
+    user.user_roles = [Mock(role=Mock()) for _ in roles]
+    for user_role, name in zip(user.user_roles, roles):
+        user_role.role.name = name
+    return user
+
+
+@pytest.fixture
+def redis_client():
+    client = DictRedis()
+    with patch.object(principals, 'get_cache') as mock_get_cache:
+        mock_get_cache.return_value.redis_client = client
+        yield client
+
+
+@pytest.fixture
+def load_user():
+    principals.clear_local_principals()
+    with patch.object(principals, '_load_user') as mock_load:
+        yield mock_load
+    principals.clear_local_principals()
+
+
+class TestPrincipal:
+    """Test the Principal value object and role helpers."""
+
+    def test_from_user_and_json_round_trip(self):
+        """Should keep id, username and roles through serialization."""
+        principal = Principal.from_user(make_user(roles=('user', 'admin')), security_version=3)
+        assert Principal.from_json(principal.to_json()) == principal
+        assert principal.roles == ('user', 'admin')
+
+    def test_role_helpers_accept_principals(self):
+        """user_has_role and role_names should work for principals and users."""
+        principal = Principal(id=1, username='a', roles=('admin',))
+        assert user_has_role(principal, 'admin')
+        assert not user_has_role(principal, 'user')
+        assert role_names(principal) == ['admin']
+        assert role_names(make_user(roles=('user',))) == ['user']
+
+
+class TestGetPrincipal:
+    """Test get_principal lookups."""
+
+    def test_miss_loads_from_database_and_caches(self, redis_client, load_user):
+        """First lookup hits the DB, the next ones don't."""
+        load_user.return_value = make_user()
+
+        first = get_principal(1)
+        principals.clear_local_principals()
+        second = get_principal(1)
+
+        assert first == second
+        load_user.assert_called_once_with(1)
+        assert 'auth:principal:v1:1' in redis_client.data
+
+    def test_local_cache_avoids_redis(self, redis_client, load_user):
+        """Repeated lookups in one process should be served locally."""
+        load_user.return_value = make_user()
+        get_principal(1)
+        with patch.object(redis_client, 'mget') as mock_mget:
+            get_principal(1)
+        mock_mget.assert_not_called()
+
+    def test_unknown_user_returns_none(self, redis_client, load_user):
+        """Should return None (and cache nothing) for missing users."""
+        load_user.return_value = None
+        assert get_principal(99) is None
+        assert redis_client.data == {}
+
+    def test_redis_failure_falls_back_to_database(self, load_user):
+        """Should still authenticate when Redis is down."""
+        load_user.return_value = make_user()
+        client = MagicMock()
+        client.mget.side_effect = ConnectionError("down")
+        with patch.object(principals, 'get_cache') as mock_get_cache:
+            mock_get_cache.return_value.redis_client = client
+            principal = get_principal(1)
+        assert principal.id == 1
+        client.set.assert_not_called()
+
+
+class TestInvalidation:
+    """Test invalidate_principal."""
+
+    def test_role_change_visible_after_invalidation(self, redis_client, load_user):
+        """New roles should be loaded right after invalidation."""
+        load_user.return_value = make_user(roles=('user',))
+        assert get_principal(1).roles == ('user',)
+
+        load_user.return_value = make_user(roles=('user', 'admin'))
+        invalidate_principal(1)
+
+        assert get_principal(1).roles == ('user', 'admin')
+
+    def test_stale_entry_rejected_by_security_version(self, redis_client, load_user):
+        """An entry written with an old version (racing request) must be ignored."""
+        load_user.return_value = make_user(roles=('admin',))
+        stale = get_principal(1)
+        invalidate_principal(1)
+        principals.clear_local_principals()
+        # A concurrent request that loaded before the invalidation writes back late
+        redis_client.set('auth:principal:v1:1', stale.to_json())
+
+        load_user.return_value = make_user(roles=('user',))
+        assert get_principal(1).roles == ('user',)
+
+    def test_invalidation_repeated_after_commit(self, redis_client, load_user):
+        """Should invalidate again when the request's session commits."""
+        app = Flask(__name__)
+        with app.app_context():
+            g.db = MagicMock(info={})
+            invalidate_principal(1)
+            assert g.db.info['principal_invalidations'] == {1}
+
+            with patch.object(principals, '_invalidate_now') as mock_invalidate:
+                principals._invalidate_after_commit(g.db)
+            mock_invalidate.assert_called_once_with(1)
+            assert 'principal_invalidations' not in g.db.info
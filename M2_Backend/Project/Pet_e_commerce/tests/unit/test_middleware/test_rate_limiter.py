@@ -0,0 +1,165 @@
+"""
+Unit tests for the rate limiter (app.core.rate_limiter).
+
+Tests token-bucket math, policy selection, principal vs IP buckets,
+RateLimit-* / Retry-After headers and the local fallback when Redis fails.
+The Lua script itself needs a Redis server and is covered by integration runs.
+"""
+import pytest
+from unittest.mock import MagicMock, patch
+from flask import Flask, Blueprint, jsonify
+from app.core import rate_limiter
+from app.core.rate_limiter import (
+    RateLimiter,
+    RateLimitPolicy,
+    LocalTokenBuckets,
+    init_rate_limiting
+)
+
+
+def make_app(policies, default_policy=None, exempt=()):
+    app = Flask(__name__)
+    api = Blueprint('api', __name__)
+    monitoring = Blueprint('monitoring', __name__)
+
+    @api.route('/login', methods=['POST'])
+    def login():
+        return jsonify({"ok": True}), 200
+
+    @api.route('/items', methods=['GET', 'POST'])
+    def items():
+        return jsonify({"ok": True}), 200
+
+    @monitoring.route('/metrics')
+    def metrics():
+        return "ok"
+
+    app.register_blueprint(api)
+    app.register_blueprint(monitoring)
+    init_rate_limiting(app, policies, default_policy, exempt)
+    return app
+
+
+@pytest.fixture
+def limiter():
+    """Fresh limiter using local buckets only (Redis unavailable)."""
+    fresh = RateLimiter(retry_seconds=60)
+    with patch.object(rate_limiter, '_limiter', fresh):
+        with patch.object(rate_limiter, 'get_cache', side_effect=ConnectionError("redis down")):
+            yield fresh
+
+
+class TestTokenBuckets:
+    """Test bucket math."""
+
+    def test_burst_then_reject(self):
+        """Should allow `capacity` requests, then reject."""
+        policy = RateLimitPolicy('t', limit=3, period=60)
+        buckets = LocalTokenBuckets()
+        results = [buckets.take('k', policy)[0] for _ in range(4)]
+        assert results == [True, True, True, False]
+
+    def test_refill_over_time(self):
+        """Tokens should refill at limit / period per second."""
+        policy = RateLimitPolicy('t', limit=60, period=60, burst=1)
+        buckets = LocalTokenBuckets()
+        with patch.object(rate_limiter.time, 'monotonic', side_effect=[100.0, 100.5, 101.6]):
+            assert buckets.take('k', policy)[0] is True
+            assert buckets.take('k', policy)[0] is False
+            assert buckets.take('k', policy)[0] is True
+
+    def test_invalid_scope_rejected(self):
+        """Should reject unknown scopes."""
+        with pytest.raises(ValueError):
+            RateLimitPolicy('t', limit=1, period=1, scope='session')
+
+
+class TestRedisBackend:
+    """Test the Redis script path."""
+
+    def test_uses_script_result(self):
+        """Should pass capacity/rate/cost to the script and parse its reply."""
+        script = MagicMock(return_value=[0, '0.25'])
+        client = MagicMock()
+        client.register_script.return_value = script
+        policy = RateLimitPolicy('login', limit=10, period=60, burst=5)
+
+        with patch.object(rate_limiter, 'get_cache') as mock_get_cache:
+            mock_get_cache.return_value.redis_client = client
+            result = RateLimiter().take('ratelimit:v1:login:ip:1.2.3.4', policy)
+
+        script.assert_called_once_with(keys=['ratelimit:v1:login:ip:1.2.3.4'], args=[5, policy.rate, 1])
+        assert result.allowed is False
+        assert result.remaining == 0.25
+        assert result.retry_after == 5  # 0.75 tokens at 1/6 per second
+
+    def test_falls_back_to_local_buckets(self):
+        """Should keep limiting in process while Redis fails, without retrying each request."""
+        client = MagicMock()
+        client.register_script.return_value.side_effect = ConnectionError("down")
+        policy = RateLimitPolicy('t', limit=1, period=60)
+        limiter = RateLimiter(retry_seconds=60)
+
+        with patch.object(rate_limiter, 'get_cache') as mock_get_cache:
+            mock_get_cache.return_value.redis_client = client
+            assert limiter.take('k', policy).allowed is True
+            assert limiter.take('k', policy).allowed is False
+
+        assert client.register_script.return_value.call_count == 1
+
+
+class TestRateLimitMiddleware:
+    """Test the Flask hooks."""
+
+    def test_rejects_with_429_and_headers(self, limiter):
+        """Should answer 429 with Retry-After once the bucket is empty."""
+        app = make_app({'api.login': RateLimitPolicy('login', limit=2, period=60, scope='ip')})
+        client = app.test_client()
+
+        first = client.post('/login')
+        client.post('/login')
+        rejected = client.post('/login')
+
+        assert first.status_code == 200
+        assert first.headers['RateLimit-Limit'] == '2'
+        assert first.headers['RateLimit-Remaining'] == '1'
+        assert first.headers['RateLimit-Policy'] == '2;w=60'
+        assert rejected.status_code == 429
+        assert rejected.headers['Retry-After'] == '30'
+        assert rejected.headers['RateLimit-Remaining'] == '0'
+
+    def test_authenticated_users_get_own_buckets(self, limiter):
+        """Buckets should be per user id when a valid JWT is sent, per IP otherwise."""
+        app = make_app({}, default_policy=RateLimitPolicy('default', limit=1, period=60))
+        client = app.test_client()
+
+        with patch.object(rate_limiter, 'verify_jwt_token',
+                          side_effect=lambda token: {'user_id': int(token)}):
+            assert client.get('/items', headers={'Authorization': 'Bearer 1'}).status_code == 200
+            assert client.get('/items', headers={'Authorization': 'Bearer 2'}).status_code == 200
+            assert client.get('/items', headers={'Authorization': 'Bearer 1'}).status_code == 429
+        assert client.get('/items').status_code == 200
+        assert client.get('/items').status_code == 429
+
+    def test_method_filter_and_exempt_blueprints(self, limiter):
+        """Policies should only apply to their methods; exempt blueprints are never limited."""
+        app = make_app(
+            {'api.items': RateLimitPolicy('search', limit=1, period=60, methods=('GET',))},
+            exempt=['monitoring']
+        )
+        client = app.test_client()
+
+        assert client.get('/items').status_code == 200
+        assert client.get('/items').status_code == 429
+        assert client.post('/items').status_code == 200
+        assert 'RateLimit-Limit' not in client.post('/items').headers
+        for _ in range(3):
+            assert client.get('/metrics').status_code == 200
+
+    def test_disabled_by_app_config(self, limiter):
+        """RATELIMIT_ENABLED=False in the Flask config should turn checks off."""
+        app = make_app({'api.login': RateLimitPolicy('login', limit=1, period=60)})
+        app.config['RATELIMIT_ENABLED'] = False
+        client = app.test_client()
+
+        assert all(client.post('/login').status_code == 200 for _ in range(3))
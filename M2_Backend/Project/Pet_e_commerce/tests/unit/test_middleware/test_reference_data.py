@@ -0,0 +1,255 @@
+"""
+Unit tests for the reference data snapshot (app.core.reference_data).
+
+Tests the immutable snapshot, lookups, Redis blob preload, refresh/publish
+and the refresher's reaction to change signals.
+"""
+import dataclasses
+import pytest
+from unittest.mock import MagicMock, patch
+from app.core import reference_data
+from app.core.reference_data import (
+    ReferenceData,
+    ReferenceDataCache,
+    ReferenceDataRefresher,
+    ReferenceSnapshot,
+    EMPTY_SNAPSHOT
+)
+
+TABLES = {
+    "product_categories": {"Food": 1, "toys": 2},
+    "pet_types": {"dog": 1},
+    "roles": {"user": 1, "admin": 2},
+    "order_statuses": {"pending": 1},
+    "return_statuses": {"requested": 1},
+    "invoice_statuses": {"paid": 1},
+}
+
+
+def make_snapshot(**overrides):
+    tables = {**TABLES, **overrides}
+    return ReferenceSnapshot(tables=tables, loaded_at=1.0)
+
+
+@pytest.fixture
+def redis_client():
+    """Redis client mock returned by get_cache(); the snapshot starts empty."""
+    client = MagicMock()
+    client.get.return_value = None
+    with patch.object(reference_data, 'get_cache') as mock_get_cache:
+        mock_get_cache.return_value.redis_client = client
+        with patch.object(ReferenceDataCache, 'snapshot', EMPTY_SNAPSHOT):
+            yield client
+
+
+class TestReferenceSnapshot:
+    """Test the immutable snapshot."""
+
+    def test_builds_forward_and_reverse_maps(self):
+        """Names should be lower-cased and mapped both ways."""
+        snapshot = make_snapshot()
+        assert snapshot.product_categories["food"] == 1
+        assert snapshot.product_categories_reverse[1] == "food"
+        assert snapshot.roles_reverse[2] == "admin"
+
+    def test_is_read_only(self):
+        """Neither the snapshot nor its maps can be modified."""
+        snapshot = make_snapshot()
+        with pytest.raises(TypeError):
+            snapshot.roles["hacker"] = 99
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            snapshot.roles = {}
+
+    def test_version_follows_content(self):
+        """Equal content gives equal versions in every process; changes give a new one."""
+        assert make_snapshot().version == make_snapshot().version
+        assert make_snapshot(pet_types={"dog": 1, "cat": 2}).version != make_snapshot().version
+
+    def test_json_round_trip_and_tampering(self):
+        """Blobs should round-trip; a blob whose content doesn't match its version is rejected."""
+        snapshot = make_snapshot()
+        restored = ReferenceSnapshot.from_json(snapshot.to_json())
+        assert restored.version == snapshot.version
+        assert restored.order_statuses == snapshot.order_statuses
+
+        tampered = snapshot.to_json().replace('"pending": 1', '"pending": 7')
+        with pytest.raises(ValueError):
+            ReferenceSnapshot.from_json(tampered)
+
+
+class TestLookups:
+    """Test the ReferenceData helpers."""
+
+    def test_lookups_read_current_snapshot(self):
+        """Lookups should be case-insensitive dict reads of the current snapshot."""
+        with patch.object(ReferenceDataCache, 'snapshot', make_snapshot()):
+            assert ReferenceData.get_product_category_id("FOOD") == 1
+            assert ReferenceData.get_pet_type_name(1) == "dog"
+            assert ReferenceData.is_valid_role("admin") is True
+            assert ReferenceData.get_invoice_status_id("void") is None
+            assert dict(ReferenceData.get_all_order_statuses()) == {"pending": 1}
+
+    def test_lookups_before_load_return_none(self):
+        """Without a loaded snapshot lookups should miss instead of querying."""
+        with patch.object(ReferenceDataCache, 'snapshot', EMPTY_SNAPSHOT):
+            with patch.object(reference_data, '_load_from_database') as mock_load:
+                assert ReferenceData.get_role_id("admin") is None
+        mock_load.assert_not_called()
+
+
+class TestLoading:
+    """Test initialize/refresh/apply_remote_version."""
+
+    def test_initialize_prefers_blob(self, redis_client):
+        """Startup should use the Redis blob instead of querying the tables."""
+        redis_client.get.return_value = make_snapshot().to_json()
+        with patch.object(reference_data, '_load_from_database') as mock_load:
+            ReferenceDataCache.initialize(prefer_blob=True)
+        mock_load.assert_not_called()
+        assert ReferenceData.get_role_id("admin") == 2
+
+    def test_initialize_falls_back_to_database_and_stores_blob(self, redis_client):
+        """Without a blob the tables are queried once and the blob is written."""
+        with patch.object(reference_data, '_load_from_database', return_value=make_snapshot()) as mock_load:
+            ReferenceDataCache.initialize(prefer_blob=True)
+            ReferenceDataCache.initialize(prefer_blob=True)
+        mock_load.assert_called_once()
+        key, blob = redis_client.set.call_args[0]
+        assert key.startswith("refdata:snapshot:v1:")
+        assert ReferenceSnapshot.from_json(blob).version == make_snapshot().version
+
+    def test_refresh_swaps_and_publishes_changes(self, redis_client):
+        """A changed snapshot replaces the old one and is announced once."""
+        old = ReferenceDataCache.snapshot = make_snapshot()
+        new = make_snapshot(order_statuses={"pending": 1, "shipped": 2})
+
+        with patch.object(reference_data, 'REFERENCE_DATA_NOTIFY', 'redis'):
+            with patch.object(reference_data, '_load_from_database', return_value=new):
+                assert ReferenceDataCache.refresh() is True
+                assert ReferenceDataCache.refresh() is False
+
+        assert ReferenceDataCache.snapshot is new
+        assert old.order_statuses.get("shipped") is None
+        redis_client.publish.assert_called_once()
+        assert redis_client.publish.call_args[0][1] == new.version
+
+    def test_apply_remote_version(self, redis_client):
+        """Known versions are ignored; new ones come from the blob when it matches."""
+        current = ReferenceDataCache.snapshot = make_snapshot()
+        new = make_snapshot(pet_types={"dog": 1, "cat": 2})
+        redis_client.get.return_value = new.to_json()
+
+        with patch.object(reference_data, '_load_from_database') as mock_load:
+            ReferenceDataCache.apply_remote_version(current.version)
+            assert ReferenceDataCache.snapshot is current
+            ReferenceDataCache.apply_remote_version(new.version)
+        mock_load.assert_not_called()
+        assert ReferenceData.get_pet_type_id("cat") == 2
+
+    def test_apply_remote_version_without_blob_queries_database(self, redis_client):
+        """A version missing from Redis should be loaded from the database."""
+        ReferenceDataCache.snapshot = make_snapshot()
+        new = make_snapshot(roles={"user": 1})
+        with patch.object(reference_data, '_load_from_database', return_value=new):
+            ReferenceDataCache.apply_remote_version(new.version)
+        assert ReferenceDataCache.snapshot is new
+
+
+class TestRefresher:
+    """Test the background refresher loop."""
+
+    def test_redis_signal_applies_version(self, redis_client):
+        """Messages on the channel should be applied; the loop ends on stop()."""
+        refresher = ReferenceDataRefresher(interval=0, mode="redis")
+        pubsub = redis_client.pubsub.return_value
+
+        def message(timeout):
+            refresher.stop()
+            return {"type": "message", "data": b"abc123"}
+
+        pubsub.get_message.side_effect = message
+        ReferenceDataCache.snapshot = make_snapshot()
+        with patch.object(ReferenceDataCache, 'apply_remote_version') as mock_apply:
+            refresher.run()
+
+        mock_apply.assert_called_once_with("abc123")
+        assert pubsub.subscribe.call_args[0][0].startswith("refdata:changed:")
+        pubsub.close.assert_called_once()
+
+    def test_scheduled_refresh(self, redis_client):
+        """Without signals the snapshot is reloaded every interval."""
+        ReferenceDataCache.snapshot = make_snapshot()
+        refresher = ReferenceDataRefresher(interval=60, mode="off")
+        refresher._next_refresh = 0
+
+        with patch.object(ReferenceDataCache, 'refresh') as mock_refresh:
+            refresher._refresh_if_due()
+            refresher._refresh_if_due()
+        mock_refresh.assert_called_once()
+
+    def test_retries_failed_startup_load(self, redis_client):
+        """With signals only, a process that started without data keeps retrying the load."""
+        refresher = ReferenceDataRefresher(interval=0, mode="off")
+        refresher._next_refresh = 0
+        with patch.object(ReferenceDataCache, 'refresh') as mock_refresh:
+            refresher._refresh_if_due()
+        mock_refresh.assert_called_once()
+
+    def test_invalid_mode_rejected(self):
+        """Unknown REFERENCE_DATA_NOTIFY values should fail fast."""
+        with pytest.raises(ValueError):
+            ReferenceDataRefresher(mode="kafka")
+
+    def test_redis_listener_waits_when_no_message(self, redis_client):
+        """A get_message that returns at once (non-dict) must not make the loop spin."""
+        refresher = ReferenceDataRefresher(interval=0, mode="redis")
+        pubsub = redis_client.pubsub.return_value
+        calls = []
+
+        def no_message(timeout):
+            calls.append(timeout)
+            if len(calls) == 2:
+                refresher.stop()
+            return MagicMock()
+
+        pubsub.get_message.side_effect = no_message
+        ReferenceDataCache.snapshot = make_snapshot()
+        with patch.object(refresher._stopped, 'wait') as mock_wait:
+            refresher.run()
+
+        assert mock_wait.call_count == 2
+        assert mock_wait.call_args[0][0] > 0
+
+
+class TestRefresherStartup:
+    """Test when the refresher thread is started."""
+
+    def make_app(self):
+        from flask import Flask
+        app = Flask(__name__)
+
+        @app.route('/ping')
+        def ping():
+            return 'ok'
+
+        return app
+
+    def test_started_on_first_request_not_by_create_app(self):
+        """Loading the snapshot must not start the thread; the first served request does."""
+        app = self.make_app()
+        with patch.object(ReferenceDataCache, 'initialize'), \
+                patch.object(reference_data, 'start_reference_data_refresher') as mock_start:
+            reference_data.init_reference_data(app)
+            mock_start.assert_not_called()
+            app.test_client().get('/ping')
+        mock_start.assert_called_once()
+
+    def test_not_started_when_testing_set_after_creation(self):
+        """Test sessions set TESTING after create_app(); no thread may start there."""
+        app = self.make_app()
+        with patch.object(ReferenceDataCache, 'initialize'), \
+                patch.object(reference_data, 'start_reference_data_refresher') as mock_start:
+            reference_data.init_reference_data(app)
+            app.config['TESTING'] = True
+            app.test_client().get('/ping')
+        mock_start.assert_not_called()
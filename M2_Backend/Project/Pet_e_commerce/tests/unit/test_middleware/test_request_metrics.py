@@ -0,0 +1,137 @@
+"""
+Unit tests for request metrics and on-demand profiling (app.core.request_metrics).
+
+Tests per-endpoint latency histograms, the in-flight gauge, profile
+authorization, stored/text profiles and the /metrics/profiles endpoints.
+"""
+import pytest
+from unittest.mock import patch
+from flask import Flask, Blueprint, jsonify
+from app.core import request_metrics, monitoring
+from app.core.monitoring import monitoring_bp
+from app.core.request_metrics import (
+    REQUEST_LATENCY,
+    REQUESTS_IN_FLIGHT,
+    init_request_metrics
+)
+
+
+@pytest.fixture
+def profile_dir(tmp_path):
+    with patch.object(request_metrics, 'PROFILE_DIR', str(tmp_path)):
+        yield tmp_path
+
+
+@pytest.fixture
+def client(profile_dir):
+    app = Flask(__name__)
+    api = Blueprint('shop', __name__)
+    seen = {}
+
+    @api.route('/items/<int:item_id>')
+    def item(item_id):
+        seen['in_flight'] = REQUESTS_IN_FLIGHT.value()
+        return jsonify({"id": item_id}), 200
+
+    app.register_blueprint(api)
+    app.register_blueprint(monitoring_bp, url_prefix='')
+    init_request_metrics(app)
+    test_client = app.test_client()
+    test_client.seen = seen
+    return test_client
+
+
+class TestLatencyMetrics:
+    """Test per-route histograms and the in-flight gauge."""
+
+    def test_records_latency_per_endpoint_and_status(self, client):
+        """Should label observations with the endpoint name, not the raw URL."""
+        before = REQUEST_LATENCY.count(endpoint='shop.item', method='GET', status='200')
+
+        client.get('/items/1')
+        client.get('/items/2')
+
+        assert REQUEST_LATENCY.count(endpoint='shop.item', method='GET', status='200') == before + 2
+
+    def test_unknown_urls_share_one_series(self, client):
+        """404s should be recorded as 'unmatched'."""
+        before = REQUEST_LATENCY.count(endpoint='unmatched', method='GET', status='404')
+        client.get('/nope/1')
+        client.get('/nope/2')
+        assert REQUEST_LATENCY.count(endpoint='unmatched', method='GET', status='404') == before + 2
+
+    def test_in_flight_gauge(self, client):
+        """Should count the request while it runs and release it afterwards."""
+        baseline = REQUESTS_IN_FLIGHT.value()
+        client.get('/items/1')
+        assert client.seen['in_flight'] == baseline + 1
+        assert REQUESTS_IN_FLIGHT.value() == baseline
+
+    def test_metrics_endpoint_exposes_histogram(self, client):
+        """GET /metrics should include the request histogram."""
+        client.get('/items/1')
+        with patch.object(monitoring, 'METRICS_TOKEN', 'scrape-secret'):
+            body = client.get('/metrics', headers={'Authorization': 'Bearer scrape-secret'}).get_data(as_text=True)
+        assert 'http_request_duration_seconds_bucket{endpoint="shop.item",method="GET",status="200"' in body
+
+
+class TestProfiling:
+    """Test on-demand profiling."""
+
+    def test_unauthorized_request_not_profiled(self, client, profile_dir):
+        """X-Profile without token or admin JWT should be ignored."""
+        response = client.get('/items/1', headers={'X-Profile': '1'})
+        assert response.status_code == 200
+        assert 'X-Profile-Id' not in response.headers
+        assert list(profile_dir.iterdir()) == []
+
+    def test_token_stores_profile(self, client, profile_dir):
+        """A valid token should store a pstats dump and return its id."""
+        with patch.object(request_metrics, 'PROFILING_TOKEN', 'secret'):
+            response = client.get('/items/1', headers={'X-Profile': '1', 'X-Profile-Token': 'secret'})
+
+        profile_id = response.headers['X-Profile-Id']
+        assert response.get_json() == {"id": 1}
+        assert (profile_dir / f"{profile_id}.prof").exists()
+        assert 'shop.item' in profile_id
+
+    def test_text_mode_returns_report(self, client):
+        """X-Profile: text should replace the body with the report."""
+        with patch.object(request_metrics, 'PROFILING_TOKEN', 'secret'):
+            response = client.get('/items/1', headers={'X-Profile': 'text', 'X-Profile-Token': 'secret'})
+
+        assert response.content_type.startswith('text/plain')
+        assert 'cumulative' in response.get_data(as_text=True)
+
+    def test_admin_jwt_authorizes_profiling(self, client):
+        """Admins should be able to profile without the shared token."""
+        with patch.object(request_metrics, 'is_admin_request', return_value=True):
+            response = client.get('/items/1', headers={'X-Profile': '1'})
+        assert 'X-Profile-Id' in response.headers
+
+    def test_sampling(self, client):
+        """PROFILE_SAMPLE_RATE should profile requests without any header."""
+        with patch.object(request_metrics, 'PROFILE_SAMPLE_RATE', 1.0):
+            response = client.get('/items/1')
+        assert 'X-Profile-Id' in response.headers
+
+    def test_profiles_endpoints(self, client):
+        """Stored profiles should be listed and rendered by /metrics/profiles."""
+        with patch.object(request_metrics, 'PROFILING_TOKEN', 'secret'):
+            profile_id = client.get(
+                '/items/1', headers={'X-Profile': '1', 'X-Profile-Token': 'secret'}
+            ).headers['X-Profile-Id']
+
+        assert client.get('/metrics/profiles').status_code == 401
+        assert client.get(f'/metrics/profiles/{profile_id}').status_code == 401
+        with patch.object(monitoring, 'METRICS_TOKEN', 'scrape-secret'):
+            scraper = {'Authorization': 'Bearer scrape-secret'}
+            assert client.get('/metrics/profiles', headers=scraper).status_code == 401
+        with patch.object(request_metrics, 'PROFILING_TOKEN', 'secret'):
+            token = {'X-Profile-Token': 'secret'}
+            assert client.get('/metrics/profiles', headers=token).get_json()['profiles'] == [profile_id]
+        with patch.object(request_metrics, 'is_admin_request', return_value=True):
+            report = client.get(f'/metrics/profiles/{profile_id}')
+            assert report.status_code == 200
+            assert 'function calls' in report.get_data(as_text=True)
+            assert client.get('/metrics/profiles/missing').status_code == 404
@@ -0,0 +1,133 @@
+"""
+Unit tests for SQL instrumentation (app.core.sql_instrumentation).
+
+Tests parameter redaction, per-request statistics, the Server-Timing header
+and the slow-query log using an in-memory SQLite engine.
+"""
+import pytest
+from unittest.mock import patch
+from flask import Flask, g
+from sqlalchemy import create_engine, event, text
+from app.core import sql_instrumentation
+from app.core.sql_instrumentation import (
+    RequestSQLStats,
+    redact_parameters,
+    install_engine_hooks,
+    init_sql_instrumentation
+)
+
+
+@pytest.fixture
+def engine():
+    """In-memory SQLite engine with the timing hooks installed."""
+    engine = create_engine("sqlite://")
+    install_engine_hooks(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def instrumented_app(engine):
+    """Flask app with per-request stats and a route issuing two queries."""
+    app = Flask(__name__)
+    init_sql_instrumentation(app)
+
+    @app.route('/items/<int:item_id>')
+    def get_item(item_id):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT :id"), {"id": item_id})
+            conn.execute(text("SELECT 1"))
+        return {"id": item_id}
+
+    return app
+
+
+class TestRedactParameters:
+    """Test redact_parameters."""
+
+    def test_dict_values_replaced_by_type(self):
+        """Should keep keys and hide values."""
+        result = redact_parameters({"email": "a@b.com", "id": 5})
+        assert result == {"email": "<str>", "id": "<int>"}
+
+    def test_positional_values_replaced_by_type(self):
+        """Should redact positional parameters."""
+        assert redact_parameters(("secret", 1.5)) == ["<str>", "<float>"]
+
+    def test_executemany_reports_row_count(self):
+        """Should describe batches by size and first row."""
+        result = redact_parameters([{"sku": "A"}, {"sku": "B"}])
+        assert result == {"rows": 2, "first": {"sku": "<str>"}}
+
+    def test_none(self):
+        """Should pass through missing parameters."""
+        assert redact_parameters(None) is None
+
+
+class TestRequestSQLStats:
+    """Test RequestSQLStats accumulation."""
+
+    def test_keeps_only_slowest_statements(self):
+        """Should keep the N slowest statements in descending order."""
+        stats = RequestSQLStats(keep_slowest=2)
+        stats.record("SELECT 1", None, 5.0)
+        stats.record("SELECT 2", None, 20.0)
+        stats.record("SELECT 3", None, 10.0)
+
+        summary = stats.summary()
+
+        assert summary["queries"] == 3
+        assert summary["db_ms"] == 35.0
+        assert [s["statement"] for s in summary["slowest"]] == ["SELECT 2", "SELECT 3"]
+
+    def test_server_timing_format(self):
+        """Should format a Server-Timing db metric."""
+        stats = RequestSQLStats()
+        stats.record("SELECT 1", None, 1.5)
+        assert stats.server_timing() == 'db;dur=1.50;desc="1 queries"'
+
+
+class TestRequestInstrumentation:
+    """Test Flask request hooks."""
+
+    def test_server_timing_header_counts_queries(self, instrumented_app):
+        """Should expose query count and DB time in Server-Timing."""
+        response = instrumented_app.test_client().get('/items/7')
+
+        assert response.status_code == 200
+        assert 'desc="2 queries"' in response.headers['Server-Timing']
+
+    def test_summary_logged_with_route(self, instrumented_app):
+        """Should log one summary line with the route template."""
+        with patch.object(sql_instrumentation, 'logger') as mock_logger:
+            instrumented_app.test_client().get('/items/7')
+
+        args = mock_logger.info.call_args[0]
+        message = args[0] % args[1:]
+        extra = mock_logger.info.call_args[1]['extra']
+        assert 'route=GET /items/<int:item_id>' in message
+        assert extra['sql']['queries'] == 2
+        assert ['<int>'] in [s['params'] for s in extra['sql']['slowest']]
+
+    def test_slow_query_logged_with_redacted_params(self, instrumented_app):
+        """Should log statements above the threshold with their route."""
+        with patch.object(sql_instrumentation, 'SLOW_QUERY_THRESHOLD_MS', 0), \
+                patch.object(sql_instrumentation, 'slow_query_logger') as mock_slow:
+            instrumented_app.test_client().get('/items/987654321')
+
+        messages = [call[0][0] % call[0][1:] for call in mock_slow.warning.call_args_list]
+        assert len(messages) == 2
+        assert all('route=GET /items/<int:item_id>' in m for m in messages)
+        assert not any('987654321' in m for m in messages)
+
+    def test_queries_outside_request_are_not_counted(self, instrumented_app, engine):
+        """Should ignore statements issued without request stats (scripts, jobs)."""
+        with instrumented_app.app_context():
+            with engine.connect() as conn:
+                assert conn.execute(text("SELECT 1")).scalar() == 1
+            assert g.get('sql_stats') is None
+
+    def test_install_engine_hooks_is_idempotent(self, engine):
+        """Should not register the listeners twice."""
+        install_engine_hooks(engine)
+        assert event.contains(engine, "before_cursor_execute", sql_instrumentation._before_cursor_execute)
@@ -0,0 +1,129 @@
+"""
+Unit tests for AnalyticsRepository.
+
+Tests the incremental refresh statements, dashboard queries and error handling.
+"""
+import pytest
+from datetime import date
+from unittest.mock import MagicMock, patch
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import SQLAlchemyError
+from app.analytics.repositories.analytics_repository import AnalyticsRepository, install_analytics_triggers
+
+
+def compiled(statement):
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+class TestAnalyticsRefresh:
+    """Test incremental rollup refresh."""
+
+    @patch('app.analytics.repositories.analytics_repository.get_db')
+    def test_refresh_recomputes_claimed_days(self, mock_get_db):
+        """Claimed days should be deleted from every rollup and re-aggregated."""
+        mock_db = MagicMock()
+        mock_get_db.return_value = mock_db
+        days = [date(2025, 1, 1), date(2025, 1, 2)]
+        mock_db.scalars.return_value = days
+
+        result = AnalyticsRepository().refresh_dirty_days(limit=10)
+
+        assert result == days
+        claim = compiled(mock_db.scalars.call_args[0][0])
+        assert 'FOR UPDATE SKIP LOCKED' in claim
+        assert 'ON CONFLICT' not in claim
+        assert mock_db.scalars.call_args[0][1] == {"limit": 10}
+
+        statements = [compiled(call[0][0]) for call in mock_db.execute.call_args_list]
+        assert len(statements) == 6
+        assert all(s.startswith('DELETE FROM') for s in statements[:4])
+        assert 'daily_sales' in statements[4] and 'daily_category_sales' in statements[4]
+        assert "st.status <> 'cancelled'" in statements[4]
+        assert 'daily_returns' in statements[5] and "st.status <> 'rejected'" in statements[5]
+        assert mock_db.execute.call_args_list[4][0][1] == {"days": days}
+
+    @patch('app.analytics.repositories.analytics_repository.get_db')
+    def test_refresh_deduplicates_marks(self, mock_get_db):
+        """A day marked several times should be refreshed once."""
+        mock_db = MagicMock()
+        mock_get_db.return_value = mock_db
+        mock_db.scalars.return_value = [date(2025, 1, 2), date(2025, 1, 1), date(2025, 1, 2)]
+
+        result = AnalyticsRepository().refresh_dirty_days(limit=10)
+
+        assert result == [date(2025, 1, 1), date(2025, 1, 2)]
+        assert mock_db.execute.call_args_list[4][0][1] == {"days": result}
+
+    @patch('app.analytics.repositories.analytics_repository.get_db')
+    def test_mark_days_is_append_only(self, mock_get_db):
+        """Marking days should never wait on an existing mark of the same day."""
+        mock_db = MagicMock()
+        mock_get_db.return_value = mock_db
+        mock_db.execute.return_value.rowcount = 2
+
+        assert AnalyticsRepository().mark_days_dirty(date(2025, 1, 1), date(2025, 1, 2)) == 2
+        assert 'ON CONFLICT' not in compiled(mock_db.execute.call_args[0][0])
+
+    @patch('app.analytics.repositories.analytics_repository.get_db')
+    def test_refresh_nothing_pending(self, mock_get_db):
+        """No queued days should skip the recompute."""
+        mock_db = MagicMock()
+        mock_get_db.return_value = mock_db
+        mock_db.scalars.return_value = []
+
+        assert AnalyticsRepository().refresh_dirty_days(limit=10) == []
+        mock_db.execute.assert_not_called()
+
+    @patch('app.analytics.repositories.analytics_repository.get_db')
+    @patch('app.analytics.repositories.analytics_repository.logger')
+    def test_refresh_database_error(self, mock_logger, mock_get_db):
+        """Database errors should return None (days stay queued on rollback)."""
+        mock_db = MagicMock()
+        mock_get_db.return_value = mock_db
+        mock_db.scalars.side_effect = SQLAlchemyError("DB error")
+
+        assert AnalyticsRepository().refresh_dirty_days(limit=10) is None
+        mock_logger.error.assert_called_once()
+
+    def test_install_triggers_covers_each_event(self):
+        """One statement-level trigger per tracked table and event."""
+        conn = MagicMock()
+
+        install_analytics_triggers(conn, "shop")
+
+        sql = [str(call[0][0]) for call in conn.execute.call_args_list]
+        creates = [s for s in sql if s.startswith('CREATE TRIGGER')]
+        assert len(creates) == 6
+        assert all('FOR EACH STATEMENT' in s and 'REFERENCING' in s for s in creates)
+        assert any('AFTER DELETE ON shop.returns REFERENCING OLD TABLE AS old_rows' in s for s in creates)
+        assert not any('ON CONFLICT' in s for s in sql)
+
+
+class TestAnalyticsQueries:
+    """Test dashboard queries over rollups."""
+
+    @patch('app.analytics.repositories.analytics_repository.get_db')
+    def test_top_products_order_by_units(self, mock_get_db):
+        """Top products should rank by the requested measure with a limit."""
+        mock_db = MagicMock()
+        mock_get_db.return_value = mock_db
+        mock_db.execute.return_value = []
+
+        AnalyticsRepository().get_top_products(date(2025, 1, 1), date(2025, 2, 1), 5, order_by="units")
+
+        sql = compiled(mock_db.execute.call_args[0][0])
+        assert 'daily_product_sales' in sql
+        assert 'ORDER BY units DESC' in sql
+        assert 'LIMIT' in sql
+        assert 'FROM orders' not in sql
+
+    @patch('app.analytics.repositories.analytics_repository.get_db')
+    @patch('app.analytics.repositories.analytics_repository.logger')
+    def test_daily_sales_database_error(self, mock_logger, mock_get_db):
+        """Database errors should return None."""
+        mock_db = MagicMock()
+        mock_get_db.return_value = mock_db
+        mock_db.scalars.side_effect = SQLAlchemyError("DB error")
+
+        assert AnalyticsRepository().get_daily_sales(date(2025, 1, 1), date(2025, 2, 1)) is None
+        mock_logger.error.assert_called_once()
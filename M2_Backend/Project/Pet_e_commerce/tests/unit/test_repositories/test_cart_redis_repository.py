@@ -0,0 +1,324 @@
+"""
+Unit tests for CartRedisRepository.
+
+Tests Redis hash serialization, cart writes, checkout persistence and the
+write-behind flusher without requiring Redis or a database.
+"""
+import json
+from datetime import datetime
+import pytest
+import redis
+from unittest.mock import Mock, MagicMock, patch
+from flask import Flask, g
+from app.core.middleware import cache_decorators
+from app.sales.repositories.cart_redis_repository import CartRedisRepository
+from app.sales.repositories.cart_repository import CartRepository
+from app.sales.models.cart import Cart, CartItem
+from app.core.lib.error_utils import ConcurrencyConflictError
+
+
+@pytest.fixture
+def mock_redis():
+    """Redis client mock returned by the patched CacheManager."""
+    client = MagicMock()
+    with patch('app.sales.repositories.cart_redis_repository.get_cache') as mock_get_cache:
+        mock_get_cache.return_value.redis_client = client
+        yield client
+
+
+@pytest.fixture
+def db_repository():
+    """CartRepository mock for persisted carts."""
+    return Mock(spec=CartRepository)
+
+
+@pytest.fixture
+def repo(db_repository):
+    """CartRedisRepository backed by the mocked database repository."""
+    return CartRedisRepository(db_repository, ttl=3600)
+
+
+def make_cart(user_id=100, cart_id=None):
+    """Build a transient cart with two items."""
+    cart = Cart(id=cart_id, user_id=user_id, finalized=False, created_at=datetime(2024, 1, 1, 12, 0, 0))
+    cart.items.append(CartItem(product_id=10, quantity=2, amount=59.98))
+    cart.items.append(CartItem(product_id=20, quantity=1, amount=15.99))
+    return cart
+
+
+def as_redis_hash(mapping):
+    """Encode a mapping the way redis-py returns it (decode_responses=False)."""
+    return {k.encode('utf-8'): v.encode('utf-8') for k, v in mapping.items()}
+
+
+class TestCartRedisRepositorySerialization:
+    """Test hash serialization round trip."""
+
+    def test_serialize_stores_meta_and_price_snapshot(self, repo):
+        """Should store one field per product plus the meta field."""
+        mapping = repo._serialize(make_cart())
+
+        assert set(mapping) == {'_meta', '10', '20'}
+        assert json.loads(mapping['10']) == {'quantity': 2, 'price': 29.99, 'amount': 59.98}
+        assert json.loads(mapping['_meta'])['user_id'] == 100
+
+    def test_hydrate_round_trip(self, repo):
+        """Should rebuild an equivalent transient cart."""
+        cart = repo._hydrate(as_redis_hash(repo._serialize(make_cart(cart_id=5))))
+
+        assert cart.id == 5
+        assert cart.user_id == 100
+        assert cart.finalized is False
+        assert cart.created_at == datetime(2024, 1, 1, 12, 0, 0)
+        assert [(i.product_id, i.quantity, i.amount) for i in cart.items] == [
+            (10, 2, 59.98), (20, 1, 15.99)
+        ]
+
+    def test_hydrate_reads_version(self, repo):
+        """Should expose the hash's write counter as the cart version."""
+        mapping = repo._serialize(make_cart())
+        mapping['_version'] = '7'
+
+        assert repo._hydrate(as_redis_hash(mapping)).version == 7
+
+    def test_hydrate_empty_hash(self, repo):
+        """Should return None for a missing hash."""
+        assert repo._hydrate({}) is None
+
+
+class TestCartRedisRepositoryReads:
+    """Test get_by_user_id, get_all and delegated reads."""
+
+    def test_get_by_user_id_success(self, repo, mock_redis):
+        """Should read the user's hash."""
+        mock_redis.hgetall.return_value = as_redis_hash(repo._serialize(make_cart()))
+
+        result = repo.get_by_user_id(100)
+
+        assert result.user_id == 100
+        assert len(result.items) == 2
+        mock_redis.hgetall.assert_called_once_with('cart:open:v1:100')
+
+    def test_get_by_user_id_not_found(self, repo, mock_redis):
+        """Should return None when no hash exists."""
+        mock_redis.hgetall.return_value = {}
+
+        assert repo.get_by_user_id(100) is None
+
+    @patch('app.sales.repositories.cart_redis_repository.logger')
+    def test_get_by_user_id_redis_error(self, mock_logger, repo, mock_redis):
+        """Should log error and return None on Redis error."""
+        mock_redis.hgetall.side_effect = redis.RedisError("down")
+
+        assert repo.get_by_user_id(100) is None
+        mock_logger.error.assert_called_once()
+
+    def test_get_all_skips_expired_carts(self, repo, mock_redis):
+        """Should hydrate indexed carts and skip expired hashes."""
+        mock_redis.smembers.return_value = {b'100', b'200'}
+        pipe = mock_redis.pipeline.return_value
+        pipe.execute.return_value = [as_redis_hash(repo._serialize(make_cart())), {}]
+
+        result = repo.get_all()
+
+        assert len(result) == 1
+        assert result[0].user_id == 100
+
+    def test_get_by_id_delegates_to_database(self, repo, db_repository):
+        """Should look up persisted carts in PostgreSQL."""
+        db_repository.get_by_id.return_value = 'persisted'
+
+        assert repo.get_by_id(1) == 'persisted'
+        db_repository.get_by_id.assert_called_once_with(1)
+
+
+class TestCartRedisRepositoryWrites:
+    """Test create, update and delete."""
+
+    def test_create_writes_hash_with_ttl_and_marks_dirty(self, repo, mock_redis, db_repository):
+        """Should replace the hash, set TTL, index and mark dirty in one script call without touching PostgreSQL."""
+        write_script = mock_redis.register_script.return_value
+        write_script.return_value = 1
+        cart = make_cart()
+
+        result = repo.create(cart)
+
+        assert result is cart
+        assert result.version == 1
+        keys = write_script.call_args[1]['keys']
+        args = write_script.call_args[1]['args']
+        assert keys == ['cart:open:v1:100', 'cart:open:v1:index', 'cart:open:v1:dirty']
+        assert args[:3] == [0, 3600, 100]
+        assert set(args[3::2]) == {'_meta', '10', '20'}
+        db_repository.create.assert_not_called()
+
+    def test_create_sets_created_at(self, repo, mock_redis):
+        """Should default created_at for new carts."""
+        mock_redis.register_script.return_value.return_value = 1
+        cart = Cart(user_id=100, finalized=False)
+
+        result = repo.create(cart)
+
+        assert result.created_at is not None
+
+    def test_update_compares_read_version(self, repo, mock_redis):
+        """Should only replace the hash if it is still at the version it was read at."""
+        write_script = mock_redis.register_script.return_value
+        write_script.return_value = 4
+        cart = make_cart()
+        cart.version = 3
+
+        assert repo.update(cart) is cart
+        assert write_script.call_args[1]['args'][0] == 3
+        assert cart.version == 4
+
+    def test_update_concurrent_change_raises_conflict(self, repo, mock_redis):
+        """Should raise instead of overwriting a cart changed by another request."""
+        mock_redis.register_script.return_value.return_value = -1
+        cart = make_cart()
+        cart.version = 3
+
+        with pytest.raises(ConcurrencyConflictError):
+            repo.update(cart)
+
+    def test_update_stale_expected_version_raises_conflict(self, repo, mock_redis):
+        """Should reject a client version that no longer matches the stored cart."""
+        cart = make_cart()
+        cart.version = 5
+
+        with pytest.raises(ConcurrencyConflictError):
+            repo.update(cart, expected_version=4)
+        mock_redis.register_script.return_value.assert_not_called()
+
+    def test_update_matching_expected_version(self, repo, mock_redis):
+        """Should write and bump the version when the client version matches."""
+        mock_redis.register_script.return_value.return_value = 6
+        cart = make_cart()
+        cart.version = 5
+
+        assert repo.update(cart, expected_version=5).version == 6
+
+    @patch('app.sales.repositories.cart_redis_repository.logger')
+    def test_update_redis_error(self, mock_logger, repo, mock_redis):
+        """Should log error and return None on Redis error."""
+        mock_redis.register_script.return_value.side_effect = redis.RedisError("down")
+
+        assert repo.update(make_cart()) is None
+        mock_logger.error.assert_called_once()
+
+    def test_delete_by_user_id_removes_redis_and_persisted_copy(self, repo, mock_redis, db_repository):
+        """Should delete the hash and any PostgreSQL copy."""
+        mock_redis.pipeline.return_value.execute.return_value = [1, 1, 1]
+        db_repository.delete_by_user_id.return_value = False
+
+        assert repo.delete_by_user_id(100) is True
+        db_repository.delete_by_user_id.assert_called_once_with(100)
+
+    def test_delete_by_user_id_not_found(self, repo, mock_redis, db_repository):
+        """Should return False when neither store has a cart."""
+        mock_redis.pipeline.return_value.execute.return_value = [0, 0, 0]
+        db_repository.delete_by_user_id.return_value = False
+
+        assert repo.delete_by_user_id(100) is False
+
+
+class TestCartRedisRepositoryPersistence:
+    """Test checkout persistence and the write-behind flusher."""
+
+    @patch('app.sales.repositories.cart_redis_repository.get_db')
+    def test_persist_writes_cart_and_clears_redis_after_commit(self, mock_get_db, repo, mock_redis, db_repository):
+        """Should copy items into the open PostgreSQL cart and drop the hash once committed."""
+        mapping = repo._serialize(make_cart())
+        mapping['_version'] = '3'
+        mock_redis.hgetall.return_value = as_redis_hash(mapping)
+        db_cart = Cart(id=7, user_id=100, finalized=False)
+        db_repository.get_by_user_id.return_value = db_cart
+        db_repository.update.side_effect = lambda cart: cart
+        release = mock_redis.register_script.return_value
+        release.return_value = 1
+
+        with Flask(__name__).app_context():
+            g.db = MagicMock(info={})
+            result = repo.persist(100)
+            release.assert_not_called()
+
+            cache_decorators._invalidate_after_commit(g.db)
+
+        assert result is db_cart
+        assert [(i.product_id, i.quantity) for i in db_cart.items] == [(10, 2), (20, 1)]
+        mock_get_db.return_value.flush.assert_called_once()
+        release.assert_called_once_with(
+            keys=['cart:open:v1:100', 'cart:open:v1:index', 'cart:open:v1:dirty'],
+            args=[3, 100]
+        )
+
+    @patch('app.sales.repositories.cart_redis_repository.get_db')
+    def test_persist_keeps_redis_cart_on_rollback(self, mock_get_db, repo, mock_redis, db_repository):
+        """A rolled back checkout should leave the Redis cart in place."""
+        mock_redis.hgetall.return_value = as_redis_hash(repo._serialize(make_cart()))
+        db_repository.get_by_user_id.return_value = Cart(id=7, user_id=100, finalized=False)
+        db_repository.update.side_effect = lambda cart: cart
+
+        with Flask(__name__).app_context():
+            g.db = MagicMock(info={})
+            repo.persist(100)
+            cache_decorators._discard_after_rollback(g.db)
+            cache_decorators._invalidate_after_commit(g.db)
+
+        mock_redis.register_script.return_value.assert_not_called()
+
+    @patch('app.sales.repositories.cart_redis_repository.logger')
+    def test_release_keeps_cart_changed_during_checkout(self, mock_logger, repo, mock_redis):
+        """Items added after the cart was read should not be dropped."""
+        mock_redis.register_script.return_value.return_value = 0
+
+        assert repo._release(100, 3) is False
+        mock_logger.warning.assert_called_once()
+
+    def test_persist_without_redis_cart_creates_empty_cart(self, repo, mock_redis, db_repository):
+        """Should create an empty persisted cart when the user has none."""
+        mock_redis.hgetall.return_value = {}
+        db_repository.get_by_user_id.return_value = None
+        db_repository.create.side_effect = lambda cart: cart
+
+        result = repo.persist(100)
+
+        assert result.user_id == 100
+        assert result.items == []
+        db_repository.create.assert_called_once()
+
+    def test_flush_dirty_carts_deletes_copy_of_expired_cart(self, repo, mock_redis, db_repository):
+        """Should remove the PostgreSQL copy when the hash is gone."""
+        mock_redis.spop.return_value = [b'100']
+        mock_redis.hgetall.return_value = {}
+
+        result = repo.flush_dirty_carts(10)
+
+        assert result == [100]
+        mock_redis.spop.assert_called_once_with('cart:open:v1:dirty', 10)
+        db_repository.delete_by_user_id.assert_called_once_with(100)
+
+    @patch('app.sales.repositories.cart_redis_repository.get_db')
+    def test_flush_dirty_carts_requeues_on_failure(self, mock_get_db, repo, mock_redis, db_repository):
+        """Should put the cart back in the dirty set when persisting fails."""
+        mock_redis.spop.return_value = [b'100']
+        mock_redis.hgetall.return_value = as_redis_hash(repo._serialize(make_cart()))
+        db_repository.get_by_user_id.return_value = Cart(id=7, user_id=100, finalized=False)
+        db_repository.update.return_value = None
+
+        result = repo.flush_dirty_carts(10)
+
+        assert result == []
+        mock_redis.sadd.assert_called_once_with('cart:open:v1:dirty', 100)
+
+    def test_sweep_expired_queues_missing_hashes(self, repo, mock_redis):
+        """Should drop expired carts from the index and mark them dirty."""
+        mock_redis.smembers.return_value = {b'100', b'200'}
+        pipe = mock_redis.pipeline.return_value
+        pipe.execute.return_value = [1, 0]
+
+        result = repo.sweep_expired()
+
+        assert result == [200]
+        mock_redis.srem.assert_called_once_with('cart:open:v1:index', 200)
+        mock_redis.sadd.assert_called_once_with('cart:open:v1:dirty', 200)
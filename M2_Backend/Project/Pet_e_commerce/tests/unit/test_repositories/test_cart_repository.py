@@ -5,10 +5,12 @@ Tests all CRUD operations, cart item management, and error handling
 for the Cart repository layer without requiring an actual database.
 """
 import pytest
-from unittest.mock import Mock, MagicMock, patch
+from unittest.mock import ANY, Mock, MagicMock, patch
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm.exc import StaleDataError
 from app.sales.repositories.cart_repository import CartRepository
 from app.sales.models.cart import Cart, CartItem
+from app.core.lib.error_utils import ConcurrencyConflictError
 
 
 class TestCartRepositoryGetByID:
@@ -24,7 +26,7 @@ class TestCartRepositoryGetByID:
         mock_cart = Mock(spec=Cart)
         mock_cart.id = 1
         
-        mock_db.query.return_value.filter_by.return_value.first.return_value = mock_cart
+        mock_db.scalars.return_value.first.return_value = mock_cart
         
         repo = CartRepository()
         
@@ -33,7 +35,7 @@ class TestCartRepositoryGetByID:
         
         # Assert
         assert result == mock_cart
-        mock_db.query.assert_called_once_with(Cart)
+        mock_db.scalars.assert_called_once_with(ANY, {'cart_id': 1})
     
     @patch('app.sales.repositories.cart_repository.get_db')
     def test_get_by_id_not_found(self, mock_get_db):
@@ -41,7 +43,7 @@ class TestCartRepositoryGetByID:
         # Arrange
         mock_db = MagicMock()
         mock_get_db.return_value = mock_db
-        mock_db.query.return_value.filter_by.return_value.first.return_value = None
+        mock_db.scalars.return_value.first.return_value = None
         
         repo = CartRepository()
         
@@ -58,7 +60,7 @@ class TestCartRepositoryGetByID:
         # Arrange
         mock_db = MagicMock()
         mock_get_db.return_value = mock_db
-        mock_db.query.side_effect = SQLAlchemyError("Database error")
+        mock_db.scalars.side_effect = SQLAlchemyError("Database error")
         
         repo = CartRepository()
         
@@ -84,7 +86,7 @@ class TestCartRepositoryGetByUserID:
         mock_cart.user_id = 1
         mock_cart.finalized = False
         
-        mock_db.query.return_value.filter_by.return_value.first.return_value = mock_cart
+        mock_db.scalars.return_value.first.return_value = mock_cart
         
         repo = CartRepository()
         
@@ -93,7 +95,7 @@ class TestCartRepositoryGetByUserID:
         
         # Assert
         assert result == mock_cart
-        mock_db.query.return_value.filter_by.assert_called_once_with(user_id=1, finalized=False)
+        mock_db.scalars.assert_called_once_with(ANY, {'user_id': 1})
     
     @patch('app.sales.repositories.cart_repository.get_db')
     def test_get_by_user_id_not_found(self, mock_get_db):
@@ -101,7 +103,7 @@ class TestCartRepositoryGetByUserID:
         # Arrange
         mock_db = MagicMock()
         mock_get_db.return_value = mock_db
-        mock_db.query.return_value.filter_by.return_value.first.return_value = None
+        mock_db.scalars.return_value.first.return_value = None
         
         repo = CartRepository()
         
@@ -123,7 +125,7 @@ class TestCartRepositoryGetAll:
         mock_get_db.return_value = mock_db
         
         mock_carts = [Mock(spec=Cart) for _ in range(3)]
-        mock_db.query.return_value.all.return_value = mock_carts
+        mock_db.query.return_value.options.return_value.all.return_value = mock_carts
         
         repo = CartRepository()
         
@@ -140,7 +142,7 @@ class TestCartRepositoryGetAll:
         # Arrange
         mock_db = MagicMock()
         mock_get_db.return_value = mock_db
-        mock_db.query.return_value.all.return_value = []
+        mock_db.query.return_value.options.return_value.all.return_value = []
         
         repo = CartRepository()
         
@@ -187,6 +189,7 @@ class TestCartRepositoryUpdate:
         mock_get_db.return_value = mock_db
         
         mock_cart = Mock(spec=Cart)
+        mock_cart.version = 1
         mock_cart.id = 1
         
         # Simulate cart is in session
@@ -199,6 +202,7 @@ class TestCartRepositoryUpdate:
         
         # Assert
         assert result == mock_cart
+        assert mock_cart.version == 2
         mock_db.flush.assert_called_once()
         mock_db.refresh.assert_called_once_with(mock_cart)
     
@@ -215,6 +219,7 @@ class TestCartRepositoryUpdate:
         # Simulate cart is not in session
         mock_db.__contains__ = Mock(return_value=False)
         merged_cart = Mock(spec=Cart)
+        merged_cart.version = 1
         mock_db.merge.return_value = merged_cart
         
         repo = CartRepository()
@@ -224,6 +229,7 @@ class TestCartRepositoryUpdate:
         
         # Assert
         assert result == merged_cart
+        assert merged_cart.version == 2
         mock_db.merge.assert_called_once_with(mock_cart)
         mock_db.flush.assert_called_once()
 
@@ -342,6 +348,7 @@ class TestCartRepositoryFinalizeCart:
         mock_get_db.return_value = mock_db
         
         mock_cart = Mock(spec=Cart)
+        mock_cart.version = 1
         mock_cart.id = 1
         mock_cart.finalized = False
         
@@ -354,6 +361,7 @@ class TestCartRepositoryFinalizeCart:
         
         # Assert
         assert result == mock_cart
+        assert mock_cart.version == 2
         assert mock_cart.finalized is True
         mock_db.flush.assert_called_once()
         mock_db.refresh.assert_called_once_with(mock_cart)
@@ -373,6 +381,26 @@ class TestCartRepositoryFinalizeCart:
         
         # Assert
         assert result is None
+    
+    @patch('app.sales.repositories.cart_repository.get_db')
+    def test_finalize_cart_concurrent_update(self, mock_get_db):
+        """Should raise ConcurrencyConflictError when another request changed the cart."""
+        # Arrange
+        mock_db = MagicMock()
+        mock_get_db.return_value = mock_db
+        
+        mock_cart = Mock(spec=Cart)
+        mock_cart.version = 1
+        mock_cart.id = 1
+        
+        mock_db.query.return_value.filter_by.return_value.first.return_value = mock_cart
+        mock_db.flush.side_effect = StaleDataError("0 rows matched")
+        
+        repo = CartRepository()
+        
+        # Act & Assert
+        with pytest.raises(ConcurrencyConflictError):
+            repo.finalize_cart(1)
 
 
 class TestCartRepositoryExistsByUserID:
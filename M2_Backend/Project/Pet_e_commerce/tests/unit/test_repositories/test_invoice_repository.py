@@ -5,6 +5,8 @@ Tests all CRUD operations, filtering, status management, and error handling.
 """
 import pytest
 from unittest.mock import Mock, MagicMock, patch
+from datetime import datetime
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.exc import SQLAlchemyError
 from app.sales.repositories.invoice_repository import InvoiceRepository
 from app.sales.models.invoice import Invoice, InvoiceStatus
@@ -19,7 +21,7 @@ class TestInvoiceRepositoryBasicOperations:
         mock_db = MagicMock()
         mock_get_db.return_value = mock_db
         mock_invoice = Mock(spec=Invoice)
-        mock_db.query.return_value.filter_by.return_value.first.return_value = mock_invoice
+        mock_db.query.return_value.options.return_value.filter_by.return_value.first.return_value = mock_invoice
         
         repo = InvoiceRepository()
         result = repo.get_by_id(1)
@@ -31,7 +33,7 @@ class TestInvoiceRepositoryBasicOperations:
         """Should return None when not found."""
         mock_db = MagicMock()
         mock_get_db.return_value = mock_db
-        mock_db.query.return_value.filter_by.return_value.first.return_value = None
+        mock_db.query.return_value.options.return_value.filter_by.return_value.first.return_value = None
         
         repo = InvoiceRepository()
         result = repo.get_by_id(999)
@@ -58,7 +60,7 @@ class TestInvoiceRepositoryBasicOperations:
         mock_db = MagicMock()
         mock_get_db.return_value = mock_db
         mock_invoice = Mock(spec=Invoice)
-        mock_db.query.return_value.filter_by.return_value.first.return_value = mock_invoice
+        mock_db.query.return_value.options.return_value.filter_by.return_value.first.return_value = mock_invoice
         
         repo = InvoiceRepository()
         result = repo.get_by_order_id(1)
@@ -71,7 +73,7 @@ class TestInvoiceRepositoryBasicOperations:
         mock_db = MagicMock()
         mock_get_db.return_value = mock_db
         mock_invoices = [Mock(spec=Invoice), Mock(spec=Invoice)]
-        mock_db.query.return_value.filter_by.return_value.all.return_value = mock_invoices
+        mock_db.query.return_value.options.return_value.filter_by.return_value.all.return_value = mock_invoices
         
         repo = InvoiceRepository()
         result = repo.get_by_user_id(1)
@@ -84,7 +86,7 @@ class TestInvoiceRepositoryBasicOperations:
         mock_db = MagicMock()
         mock_get_db.return_value = mock_db
         mock_invoices = [Mock(spec=Invoice) for _ in range(5)]
-        mock_db.query.return_value.all.return_value = mock_invoices
+        mock_db.query.return_value.options.return_value.all.return_value = mock_invoices
         
         repo = InvoiceRepository()
         result = repo.get_all()
@@ -100,7 +102,7 @@ class TestInvoiceRepositoryFiltering:
         """Should filter by user_id."""
         mock_db = MagicMock()
         mock_get_db.return_value = mock_db
-        mock_query = mock_db.query.return_value
+        mock_query = mock_db.query.return_value.options.return_value
         mock_query.filter.return_value = mock_query
         mock_query.all.return_value = [Mock(spec=Invoice)]
         
@@ -114,7 +116,7 @@ class TestInvoiceRepositoryFiltering:
         """Should filter by status_id."""
         mock_db = MagicMock()
         mock_get_db.return_value = mock_db
-        mock_query = mock_db.query.return_value
+        mock_query = mock_db.query.return_value.options.return_value
         mock_query.filter.return_value = mock_query
         mock_query.all.return_value = [Mock(spec=Invoice)]
         
@@ -128,7 +130,7 @@ class TestInvoiceRepositoryFiltering:
         """Should filter by overdue status."""
         mock_db = MagicMock()
         mock_get_db.return_value = mock_db
-        mock_query = mock_db.query.return_value
+        mock_query = mock_db.query.return_value.options.return_value
         mock_query.filter.return_value = mock_query
         mock_query.all.return_value = [Mock(spec=Invoice)]
         
@@ -161,12 +163,14 @@ class TestInvoiceRepositoryCreateUpdateDelete:
         mock_db = MagicMock()
         mock_get_db.return_value = mock_db
         mock_invoice = Mock(spec=Invoice)
+        mock_invoice.version = 1
         mock_db.merge.return_value = mock_invoice
         
         repo = InvoiceRepository()
         result = repo.update(mock_invoice)
         
         assert result == mock_invoice
+        assert mock_invoice.version == 2
         mock_db.merge.assert_called_once()
     
     @patch('app.sales.repositories.invoice_repository.get_db')
@@ -247,3 +251,34 @@ class TestInvoiceRepositoryStatusOperations:
         result = repo.exists_by_order_id(999)
         
         assert result is False
+
+
+class TestInvoiceRepositoryOverdueSweep:
+    """Test the set-based overdue update."""
+    
+    @patch('app.sales.repositories.invoice_repository.get_db')
+    def test_mark_overdue_single_update(self, mock_get_db):
+        """Should claim due pending invoices and update them in one statement."""
+        mock_db = MagicMock()
+        mock_get_db.return_value = mock_db
+        rows = [Mock(id=1, user_id=50)]
+        mock_db.execute.return_value.all.return_value = rows
+        
+        result = InvoiceRepository().mark_overdue(2, 3, datetime(2024, 3, 1), 500)
+        
+        assert result == rows
+        mock_db.execute.assert_called_once()
+        sql = str(mock_db.execute.call_args[0][0].compile(dialect=postgresql.dialect()))
+        assert sql.startswith('UPDATE')
+        assert 'version=(' in sql
+        assert 'FOR UPDATE SKIP LOCKED' in sql
+        assert 'RETURNING' in sql
+    
+    @patch('app.sales.repositories.invoice_repository.get_db')
+    def test_mark_overdue_database_error(self, mock_get_db):
+        """Should return None on database error."""
+        mock_db = MagicMock()
+        mock_get_db.return_value = mock_db
+        mock_db.execute.side_effect = SQLAlchemyError("DB error")
+        
+        assert InvoiceRepository().mark_overdue(2, 3, datetime(2024, 3, 1), 500) is None
@@ -0,0 +1,42 @@
+"""
+Unit tests for sales loading profiles.
+
+Tests that list and detail profiles build the expected loader options.
+"""
+import pytest
+from app.sales.repositories.load_profiles import load_options, LIST_VIEW, DETAIL_VIEW
+from app.sales.models.cart import Cart
+from app.sales.models.order import Order
+from app.sales.models.invoice import Invoice
+from app.sales.models.returns import Return
+
+
+def loaded_paths(options):
+    """Return the relationship keys each loader option points at."""
+    return [option.path[1].key for option in options]
+
+
+class TestLoadProfiles:
+    """Test load_options."""
+
+    def test_order_list_loads_items(self):
+        """List view should only eager-load items."""
+        assert loaded_paths(load_options(Order, LIST_VIEW)) == ['items']
+
+    def test_order_detail_loads_items_and_status(self):
+        """Detail view should also load the status row."""
+        assert loaded_paths(load_options(Order, DETAIL_VIEW)) == ['items', 'status']
+
+    def test_invoice_list_loads_nothing(self):
+        """Invoices have no collections in list responses."""
+        assert load_options(Invoice, LIST_VIEW) == ()
+
+    def test_default_profile_is_list_view(self):
+        """Should default to the list view."""
+        assert loaded_paths(load_options(Return)) == loaded_paths(load_options(Return, LIST_VIEW))
+        assert loaded_paths(load_options(Cart)) == ['items']
+
+    def test_unknown_profile_raises(self):
+        """Should reject unknown profile names."""
+        with pytest.raises(ValueError):
+            load_options(Order, 'summary')
@@ -6,8 +6,10 @@ Tests all CRUD operations, filtering, status management, and error handling.
 import pytest
 from unittest.mock import Mock, MagicMock, patch
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm.exc import StaleDataError
 from app.sales.repositories.order_repository import OrderRepository
 from app.sales.models.order import Order, OrderStatus
+from app.core.lib.error_utils import ConcurrencyConflictError
 
 
 class TestOrderRepositoryBasicOperations:
@@ -19,7 +21,7 @@ class TestOrderRepositoryBasicOperations:
         mock_db = MagicMock()
         mock_get_db.return_value = mock_db
         mock_order = Mock(spec=Order)
-        mock_db.query.return_value.filter_by.return_value.first.return_value = mock_order
+        mock_db.query.return_value.options.return_value.filter_by.return_value.first.return_value = mock_order
         
         repo = OrderRepository()
         result = repo.get_by_id(1)
@@ -31,7 +33,7 @@ class TestOrderRepositoryBasicOperations:
         """Should return None when order not found."""
         mock_db = MagicMock()
         mock_get_db.return_value = mock_db
-        mock_db.query.return_value.filter_by.return_value.first.return_value = None
+        mock_db.query.return_value.options.return_value.filter_by.return_value.first.return_value = None
         
         repo = OrderRepository()
         result = repo.get_by_id(999)
@@ -58,7 +60,7 @@ class TestOrderRepositoryBasicOperations:
         mock_db = MagicMock()
         mock_get_db.return_value = mock_db
         mock_orders = [Mock(spec=Order), Mock(spec=Order)]
-        mock_db.query.return_value.filter_by.return_value.all.return_value = mock_orders
+        mock_db.query.return_value.options.return_value.filter_by.return_value.all.return_value = mock_orders
         
         repo = OrderRepository()
         result = repo.get_by_user_id(1)
@@ -71,7 +73,7 @@ class TestOrderRepositoryBasicOperations:
         mock_db = MagicMock()
         mock_get_db.return_value = mock_db
         mock_orders = [Mock(spec=Order) for _ in range(5)]
-        mock_db.query.return_value.all.return_value = mock_orders
+        mock_db.query.return_value.options.return_value.all.return_value = mock_orders
         
         repo = OrderRepository()
         result = repo.get_all()
@@ -87,7 +89,7 @@ class TestOrderRepositoryFiltering:
         """Should filter by user_id."""
         mock_db = MagicMock()
         mock_get_db.return_value = mock_db
-        mock_query = mock_db.query.return_value
+        mock_query = mock_db.query.return_value.options.return_value
         mock_query.filter.return_value = mock_query
         mock_query.all.return_value = [Mock(spec=Order)]
         
@@ -101,7 +103,7 @@ class TestOrderRepositoryFiltering:
         """Should filter by status_id."""
         mock_db = MagicMock()
         mock_get_db.return_value = mock_db
-        mock_query = mock_db.query.return_value
+        mock_query = mock_db.query.return_value.options.return_value
         mock_query.filter.return_value = mock_query
         mock_query.all.return_value = [Mock(spec=Order)]
         
@@ -134,12 +136,14 @@ class TestOrderRepositoryCreateUpdateDelete:
         mock_db = MagicMock()
         mock_get_db.return_value = mock_db
         mock_order = Mock(spec=Order)
+        mock_order.version = 1
         mock_db.merge.return_value = mock_order
         
         repo = OrderRepository()
         result = repo.update(mock_order)
         
         assert result == mock_order
+        assert mock_order.version == 2
         mock_db.merge.assert_called_once()
     
     @patch('app.sales.repositories.order_repository.get_db')
@@ -169,6 +173,57 @@ class TestOrderRepositoryCreateUpdateDelete:
         assert result is False
 
 
+
+class TestOrderRepositoryConcurrency:
+    """Test optimistic concurrency (version compare-and-swap)."""
+    
+    @patch('app.sales.repositories.order_repository.get_db')
+    def test_update_stale_data_raises_conflict(self, mock_get_db):
+        """Should convert StaleDataError into ConcurrencyConflictError."""
+        mock_db = MagicMock()
+        mock_get_db.return_value = mock_db
+        mock_order = Mock(spec=Order)
+        mock_order.id = 1
+        mock_order.version = 1
+        mock_db.merge.return_value = mock_order
+        mock_db.flush.side_effect = StaleDataError("0 rows matched")
+        
+        repo = OrderRepository()
+        
+        with pytest.raises(ConcurrencyConflictError):
+            repo.update(mock_order)
+    
+    @patch('app.sales.repositories.order_repository.get_db')
+    def test_update_expected_version_mismatch_raises_conflict(self, mock_get_db):
+        """Should reject updates based on an outdated version without flushing."""
+        mock_db = MagicMock()
+        mock_get_db.return_value = mock_db
+        mock_order = Mock(spec=Order)
+        mock_order.id = 1
+        mock_order.version = 3
+        mock_db.merge.return_value = mock_order
+        
+        repo = OrderRepository()
+        
+        with pytest.raises(ConcurrencyConflictError):
+            repo.update(mock_order, expected_version=2)
+        assert mock_order.version == 3
+        mock_db.flush.assert_not_called()
+    
+    @patch('app.sales.repositories.order_repository.get_db')
+    def test_update_expected_version_match(self, mock_get_db):
+        """Should bump the version when the client version is current."""
+        mock_db = MagicMock()
+        mock_get_db.return_value = mock_db
+        mock_order = Mock(spec=Order)
+        mock_order.version = 3
+        mock_db.merge.return_value = mock_order
+        
+        repo = OrderRepository()
+        result = repo.update(mock_order, expected_version=3)
+        
+        assert result.version == 4
+
 class TestOrderRepositoryStatusOperations:
     """Test status-related operations."""
     
@@ -196,3 +251,35 @@ class TestOrderRepositoryStatusOperations:
         result = repo.get_status_by_name('invalid')
         
         assert result is None
+
+
+class TestOrderRepositoryExportStream:
+    """Test server-side cursor streaming for exports."""
+    
+    @patch('app.sales.repositories.order_repository.get_db')
+    def test_stream_for_export_uses_yield_per_and_date_range(self, mock_get_db):
+        """Should stream with yield_per and filter created_at as [start, end)."""
+        from datetime import datetime
+        mock_db = MagicMock()
+        mock_get_db.return_value = mock_db
+        
+        repo = OrderRepository()
+        result = repo.stream_for_export(datetime(2025, 1, 1), datetime(2025, 2, 1), batch_size=500)
+        
+        assert result == mock_db.scalars.return_value
+        statement = mock_db.scalars.call_args[0][0]
+        assert statement.get_execution_options()['yield_per'] == 500
+        sql = str(statement)
+        assert 'orders.created_at >=' in sql and 'orders.created_at <' in sql
+        assert 'ORDER BY' in sql
+    
+    @patch('app.sales.repositories.order_repository.get_db')
+    @patch('app.sales.repositories.order_repository.logger')
+    def test_stream_for_export_database_error(self, mock_logger, mock_get_db):
+        """Should return None on database errors."""
+        mock_db = MagicMock()
+        mock_get_db.return_value = mock_db
+        mock_db.scalars.side_effect = SQLAlchemyError("DB error")
+        
+        assert OrderRepository().stream_for_export() is None
+        mock_logger.error.assert_called_once()
@@ -5,7 +5,8 @@ Tests all CRUD operations, filtering, search functionality, and error handling
 for the Product repository layer without requiring an actual database.
 """
 import pytest
-from unittest.mock import Mock, MagicMock, patch
+from datetime import datetime
+from unittest.mock import ANY, Mock, MagicMock, patch
 from sqlalchemy.exc import SQLAlchemyError
 from app.products.repositories.product_repository import ProductRepository
 from app.products.models.product import Product, ProductCategory, PetType
@@ -25,7 +26,7 @@ class TestProductRepositoryGetByID:
         mock_product.id = 1
         mock_product.name = 'Test Product'
         
-        mock_db.query.return_value.filter_by.return_value.first.return_value = mock_product
+        mock_db.scalars.return_value.first.return_value = mock_product
         
         repo = ProductRepository()
         
@@ -34,7 +35,7 @@ class TestProductRepositoryGetByID:
         
         # Assert
         assert result == mock_product
-        mock_db.query.assert_called_once_with(Product)
+        mock_db.scalars.assert_called_once_with(ANY, {'product_id': 1})
     
     @patch('app.products.repositories.product_repository.get_db')
     def test_get_by_id_not_found(self, mock_get_db):
@@ -42,7 +43,7 @@ class TestProductRepositoryGetByID:
         # Arrange
         mock_db = MagicMock()
         mock_get_db.return_value = mock_db
-        mock_db.query.return_value.filter_by.return_value.first.return_value = None
+        mock_db.scalars.return_value.first.return_value = None
         
         repo = ProductRepository()
         
@@ -59,7 +60,7 @@ class TestProductRepositoryGetByID:
         # Arrange
         mock_db = MagicMock()
         mock_get_db.return_value = mock_db
-        mock_db.query.side_effect = SQLAlchemyError("Database error")
+        mock_db.scalars.side_effect = SQLAlchemyError("Database error")
         
         repo = ProductRepository()
         
@@ -503,3 +504,130 @@ class TestProductRepositoryLookupMethods:
         
         # Assert
         assert result is None
+
+
+class TestProductRepositoryBulkImport:
+    """Test the staged bulk import (temp table, COPY, upsert)."""
+    
+    @patch('app.products.repositories.product_repository.get_db')
+    def test_copy_into_import_staging(self, mock_get_db):
+        """Should COPY the batch as CSV through the session's DBAPI cursor."""
+        # Arrange
+        mock_db = MagicMock()
+        mock_get_db.return_value = mock_db
+        cursor = mock_db.connection.return_value.connection.cursor.return_value
+        rows = [(2, 'AB001', 'Dog, large', 1, 1, 5, 9.5, None, None, True, None, None, 'admin', None)]
+        
+        repo = ProductRepository()
+        
+        # Act
+        result = repo.copy_into_import_staging(rows)
+        
+        # Assert
+        assert result is True
+        sql, buffer = cursor.copy_expert.call_args[0]
+        assert sql.startswith('COPY product_import_staging (line, sku,')
+        assert buffer.read() == '2,AB001,"Dog, large",1,1,5,9.5,,,t,,,admin,\n'
+        cursor.close.assert_called_once()
+    
+    @patch('app.products.repositories.product_repository.get_db')
+    def test_merge_import_staging_counts(self, mock_get_db):
+        """Should run one upsert and derive unchanged rows from the staged count."""
+        # Arrange
+        mock_db = MagicMock()
+        mock_get_db.return_value = mock_db
+        mock_db.execute.return_value.one.return_value = (10, 4, 3)
+        
+        repo = ProductRepository()
+        
+        # Act
+        result = repo.merge_import_staging()
+        
+        # Assert
+        assert result == {'inserted': 4, 'updated': 3, 'unchanged': 3}
+        sql = str(mock_db.execute.call_args[0][0])
+        assert 'ON CONFLICT (sku) DO UPDATE' in sql
+        assert 'DISTINCT ON (sku)' in sql
+    
+    @patch('app.products.repositories.product_repository.get_db')
+    def test_import_staging_database_errors(self, mock_get_db):
+        """Should return False/None on database errors."""
+        # Arrange
+        mock_db = MagicMock()
+        mock_get_db.return_value = mock_db
+        mock_db.execute.side_effect = SQLAlchemyError("Database error")
+        
+        repo = ProductRepository()
+        
+        # Act / Assert
+        assert repo.create_import_staging() is False
+        assert repo.merge_import_staging() is None
+
+
+class TestProductRepositoryBulkAdjust:
+    """Test set-based bulk adjustments (UPDATE ... FROM (VALUES ...))."""
+    
+    @staticmethod
+    def _sql(mock_db):
+        from sqlalchemy.dialects import postgresql
+        statement = mock_db.scalars.call_args[0][0]
+        return str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    
+    @patch('app.products.repositories.product_repository.get_db')
+    def test_bulk_adjust_by_ids(self, mock_get_db):
+        """Should run one UPDATE joined to a VALUES list and return updated IDs."""
+        # Arrange
+        mock_db = MagicMock()
+        mock_get_db.return_value = mock_db
+        mock_db.scalars.return_value = iter([1, 2])
+        
+        repo = ProductRepository()
+        
+        # Act
+        result = repo.bulk_adjust_by_ids([(1, 'set', 9.5, 0), (2, 'percent', -10.0, 5)], datetime(2025, 1, 1))
+        
+        # Assert
+        assert result == [1, 2]
+        mock_db.scalars.assert_called_once()
+        sql = self._sql(mock_db)
+        assert "FROM (VALUES (1, 'set', 9.5, 0), (2, 'percent', -10.0, 5))" in sql
+        assert 'products.id = adjustment.product_id' in sql
+        assert 'stock_quantity + adjustment.stock_delta >= 0' in sql
+    
+    @patch('app.products.repositories.product_repository.get_db')
+    def test_bulk_adjust_by_filter(self, mock_get_db):
+        """Should combine filters and apply one VALUES row to all matches."""
+        # Arrange
+        mock_db = MagicMock()
+        mock_get_db.return_value = mock_db
+        mock_db.scalars.return_value = iter([4])
+        
+        repo = ProductRepository()
+        
+        # Act
+        result = repo.bulk_adjust_by_filter(
+            {'category_id': 2, 'brand': 'Acme'}, 'keep', 0.0, -1, datetime(2025, 1, 1)
+        )
+        
+        # Assert
+        assert result == [4]
+        sql = self._sql(mock_db)
+        assert "FROM (VALUES ('keep', 0.0, -1))" in sql
+        assert 'product_category_id = 2' in sql
+        assert "lower(lyfter_backend_project.products.brand) = 'acme'" in sql
+    
+    def test_bulk_adjust_by_filter_requires_filter(self):
+        """Should refuse to update the whole catalog."""
+        with pytest.raises(ValueError):
+            ProductRepository().bulk_adjust_by_filter({}, 'keep', 0.0, 1, datetime(2025, 1, 1))
+    
+    @patch('app.products.repositories.product_repository.get_db')
+    def test_bulk_adjust_database_error(self, mock_get_db):
+        """Should return None on database errors."""
+        # Arrange
+        mock_db = MagicMock()
+        mock_get_db.return_value = mock_db
+        mock_db.scalars.side_effect = SQLAlchemyError("Database error")
+        
+        # Act / Assert
+        assert ProductRepository().bulk_adjust_by_ids([(1, 'set', 1.0, 0)], datetime(2025, 1, 1)) is None
@@ -0,0 +1,91 @@
+"""
+Unit tests for RelatedProductRepository.
+
+Tests the related products lookup and the batched offline rebuild.
+"""
+import pytest
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import SQLAlchemyError
+from app.products.repositories.related_product_repository import RelatedProductRepository
+
+
+def compiled(statement):
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.unit
+@pytest.mark.products
+class TestRelatedProductLookup:
+    """Test reading a product's related list."""
+
+    @patch('app.products.repositories.related_product_repository.get_db')
+    def test_reads_ranked_active_neighbours(self, mock_get_db):
+        """The lookup should be a ranked range of one product's rows."""
+        mock_db = MagicMock()
+        mock_get_db.return_value = mock_db
+        mock_db.scalars.return_value = ["p2", "p3"]
+
+        result = RelatedProductRepository().get_related(1, limit=5)
+
+        assert result == ["p2", "p3"]
+        statement = compiled(mock_db.scalars.call_args[0][0])
+        assert 'related_products.product_id = %(product_id_1)s' in statement
+        assert 'products.is_active IS NOT false' in statement
+        assert 'ORDER BY' in statement and 'related_products.rank' in statement
+        assert 'LIMIT' in statement
+
+    @patch('app.products.repositories.related_product_repository.get_db')
+    def test_lookup_database_error(self, mock_get_db):
+        """Database errors should return None."""
+        mock_get_db.return_value.scalars.side_effect = SQLAlchemyError("DB error")
+
+        assert RelatedProductRepository().get_related(1, limit=5) is None
+
+
+@pytest.mark.unit
+@pytest.mark.products
+class TestRelatedProductRebuild:
+    """Test the batched rebuild."""
+
+    @patch('app.products.repositories.related_product_repository.get_db')
+    def test_rebuild_replaces_batch(self, mock_get_db):
+        """The batch's rows should be deleted and re-ranked from order items."""
+        mock_db = MagicMock()
+        mock_get_db.return_value = mock_db
+        mock_db.scalars.return_value = [3, 4]
+        built_at = datetime(2025, 1, 1)
+
+        result = RelatedProductRepository().rebuild(after_product_id=2, limit=2, top_k=10, built_at=built_at)
+
+        assert result == [3, 4]
+        assert mock_db.scalars.call_args[0][1] == {"after": 2, "limit": 2}
+        delete_statement, insert_call = mock_db.execute.call_args_list
+        assert compiled(delete_statement[0][0]).startswith('DELETE FROM')
+        insert_statement, params = insert_call[0]
+        insert_sql = compiled(insert_statement)
+        assert 'b.product_id <> a.product_id' in insert_sql
+        assert "st.status <> 'cancelled'" in insert_sql
+        assert 'WHERE rank <= %(top_k)s' in insert_sql
+        assert params == {"ids": [3, 4], "top_k": 10, "built_at": built_at}
+
+    @patch('app.products.repositories.related_product_repository.get_db')
+    def test_rebuild_done(self, mock_get_db):
+        """No products left should skip the rebuild statements."""
+        mock_db = MagicMock()
+        mock_get_db.return_value = mock_db
+        mock_db.scalars.return_value = []
+
+        assert RelatedProductRepository().rebuild(99, 2, 10, datetime(2025, 1, 1)) == []
+        mock_db.execute.assert_not_called()
+
+    @patch('app.products.repositories.related_product_repository.get_db')
+    def test_rebuild_database_error(self, mock_get_db):
+        """Database errors should return None."""
+        mock_db = MagicMock()
+        mock_get_db.return_value = mock_db
+        mock_db.scalars.return_value = [3]
+        mock_db.execute.side_effect = SQLAlchemyError("DB error")
+
+        assert RelatedProductRepository().rebuild(2, 2, 10, datetime(2025, 1, 1)) is None
@@ -19,7 +19,7 @@ class TestReturnRepositoryBasicOperations:
         mock_db = MagicMock()
         mock_get_db.return_value = mock_db
         mock_return = Mock(spec=Return)
-        mock_db.query.return_value.filter_by.return_value.first.return_value = mock_return
+        mock_db.query.return_value.options.return_value.filter_by.return_value.first.return_value = mock_return
         
         repo = ReturnRepository()
         result = repo.get_by_id(1)
@@ -31,7 +31,7 @@ class TestReturnRepositoryBasicOperations:
         """Should return None when not found."""
         mock_db = MagicMock()
         mock_get_db.return_value = mock_db
-        mock_db.query.return_value.filter_by.return_value.first.return_value = None
+        mock_db.query.return_value.options.return_value.filter_by.return_value.first.return_value = None
         
         repo = ReturnRepository()
         result = repo.get_by_id(999)
@@ -58,7 +58,7 @@ class TestReturnRepositoryBasicOperations:
         mock_db = MagicMock()
         mock_get_db.return_value = mock_db
         mock_returns = [Mock(spec=Return), Mock(spec=Return)]
-        mock_db.query.return_value.filter_by.return_value.all.return_value = mock_returns
+        mock_db.query.return_value.options.return_value.filter_by.return_value.all.return_value = mock_returns
         
         repo = ReturnRepository()
         result = repo.get_by_order_id(1)
@@ -71,7 +71,7 @@ class TestReturnRepositoryBasicOperations:
         mock_db = MagicMock()
         mock_get_db.return_value = mock_db
         mock_returns = [Mock(spec=Return), Mock(spec=Return)]
-        mock_db.query.return_value.filter_by.return_value.all.return_value = mock_returns
+        mock_db.query.return_value.options.return_value.filter_by.return_value.all.return_value = mock_returns
         
         repo = ReturnRepository()
         result = repo.get_by_user_id(1)
@@ -84,7 +84,7 @@ class TestReturnRepositoryBasicOperations:
         mock_db = MagicMock()
         mock_get_db.return_value = mock_db
         mock_returns = [Mock(spec=Return) for _ in range(5)]
-        mock_db.query.return_value.all.return_value = mock_returns
+        mock_db.query.return_value.options.return_value.all.return_value = mock_returns
         
         repo = ReturnRepository()
         result = repo.get_all()
@@ -100,7 +100,7 @@ class TestReturnRepositoryFiltering:
         """Should filter by user_id."""
         mock_db = MagicMock()
         mock_get_db.return_value = mock_db
-        mock_query = mock_db.query.return_value
+        mock_query = mock_db.query.return_value.options.return_value
         mock_query.filter.return_value = mock_query
         mock_query.all.return_value = [Mock(spec=Return)]
         
@@ -114,7 +114,7 @@ class TestReturnRepositoryFiltering:
         """Should filter by status_id."""
         mock_db = MagicMock()
         mock_get_db.return_value = mock_db
-        mock_query = mock_db.query.return_value
+        mock_query = mock_db.query.return_value.options.return_value
         mock_query.filter.return_value = mock_query
         mock_query.all.return_value = [Mock(spec=Return)]
         
@@ -128,7 +128,7 @@ class TestReturnRepositoryFiltering:
         """Should filter by order_id."""
         mock_db = MagicMock()
         mock_get_db.return_value = mock_db
-        mock_query = mock_db.query.return_value
+        mock_query = mock_db.query.return_value.options.return_value
         mock_query.filter.return_value = mock_query
         mock_query.all.return_value = [Mock(spec=Return)]
         
@@ -161,12 +161,14 @@ class TestReturnRepositoryCreateUpdateDelete:
         mock_db = MagicMock()
         mock_get_db.return_value = mock_db
         mock_return = Mock(spec=Return)
+        mock_return.version = 1
         mock_db.merge.return_value = mock_return
         
         repo = ReturnRepository()
         result = repo.update(mock_return)
         
         assert result == mock_return
+        assert mock_return.version == 2
         mock_db.merge.assert_called_once()
     
     @patch('app.sales.repositories.return_repository.get_db')
@@ -5,7 +5,7 @@ Tests all CRUD operations, query methods, role management, and error handling
 for the User repository layer without requiring an actual database.
 """
 import pytest
-from unittest.mock import Mock, MagicMock, patch
+from unittest.mock import ANY, Mock, MagicMock, patch
 from sqlalchemy.exc import SQLAlchemyError
 from app.auth.repositories.user_repository import UserRepository
 from app.auth.models.user import User, Role, RoleUser
@@ -25,8 +25,7 @@ class TestUserRepositoryGetByID:
         mock_user.id = 1
         mock_user.username = 'testuser'
         
-        mock_query = mock_db.query.return_value
-        mock_query.options.return_value.filter_by.return_value.first.return_value = mock_user
+        mock_db.scalars.return_value.first.return_value = mock_user
         
         repo = UserRepository()
         
@@ -35,8 +34,25 @@ class TestUserRepositoryGetByID:
         
         # Assert
         assert result == mock_user
-        mock_db.query.assert_called_once_with(User)
-        mock_query.options.return_value.filter_by.assert_called_once_with(id=1)
+        mock_db.scalars.assert_called_once_with(ANY, {'user_id': 1})
+    
+    @patch('app.auth.repositories.user_repository.get_db')
+    def test_get_by_id_reuses_statement(self, mock_get_db):
+        """Should execute the same prebuilt statement on every call (compiled cache hit)."""
+        # Arrange
+        mock_db = MagicMock()
+        mock_get_db.return_value = mock_db
+        repo = UserRepository()
+        
+        # Act
+        repo.get_by_id(1)
+        repo.get_by_id(2)
+        
+        # Assert
+        first_stmt = mock_db.scalars.call_args_list[0][0][0]
+        second_stmt = mock_db.scalars.call_args_list[1][0][0]
+        assert first_stmt is second_stmt
+        assert mock_db.scalars.call_args_list[1][0][1] == {'user_id': 2}
     
     @patch('app.auth.repositories.user_repository.get_db')
     def test_get_by_id_not_found(self, mock_get_db):
@@ -45,8 +61,7 @@ class TestUserRepositoryGetByID:
         mock_db = MagicMock()
         mock_get_db.return_value = mock_db
         
-        mock_query = mock_db.query.return_value
-        mock_query.options.return_value.filter_by.return_value.first.return_value = None
+        mock_db.scalars.return_value.first.return_value = None
         
         repo = UserRepository()
         
@@ -63,7 +78,7 @@ class TestUserRepositoryGetByID:
         # Arrange
         mock_db = MagicMock()
         mock_get_db.return_value = mock_db
-        mock_db.query.side_effect = SQLAlchemyError("Database error")
+        mock_db.scalars.side_effect = SQLAlchemyError("Database error")
         
         repo = UserRepository()
         
@@ -175,7 +190,7 @@ class TestUserRepositoryGetAll:
         mock_get_db.return_value = mock_db
         
         mock_users = [Mock(spec=User), Mock(spec=User), Mock(spec=User)]
-        mock_db.query.return_value.all.return_value = mock_users
+        mock_db.query.return_value.options.return_value.all.return_value = mock_users
         
         repo = UserRepository()
         
@@ -192,7 +207,7 @@ class TestUserRepositoryGetAll:
         # Arrange
         mock_db = MagicMock()
         mock_get_db.return_value = mock_db
-        mock_db.query.return_value.all.return_value = []
+        mock_db.query.return_value.options.return_value.all.return_value = []
         
         repo = UserRepository()
         
@@ -0,0 +1,79 @@
+"""
+Unit tests for UserStatsRepository.
+
+Tests the batched rebuild and the trigger DDL.
+"""
+import pytest
+from unittest.mock import MagicMock, patch
+from sqlalchemy.exc import SQLAlchemyError
+from app.auth.repositories.user_stats_repository import UserStatsRepository, install_user_stats_triggers
+
+
+@pytest.mark.unit
+class TestUserStatsRebuild:
+    """Test batched rebuild."""
+
+    @patch('app.auth.repositories.user_stats_repository.get_db')
+    def test_rebuild_recomputes_next_batch(self, mock_get_db):
+        """The next users by id should be recomputed in one call."""
+        mock_db = MagicMock()
+        mock_get_db.return_value = mock_db
+        mock_db.scalars.return_value = [11, 12, 13]
+
+        result = UserStatsRepository().rebuild(after_user_id=10, limit=3)
+
+        assert result == [11, 12, 13]
+        assert mock_db.scalars.call_args[0][1] == {"after": 10, "limit": 3}
+        statement, params = mock_db.execute.call_args[0]
+        assert 'recompute_user_stats' in str(statement)
+        assert params == {"ids": [11, 12, 13]}
+
+    @patch('app.auth.repositories.user_stats_repository.get_db')
+    def test_rebuild_done(self, mock_get_db):
+        """No users left should skip the recompute."""
+        mock_db = MagicMock()
+        mock_get_db.return_value = mock_db
+        mock_db.scalars.return_value = []
+
+        assert UserStatsRepository().rebuild(after_user_id=99, limit=3) == []
+        mock_db.execute.assert_not_called()
+
+    @patch('app.auth.repositories.user_stats_repository.get_db')
+    def test_rebuild_database_error(self, mock_get_db):
+        """Database errors should return None."""
+        mock_db = MagicMock()
+        mock_get_db.return_value = mock_db
+        mock_db.scalars.side_effect = SQLAlchemyError("DB error")
+
+        assert UserStatsRepository().rebuild(after_user_id=0, limit=3) is None
+
+
+@pytest.mark.unit
+class TestUserStatsTriggers:
+    """Test trigger installation."""
+
+    def test_statement_triggers_on_sales_tables(self):
+        """Each sales table should get one statement-level trigger per event."""
+        conn = MagicMock()
+
+        install_user_stats_triggers(conn, "shop")
+
+        statements = [str(call[0][0]) for call in conn.execute.call_args_list]
+        creates = [s for s in statements if s.startswith("CREATE TRIGGER")]
+        assert len(creates) == 9
+        assert all("FOR EACH STATEMENT" in s for s in creates)
+        assert any("ON shop.invoices REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows" in s for s in creates)
+        recompute = statements[0]
+        assert "ON CONFLICT (user_id) DO UPDATE" in recompute
+        assert "st.status <> 'cancelled'" in recompute
+
+    def test_recompute_locks_users_before_aggregating(self):
+        """Per-user locks should be taken in a statement before the aggregate."""
+        conn = MagicMock()
+
+        install_user_stats_triggers(conn, "shop")
+
+        recompute = str(conn.execute.call_args_list[0][0][0])
+        lock = recompute.index("pg_advisory_xact_lock(hashtext('shop.user_stats'), id)")
+        assert "ORDER BY 1) ids;" in recompute[lock:recompute.index("INSERT INTO")]
+        assert lock < recompute.index("INSERT INTO shop.user_stats")
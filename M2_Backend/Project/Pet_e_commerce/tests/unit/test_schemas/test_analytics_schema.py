@@ -0,0 +1,39 @@
+"""
+Unit tests for the analytics query schema.
+"""
+import pytest
+from datetime import date, timedelta
+from marshmallow import ValidationError
+from app.analytics.schemas.analytics_schema import AnalyticsQuerySchema
+
+
+@pytest.mark.unit
+class TestAnalyticsQuerySchema:
+    """Test date range resolution and validation."""
+
+    def test_inclusive_to_becomes_exclusive_end(self):
+        """from/to are inclusive; end_day is the day after 'to'."""
+        data = AnalyticsQuerySchema().load({"from": "2025-01-01", "to": "2025-01-31"})
+
+        assert data["start_day"] == date(2025, 1, 1)
+        assert data["end_day"] == date(2025, 2, 1)
+        assert data["limit"] == 10 and data["order_by"] == "revenue" and data["group_by"] == "category"
+
+    def test_default_range_ends_today(self):
+        """Without dates the range is the last 30 days, today included."""
+        data = AnalyticsQuerySchema().load({})
+
+        assert data["end_day"] == date.today() + timedelta(days=1)
+        assert data["end_day"] - data["start_day"] == timedelta(days=30)
+
+    @pytest.mark.parametrize("params", [
+        {"from": "2025-02-01", "to": "2025-01-01"},
+        {"from": "2020-01-01", "to": "2025-01-01"},
+        {"order_by": "margin"},
+        {"group_by": "brand"},
+        {"limit": "500"},
+    ])
+    def test_invalid_queries(self, params):
+        """Reversed or oversized ranges and unknown options are rejected."""
+        with pytest.raises(ValidationError):
+            AnalyticsQuerySchema().load(params)
@@ -264,6 +264,7 @@ class TestInvoiceResponseSchema:
         mock_invoice.due_date = datetime.now() + timedelta(days=30)
         mock_invoice.created_at = datetime.now()
         mock_invoice.invoice_status_id = 1
+        mock_invoice.version = 1
         mock_invoice.is_overdue = mocker.Mock(return_value=False)
         
         mocker.patch(
@@ -296,6 +297,7 @@ class TestInvoiceResponseSchema:
         mock_invoice.due_date = datetime.now() - timedelta(days=5)  # Past due
         mock_invoice.created_at = datetime.now() - timedelta(days=35)
         mock_invoice.invoice_status_id = 1
+        mock_invoice.version = 1
         mock_invoice.is_overdue = mocker.Mock(return_value=True)
         
         mocker.patch(
@@ -6,7 +6,8 @@ import pytest
 from marshmallow import ValidationError
 from app.products.schemas.product_schema import (
     ProductRegistrationSchema,
-    ProductResponseSchema
+    ProductResponseSchema,
+    ProductBulkUpdateSchema
 )
 
 
@@ -306,3 +307,55 @@ class TestProductResponseSchema:
         
         assert 'exact_stock_quantity' in result
         assert result['exact_stock_quantity'] == 42
+
+
+@pytest.mark.unit
+@pytest.mark.products
+class TestProductBulkUpdateSchema:
+    """Test suite for ProductBulkUpdateSchema."""
+
+    def test_filter_with_adjustment(self, mocker):
+        """Test filter mode with a percentage price change."""
+        mocker.patch('app.products.schemas.product_schema.ReferenceData.is_valid_product_category', return_value=True)
+
+        result = ProductBulkUpdateSchema().load({
+            'filter': {'category': 'food', 'brand': 'Acme'},
+            'adjustment': {'price_percent': -10, 'stock_delta': 5}
+        })
+
+        assert result['filter'] == {'category': 'food', 'brand': 'Acme'}
+        assert result['adjustment'] == {'price_percent': -10.0, 'stock_delta': 5}
+
+    def test_explicit_changes(self):
+        """Test explicit per-product changes."""
+        result = ProductBulkUpdateSchema().load({
+            'changes': [{'id': 1, 'price': 19.99}, {'id': 2, 'stock_delta': -3}]
+        })
+
+        assert result['changes'][0] == {'id': 1, 'price': 19.99}
+
+    @pytest.mark.parametrize('data', [
+        {},
+        {'filter': {'brand': 'Acme'}},
+        {'filter': {}, 'adjustment': {'stock_delta': 1}},
+        {'filter': {'ids': [1]}, 'adjustment': {}},
+        {'filter': {'ids': [1]}, 'adjustment': {'price': 5, 'price_percent': 10}},
+        {'filter': {'ids': [1]}, 'adjustment': {'price_percent': -100}},
+        {'changes': [{'id': 1, 'price': 5}], 'filter': {'ids': [1]}},
+        {'changes': [{'id': 1, 'price': 5}, {'id': 1, 'stock_delta': 2}]},
+        {'changes': [{'price': 5}]},
+        {'changes': []},
+    ])
+    def test_invalid_requests(self, data):
+        """Test missing modes, empty filters, conflicting and duplicate changes are rejected."""
+        with pytest.raises(ValidationError):
+            ProductBulkUpdateSchema().load(data)
+
+    def test_invalid_category(self, mocker):
+        """Test unknown category names are rejected."""
+        mocker.patch('app.products.schemas.product_schema.ReferenceData.is_valid_product_category', return_value=False)
+
+        with pytest.raises(ValidationError) as exc_info:
+            ProductBulkUpdateSchema().load({'filter': {'category': 'rocks'}, 'adjustment': {'stock_delta': 1}})
+
+        assert 'category' in exc_info.value.messages['filter']
@@ -546,6 +546,7 @@ class TestReturnResponseSchema:
         mock_return.total_refund = 99.98
         mock_return.created_at = datetime(2024, 1, 15, 10, 30, 0)
         mock_return.return_status_id = 1
+        mock_return.version = 1
         mock_return.items = []
         
         mocker.patch(
@@ -576,6 +577,7 @@ class TestReturnResponseSchema:
         mock_return.total_refund = 50.00
         mock_return.created_at = datetime(2024, 1, 15, 10, 30, 0)
         mock_return.return_status_id = None
+        mock_return.version = 1
         mock_return.items = []
         
         schema = ReturnResponseSchema()
@@ -12,7 +12,7 @@ from app.auth.schemas.user_schema import (
     UserPasswordChangeSchema,
     RoleAssignmentSchema
 )
-from app.auth.models.user import User
+from app.auth.models.user import User, UserStats
 
 
 @pytest.mark.unit
@@ -259,6 +259,33 @@ class TestUserResponseSchema:
         
         assert isinstance(result['roles'], list)
 
+    def test_stats_from_summary_row(self):
+        """Test that stats come from the precomputed user_stats row."""
+        user = User(id=1, username='buyer', email='buyer@example.com', password_hash='x')
+        user.stats = UserStats(
+            user_id=1, order_count=3, lifetime_spend=120.456, open_invoice_count=1,
+            open_invoice_amount=40.0, pending_return_count=2
+        )
+        
+        result = UserResponseSchema().dump(user)
+        
+        assert result['stats'] == {
+            'order_count': 3,
+            'lifetime_spend': 120.46,
+            'open_invoice_count': 1,
+            'open_invoice_amount': 40.0,
+            'pending_return_count': 2
+        }
+
+    def test_stats_default_to_zero_without_row(self):
+        """Test that users without activity get an all-zero summary."""
+        user = User(id=2, username='newcomer', email='new@example.com', password_hash='x')
+        
+        result = UserResponseSchema().dump(user)
+        
+        assert result['stats']['order_count'] == 0
+        assert result['stats']['lifetime_spend'] == 0.0
+
 
 @pytest.mark.unit
 @pytest.mark.auth
@@ -0,0 +1,124 @@
+"""
+Unit tests for AnalyticsService.
+
+Tests cover:
+- Report shape (inclusive from/to, stale_days)
+- Category names, shares and return rates
+- Rollup refresh batches
+- Repository failures
+"""
+
+import pytest
+from datetime import date
+from types import SimpleNamespace
+from unittest.mock import patch
+from app.core.reference_data import ReferenceDataCache, ReferenceSnapshot
+from app.analytics.services.analytics_service import AnalyticsService
+
+SNAPSHOT = ReferenceSnapshot(tables={
+    "product_categories": {"food": 1, "toys": 2},
+    "pet_types": {},
+    "roles": {},
+    "order_statuses": {},
+    "return_statuses": {},
+    "invoice_statuses": {},
+})
+
+START, END = date(2025, 1, 1), date(2025, 2, 1)
+
+
+@pytest.fixture(autouse=True)
+def reference_snapshot():
+    with patch.object(ReferenceDataCache, 'snapshot', SNAPSHOT):
+        yield
+
+
+@pytest.fixture
+def service(mocker):
+    service = AnalyticsService()
+    mocker.patch.object(service.analytics_repo, 'count_dirty_days', return_value=2)
+    return service
+
+
+@pytest.mark.unit
+@pytest.mark.sales
+class TestAnalyticsReports:
+    """Test dashboard reports built from rollup rows."""
+
+    def test_daily_sales(self, service, mocker):
+        """Days should be serialized with an inclusive 'to' and stale_days."""
+        mocker.patch.object(service.analytics_repo, 'get_daily_sales', return_value=[
+            SimpleNamespace(day=date(2025, 1, 3), order_count=4, units=9, revenue=120.456)
+        ])
+
+        report = service.get_daily_sales(START, END)
+
+        assert report["from"] == "2025-01-01" and report["to"] == "2025-01-31"
+        assert report["stale_days"] == 2
+        assert report["days"] == [{"day": "2025-01-03", "order_count": 4, "units": 9, "revenue": 120.46}]
+
+    def test_category_mix_shares(self, service, mocker):
+        """Categories should carry names and shares, largest revenue first."""
+        mocker.patch.object(service.analytics_repo, 'get_category_sales', return_value=[
+            {"product_category_id": 1, "units": 10, "revenue": 25.0},
+            {"product_category_id": 2, "units": 30, "revenue": 75.0},
+        ])
+
+        categories = service.get_category_mix(START, END)["categories"]
+
+        assert [c["category"] for c in categories] == ["toys", "food"]
+        assert categories[0]["revenue_share"] == 0.75
+        assert categories[1]["units_share"] == 0.25
+
+    def test_return_rates(self, service, mocker):
+        """Rates should be returned/sold units; no sales gives a zero rate."""
+        mocker.patch.object(service.analytics_repo, 'get_returned_units', return_value=[
+            {"key": 1, "units_returned": 3, "units_sold": 12, "refund_amount": 30.0, "return_count": 2},
+            {"key": 2, "units_returned": 1, "units_sold": 0, "refund_amount": 5.0, "return_count": 1},
+        ])
+
+        groups = service.get_return_rates(START, END)["groups"]
+
+        assert groups[0]["category"] == "food" and groups[0]["return_rate"] == 0.25
+        assert groups[1]["return_rate"] == 0.0
+
+        by_product = service.get_return_rates(START, END, group_by="product")["groups"]
+        assert by_product[0]["product_id"] == 1
+
+    def test_top_products(self, service, mocker):
+        """Top products should be passed through with category names."""
+        mock = mocker.patch.object(service.analytics_repo, 'get_top_products', return_value=[
+            {"product_id": 5, "sku": "AB001", "description": "Kibble", "product_category_id": 1,
+             "order_count": 3, "units": 6, "revenue": 60.0}
+        ])
+
+        products = service.get_top_products(START, END, limit=5, order_by="units")["products"]
+
+        mock.assert_called_once_with(START, END, 5, order_by="units")
+        assert products[0]["category"] == "food"
+
+    def test_repository_failure_returns_none(self, service, mocker):
+        """A failed rollup query should fail the report."""
+        mocker.patch.object(service.analytics_repo, 'get_daily_sales', return_value=None)
+        assert service.get_daily_sales(START, END) is None
+
+
+@pytest.mark.unit
+@pytest.mark.sales
+class TestAnalyticsRefresh:
+    """Test rollup refresh."""
+
+    def test_refresh_reports_days_and_pending(self, service, mocker):
+        """Refreshed days should be listed with the number still queued."""
+        mock = mocker.patch.object(service.analytics_repo, 'refresh_dirty_days',
+                                   return_value=[date(2025, 1, 1), date(2025, 1, 2)])
+
+        result = service.refresh_rollups(max_days=7)
+
+        mock.assert_called_once_with(7)
+        assert result == {"refreshed_days": ["2025-01-01", "2025-01-02"], "pending_days": 2}
+
+    def test_refresh_failure(self, service, mocker):
+        """A failed refresh should return None."""
+        mocker.patch.object(service.analytics_repo, 'refresh_dirty_days', return_value=None)
+        assert service.refresh_rollups() is None
@@ -394,6 +394,45 @@ class TestAuthServiceUserCreation:
         
         assert user is None
         assert "Error creating user" in error
+    
+    def test_create_user_propagates_hashing_pool_busy(self, auth_service, mocker):
+        """Test a saturated hashing pool is raised (503) rather than reported as a failure."""
+        from app.core.lib.error_utils import PasswordHasherBusyError
+        mocker.patch.object(auth_service, '_validate_user_uniqueness', return_value=None)
+        mocker.patch.object(auth_service, '_validate_and_get_role_id', return_value=(1, None))
+        mocker.patch('app.auth.services.security_service.hash_password', side_effect=PasswordHasherBusyError())
+        
+        with pytest.raises(PasswordHasherBusyError):
+            auth_service.create_user("testuser", "test@example.com", "plain_password")
+
+
+class TestAuthServicePasswordUpgrade:
+    """Test rehash-on-login."""
+    
+    def test_upgrade_rehashes_outdated_cost(self, auth_service, mock_user, mocker):
+        """Test hashes with an outdated cost are replaced and saved."""
+        mocker.patch('app.auth.services.security_service.needs_rehash', return_value=True)
+        mocker.patch('app.auth.services.security_service.hash_password', return_value="new_hash")
+        mock_update = mocker.patch.object(auth_service.user_repo, 'update', return_value=mock_user)
+        
+        assert auth_service.upgrade_password_hash(mock_user, "plain_password") is True
+        assert mock_user.password_hash == "new_hash"
+        mock_update.assert_called_once_with(mock_user)
+    
+    def test_upgrade_skips_current_cost(self, auth_service, mock_user, mocker):
+        """Test hashes with the configured cost are left untouched."""
+        mocker.patch('app.auth.services.security_service.needs_rehash', return_value=False)
+        mock_update = mocker.patch.object(auth_service.user_repo, 'update')
+        
+        assert auth_service.upgrade_password_hash(mock_user, "plain_password") is False
+        mock_update.assert_not_called()
+    
+    def test_upgrade_failure_does_not_raise(self, auth_service, mock_user, mocker):
+        """Test a failed upgrade never breaks the login."""
+        mocker.patch('app.auth.services.security_service.needs_rehash', return_value=True)
+        mocker.patch('app.auth.services.security_service.hash_password', side_effect=Exception("pool down"))
+        
+        assert auth_service.upgrade_password_hash(mock_user, "plain_password") is False
 
 
 class TestAuthServiceUserUpdate:
@@ -24,6 +24,7 @@ def mock_cart():
     cart.id = 1
     cart.user_id = 100
     cart.finalized = False
+    cart.version = 1
     cart.created_at = datetime(2024, 1, 1, 12, 0, 0)
     cart.items = []
     return cart
@@ -261,7 +262,7 @@ class TestCartServiceUpdate:
         
         assert result == updated_cart
         assert mock_cart.finalized is True
-        service.repository.update.assert_called_once_with(mock_cart)
+        service.repository.update.assert_called_once_with(mock_cart, expected_version=None)
     
     def test_update_cart_not_found(self, mocker, service):
         """Test updating non-existent cart."""
@@ -760,7 +761,7 @@ class TestCartServiceCachedMethods:
             schema = schema_class(many=many, **(schema_kwargs or {}))
             return schema.dump(data)
         
-        mocker.patch.object(service.cache, 'get_or_set', side_effect=mock_get_or_set)
+        mocker.patch.object(service.cache_helper, 'get_or_set', side_effect=mock_get_or_set)
         
         result = service.get_cart_by_user_id_cached(100)
         
@@ -771,7 +772,7 @@ class TestCartServiceCachedMethods:
     
     def test_get_cart_by_user_id_cached_uses_cache_helper(self, mocker, service):
         """Test that cached method uses CacheHelper."""
-        mock_get_or_set = mocker.patch.object(service.cache, 'get_or_set', return_value={'id': 1})
+        mock_get_or_set = mocker.patch.object(service.cache_helper, 'get_or_set', return_value={'id': 1})
         
         result = service.get_cart_by_user_id_cached(100)
         
@@ -792,8 +793,8 @@ class TestCartServiceCachedMethods:
         # Create proper mock cart objects with items
         mock_item1 = Mock(product_id=1, quantity=2, price=10.0, amount=20.0)
         mock_item2 = Mock(product_id=2, quantity=1, price=15.0, amount=15.0)
-        mock_cart1 = Mock(id=1, user_id=100, finalized=False, items=[mock_item1], created_at=datetime.now())
-        mock_cart2 = Mock(id=2, user_id=200, finalized=False, items=[mock_item2], created_at=datetime.now())
+        mock_cart1 = Mock(id=1, user_id=100, finalized=False, version=1, items=[mock_item1], created_at=datetime.now())
+        mock_cart2 = Mock(id=2, user_id=200, finalized=False, version=1, items=[mock_item2], created_at=datetime.now())
         
         mocker.patch.object(service.repository, 'get_all', return_value=[mock_cart1, mock_cart2])
         
@@ -804,7 +805,7 @@ class TestCartServiceCachedMethods:
             schema = schema_class(many=many, **(schema_kwargs or {}))
             return schema.dump(data)
         
-        mocker.patch.object(service.cache, 'get_or_set', side_effect=mock_get_or_set)
+        mocker.patch.object(service.cache_helper, 'get_or_set', side_effect=mock_get_or_set)
         
         result = service.get_all_carts_cached()
         
@@ -825,7 +826,7 @@ class TestCartServiceCachedMethods:
             schema = schema_class(many=many, **(schema_kwargs or {}))
             return schema.dump(data)
         
-        mocker.patch.object(service.cache, 'get_or_set', side_effect=mock_get_or_set)
+        mocker.patch.object(service.cache_helper, 'get_or_set', side_effect=mock_get_or_set)
         
         result = service.get_cart_by_user_id_cached(100)
         
@@ -865,3 +866,98 @@ class TestCartServiceCacheInvalidation:
         """Test that remove_item_from_cart has @cache_invalidate decorator."""
         assert hasattr(service.remove_item_from_cart, '__name__')
 
+
+
+class TestCartServiceStorageMode:
+    """Test Redis storage mode and checkout persistence."""
+    
+    def test_database_mode_uses_cart_repository(self):
+        """Test that database mode keeps a single PostgreSQL repository."""
+        from app.sales.repositories.cart_repository import CartRepository
+        
+        service = CartService(storage_mode="database")
+        
+        assert isinstance(service.repository, CartRepository)
+        assert service.repository is service.database_repository
+    
+    def test_redis_mode_uses_redis_repository(self):
+        """Test that redis mode stores open carts through CartRedisRepository."""
+        from app.sales.repositories.cart_redis_repository import CartRedisRepository
+        
+        service = CartService(storage_mode="redis")
+        
+        assert isinstance(service.repository, CartRedisRepository)
+        assert service.repository.db_repository is service.database_repository
+    
+    def test_force_create_persists_cart_in_redis_mode(self, mocker):
+        """Test that carts created for orders bypass Redis."""
+        service = CartService(storage_mode="redis")
+        created = Mock(spec=Cart)
+        mocker.patch.object(service.database_repository, 'create', return_value=created)
+        redis_create = mocker.patch.object(service.repository, 'create')
+        
+        result = service.create_cart(force_create=True, user_id=100)
+        
+        assert result == created
+        redis_create.assert_not_called()
+    
+    def test_checkout_cart_database_mode(self, mocker, service, mock_cart):
+        """Test checkout returns the open cart in database mode."""
+        mocker.patch.object(service.repository, 'get_by_user_id', return_value=mock_cart)
+        
+        result = service.checkout_cart(100)
+        
+        assert result == mock_cart
+    
+    def test_checkout_cart_redis_mode_persists(self, mocker, mock_cart):
+        """Test checkout persists the Redis cart in redis mode."""
+        service = CartService(storage_mode="redis")
+        persist = mocker.patch.object(service.repository, 'persist', return_value=mock_cart)
+        
+        result = service.checkout_cart(100)
+        
+        assert result == mock_cart
+        persist.assert_called_once_with(100)
+    
+    def test_checkout_cart_invalidates_cached_cart(self, mocker, mock_cart):
+        """Test checkout deletes the user's cached cart and the all-carts list."""
+        service = CartService(storage_mode="redis")
+        mocker.patch.object(service.repository, 'persist', return_value=mock_cart)
+        cache = mocker.patch.object(service.cache_helper, 'cache')
+        
+        service.checkout_cart(100)
+        
+        deleted = [call[0][0] for call in cache.delete_data.call_args_list]
+        assert deleted == ["cart:v1:100", "cart:v1:all"]
+    
+    def test_get_cart_by_user_id_cached_reads_redis_directly(self, mocker):
+        """Test a Redis-resident cart is not copied into a second cache key."""
+        service = CartService(storage_mode="redis")
+        cart = Cart(id=1, user_id=100, finalized=False)
+        mocker.patch.object(service.repository, 'get_by_user_id', return_value=cart)
+        get_or_set = mocker.patch.object(service.cache_helper, 'get_or_set')
+        
+        result = service.get_cart_by_user_id_cached(100)
+        
+        assert result['user_id'] == 100
+        get_or_set.assert_not_called()
+    
+    def test_checkout_cart_handles_exception(self, mocker):
+        """Test checkout returns None on error."""
+        service = CartService(storage_mode="redis")
+        mocker.patch.object(service.repository, 'persist', side_effect=Exception("Redis down"))
+        
+        assert service.checkout_cart(100) is None
+    
+    def test_update_cart_items_redis_mode_skips_database(self, mocker):
+        """Test replacing items of a Redis cart never opens a database transaction."""
+        service = CartService(storage_mode="redis")
+        cart = Cart(user_id=100, finalized=False)
+        mocker.patch.object(service.repository, 'get_by_user_id', return_value=cart)
+        mocker.patch.object(service.repository, 'update', side_effect=lambda cart, expected_version=None: cart)
+        get_db = mocker.patch('app.core.database.get_db')
+        
+        result = service.update_cart(100, items=[{'product_id': 10, 'quantity': 2, 'amount': 20.0}])
+        
+        assert [(i.product_id, i.quantity) for i in result.items] == [(10, 2)]
+        get_db.assert_not_called()
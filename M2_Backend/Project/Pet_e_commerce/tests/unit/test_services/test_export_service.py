@@ -0,0 +1,133 @@
+"""
+Unit tests for SalesExportService.
+
+Tests cover:
+- Row conversion (status names, ISO dates, nested items)
+- CSV encoding (header, JSON-encoded item cells) and NDJSON encoding
+- Chunked output for large exports
+- Validation of resource/format and repository failures
+"""
+
+import csv
+import io
+import json
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import patch
+from app.core.reference_data import ReferenceDataCache, ReferenceSnapshot
+from app.sales.services import export_service
+from app.sales.services.export_service import SalesExportService
+
+SNAPSHOT = ReferenceSnapshot(tables={
+    "product_categories": {},
+    "pet_types": {},
+    "roles": {},
+    "order_statuses": {"pending": 1, "shipped": 2},
+    "return_statuses": {"requested": 1},
+    "invoice_statuses": {"paid": 1},
+})
+
+
+def make_order(order_id=1):
+    return SimpleNamespace(
+        id=order_id, user_id=7, order_status_id=2, total_amount=30.5,
+        created_at=datetime(2025, 1, 2, 10, 30), shipping_address="1 Main St, Town",
+        items=[SimpleNamespace(product_id=3, quantity=2, amount=15.25)]
+    )
+
+
+def make_service(mocker, records):
+    service = SalesExportService(batch_size=100)
+    for repo in service.repositories.values():
+        mocker.patch.object(repo, 'stream_for_export', return_value=iter(records))
+    return service
+
+
+@pytest.fixture(autouse=True)
+def reference_snapshot():
+    with patch.object(ReferenceDataCache, 'snapshot', SNAPSHOT):
+        yield
+
+
+@pytest.mark.unit
+@pytest.mark.sales
+class TestSalesExportEncoding:
+    """Test row conversion and encoders."""
+
+    def test_orders_csv(self, mocker):
+        """CSV should have a header and JSON-encoded items; commas are quoted."""
+        service = make_service(mocker, [make_order()])
+
+        body = "".join(service.export("orders", "csv"))
+
+        rows = list(csv.DictReader(io.StringIO(body)))
+        assert rows[0]["status"] == "shipped"
+        assert rows[0]["created_at"] == "2025-01-02T10:30:00"
+        assert rows[0]["shipping_address"] == "1 Main St, Town"
+        assert json.loads(rows[0]["items"]) == [{"product_id": 3, "quantity": 2, "amount": 15.25}]
+
+    def test_orders_ndjson(self, mocker):
+        """NDJSON should emit one object per line with nested items."""
+        service = make_service(mocker, [make_order(1), make_order(2)])
+
+        lines = "".join(service.export("orders", "ndjson")).splitlines()
+
+        assert [json.loads(line)["id"] for line in lines] == [1, 2]
+        assert json.loads(lines[0])["items"][0]["amount"] == 15.25
+
+    def test_invoices_and_returns(self, mocker):
+        """Invoice and return rows should use their own status tables."""
+        invoice = SimpleNamespace(id=4, order_id=1, user_id=7, invoice_status_id=1, total_amount=30.5,
+                                  created_at=datetime(2025, 1, 2), due_date=None)
+        service = make_service(mocker, [invoice])
+        row = json.loads("".join(service.export("invoices", "ndjson")))
+        assert row["status"] == "paid" and row["due_date"] is None
+
+        return_obj = SimpleNamespace(id=5, order_id=1, user_id=7, return_status_id=1, total_amount=10,
+                                     created_at=None, items=[SimpleNamespace(
+                                         product_id=3, quantity=1, amount=10, reason="Damaged")])
+        service = make_service(mocker, [return_obj])
+        row = json.loads("".join(service.export("returns", "ndjson")))
+        assert row["status"] == "requested" and row["items"][0]["reason"] == "Damaged"
+
+    def test_output_is_chunked(self, mocker):
+        """Large exports should be yielded in several bounded chunks."""
+        mocker.patch.object(export_service, 'CHUNK_SIZE', 1024)
+        service = make_service(mocker, [make_order(i) for i in range(100)])
+
+        for file_format in ("csv", "ndjson"):
+            service.repositories["orders"].stream_for_export.return_value = iter([make_order(i) for i in range(100)])
+            chunks = list(service.export("orders", file_format))
+            assert len(chunks) > 1
+            assert all(len(chunk) < 2048 for chunk in chunks)
+
+    def test_date_range_passed_to_repository(self, mocker):
+        """from/to should be forwarded to the repository stream."""
+        service = make_service(mocker, [])
+        start, end = datetime(2025, 1, 1), datetime(2025, 2, 1)
+
+        assert "".join(service.export("invoices", "csv", start_date=start, end_date=end)).startswith("id,")
+        service.repositories["invoices"].stream_for_export.assert_called_once_with(
+            start_date=start, end_date=end, batch_size=100)
+
+
+@pytest.mark.unit
+@pytest.mark.sales
+class TestSalesExportErrors:
+    """Test validation and failures."""
+
+    def test_unknown_resource_or_format(self, mocker):
+        """Unknown resources and formats should raise ValueError."""
+        service = make_service(mocker, [])
+        with pytest.raises(ValueError):
+            service.export("carts", "csv")
+        with pytest.raises(ValueError):
+            service.export("orders", "xml")
+
+    def test_repository_failure_returns_none(self, mocker):
+        """A failed query should be reported before streaming starts."""
+        service = make_service(mocker, [])
+        service.repositories["orders"].stream_for_export.return_value = None
+
+        assert service.export("orders", "csv") is None
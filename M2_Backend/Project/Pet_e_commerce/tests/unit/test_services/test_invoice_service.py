@@ -280,13 +280,29 @@ class TestInvoiceServiceCreation:
         assert result is None
     
     def test_create_invoice_duplicate_for_order(self, service, mock_invoice, mocker):
-        """Test creating duplicate invoice for same order fails."""
+        """Test creating duplicate invoice for same order returns the existing invoice."""
         mocker.patch.object(service.repository, 'get_by_order_id', return_value=mock_invoice)
+        mocker.patch.object(service.repository, 'create')
         
         result = service.create_invoice(order_id=100, user_id=50)
         
-        assert result is None
+        assert result == mock_invoice
         service.repository.get_by_order_id.assert_called_once_with(100)
+        service.repository.create.assert_not_called()
+    
+    def test_create_or_get_invoice_reports_existing(self, service, mock_invoice, mocker):
+        """Test the existing invoice is returned with created=False."""
+        mocker.patch.object(service.repository, 'get_by_order_id', return_value=mock_invoice)
+        
+        assert service.create_or_get_invoice(order_id=100, user_id=50) == (mock_invoice, False)
+    
+    def test_create_invoice_duplicate_for_other_user(self, service, mock_invoice, mocker):
+        """Test an existing invoice of another user is not returned."""
+        mocker.patch.object(service.repository, 'get_by_order_id', return_value=mock_invoice)
+        
+        result = service.create_invoice(order_id=100, user_id=51)
+        
+        assert result is None
     
     def test_create_invoice_order_not_found(self, service, mocker):
         """Test creating invoice with non-existent order."""
@@ -538,6 +554,59 @@ class TestInvoiceServiceStatusManagement:
         assert result is None
 
 
+@pytest.mark.unit
+@pytest.mark.sales
+@pytest.mark.invoices
+class TestInvoiceServiceOverdueSweep:
+    """Test the set-based overdue sweep."""
+    
+    def test_sweep_marks_and_invalidates_in_batch(self, service, mocker):
+        """Updated invoices and their users' lists should be invalidated in one call after commit."""
+        mocker.patch('app.sales.services.invoice_service.ReferenceData.get_invoice_status_id',
+                     side_effect=lambda name: {'pending': 2, 'overdue': 3}[name])
+        mocker.patch.object(service.repository, 'mark_overdue', return_value=[
+            Mock(id=1, user_id=50), Mock(id=2, user_id=50), Mock(id=3, user_id=60)
+        ])
+        service.cache_helper = Mock()
+        cutoff = datetime(2024, 3, 1)
+        
+        result = service.sweep_overdue_invoices(batch_size=100, now=cutoff)
+        
+        service.repository.mark_overdue.assert_called_once_with(2, 3, cutoff, 100)
+        service.cache_helper.invalidate_many_after_commit.assert_called_once_with(
+            ["1", "2", "3", "user:50:all", "user:60:all", "all"]
+        )
+        assert result["updated"] == 3
+        assert result["user_ids"] == [50, 60]
+        assert result["duration_ms"] >= 0
+    
+    def test_sweep_nothing_due(self, service, mocker):
+        """No overdue invoices should skip cache invalidation."""
+        mocker.patch('app.sales.services.invoice_service.ReferenceData.get_invoice_status_id', return_value=2)
+        mocker.patch.object(service.repository, 'mark_overdue', return_value=[])
+        service.cache_helper = Mock()
+        
+        result = service.sweep_overdue_invoices()
+        
+        assert result["updated"] == 0
+        service.cache_helper.invalidate_many_after_commit.assert_not_called()
+    
+    def test_sweep_repository_error(self, service, mocker):
+        """Repository errors should return None."""
+        mocker.patch('app.sales.services.invoice_service.ReferenceData.get_invoice_status_id', return_value=2)
+        mocker.patch.object(service.repository, 'mark_overdue', return_value=None)
+        
+        assert service.sweep_overdue_invoices() is None
+    
+    def test_sweep_missing_status(self, service, mocker):
+        """Unknown statuses should return None without touching invoices."""
+        mocker.patch('app.sales.services.invoice_service.ReferenceData.get_invoice_status_id', return_value=None)
+        mark = mocker.patch.object(service.repository, 'mark_overdue')
+        
+        assert service.sweep_overdue_invoices() is None
+        mark.assert_not_called()
+
+
 # ============ VALIDATION TESTS ============
 @pytest.mark.unit
 @pytest.mark.sales
@@ -726,3 +795,54 @@ class TestInvoiceServiceCacheInvalidation:
     def test_update_invoice_status_has_cache_invalidate_decorator(self, service):
         """Test that update_invoice_status has @cache_invalidate decorator."""
         assert hasattr(service.update_invoice_status, '__name__')
+    
+    def test_update_invoice_invalidates_owner_list_without_extra_queries(self, service, mock_invoice, mocker):
+        """The owner's list key should come from the loaded invoice, not new lookups."""
+        mocker.patch.object(service.repository, 'get_by_id', return_value=mock_invoice)
+        mocker.patch.object(service.repository, 'update', return_value=mock_invoice)
+        service.cache_helper = Mock()
+        
+        service.update_invoice(1, due_date=datetime(2024, 2, 15))
+        
+        service.repository.get_by_id.assert_called_once_with(1)
+        deleted = [call[0][0] for call in service.cache_helper.cache.delete_data.call_args_list]
+        assert deleted == [
+            "invoice:v1:1", "invoice:v1:user:50:all", "invoice:v1:all",
+            "user:v1:50:sensitive=True", "user:v1:50:sensitive=False",
+            "user:v1:all:sensitive=True", "user:v1:all:sensitive=False"
+        ]
+    
+    def test_delete_invoice_invalidates_owner_list(self, service, mock_invoice, mocker):
+        """Delete should invalidate the owner's list although the row is gone."""
+        mocker.patch.object(service.repository, 'get_by_id', return_value=mock_invoice)
+        mocker.patch.object(service.repository, 'delete', return_value=True)
+        service.cache_helper = Mock()
+        
+        service.delete_invoice(1)
+        
+        service.repository.get_by_id.assert_called_once_with(1)
+        deleted = [call[0][0] for call in service.cache_helper.cache.delete_data.call_args_list]
+        assert "invoice:v1:user:50:all" in deleted
+    
+    def test_missing_invoice_skips_owner_key(self, service, mocker):
+        """Without a loaded invoice there is no owner key to invalidate."""
+        mocker.patch.object(service.repository, 'get_by_id', return_value=None)
+        service.cache_helper = Mock()
+        
+        service.delete_invoice(999)
+        
+        deleted = [call[0][0] for call in service.cache_helper.cache.delete_data.call_args_list]
+        assert deleted == [
+            "invoice:v1:999", "invoice:v1:all", "user:v1:all:sensitive=True", "user:v1:all:sensitive=False"
+        ]
+    
+    def test_create_invoice_invalidates_owner_profile(self, service, mocker):
+        """The owner's profile embeds user_stats and should be invalidated on create."""
+        mocker.patch.object(service.repository, 'get_by_order_id', return_value=None)
+        service.cache_helper = Mock()
+        
+        service.create_invoice(order_id=100, user_id=50)
+        
+        deleted = [call[0][0] for call in service.cache_helper.cache.delete_data.call_args_list]
+        assert "user:v1:50:sensitive=True" in deleted
+        assert "user:v1:50:sensitive=False" in deleted
@@ -0,0 +1,161 @@
+"""
+Unit tests for the background job queue and sales tasks.
+
+Tests cover:
+- Retry backoff (exponential, capped, jittered)
+- Enqueue into the caller's transaction
+- Claiming with SKIP LOCKED, success, retry and dead-lettering
+- The idempotent sales.create_invoice task
+"""
+
+import pytest
+from datetime import datetime
+from unittest.mock import MagicMock, Mock, patch
+from sqlalchemy.dialects import postgresql
+from app.core import jobs
+from app.core.jobs import DeadJob, Job, JobQueue, retry_delay
+from app.sales import tasks
+
+
+def make_job(task="test.task", attempts=0, max_attempts=3):
+    return Job(id=7, queue="default", task=task, payload={"order_id": 1}, attempts=attempts,
+               max_attempts=max_attempts, run_at=datetime(2025, 1, 1), created_at=datetime(2025, 1, 1))
+
+
+@pytest.fixture
+def mock_db():
+    db = MagicMock()
+    with patch('app.core.jobs.get_db', return_value=db):
+        yield db
+
+
+@pytest.fixture
+def registered_task():
+    handler = Mock()
+    with patch.dict(jobs.TASKS, {"test.task": handler}):
+        yield handler
+
+
+@pytest.mark.unit
+class TestRetryDelay:
+    """Test retry backoff."""
+
+    def test_exponential_with_jitter(self):
+        with patch.object(jobs, 'JOB_RETRY_BASE_SECONDS', 10), patch.object(jobs, 'JOB_RETRY_MAX_SECONDS', 3600):
+            assert 8 <= retry_delay(1) <= 12
+            assert 32 <= retry_delay(3) <= 48
+
+    def test_capped(self):
+        with patch.object(jobs, 'JOB_RETRY_BASE_SECONDS', 10), patch.object(jobs, 'JOB_RETRY_MAX_SECONDS', 60):
+            assert retry_delay(20) <= 72
+
+
+@pytest.mark.unit
+class TestJobQueue:
+    """Test enqueue and run_next."""
+
+    def test_enqueue_adds_to_session(self, mock_db):
+        job = JobQueue().enqueue("test.task", {"order_id": 1}, delay_seconds=30)
+
+        mock_db.add.assert_called_once_with(job)
+        assert job.task == "test.task"
+        assert job.payload == {"order_id": 1}
+        assert (job.run_at - job.created_at).total_seconds() == 30
+
+    def test_enqueue_error_returns_none(self):
+        with patch('app.core.jobs.get_db', side_effect=RuntimeError("no app context")):
+            assert JobQueue().enqueue("test.task", {}) is None
+
+    def test_no_due_job(self, mock_db):
+        mock_db.scalars.return_value.first.return_value = None
+
+        assert JobQueue().run_next() is None
+        mock_db.rollback.assert_called_once()
+
+    def test_claim_uses_skip_locked(self, mock_db, registered_task):
+        mock_db.scalars.return_value.first.return_value = make_job()
+
+        JobQueue().run_next(["default"])
+
+        claim = str(mock_db.scalars.call_args[0][0].compile(dialect=postgresql.dialect()))
+        assert 'FOR UPDATE SKIP LOCKED' in claim
+
+    def test_success_deletes_job(self, mock_db, registered_task):
+        job = make_job()
+        mock_db.scalars.return_value.first.return_value = job
+
+        assert JobQueue().run_next() is True
+        registered_task.assert_called_once_with({"order_id": 1})
+        mock_db.begin_nested.assert_called_once()
+        mock_db.delete.assert_called_once_with(job)
+        mock_db.commit.assert_called_once()
+
+    def test_failure_schedules_retry(self, mock_db, registered_task):
+        job = make_job(attempts=0, max_attempts=3)
+        mock_db.scalars.return_value.first.return_value = job
+        registered_task.side_effect = RuntimeError("boom")
+
+        assert JobQueue().run_next() is False
+        assert job.attempts == 1
+        assert "boom" in job.last_error
+        assert job.run_at > datetime.utcnow()
+        mock_db.delete.assert_not_called()
+        mock_db.commit.assert_called_once()
+
+    def test_last_attempt_dead_letters(self, mock_db, registered_task):
+        job = make_job(attempts=2, max_attempts=3)
+        mock_db.scalars.return_value.first.return_value = job
+        registered_task.side_effect = RuntimeError("boom")
+
+        assert JobQueue().run_next() is False
+        dead = mock_db.add.call_args[0][0]
+        assert isinstance(dead, DeadJob)
+        assert dead.job_id == 7 and dead.attempts == 3
+        mock_db.delete.assert_called_once_with(job)
+
+    def test_unknown_task_fails(self, mock_db):
+        job = make_job(task="missing.task")
+        mock_db.scalars.return_value.first.return_value = job
+
+        assert JobQueue().run_next() is False
+        assert "No handler" in job.last_error
+
+
+@pytest.mark.unit
+@pytest.mark.sales
+class TestCreateInvoiceTask:
+    """Test the sales.create_invoice task."""
+
+    def test_registered(self):
+        assert jobs.TASKS[tasks.CREATE_INVOICE_TASK] is tasks.create_order_invoice
+
+    @patch('app.sales.tasks.OrderRepository')
+    @patch('app.sales.tasks.InvoiceRepository')
+    def test_existing_invoice_is_skipped(self, mock_invoice_repo, mock_order_repo):
+        mock_invoice_repo.return_value.get_by_order_id.return_value = Mock()
+
+        tasks.create_order_invoice({"order_id": 1})
+
+        mock_order_repo.return_value.get_by_id.assert_not_called()
+
+    @patch('app.sales.services.invoice_service.InvoiceService')
+    @patch('app.sales.tasks.OrderRepository')
+    @patch('app.sales.tasks.InvoiceRepository')
+    def test_creates_pending_invoice(self, mock_invoice_repo, mock_order_repo, mock_service):
+        mock_invoice_repo.return_value.get_by_order_id.return_value = None
+        mock_order_repo.return_value.get_by_id.return_value = Mock(id=1, user_id=100)
+
+        tasks.create_order_invoice({"order_id": 1})
+
+        mock_service.return_value.create_invoice.assert_called_once_with(order_id=1, user_id=100, status="pending")
+
+    @patch('app.sales.services.invoice_service.InvoiceService')
+    @patch('app.sales.tasks.OrderRepository')
+    @patch('app.sales.tasks.InvoiceRepository')
+    def test_failed_creation_raises_for_retry(self, mock_invoice_repo, mock_order_repo, mock_service):
+        mock_invoice_repo.return_value.get_by_order_id.return_value = None
+        mock_order_repo.return_value.get_by_id.return_value = Mock(id=1, user_id=100)
+        mock_service.return_value.create_invoice.return_value = None
+
+        with pytest.raises(RuntimeError):
+            tasks.create_order_invoice({"order_id": 1})
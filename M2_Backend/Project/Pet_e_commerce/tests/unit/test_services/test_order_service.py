@@ -171,11 +171,22 @@ class TestOrderServiceCreation:
             ]
         }
         
+        service.job_queue = Mock()
+        service.auto_invoice = True
+        
         result = service.create_order(**order_data)
         
         assert result == created_order
         service.repository.create.assert_called_once()
         cart_service_mock.finalize_cart.assert_called_once_with(10)
+        service.job_queue.enqueue.assert_called_once_with("sales.create_invoice", {"order_id": created_order.id})
+        
+        # Without ORDER_AUTO_INVOICE the invoice is left to POST /sales/invoices
+        service.job_queue.reset_mock()
+        service.auto_invoice = False
+        
+        assert service.create_order(**order_data) == created_order
+        service.job_queue.enqueue.assert_not_called()
     
     def test_create_order_converts_status_name(self, mocker, service):
         """Test that create_order converts status name to ID."""
@@ -254,7 +265,7 @@ class TestOrderServiceCreation:
         cart_service_mock = Mock()
         new_cart = Mock()
         new_cart.id = 20
-        cart_service_mock.get_cart_by_user_id.return_value = None  # No existing cart
+        cart_service_mock.checkout_cart.return_value = None  # No existing cart
         cart_service_mock.create_cart.return_value = new_cart
         cart_service_mock.finalize_cart.return_value = new_cart
         mocker.patch('app.sales.services.cart_service.CartService', return_value=cart_service_mock)
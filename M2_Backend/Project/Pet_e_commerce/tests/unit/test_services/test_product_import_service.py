@@ -0,0 +1,183 @@
+"""
+Unit tests for ProductImportService.
+
+Tests cover:
+- CSV and NDJSON parsing (empty cells, blank lines, invalid JSON)
+- Batched validation with per-row error report
+- Reference data conversion into staging rows
+- Duplicate SKUs (last line wins)
+- Single cache invalidation and failure handling
+"""
+
+import io
+import json
+import pytest
+from unittest.mock import patch
+from app.core.reference_data import ReferenceDataCache, ReferenceSnapshot
+from app.products.services.product_import_service import ProductImportService
+
+SNAPSHOT = ReferenceSnapshot(tables={
+    "product_categories": {"food": 1, "toys": 2},
+    "pet_types": {"dog": 1, "cat": 2},
+    "roles": {},
+    "order_statuses": {},
+    "return_statuses": {},
+    "invoice_statuses": {},
+})
+
+CSV_HEADER = "sku,name,description,category,pet_type,price,stock_quantity,brand\n"
+
+
+def make_service(mocker, batch_size=2, max_errors=100):
+    service = ProductImportService(batch_size=batch_size, max_errors=max_errors)
+    mocker.patch.object(service.product_repo, 'create_import_staging', return_value=True)
+    mocker.patch.object(service.product_repo, 'copy_into_import_staging', return_value=True)
+    mocker.patch.object(service.product_repo, 'merge_import_staging',
+                        return_value={"inserted": 2, "updated": 1, "unchanged": 0})
+    mocker.patch.object(service.cache_helper, 'invalidate_all_after_commit')
+    return service
+
+
+def staged_rows(service):
+    return [row for call in service.product_repo.copy_into_import_staging.call_args_list for row in call[0][0]]
+
+
+@pytest.fixture(autouse=True)
+def reference_snapshot():
+    with patch.object(ReferenceDataCache, 'snapshot', SNAPSHOT):
+        yield
+
+
+@pytest.mark.unit
+@pytest.mark.products
+class TestProductImportParsing:
+    """Test file parsing and validation."""
+
+    def test_csv_rows_are_validated_and_staged_in_batches(self, mocker):
+        """Valid rows should be converted to IDs and COPYed per batch."""
+        service = make_service(mocker)
+        body = CSV_HEADER + (
+            "AB001,Kibble,Dog kibble,food,dog,10.5,20,Acme\n"
+            "AB002,Ball,Cat ball,toys,cat,3,5,\n"
+            "AB003,Bone,Chew bone,toys,dog,4.25,7,Acme\n"
+        )
+
+        report = service.import_products(io.BytesIO(body.encode()), "csv", created_by="admin")
+
+        assert service.product_repo.copy_into_import_staging.call_count == 2
+        rows = staged_rows(service)
+        assert [row[:7] for row in rows] == [
+            (2, "AB001", "Dog kibble", 1, 1, 20, 10.5),
+            (3, "AB002", "Cat ball", 2, 2, 5, 3.0),
+            (4, "AB003", "Chew bone", 2, 1, 7, 4.25),
+        ]
+        assert rows[1][7] is None  # Empty cell = missing brand
+        assert rows[0][12] == "admin"
+        assert report["processed"] == 3
+        assert report["failed"] == 0
+        assert report["inserted"] == 2
+
+    def test_invalid_rows_are_reported_with_line_numbers(self, mocker):
+        """Bad rows should be skipped and reported; good rows still imported."""
+        service = make_service(mocker)
+        body = CSV_HEADER + (
+            "AB001,Kibble,Dog kibble,food,dog,10.5,20,Acme\n"
+            "AB002,Ball,Cat ball,snacks,cat,-3,5,\n"
+            "TOOLONG,Bone,Chew bone,toys,dog,4.25,7,Acme\n"
+        )
+
+        report = service.import_products(io.BytesIO(body.encode()), "csv")
+
+        assert [row[1] for row in staged_rows(service)] == ["AB001"]
+        assert report["failed"] == 2
+        first, second = report["errors"]
+        assert first["line"] == 3 and first["sku"] == "AB002"
+        assert set(first["errors"]) == {"category", "price"}
+        assert second["line"] == 4 and "sku" in second["errors"]
+
+    def test_ndjson_rows(self, mocker):
+        """NDJSON should skip blank lines and report invalid JSON per line."""
+        service = make_service(mocker)
+        product = {"sku": "CD001", "name": "Bed", "description": "Soft bed", "category": "toys",
+                   "pet_type": "cat", "price": 25, "stock_quantity": 3, "is_active": False}
+        body = json.dumps(product) + "\n\n{not json}\n[1, 2]\n"
+
+        report = service.import_products(io.BytesIO(body.encode()), "ndjson")
+
+        rows = staged_rows(service)
+        assert len(rows) == 1 and rows[0][1] == "CD001" and rows[0][9] is False
+        assert report["processed"] == 3
+        assert [error["line"] for error in report["errors"]] == [3, 4]
+        assert report["errors"][0]["errors"] == {"_row": ["Invalid JSON"]}
+
+    def test_duplicate_sku_last_line_wins(self, mocker):
+        """A repeated SKU should report the earlier line as superseded."""
+        service = make_service(mocker)
+        body = CSV_HEADER + (
+            "AB001,Kibble,Dog kibble,food,dog,10.5,20,Acme\n"
+            "AB001,Kibble,Dog kibble v2,food,dog,11,20,Acme\n"
+        )
+
+        report = service.import_products(io.BytesIO(body.encode()), "csv")
+
+        assert report["duplicates"] == 1
+        assert report["failed"] == 0
+        assert report["errors"] == [{"line": 2, "sku": "AB001", "errors": {"sku": ["Superseded by line 3"]}}]
+
+    def test_error_report_is_capped(self, mocker):
+        """Only max_errors entries are kept; the count stays exact."""
+        service = make_service(mocker, max_errors=1)
+        body = CSV_HEADER + "X,,,,,,\n" * 3
+
+        report = service.import_products(io.BytesIO(body.encode()), "csv")
+
+        assert report["failed"] == 3
+        assert len(report["errors"]) == 1
+        assert report["errors_truncated"] is True
+
+    def test_unsupported_format_and_undecodable_file(self, mocker):
+        """Unknown formats and non-UTF-8 files should raise ValueError."""
+        service = make_service(mocker)
+        with pytest.raises(ValueError):
+            service.import_products(io.BytesIO(b""), "xml")
+        with pytest.raises(ValueError):
+            service.import_products(io.BytesIO(CSV_HEADER.encode() + b"\xff\xfe\x00bad\n"), "csv")
+
+
+@pytest.mark.unit
+@pytest.mark.products
+class TestProductImportMerge:
+    """Test merge, cache invalidation and failures."""
+
+    def test_cache_invalidated_once(self, mocker):
+        """Product caches should be cleared once per import, not per row."""
+        service = make_service(mocker, batch_size=1)
+        body = CSV_HEADER + "AB001,Kibble,Dog kibble,food,dog,10.5,20,Acme\n" * 3
+
+        service.import_products(io.BytesIO(body.encode()), "csv")
+
+        service.product_repo.merge_import_staging.assert_called_once()
+        service.cache_helper.invalidate_all_after_commit.assert_called_once()
+
+    def test_no_invalidation_when_nothing_changed(self, mocker):
+        """Unchanged imports should leave the cache alone."""
+        service = make_service(mocker)
+        service.product_repo.merge_import_staging.return_value = {"inserted": 0, "updated": 0, "unchanged": 1}
+
+        service.import_products(io.BytesIO((CSV_HEADER + "AB001,K,Dog kibble,food,dog,1,1,\n").encode()), "csv")
+
+        service.cache_helper.invalidate_all_after_commit.assert_not_called()
+
+    def test_staging_failure_returns_none(self, mocker):
+        """A failed COPY or merge should fail the whole import."""
+        service = make_service(mocker)
+        service.product_repo.copy_into_import_staging.return_value = False
+        body = (CSV_HEADER + "AB001,K,Dog kibble,food,dog,1,1,\n").encode()
+
+        assert service.import_products(io.BytesIO(body), "csv") is None
+        service.product_repo.merge_import_staging.assert_not_called()
+
+        service.product_repo.copy_into_import_staging.return_value = True
+        service.product_repo.merge_import_staging.return_value = None
+        assert service.import_products(io.BytesIO(body), "csv") is None
+        service.cache_helper.invalidate_all_after_commit.assert_not_called()
@@ -849,3 +849,113 @@ class TestProductServiceCacheInvalidation:
         """Test that delete_product has @cache_invalidate decorator."""
         service = ProductService()
         assert hasattr(service.delete_product, '__name__')
+
+
+@pytest.mark.unit
+@pytest.mark.products
+class TestProductServiceBulkAdjust:
+    """Test set-based bulk price/stock adjustments."""
+    
+    def test_explicit_changes(self, mocker):
+        """Test changes become one VALUES row each and missing products are reported."""
+        service = ProductService()
+        mocker.patch.object(service.product_repo, 'bulk_adjust_by_ids', return_value=[1, 3])
+        mocker.patch.object(service.cache_helper, 'invalidate_all_after_commit')
+        
+        result = service.bulk_adjust_products(changes=[
+            {'id': 1, 'price': 19.99},
+            {'id': 2, 'price_percent': -10, 'stock_delta': -5},
+            {'id': 3, 'stock_delta': 7},
+        ])
+        
+        rows = service.product_repo.bulk_adjust_by_ids.call_args[0][0]
+        assert rows == [(1, 'set', 19.99, 0), (2, 'percent', -10.0, -5), (3, 'keep', 0.0, 7)]
+        assert result == {'requested': 3, 'updated': 2, 'not_updated': [2]}
+        service.cache_helper.invalidate_all_after_commit.assert_called_once()
+    
+    def test_filter_converts_reference_names(self, mocker):
+        """Test filter names are converted to IDs before the single UPDATE."""
+        service = ProductService()
+        mocker.patch('app.products.services.product_service.ReferenceData.get_product_category_id', return_value=4)
+        mocker.patch('app.products.services.product_service.ReferenceData.get_pet_type_id', return_value=2)
+        mocker.patch.object(service.product_repo, 'bulk_adjust_by_filter', return_value=[5, 6, 7])
+        mocker.patch.object(service.cache_helper, 'invalidate_all_after_commit')
+        
+        result = service.bulk_adjust_products(
+            filters={'category': 'food', 'pet_type': 'cat', 'brand': 'Acme'},
+            adjustment={'price_percent': 5}
+        )
+        
+        filters, mode, value, delta, _ = service.product_repo.bulk_adjust_by_filter.call_args[0]
+        assert filters == {'brand': 'Acme', 'category_id': 4, 'pet_type_id': 2}
+        assert (mode, value, delta) == ('percent', 5.0, 0)
+        assert result == {'updated': 3}
+        service.cache_helper.invalidate_all_after_commit.assert_called_once()
+    
+    def test_nothing_updated_keeps_cache(self, mocker):
+        """Test the cache is left alone when no product changed."""
+        service = ProductService()
+        mocker.patch.object(service.product_repo, 'bulk_adjust_by_filter', return_value=[])
+        mocker.patch.object(service.cache_helper, 'invalidate_all_after_commit')
+        
+        result = service.bulk_adjust_products(filters={'ids': [9]}, adjustment={'stock_delta': -1})
+        
+        assert result == {'updated': 0}
+        service.cache_helper.invalidate_all_after_commit.assert_not_called()
+    
+    def test_repository_error_returns_none(self, mocker):
+        """Test database errors propagate as None."""
+        service = ProductService()
+        mocker.patch.object(service.product_repo, 'bulk_adjust_by_ids', return_value=None)
+        
+        assert service.bulk_adjust_products(changes=[{'id': 1, 'price': 2}]) is None
+
+
+@pytest.mark.unit
+@pytest.mark.products
+class TestProductServiceRelated:
+    """Test the related products read path and offline rebuild."""
+    
+    def test_related_cached_per_product_and_sliced(self, mocker):
+        """Test the full top-K list is cached once per product and sliced to the limit."""
+        service = ProductService()
+        mock_get_or_set = mocker.patch.object(
+            service.cache_helper, 'get_or_set', return_value=[{'id': 2}, {'id': 3}, {'id': 4}]
+        )
+        
+        result = service.get_related_products_cached(1, limit=2)
+        
+        assert result == [{'id': 2}, {'id': 3}]
+        assert mock_get_or_set.call_args[1]['cache_key'] == "1:related"
+        assert mock_get_or_set.call_args[1]['many'] is True
+    
+    def test_related_error_returns_none(self, mocker):
+        """Test a failed lookup is not turned into an empty list."""
+        service = ProductService()
+        mocker.patch.object(service.cache_helper, 'get_or_set', return_value=None)
+        
+        assert service.get_related_products_cached(1) is None
+    
+    def test_rebuild_invalidates_rebuilt_lists(self, mocker):
+        """Test a rebuilt batch drops its cached related lists in one call after commit."""
+        service = ProductService()
+        mocker.patch.object(service.related_repo, 'rebuild', return_value=[5, 6])
+        mocker.patch.object(service.cache_helper, 'invalidate_many_after_commit')
+        
+        result = service.rebuild_related_products(after_product_id=4, batch_size=2)
+        
+        assert result['product_ids'] == [5, 6]
+        assert service.related_repo.rebuild.call_args[0][:2] == (4, 2)
+        assert list(service.cache_helper.invalidate_many_after_commit.call_args[0][0]) == ["5:related", "6:related"]
+    
+    def test_rebuild_done_and_error(self, mocker):
+        """Test an exhausted rebuild returns no ids and an error returns None."""
+        service = ProductService()
+        mocker.patch.object(service.cache_helper, 'invalidate_many_after_commit')
+        mocker.patch.object(service.related_repo, 'rebuild', return_value=[])
+        
+        assert service.rebuild_related_products(after_product_id=9)['product_ids'] == []
+        service.cache_helper.invalidate_many_after_commit.assert_not_called()
+        
+        service.related_repo.rebuild.return_value = None
+        assert service.rebuild_related_products(after_product_id=9) is None
@@ -7,17 +7,31 @@ Tests cover:
 - Security configuration (bcrypt rounds)
 - Both class methods and convenience functions
 - Edge cases and error handling
+- Bounded worker pool (backpressure, process pool) and rehash detection
 """
 
+import threading
+from concurrent.futures import Future
 import pytest
 from unittest.mock import patch, MagicMock
+from app.auth.services import security_service
 from app.auth.services.security_service import (
     SecurityService,
+    PasswordHasher,
     hash_password,
     verify_password,
+    needs_rehash,
     APP_PEPPER,
     SECURITY_CONFIG
 )
+from app.core.lib.error_utils import PasswordHasherBusyError
+
+
+@pytest.fixture(autouse=True)
+def inline_hasher():
+    """Hash on the test thread so bcrypt mocks apply (pool covered separately)."""
+    with patch.object(security_service, '_hasher', PasswordHasher(0, 4, 10)):
+        yield
 
 
 @pytest.mark.unit
@@ -272,3 +286,95 @@ class TestPasswordHashingEdgeCases:
         
         # Exact match should succeed
         assert SecurityService.verify_password("TestPassword123", hashed) is True
+
+
+@pytest.mark.unit
+@pytest.mark.auth
+class TestPasswordHasherPool:
+    """Test the bounded worker pool."""
+    
+    def test_process_pool_hashes_and_verifies(self):
+        """Hashes made in worker processes should verify normally."""
+        hasher = PasswordHasher(workers=1, max_pending=2, timeout=30)
+        with patch.object(security_service, '_hasher', hasher):
+            with patch.dict(SECURITY_CONFIG, {'bcrypt_rounds': 4}):
+                hashed = hash_password("pool_password")
+                assert hashed.startswith("$2b$04$")
+                assert verify_password("pool_password", hashed) is True
+                assert verify_password("other", hashed) is False
+        hasher.shutdown()
+    
+    def test_saturated_pool_rejects_immediately(self):
+        """Should raise PasswordHasherBusyError instead of queueing past the limit."""
+        hasher = PasswordHasher(workers=0, max_pending=1, timeout=10)
+        started, release = threading.Event(), threading.Event()
+        
+        def slow():
+            started.set()
+            release.wait(5)
+        
+        worker = threading.Thread(target=hasher.run, args=('hash', slow))
+        worker.start()
+        started.wait(5)
+        try:
+            with pytest.raises(PasswordHasherBusyError):
+                hasher.run('verify', lambda: True)
+        finally:
+            release.set()
+            worker.join()
+        
+        # Slot released once the running operation finished
+        assert hasher.run('verify', lambda: True) is True
+    
+    def test_timed_out_operation_keeps_its_slot(self):
+        """A timed-out task still running in the pool should hold its slot until it finishes."""
+        hasher = PasswordHasher(workers=1, max_pending=1, timeout=0.01)
+        future = Future()
+        executor = MagicMock()
+        executor.submit.return_value = future
+        
+        with patch.object(hasher, '_get_executor', return_value=executor):
+            with pytest.raises(PasswordHasherBusyError):
+                hasher.run('hash', lambda: True)
+            with pytest.raises(PasswordHasherBusyError):
+                hasher.run('verify', lambda: True)
+            
+            future.set_result(True)
+            executor.submit.return_value = Future()
+            executor.submit.return_value.set_result("ok")
+            assert hasher.run('verify', lambda: True) == "ok"
+    
+    def test_pool_does_not_fork(self):
+        """Workers should be started by a forkserver, not forked from the app process."""
+        hasher = PasswordHasher(workers=1, max_pending=1, timeout=10)
+        with patch.object(security_service, 'ProcessPoolExecutor') as pool:
+            hasher._get_executor()
+        assert pool.call_args.kwargs['mp_context'].get_start_method() == 'forkserver'
+    
+    def test_busy_error_is_503(self):
+        """Busy errors should map to 503 with a retry hint."""
+        error = PasswordHasherBusyError()
+        assert error.code == 503
+        assert error.retry_after >= 1
+
+
+@pytest.mark.unit
+@pytest.mark.auth
+class TestNeedsRehash:
+    """Test detection of hashes made with an outdated cost."""
+    
+    def test_current_cost_not_rehashed(self):
+        """Hashes with the configured cost are kept."""
+        rounds = SECURITY_CONFIG['bcrypt_rounds']
+        assert needs_rehash(f"$2b${rounds:02d}$abcdefghijklmnopqrstuv") is False
+    
+    def test_other_cost_rehashed(self):
+        """Hashes with a lower or higher cost are upgraded."""
+        with patch.dict(SECURITY_CONFIG, {'bcrypt_rounds': 12}):
+            assert needs_rehash("$2b$14$abcdefghijklmnopqrstuv") is True
+            assert needs_rehash("$2b$10$abcdefghijklmnopqrstuv") is True
+    
+    def test_unparseable_hash_not_rehashed(self):
+        """Non-bcrypt values are left alone."""
+        assert needs_rehash("hashed_password") is False
+        assert needs_rehash(None) is False